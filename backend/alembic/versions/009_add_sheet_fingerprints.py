@@ -0,0 +1,26 @@
+"""Add sheet fingerprints to uploaded files
+
+Revision ID: 009
+Revises: 008
+Create Date: 2025-01-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "009"
+down_revision = "008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "uploaded_files", sa.Column("sheet_fingerprints", sa.Text(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("uploaded_files", "sheet_fingerprints")
@@ -0,0 +1,48 @@
+"""Drop rate_limits table now that rate limits live in Redis
+
+Revision ID: 010
+Revises: 009
+Create Date: 2025-01-20 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "010"
+down_revision = "009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index(op.f("ix_rate_limits_window_start"), table_name="rate_limits")
+    op.drop_index(op.f("ix_rate_limits_key"), table_name="rate_limits")
+    op.drop_table("rate_limits")
+
+
+def downgrade() -> None:
+    op.create_table(
+        "rate_limits",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, default=0),
+        sa.Column("window_start", sa.DateTime(), nullable=False),
+        sa.Column("blocked_until", sa.DateTime(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("key"),
+    )
+    op.create_index(op.f("ix_rate_limits_key"), "rate_limits", ["key"], unique=False)
+    op.create_index(
+        op.f("ix_rate_limits_window_start"),
+        "rate_limits",
+        ["window_start"],
+        unique=False,
+    )
@@ -0,0 +1,35 @@
+"""Add background job tracking to report exports
+
+Revision ID: 012
+Revises: 011
+Create Date: 2025-01-23 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "012"
+down_revision = "011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("report_exports", sa.Column("task_id", sa.String(255)))
+    op.add_column(
+        "report_exports",
+        sa.Column("priority", sa.String(20), server_default="interactive"),
+    )
+    op.add_column(
+        "report_exports", sa.Column("progress", sa.Integer(), server_default="0")
+    )
+    op.add_column("report_exports", sa.Column("current_step", sa.String(255)))
+
+
+def downgrade() -> None:
+    op.drop_column("report_exports", "current_step")
+    op.drop_column("report_exports", "progress")
+    op.drop_column("report_exports", "priority")
+    op.drop_column("report_exports", "task_id")
@@ -0,0 +1,27 @@
+"""Add ZIP export format for report bundles
+
+Revision ID: 013
+Revises: 012
+Create Date: 2025-01-24 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "013"
+down_revision = "012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Only PostgreSQL has a native enum type to extend
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE exportformat ADD VALUE IF NOT EXISTS 'ZIP'")
+
+
+def downgrade() -> None:
+    # PostgreSQL cannot drop enum values; remove bundle exports instead
+    op.execute("DELETE FROM report_exports WHERE export_format = 'ZIP'")
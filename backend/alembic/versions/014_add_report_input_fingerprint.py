@@ -0,0 +1,30 @@
+"""Add input fingerprint to report exports
+
+Revision ID: 014
+Revises: 013
+Create Date: 2025-01-25 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "014"
+down_revision = "013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("report_exports", sa.Column("input_fingerprint", sa.String(64)))
+    op.create_index(
+        "ix_report_exports_input_fingerprint",
+        "report_exports",
+        ["input_fingerprint"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_report_exports_input_fingerprint", table_name="report_exports")
+    op.drop_column("report_exports", "input_fingerprint")
@@ -278,6 +278,7 @@ def system_health(
     """Get system health information."""
     from datetime import datetime, timedelta
 
+    from app.core.executors import executor_stats
     from app.models.audit import AuditLog
     from sqlalchemy import func
 
@@ -317,6 +318,7 @@ def system_health(
             "failed_logins": recent_failed_logins,
         },
         "database": {"status": "connected"},
+        "executors": executor_stats(),
     }
 
 
@@ -402,6 +402,7 @@ def execute_partial_processing(
             # Update file record with partial data
             file_record.parsed_data = json.dumps(result.extracted_data)
             file_record.status = FileStatus.COMPLETED
+            file_record.processing_completed_at = datetime.utcnow()
             file_record.is_valid = result.completion_percentage > 50
 
             # Update validation errors with partial processing info
@@ -25,7 +25,7 @@ from app.services.auth_service import AuthService
 from app.core.security import (
     create_access_token,
     create_refresh_token,
-    verify_token,
+    decode_token,
     create_email_verification_token,
 )
 from app.core.config import settings
@@ -50,9 +50,9 @@ def get_current_user(
         )
 
     token = credentials.credentials
-    user_id = verify_token(token)
+    claims = decode_token(token)
 
-    if user_id is None:
+    if claims is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
@@ -60,7 +60,7 @@ def get_current_user(
         )
 
     auth_service = AuthService(db)
-    user = auth_service.get_user_by_id(int(user_id))
+    user = auth_service.get_user_by_id(int(claims.subject))
 
     if user is None:
         raise HTTPException(
@@ -69,6 +69,13 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    if (user.token_version or 0) != claims.version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
@@ -111,7 +118,7 @@ def register(
 ) -> Any:
     """Register a new user."""
     # Apply rate limiting
-    rate_limiter = RateLimiter(db)
+    rate_limiter = RateLimiter()
     rate_limiter.check_rate_limit(
         request=request,
         endpoint="register",
@@ -164,7 +171,7 @@ async def login(
 ) -> Any:
     """Login user and return access token."""
     # Apply rate limiting
-    rate_limiter = RateLimiter(db)
+    rate_limiter = RateLimiter()
     rate_limiter.check_rate_limit(
         request=request,
         endpoint="login",
@@ -224,7 +231,9 @@ async def login(
         access_token_expires = timedelta(days=30)
 
     access_token = create_access_token(
-        subject=user.id, expires_delta=access_token_expires
+        subject=user.id,
+        expires_delta=access_token_expires,
+        version=user.token_version or 0,
     )
 
     return {
@@ -236,10 +245,11 @@ async def login(
 @router.post("/logout")
 def logout(
     request: Request,
+    everywhere: bool = False,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ) -> Any:
-    """Logout user."""
+    """Logout user. With ``everywhere`` all of the user's tokens are revoked."""
     auth_service = AuthService(db)
 
     # Get client info for audit logging
@@ -249,6 +259,8 @@ def logout(
     auth_service.logout_user(
         user_id=current_user.id, ip_address=ip_address, user_agent=user_agent
     )
+    if everywhere:
+        auth_service.revoke_user_tokens(current_user.id)
 
     return {"message": "Successfully logged out"}
 
@@ -256,25 +268,32 @@ def logout(
 @router.post("/refresh", response_model=Token)
 def refresh_token(refresh_token: str, db: Session = Depends(get_db)) -> Any:
     """Refresh access token."""
-    user_id = verify_token(refresh_token, "refresh")
+    claims = decode_token(refresh_token, "refresh")
 
-    if user_id is None:
+    if claims is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
         )
 
     auth_service = AuthService(db)
-    user = auth_service.get_user_by_id(int(user_id))
+    user = auth_service.get_user_by_id(int(claims.subject))
 
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid user"
         )
 
+    if (user.token_version or 0) != claims.version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
+        )
+
     # Create new access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        subject=user.id, expires_delta=access_token_expires
+        subject=user.id,
+        expires_delta=access_token_expires,
+        version=user.token_version or 0,
     )
 
     return {
@@ -365,7 +384,7 @@ def request_password_reset(
 ) -> Any:
     """Request password reset."""
     # Apply rate limiting
-    rate_limiter = RateLimiter(db)
+    rate_limiter = RateLimiter()
     rate_limiter.check_rate_limit(
         request=request,
         endpoint="password_reset",
@@ -1,55 +1,47 @@
 from typing import Any, List, Optional, Dict
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-# # from fastapi_cache.decorator import cache  # TODO: Fix fastapi-cache2 import  # TODO: Fix fastapi-cache2 import
-
-from app.models.base import get_db
+from app.models.base import get_async_db, get_db
 from app.models.user import User
 from app.models.file import UploadedFile, FileStatus
-from app.models.parameter import Parameter
-from app.models.report import ReportExport
 from app.api.v1.endpoints.auth import get_current_active_user
 from app.core.dependencies import require_permissions
 from app.core.permissions import Permission
+from app.core.response_cache import cached_response, invalidate_user_responses
+from app.repositories.async_repositories import (
+    AsyncParameterRepository,
+    AsyncReportExportRepository,
+    AsyncUploadedFileRepository,
+)
 from app.services.dashboard_metrics import DashboardMetricsService
 
 router = APIRouter()
 
 
 @router.get("/metrics")
+@cached_response("dashboard")
 async def get_dashboard_metrics(
     current_user: User = Depends(require_permissions(Permission.DASHBOARD_READ)),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Dict[str, Any]:
     """Return simple dashboard metrics."""
-    total_files = (
-        db.query(UploadedFile).filter(UploadedFile.user_id == current_user.id).count()
+    files = AsyncUploadedFileRepository(db)
+    total_files = await files.count({"user_id": current_user.id})
+    completed_files = await files.count(
+        {"user_id": current_user.id, "status": FileStatus.COMPLETED}
     )
-    completed_files = (
-        db.query(UploadedFile)
-        .filter(
-            UploadedFile.user_id == current_user.id,
-            UploadedFile.status == FileStatus.COMPLETED,
-        )
-        .count()
+    processing_files = await files.count(
+        {"user_id": current_user.id, "status": FileStatus.PROCESSING}
     )
-    processing_files = (
-        db.query(UploadedFile)
-        .filter(
-            UploadedFile.user_id == current_user.id,
-            UploadedFile.status == FileStatus.PROCESSING,
-        )
-        .count()
+    total_parameters = await AsyncParameterRepository(db).count(
+        {"user_id": current_user.id}
     )
-    total_parameters = (
-        db.query(Parameter).filter(Parameter.user_id == current_user.id).count()
-    )
-    total_reports = (
-        db.query(ReportExport)
-        .filter(ReportExport.created_by == current_user.id)
-        .count()
+    total_reports = await AsyncReportExportRepository(db).count(
+        {"created_by": current_user.id}
     )
     return {
         "total_files": total_files,
@@ -61,6 +53,7 @@ async def get_dashboard_metrics(
 
 
 @router.get("/charts")
+@cached_response("dashboard")
 async def get_dashboard_charts(
     current_user: User = Depends(require_permissions(Permission.DASHBOARD_READ)),
     db: Session = Depends(get_db),
@@ -85,7 +78,7 @@ class DashboardPeriod:
 
 
 @router.get("/metrics/overview")
-# @cache(expire=300)  # TODO: Fix caching
+@cached_response("dashboard")
 async def get_overview_metrics(
     period: str = Query(DashboardPeriod.YTD, description="Time period for metrics"),
     file_id: Optional[int] = Query(None, description="Specific file ID to analyze"),
@@ -119,7 +112,7 @@ async def get_overview_metrics(
 
 
 @router.get("/metrics/pl")
-# @cache(expire=300)  # TODO: Fix caching
+@cached_response("dashboard")
 async def get_pl_metrics(
     period: str = Query(DashboardPeriod.YTD, description="Time period for metrics"),
     file_id: Optional[int] = Query(None, description="Specific file ID to analyze"),
@@ -155,7 +148,7 @@ async def get_pl_metrics(
 
 
 @router.get("/metrics/cash-flow")
-# @cache(expire=300)  # TODO: Fix caching
+@cached_response("dashboard")
 async def get_cash_flow_metrics(
     period: str = Query(DashboardPeriod.YTD, description="Time period for metrics"),
     file_id: Optional[int] = Query(None, description="Specific file ID to analyze"),
@@ -192,7 +185,7 @@ async def get_cash_flow_metrics(
 
 
 @router.get("/metrics/balance-sheet")
-# @cache(expire=300)  # TODO: Fix caching
+@cached_response("dashboard")
 async def get_balance_sheet_metrics(
     period: str = Query(DashboardPeriod.YTD, description="Time period for metrics"),
     file_id: Optional[int] = Query(None, description="Specific file ID to analyze"),
@@ -229,7 +222,7 @@ async def get_balance_sheet_metrics(
 
 
 @router.get("/metrics/trends")
-# @cache(expire=300)  # TODO: Fix caching
+@cached_response("dashboard")
 async def get_financial_trends(
     metric_type: str = Query(
         ..., description="Type of metric (revenue, expenses, cash_flow, etc.)"
@@ -274,7 +267,7 @@ async def get_financial_trends(
 
 
 @router.get("/metrics/kpis")
-# @cache(expire=300)  # TODO: Fix caching
+@cached_response("dashboard")
 async def get_key_performance_indicators(
     period: str = Query(DashboardPeriod.YTD, description="Time period for KPIs"),
     industry: Optional[str] = Query(None, description="Industry for benchmarking"),
@@ -312,7 +305,7 @@ async def get_key_performance_indicators(
 
 
 @router.get("/metrics/ratios")
-# @cache(expire=300)  # TODO: Fix caching
+@cached_response("dashboard")
 async def get_financial_ratios(
     ratio_category: Optional[str] = Query(
         None,
@@ -356,6 +349,7 @@ async def get_financial_ratios(
 
 
 @router.get("/metrics/variance")
+@cached_response("dashboard")
 async def get_variance_analysis(
     base_period: str = Query(..., description="Base period for comparison"),
     compare_period: str = Query(..., description="Period to compare against"),
@@ -401,9 +395,10 @@ async def get_variance_analysis(
 
 
 @router.get("/data-sources")
+@cached_response("dashboard")
 async def get_dashboard_data_sources(
     current_user: User = Depends(require_permissions(Permission.DASHBOARD_READ)),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Dict[str, Any]:
     """
     Get available data sources for dashboard metrics.
@@ -412,12 +407,7 @@ async def get_dashboard_data_sources(
     """
     try:
         # Get user's uploaded files
-        files = (
-            db.query(UploadedFile)
-            .filter(UploadedFile.uploaded_by_id == current_user.id)
-            .order_by(UploadedFile.created_at.desc())
-            .all()
-        )
+        files = await AsyncUploadedFileRepository(db).list_for_user(current_user.id)
 
         data_sources = []
         for file in files:
@@ -465,6 +455,7 @@ async def refresh_dashboard_cache(
         refresh_result = await metrics_service.refresh_cache(
             user_id=current_user.id, file_id=file_id
         )
+        await run_in_threadpool(invalidate_user_responses, current_user.id)
 
         return {
             "message": "Dashboard cache refreshed successfully",
@@ -1,5 +1,14 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status, Query
+from fastapi import (
+    APIRouter,
+    Depends,
+    UploadFile,
+    File,
+    HTTPException,
+    status,
+    Query,
+    Request,
+)
 from fastapi.responses import FileResponse, Response
 from sqlalchemy.orm import Session
 
@@ -7,6 +16,8 @@ from app.models.base import get_db
 from app.models.user import User
 from app.models.file import FileStatus
 from app.schemas.file import (
+    ChunkedUploadCreate,
+    ChunkedUploadStatus,
     FileUploadResponse,
     FileInfo,
     FileListResponse,
@@ -19,6 +30,7 @@ from app.services.file_service import FileService
 from app.api.v1.endpoints.auth import get_current_active_user
 from app.core.dependencies import require_permissions
 from app.core.permissions import Permission
+from app.core.rate_limiter import rate_limit
 
 router = APIRouter()
 
@@ -31,6 +43,7 @@ def get_file_service(db: Session = Depends(get_db)) -> FileService:
 @router.post(
     "/upload", response_model=FileUploadResponse, status_code=status.HTTP_201_CREATED
 )
+@rate_limit(max_attempts=30, window_minutes=1, block_minutes=1, endpoint="upload")
 async def upload_file(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_active_user),
@@ -51,6 +64,70 @@ async def upload_file(
         )
 
 
+@router.post(
+    "/uploads",
+    response_model=ChunkedUploadStatus,
+    status_code=status.HTTP_201_CREATED,
+)
+@rate_limit(max_attempts=30, window_minutes=1, block_minutes=1, endpoint="upload")
+def start_chunked_upload(
+    upload: ChunkedUploadCreate,
+    current_user: User = Depends(get_current_active_user),
+    file_service: FileService = Depends(get_file_service),
+) -> Any:
+    """
+    Start a resumable chunked upload for large files.
+    """
+    return file_service.start_chunked_upload(
+        upload.filename, upload.total_size, upload.content_type, current_user
+    )
+
+
+@router.get("/uploads/{upload_id}", response_model=ChunkedUploadStatus)
+async def get_chunked_upload_status(
+    upload_id: str,
+    current_user: User = Depends(get_current_active_user),
+    file_service: FileService = Depends(get_file_service),
+) -> Any:
+    """
+    Get the number of bytes received so far, to resume an interrupted upload.
+    """
+    return await file_service.get_chunked_upload_status(upload_id, current_user)
+
+
+@router.put("/uploads/{upload_id}", response_model=ChunkedUploadStatus)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0, description="Byte offset of this chunk"),
+    current_user: User = Depends(get_current_active_user),
+    file_service: FileService = Depends(get_file_service),
+) -> Any:
+    """
+    Append the raw request body to a chunked upload at the given offset.
+    """
+    return await file_service.append_upload_chunk(
+        upload_id, offset, request.stream(), current_user
+    )
+
+
+@router.post(
+    "/uploads/{upload_id}/complete",
+    response_model=FileUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def complete_chunked_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_active_user),
+    file_service: FileService = Depends(get_file_service),
+) -> Any:
+    """
+    Finish a chunked upload and register it as an uploaded file.
+    """
+    uploaded_file = await file_service.complete_chunked_upload(upload_id, current_user)
+    return FileUploadResponse.from_orm(uploaded_file)
+
+
 @router.get("/", response_model=List[FileInfo])
 def list_files(
     skip: int = Query(0, ge=0, description="Number of files to skip"),
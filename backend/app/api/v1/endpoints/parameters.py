@@ -1,11 +1,12 @@
 from typing import Any, List, Optional, Dict
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
 import math
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 from datetime import datetime
 
-from app.models.base import get_db
+from app.models.base import get_async_db, get_db
 from app.models.user import User
 from app.models.parameter import (
     Parameter,
@@ -26,7 +27,9 @@ from app.schemas.parameter import (
 )
 from app.api.v1.endpoints.auth import get_current_active_user
 from app.core.dependencies import require_permissions
+from app.core.executors import ExecutorBusyError, ExecutorTimeoutError
 from app.core.permissions import Permission
+from app.repositories.async_repositories import AsyncParameterRepository
 from app.services.parameter_detector import ParameterDetector
 
 router = APIRouter()
@@ -127,7 +130,7 @@ async def list_parameters(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Any:
     """
     List parameters with optional filtering.
@@ -135,21 +138,17 @@ async def list_parameters(
     Returns paginated list of parameters with filtering options.
     """
     try:
-        # Build query
-        query = db.query(Parameter)
-
-        # Apply filters
-        if file_id:
-            query = query.filter(Parameter.source_file_id == file_id)
-        if category:
-            query = query.filter(Parameter.category == category)
-        if parameter_type:
-            query = query.filter(Parameter.parameter_type == parameter_type)
-        if sensitivity_level:
-            query = query.filter(Parameter.sensitivity_level == sensitivity_level)
-
-        # Apply pagination
-        parameters = query.offset(skip).limit(limit).all()
+        filters = {
+            "source_file_id": file_id,
+            "category": category,
+            "parameter_type": parameter_type,
+            "sensitivity_level": sensitivity_level,
+        }
+        parameters = await AsyncParameterRepository(db).get_multi(
+            skip=skip,
+            limit=limit,
+            filters={name: value for name, value in filters.items() if value},
+        )
 
         return [ParameterResponse.from_orm(param) for param in parameters]
 
@@ -164,14 +163,14 @@ async def list_parameters(
 async def get_parameter(
     parameter_id: int,
     current_user: User = Depends(require_permissions(Permission.MODEL_READ)),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Any:
     """
     Get a specific parameter by ID.
 
     Returns detailed parameter information including dependencies.
     """
-    parameter = db.query(Parameter).filter(Parameter.id == parameter_id).first()
+    parameter = await AsyncParameterRepository(db).get(parameter_id)
 
     if not parameter:
         raise HTTPException(
@@ -509,6 +508,8 @@ async def detect_parameters_from_file(
 
         return created_parameters
 
+    except (ExecutorBusyError, ExecutorTimeoutError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
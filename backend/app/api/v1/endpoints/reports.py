@@ -1,3 +1,4 @@
+from datetime import date
 from typing import List, Optional
 from fastapi import (
     APIRouter,
@@ -8,16 +9,17 @@ from fastapi import (
     Query,
     Body,
 )
-from fastapi.responses import Response, FileResponse
+from fastapi.responses import Response, FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from datetime import datetime
 
 from app.core.dependencies import (
     get_db,
     require_permissions,
 )
 from app.api.v1.endpoints.auth import get_current_active_user
+from app.core.config import settings
 from app.core.permissions import Permission
+from app.core.websocket import manager as websocket_manager
 from app.models.user import User
 from app.models.report import (
     ReportType,
@@ -36,11 +38,15 @@ from app.schemas.report import (
     ReportExportCreate,
     ReportExportUpdate,
     GenerateReportRequest,
+    ReportBundleRequest,
     ChartExportRequest,
     DataExportRequest,
+    DataStreamDataset,
+    DataStreamFormat,
     ReportGenerationStatus,
     ExportSummary,
 )
+from app.services.data_export_stream import MEDIA_TYPES, stream_dataset
 from app.services.report_service import ReportService
 
 router = APIRouter()
@@ -177,20 +183,18 @@ async def generate_report(
                 detail="No data provided",
             )
 
-        # The real service performs heavy PDF/Excel generation which isn't
-        # needed for the tests. Instead, create a minimal ReportExport record
-        # directly and mark it as processing so tests can update it later.
-        export_record = ReportExportModel(
-            name=request.name or "Report",
+        # Generation runs on the report queue; the PENDING record is the
+        # job to poll, and open sockets get its progress events
+        report_service = ReportService(db)
+        export_record = await report_service.generate_report(
+            user_id=current_user.id,
             export_format=request.export_format,
             template_id=request.template_id,
-            source_file_ids=request.source_file_ids or [],
-            created_by=current_user.id,
-            status=ReportStatus.PROCESSING,
+            source_file_ids=request.source_file_ids,
+            custom_config=request.custom_config,
+            name=request.name or "Report",
         )
-        db.add(export_record)
-        db.commit()
-        db.refresh(export_record)
+        await websocket_manager.subscribe_to_report(current_user.id, export_record.id)
 
         return export_record
 
@@ -203,6 +207,53 @@ async def generate_report(
         )
 
 
+@router.post(
+    "/bundles", response_model=ReportExport, status_code=status.HTTP_201_CREATED
+)
+async def generate_report_bundle(
+    request: ReportBundleRequest,
+    current_user: User = Depends(require_permissions(Permission.REPORT_CREATE)),
+    db: Session = Depends(get_db),
+):
+    """
+    Generate one report per (file or scenario, period) target as a ZIP bundle.
+
+    The bundle is a single job on the bulk report lane; poll the returned
+    export for progress.
+
+    Reports are rendered across REPORT_BUNDLE_WORKERS spawned processes only
+    when the worker consuming ``reports_bulk`` can start child processes,
+    i.e. runs with ``--pool threads`` or ``--pool solo``. Celery's default
+    prefork children are daemonic and render the bundle in-process.
+    """
+    max_targets = settings.REPORT_BUNDLE_MAX_TARGETS
+    if len(request.targets) > max_targets:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A bundle can have at most {max_targets} targets",
+        )
+
+    try:
+        export_record = await ReportService(db).generate_bundle(
+            user_id=current_user.id,
+            export_format=request.export_format,
+            targets=[target.dict() for target in request.targets],
+            template_id=request.template_id,
+            custom_config=request.custom_config,
+            name=request.name,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to generate report bundle: {str(e)}",
+        )
+
+    await websocket_manager.subscribe_to_report(current_user.id, export_record.id)
+    return export_record
+
+
 @router.post("/charts/export")
 async def export_chart(
     request: ChartExportRequest,
@@ -273,6 +324,49 @@ async def export_data(
         )
 
 
+@router.get("/data/stream/{dataset}")
+async def stream_data(
+    dataset: DataStreamDataset,
+    export_format: DataStreamFormat = Query(DataStreamFormat.CSV, alias="format"),
+    scenario_id: Optional[int] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    current_user: User = Depends(require_permissions(Permission.DATA_EXPORT)),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream time series or metric rows as CSV, Parquet or an Arrow IPC stream.
+
+    Rows are read from a server-side cursor and encoded batch by batch, so the
+    response starts immediately and the export is never held in memory.
+    """
+    try:
+        chunks = stream_dataset(
+            db.get_bind(),
+            dataset.value,
+            export_format.value,
+            user_id=current_user.id,
+            scenario_id=scenario_id,
+            start_date=start_date,
+            end_date=end_date,
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    extension = (
+        "arrows" if export_format == DataStreamFormat.ARROW else export_format.value
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[export_format.value],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{dataset.value}.{extension}"'
+            )
+        },
+    )
+
+
 # Export Management Endpoints
 @router.get("/exports", response_model=List[ReportExport])
 async def get_exports(
@@ -344,28 +438,15 @@ async def get_export_status(
             status_code=status.HTTP_404_NOT_FOUND, detail="Export not found"
         )
 
-    # Calculate progress percentage
-    progress_percentage = None
-    if export.status == ReportStatus.PROCESSING:
-        # Simple progress estimation based on time elapsed
-        if export.processing_started_at:
-            elapsed_seconds = (
-                datetime.utcnow() - export.processing_started_at
-            ).total_seconds()
-            # Assume average processing time of 30 seconds
-            progress_percentage = min(int((elapsed_seconds / 30) * 100), 95)
-    elif export.status == ReportStatus.COMPLETED:
+    progress_percentage = export.progress
+    if export.status == ReportStatus.COMPLETED:
         progress_percentage = 100
-    elif export.status == ReportStatus.FAILED:
-        progress_percentage = 0
 
     return ReportGenerationStatus(
         export_id=export.id,
         status=export.status,
         progress_percentage=progress_percentage,
-        current_step="Processing financial data"
-        if export.status == ReportStatus.PROCESSING
-        else None,
+        current_step=export.current_step,
         error_message=export.error_message,
     )
 
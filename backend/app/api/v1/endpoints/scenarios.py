@@ -1,10 +1,11 @@
 from typing import Any, List, Optional, Dict
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc
 
-from app.models.base import get_db
+from app.models.base import get_async_db, get_db
 from app.models.user import User
 from app.models.parameter import Scenario, ParameterValue, Parameter
 from app.models.file import UploadedFile
@@ -18,13 +19,17 @@ from app.schemas.parameter import (
 )
 from app.api.v1.endpoints.auth import get_current_active_user
 from app.core.dependencies import require_permissions
+from app.core.executors import ExecutorBusyError, ExecutorTimeoutError
 from app.core.permissions import Permission
+from app.core.rate_limiter import rate_limit
+from app.repositories.async_repositories import AsyncScenarioRepository
 from app.services.scenario_manager import ScenarioManager
 
 router = APIRouter()
 
 
 @router.post("/analyze", status_code=status.HTTP_201_CREATED)
+@rate_limit(max_attempts=20, window_minutes=1, block_minutes=1)
 async def analyze_scenarios(
     request: Dict[str, Any],
     current_user: User = Depends(get_current_active_user),
@@ -80,7 +85,7 @@ async def list_scenarios(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     current_user: User = Depends(require_permissions(Permission.MODEL_READ)),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Any:
     """
     List scenarios with optional filtering.
@@ -88,22 +93,14 @@ async def list_scenarios(
     Returns paginated list of scenarios accessible to the current user.
     """
     try:
-        # Build query
-        query = db.query(Scenario).filter(Scenario.created_by_id == current_user.id)
-
-        # Apply filters
-        if base_file_id:
-            query = query.filter(Scenario.base_file_id == base_file_id)
-        if is_baseline is not None:
-            query = query.filter(Scenario.is_baseline == is_baseline)
-        if is_template is not None:
-            query = query.filter(Scenario.is_template == is_template)
-        if status_filter:
-            query = query.filter(Scenario.status == status_filter)
-
-        # Apply pagination and ordering
-        scenarios = (
-            query.order_by(desc(Scenario.created_at)).offset(skip).limit(limit).all()
+        scenarios = await AsyncScenarioRepository(db).list_for_user(
+            current_user.id,
+            base_file_id=base_file_id,
+            is_baseline=is_baseline,
+            is_template=is_template,
+            status=status_filter,
+            skip=skip,
+            limit=limit,
         )
 
         return [ScenarioResponse.from_orm(scenario) for scenario in scenarios]
@@ -119,17 +116,15 @@ async def list_scenarios(
 async def get_scenario(
     scenario_id: int,
     current_user: User = Depends(require_permissions(Permission.MODEL_READ)),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Any:
     """
     Get a specific scenario by ID.
 
     Returns detailed scenario information including parameter values.
     """
-    scenario = (
-        db.query(Scenario)
-        .filter(Scenario.id == scenario_id, Scenario.created_by_id == current_user.id)
-        .first()
+    scenario = await AsyncScenarioRepository(db).get_for_user(
+        scenario_id, current_user.id
     )
 
     if not scenario:
@@ -466,6 +461,8 @@ async def calculate_scenario(
             "warnings": calculation_result.get("warnings", []),
         }
 
+    except (ExecutorBusyError, ExecutorTimeoutError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -12,11 +12,13 @@ from app.schemas.financial import (
     FinancialStatementListResponse,
 )
 from app.api.v1.endpoints.auth import get_current_active_user
+from app.core.response_cache import cached_response, invalidate_user_responses
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[FinancialStatementResponse])
+@cached_response("statements")
 def list_statements(
     skip: int = Query(0, ge=0, description="Number of statements to skip"),
     limit: int = Query(
@@ -44,6 +46,7 @@ def list_statements(
 
 
 @router.get("/{statement_id}", response_model=FinancialStatementResponse)
+@cached_response("statements")
 def get_statement(
     statement_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -71,6 +74,7 @@ def get_statement(
 
 
 @router.get("/{statement_id}/data")
+@cached_response("statements")
 def get_statement_data(
     statement_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -146,6 +150,7 @@ def update_statement(
 
     db.commit()
     db.refresh(statement)
+    invalidate_user_responses(current_user.id)
 
     return FinancialStatementResponse.from_orm(statement)
 
@@ -176,6 +181,7 @@ def delete_statement(
 
     db.delete(statement)
     db.commit()
+    invalidate_user_responses(current_user.id)
 
     return {"message": "Financial statement deleted successfully"}
 
@@ -220,6 +226,7 @@ def validate_statement(
 
 
 @router.get("/{statement_id}/metrics")
+@cached_response("statements")
 def get_statement_metrics(
     statement_id: int,
     current_user: User = Depends(get_current_active_user),
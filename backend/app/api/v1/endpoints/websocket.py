@@ -8,16 +8,63 @@ from fastapi import (
     HTTPException,
     status,
 )
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.models.base import get_db
+from app.models.base import SessionLocal, get_db
+from app.models.parameter import Scenario
 from app.models.user import User
-from app.core.websocket import manager, handle_websocket_message
-from app.core.security import verify_token
+from app.core.permissions import Permission, PermissionChecker
+from app.core.principal_cache import effective_roles, principal_cache
+from app.core.websocket import (
+    manager,
+    handle_websocket_message,
+    negotiate_encoding,
+)
+from app.core.security import decode_token
+from app.services.auth_service import AuthService
 
 router = APIRouter()
 
 
+def can_watch_scenario(db: Session, user_id: int, scenario_id: int) -> bool:
+    """Check that a user may read a scenario's live results."""
+    scenario = db.query(Scenario).filter(Scenario.id == scenario_id).first()
+    if scenario is None:
+        return False
+
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        roles = list(principal.roles)
+    else:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            return False
+        roles = effective_roles(user, AuthService(db).get_user_roles(user_id))
+
+    return PermissionChecker.can_access_resource(
+        roles, scenario.created_by_id, user_id, Permission.MODEL_READ
+    )
+
+
+async def authorize_scenario_topic(user_id: int, topic: str) -> bool:
+    """Topic authorizer for ``scenario:{id}`` subscriptions."""
+    try:
+        scenario_id = int(topic.split(":", 1)[1])
+    except ValueError:
+        return False
+
+    def check() -> bool:
+        with SessionLocal() as db:
+            return can_watch_scenario(db, user_id, scenario_id)
+
+    # The ownership query is blocking; keep it off the event loop
+    return await run_in_threadpool(check)
+
+
+manager.register_topic_authorizer("scenario", authorize_scenario_topic)
+
+
 async def get_current_user_websocket(websocket: WebSocket, token: str = None) -> User:
     """
     Get current user for WebSocket connections.
@@ -27,19 +74,23 @@ async def get_current_user_websocket(websocket: WebSocket, token: str = None) ->
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         raise HTTPException(status_code=401, detail="Token required")
 
-    user_id = verify_token(token)
-    if user_id is None:
+    claims = decode_token(token)
+    if claims is None:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         raise HTTPException(status_code=401, detail="Invalid token")
 
     # Get user from database
     db = next(get_db())
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = db.query(User).filter(User.id == int(claims.subject)).first()
 
     if not user or not user.is_active:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         raise HTTPException(status_code=401, detail="User not found or inactive")
 
+    if (user.token_version or 0) != claims.version:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+
     return user
 
 
@@ -50,19 +101,30 @@ async def websocket_files_endpoint(websocket: WebSocket, token: str = None):
 
     Query parameters:
     - token: JWT authentication token
+    - encoding: "msgpack" for binary frames (also negotiable via the
+      "msgpack" subprotocol); client messages are always JSON text
 
     Messages sent by client:
     - {"type": "subscribe_file", "file_id": 123}
     - {"type": "unsubscribe_file", "file_id": 123}
     - {"type": "subscribe_task", "task_id": "abc123"}
     - {"type": "unsubscribe_task", "task_id": "abc123"}
+    - {"type": "subscribe_report", "export_id": 7}
+    - {"type": "unsubscribe_report", "export_id": 7}
+    - {"type": "subscribe", "topic": "scenario:1"}
+    - {"type": "unsubscribe", "topic": "scenario:1"}
     - {"type": "ping", "timestamp": 1234567890}
 
     Messages sent by server:
     - {"type": "connection_established", "user_id": 123}
+    - {"type": "subscribed", "topic": "scenario:1"}
     - {"type": "file_status_update", "file_id": 123, "data": {...}}
     - {"type": "task_progress_update", "task_id": "abc123", "data": {...}}
+    - {"type": "report_progress_update", "export_id": 7, "data": {...}}
     - {"type": "notification", "data": {...}}
+    - {"type": "scenario_results", "scenario_id": 1, "version": 1, "values": {...}}
+    - {"type": "scenario_results_delta", "scenario_id": 1, "version": 2,
+       "base_version": 1, "changed": {...}, "removed": [...]}
     - {"type": "error", "message": "..."}
     """
     try:
@@ -70,7 +132,7 @@ async def websocket_files_endpoint(websocket: WebSocket, token: str = None):
         user = await get_current_user_websocket(websocket, token)
 
         # Connect to manager
-        await manager.connect(websocket, user.id)
+        await manager.connect(websocket, user.id, negotiate_encoding(websocket))
 
         # Handle messages
         while True:
@@ -113,12 +175,8 @@ async def websocket_files_endpoint(websocket: WebSocket, token: str = None):
 
 
 @router.get("/ws/stats")
-def get_websocket_stats() -> Any:
+async def get_websocket_stats() -> Any:
     """
-    Get WebSocket connection statistics.
+    Get WebSocket connection statistics across all API workers.
     """
-    return {
-        "connected_users": manager.get_connected_users(),
-        "total_connections": manager.get_connection_count(),
-        "user_count": len(manager.get_connected_users()),
-    }
+    return await manager.get_cluster_stats()
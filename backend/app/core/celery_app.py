@@ -10,6 +10,7 @@ celery_app = Celery(
         "app.tasks.file_processing",
         "app.tasks.notifications",
         "app.tasks.scheduled_tasks",
+        "app.tasks.report_generation",
     ],
 )
 
@@ -45,6 +46,10 @@ celery_app.conf.update(
         "app.tasks.file_processing.*": {"queue": "file_processing"},
         "app.tasks.notifications.*": {"queue": "notifications"},
         "app.tasks.scheduled_tasks.*": {"queue": "scheduled"},
+        # Report jobs are sent to "reports" or "reports_bulk" by lane, see
+        # ReportService.generate_report; the scheduler itself is light work
+        "app.tasks.report_generation.generate_report_export": {"queue": "reports"},
+        "app.tasks.report_generation.enqueue_scheduled_reports": {"queue": "scheduled"},
     },
     # Define queues
     task_queues={
@@ -64,6 +69,18 @@ celery_app.conf.update(
             "exchange": "scheduled",
             "routing_key": "scheduled",
         },
+        # Interactive and scheduled report lanes; run a dedicated worker with
+        # -Q reports,reports_bulk so report rendering doesn't hold up others.
+        # Bundles only fan out to REPORT_BUNDLE_WORKERS processes under
+        # --pool threads or --pool solo: prefork children cannot spawn
+        "reports": {
+            "exchange": "reports",
+            "routing_key": "reports",
+        },
+        "reports_bulk": {
+            "exchange": "reports_bulk",
+            "routing_key": "reports_bulk",
+        },
         "high_priority": {
             "exchange": "high_priority",
             "routing_key": "high_priority",
@@ -85,6 +102,9 @@ celery_app.conf.update(
             "rate_limit": "10/m",
             "time_limit": 1800,  # 30 minutes for file processing
         },
+        "app.tasks.report_generation.generate_report_export": {
+            "time_limit": 900,  # 15 minutes per report
+        },
     },
 )
 
@@ -2,7 +2,9 @@ from functools import wraps
 from typing import Any, Callable, List, Set
 
 from app.api.v1.endpoints.auth import get_current_active_user, get_current_user
-from app.core.permissions import Permission, PermissionChecker
+from app.core.permissions import Permission, PermissionChecker, permission_mask
+from app.core.principal_cache import Principal, effective_roles, principal_cache
+from app.core.security import decode_token
 from app.models.audit import AuditAction
 from app.models.base import get_db
 from app.models.role import RoleType
@@ -13,6 +15,33 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
 
+def resolve_principal(
+    credentials: HTTPAuthorizationCredentials, db: Session
+) -> Principal:
+    """Resolve the token's user and roles, served from the principal cache."""
+    claims = decode_token(credentials.credentials)
+    if claims is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    principal = principal_cache.get(int(claims.subject))
+    if principal is not None:
+        if principal.token_version != claims.version:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return principal
+
+    current_user = get_current_user(credentials, db)
+    user_roles = AuthService(db).get_user_roles(current_user.id)
+    return principal_cache.put(current_user, effective_roles(current_user, user_roles))
+
+
 def require_permissions(
     *required_permissions: Permission,
     unauthenticated_status: int = status.HTTP_401_UNAUTHORIZED,
@@ -25,6 +54,7 @@ def require_permissions(
     """
 
     security = HTTPBearer(auto_error=False)
+    required_mask = permission_mask(required_permissions)
 
     def permission_decorator(
         credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -39,29 +69,18 @@ def require_permissions(
                 detail="Not authenticated",
             )
 
-        # Manually resolve the user from the provided credentials so that we do
-        # not trigger the 401 response from ``get_current_active_user`` when the
-        # Authorization header is missing.
-        current_user = get_current_user(credentials, db)
-        if not current_user.is_active:
+        principal = resolve_principal(credentials, db)
+        if not principal.is_active:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
             )
 
-        auth_service = AuthService(db)
-        user_roles = auth_service.get_user_roles(current_user.id)
-        if current_user.is_admin and RoleType.ADMIN.value not in user_roles:
-            user_roles.append(RoleType.ADMIN.value)
-        if not user_roles:
-            user_roles.append(RoleType.VIEWER.value)
-
         # Check if user has any of the required permissions
-        if not PermissionChecker.has_any_permission(
-            user_roles, list(required_permissions)
-        ):
+        if not principal.has_any_permission(required_mask):
             # Log permission denied
+            auth_service = AuthService(db)
             auth_service.log_audit_action(
-                user_id=current_user.id,
+                user_id=principal.user_id,
                 action=AuditAction.PERMISSION_DENIED,
                 success="failure",
                 details=f"Missing permissions: {[p.value for p in required_permissions]}",
@@ -73,7 +92,7 @@ def require_permissions(
                 detail=f"Missing required permissions: {[p.value for p in required_permissions]}",
             )
 
-        return current_user
+        return principal.attach(db)
 
     return permission_decorator
 
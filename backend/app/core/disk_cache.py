@@ -0,0 +1,41 @@
+"""
+Size-bounded eviction for on-disk caches of derived data
+"""
+import os
+from pathlib import Path
+
+
+def touch(path: Path) -> None:
+    """Mark a cache entry as recently used."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def evict_least_recently_used(cache_dir: Path, pattern: str, max_bytes: int) -> int:
+    """
+    Delete the least recently used entries matching ``pattern`` until the
+    rest fit in ``max_bytes``.
+
+    Recency is the entry's modification time, refreshed with ``touch`` on
+    reads. Returns the number of entries deleted.
+    """
+    entries = []
+    total = 0
+    for path in Path(cache_dir).glob(pattern):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    deleted = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        deleted += 1
+    return deleted
@@ -0,0 +1,250 @@
+"""
+Bounded executors for blocking work called from async code
+
+Two shared pools are available: ``io`` (threads, for blocking I/O and for
+work that must mutate in-process state) and ``cpu`` (processes, for pure
+CPU-bound functions). Mark a blocking function or method with ``offload``
+to run it on one of them from a coroutine.
+"""
+import asyncio
+import functools
+import importlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when an executor's queue is full."""
+
+
+class ExecutorTimeoutError(TimeoutError):
+    """Raised when an offloaded call exceeds its timeout."""
+
+
+class ManagedExecutor:
+    """
+    Thread or process pool with a bounded queue, per-call timeouts and
+    counters for monitoring.
+
+    At most ``max_workers + max_queue`` calls are in flight; further calls
+    are rejected with ExecutorBusyError instead of queueing without bound.
+    A call that times out is cancelled if it has not started; a running
+    call cannot be interrupted and keeps its worker until it returns.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: str = "thread",
+        max_workers: int = 4,
+        max_queue: int = 100,
+        default_timeout: Optional[float] = None,
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.default_timeout = default_timeout
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._counters = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "rejected": 0,
+        }
+        self._busy_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "thread":
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix=f"{self.name}-executor"
+                )
+            else:
+                # Fresh interpreters avoid forking a process that runs threads
+                self._executor = ProcessPoolExecutor(
+                    self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+        return self._executor
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run ``func(*args, **kwargs)`` with the default timeout."""
+        return await self.submit(func, args, kwargs)
+
+    async def submit(
+        self,
+        func: Callable,
+        args: tuple = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Run a call on the pool and await its result."""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._counters["rejected"] += 1
+                raise ExecutorBusyError(f"The {self.name} executor is at capacity")
+            self._pending += 1
+            self._counters["submitted"] += 1
+
+        started = time.monotonic()
+        try:
+            future = self._get_executor().submit(func, *args, **(kwargs or {}))
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(functools.partial(self._on_done, started))
+
+        timeout = timeout if timeout is not None else self.default_timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            with self._lock:
+                self._counters["timed_out"] += 1
+            name = getattr(func, "__qualname__", repr(func))
+            raise ExecutorTimeoutError(f"{name} did not finish within {timeout}s")
+
+    def _on_done(self, started: float, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._busy_seconds += time.monotonic() - started
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self._counters["failed"] += 1
+            else:
+                self._counters["completed"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and call counters."""
+        with self._lock:
+            running = min(self._pending, self.max_workers)
+            finished = self._counters["completed"] + self._counters["failed"]
+            return {
+                "name": self.name,
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": running,
+                "queued": self._pending - running,
+                **self._counters,
+                "avg_latency_seconds": self._busy_seconds / finished
+                if finished
+                else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+_executors: Dict[str, ManagedExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _build_executor(name: str) -> ManagedExecutor:
+    if name == "io":
+        return ManagedExecutor(
+            "io",
+            "thread",
+            max_workers=settings.EXECUTOR_IO_WORKERS,
+            max_queue=settings.EXECUTOR_QUEUE_SIZE,
+            default_timeout=settings.EXECUTOR_DEFAULT_TIMEOUT,
+        )
+    if name == "cpu":
+        return ManagedExecutor(
+            "cpu",
+            settings.EXECUTOR_CPU_KIND,
+            max_workers=settings.EXECUTOR_CPU_WORKERS or os.cpu_count() or 2,
+            max_queue=settings.EXECUTOR_QUEUE_SIZE,
+            default_timeout=settings.EXECUTOR_DEFAULT_TIMEOUT,
+        )
+    raise ValueError(f"Unknown executor: {name}")
+
+
+def get_executor(name: str) -> ManagedExecutor:
+    """Return the shared ``io`` or ``cpu`` executor, creating it on first use."""
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = _executors[name] = _build_executor(name)
+    return executor
+
+
+def set_executor(name: str, executor: Optional[ManagedExecutor]) -> None:
+    """Replace a shared executor (used by tests); None resets it."""
+    with _executors_lock:
+        previous = _executors.pop(name, None)
+        if executor is not None:
+            _executors[name] = executor
+    if previous is not None and previous is not executor:
+        previous.shutdown(wait=False)
+
+
+def executor_stats() -> List[Dict[str, Any]]:
+    return [executor.stats() for executor in list(_executors.values())]
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
+
+
+def _call_original(module: str, qualname: str, *args, **kwargs) -> Any:
+    # Runs in the worker process: resolve the decorated function by name
+    # (the undecorated original cannot be pickled by reference)
+    target: Any = importlib.import_module(module)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    return target.__wrapped__(*args, **kwargs)
+
+
+def offload(pool: str = "io", timeout: Optional[float] = None):
+    """
+    Decorator turning a blocking function or method into a coroutine that
+    runs on a shared executor.
+
+    Functions sent to the ``cpu`` process pool must be defined at module or
+    class level, and their arguments (including ``self``) and result must
+    be picklable. The blocking version stays available as ``__wrapped__``.
+
+    Usage:
+        @offload("cpu", timeout=120)
+        def render(data: dict) -> bytes:
+            ...
+
+        pdf = await render(data)
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            executor = get_executor(pool)
+            target = func
+            if executor.kind == "process":
+                target = functools.partial(
+                    _call_original, func.__module__, func.__qualname__
+                )
+            return await executor.submit(target, args, kwargs, timeout)
+
+        return wrapper
+
+    return decorator
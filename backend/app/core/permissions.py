@@ -1,5 +1,5 @@
 from enum import Enum as PyEnum
-from typing import List, Set, Dict, Any
+from typing import Iterable, List, Set, Dict, Any
 from app.models.role import RoleType
 
 
@@ -122,9 +122,40 @@ ROLE_PERMISSIONS: Dict[RoleType, Set[Permission]] = {
 }
 
 
+# Each permission owns one bit so a set of permissions packs into an int and
+# authorization checks become a single AND.
+PERMISSION_BITS: Dict[Permission, int] = {
+    permission: 1 << index for index, permission in enumerate(Permission)
+}
+
+
+def permission_mask(permissions: Iterable[Permission]) -> int:
+    """Pack permissions into a bitmask."""
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS[permission]
+    return mask
+
+
+ROLE_PERMISSION_MASKS: Dict[RoleType, int] = {
+    role: permission_mask(permissions) for role, permissions in ROLE_PERMISSIONS.items()
+}
+
+
 class PermissionChecker:
     """Helper class for checking permissions."""
 
+    @staticmethod
+    def get_permission_mask(user_roles: List[str]) -> int:
+        """Get the combined permission bitmask for user roles."""
+        mask = 0
+        for role_str in user_roles:
+            try:
+                mask |= ROLE_PERMISSION_MASKS.get(RoleType(role_str), 0)
+            except ValueError:
+                continue
+        return mask
+
     @staticmethod
     def has_permission(user_roles: List[str], required_permission: Permission) -> bool:
         """Check if user roles have the required permission."""
@@ -0,0 +1,240 @@
+"""
+In-process cache of resolved principals for permission checks
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import settings
+from app.core.permissions import PermissionChecker
+from app.models.role import RoleType, UserRole
+from app.models.user import User
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is a hard dependency in production
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authorization-relevant snapshot of a user."""
+
+    user_id: int
+    is_active: bool
+    roles: Tuple[str, ...]
+    permission_mask: int
+    token_version: int
+    user_state: Tuple[Tuple[str, Any], ...]
+    expires_at: float
+
+    def has_any_permission(self, required_mask: int) -> bool:
+        return bool(self.permission_mask & required_mask)
+
+    def attach(self, db: Session) -> User:
+        """
+        Return a session-bound User built from the snapshot.
+
+        ``merge(load=False)`` attaches the instance without a SELECT;
+        relationships still lazy-load on access.
+        """
+        user = User(**dict(self.user_state))
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+
+class PrincipalCache:
+    """
+    Thread-safe TTL cache mapping user id to a resolved Principal.
+
+    Entries are dropped when the TTL expires and whenever a committed
+    transaction touched the user or one of its role assignments. With a
+    backplane, commits in other processes invalidate entries here too; while
+    the backplane is disconnected the cache is bypassed.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int, backplane=None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.backplane = backplane
+        self._entries: "OrderedDict[int, Principal]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        if self.backplane is not None and not self.backplane.listen(self):
+            return None
+        with self._lock:
+            principal = self._entries.get(user_id)
+            if principal is None:
+                return None
+            if principal.expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def put(self, user: User, roles: List[str]) -> Principal:
+        """Snapshot a loaded user and its effective roles."""
+        principal = Principal(
+            user_id=user.id,
+            is_active=bool(user.is_active),
+            roles=tuple(roles),
+            permission_mask=PermissionChecker.get_permission_mask(roles),
+            token_version=user.token_version or 0,
+            user_state=tuple(
+                (attr.key, getattr(user, attr.key))
+                for attr in inspect(User).column_attrs
+            ),
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        if self.ttl_seconds <= 0:
+            return principal
+
+        with self._lock:
+            self._entries[user.id] = principal
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return principal
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def invalidate_everywhere(self, user_id: int) -> None:
+        """Invalidate here and, through the backplane, in every other process."""
+        self.invalidate(user_id)
+        if self.backplane is not None:
+            self.backplane.publish(user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisPrincipalBackplane:
+    """
+    Redis pub/sub channel carrying principal invalidations between processes.
+
+    Any process publishes the ids of users whose commit touched them; API
+    workers subscribe from a daemon thread started on first cache read. The
+    cache is cleared on every (re)subscribe, since invalidations published
+    while disconnected are lost.
+    """
+
+    CHANNEL = "principal:invalidate"
+
+    def __init__(self, url: str, retry_interval: float = 5.0):
+        self.client = redis.Redis.from_url(
+            url, socket_connect_timeout=0.5, health_check_interval=30
+        )
+        self.retry_interval = retry_interval
+        self.connected = False
+        self._listener: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._unavailable_until = 0.0
+
+    def publish(self, user_id: int) -> None:
+        # Subscribers bypass their caches while Redis is down, so skipping
+        # publishes for a while after a failure loses nothing
+        if time.monotonic() < self._unavailable_until:
+            return
+        try:
+            self.client.publish(self.CHANNEL, user_id)
+        except redis.RedisError as e:
+            self._unavailable_until = time.monotonic() + self.retry_interval
+            logger.warning(f"Failed to publish principal invalidation: {e}")
+
+    def listen(self, cache: "PrincipalCache") -> bool:
+        """Start the subscriber if needed; return whether it is connected."""
+        if self._listener is None:
+            with self._lock:
+                if self._listener is None:
+                    self._listener = threading.Thread(
+                        target=self._listen,
+                        args=(cache,),
+                        name="principal-invalidations",
+                        daemon=True,
+                    )
+                    self._listener.start()
+        return self.connected
+
+    def _listen(self, cache: "PrincipalCache") -> None:
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.CHANNEL)
+                cache.clear()
+                self.connected = True
+                while True:
+                    # Polling lets the client's health checks detect a dead
+                    # connection, which a blocking read would wait on forever
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        cache.invalidate(int(message["data"]))
+            except (redis.RedisError, ValueError) as e:
+                logger.warning(f"Principal invalidation listener error: {e}")
+            finally:
+                self.connected = False
+                pubsub.close()
+            time.sleep(self.retry_interval)
+
+
+def create_principal_backplane() -> Optional[RedisPrincipalBackplane]:
+    """Build the backplane selected by ``PRINCIPAL_CACHE_BACKPLANE``."""
+    if settings.PRINCIPAL_CACHE_BACKPLANE == "redis" and redis is not None:
+        return RedisPrincipalBackplane(settings.PRINCIPAL_CACHE_REDIS_URL)
+    return None
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    backplane=create_principal_backplane(),
+)
+
+
+def effective_roles(user: User, assigned_roles: List[Any]) -> List[str]:
+    """Normalize assigned roles and apply the admin flag / viewer fallback."""
+    roles = [
+        role.value if isinstance(role, RoleType) else role for role in assigned_roles
+    ]
+    if user.is_admin and RoleType.ADMIN.value not in roles:
+        roles.append(RoleType.ADMIN.value)
+    if not roles:
+        roles.append(RoleType.VIEWER.value)
+    return roles
+
+
+_PENDING_KEY = "principal_cache_invalidations"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_changes(session: Session, flush_context) -> None:
+    user_ids = session.info.setdefault(_PENDING_KEY, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            user_ids.add(obj.id)
+        elif isinstance(obj, UserRole):
+            user_ids.add(obj.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_principals(session: Session) -> None:
+    # Invalidate only after commit so a concurrent request cannot re-cache
+    # the pre-commit state
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        principal_cache.invalidate_everywhere(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
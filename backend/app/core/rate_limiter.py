@@ -1,38 +1,208 @@
 """
-Rate limiting middleware for authentication endpoints
+Rate limiting for authentication and other expensive endpoints
 """
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Callable, Dict, Optional
+
 from fastapi import HTTPException, Request, status
-from sqlalchemy.orm import Session
-from sqlalchemy import Column, String, Integer, DateTime, Text
-from sqlalchemy.sql import func
-import uuid
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is a hard dependency in production
+    redis = None
+
+logger = logging.getLogger(__name__)
 
-from app.models.base import Base
 
+@dataclass(frozen=True)
+class RateLimitDecision:
+    """Outcome of a single rate limit check."""
+
+    allowed: bool
+    retry_after: float = 0.0
+
+
+class InMemoryRateLimitBackend:
+    """
+    Per-process token bucket used for tests and when Redis is unavailable.
+
+    Each key holds ``max_attempts`` tokens refilled evenly over the window;
+    draining the bucket blocks the key for ``block_seconds``.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def hit(
+        self, key: str, max_attempts: int, window_seconds: float, block_seconds: float
+    ) -> RateLimitDecision:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._prune(now, window_seconds)
+                # [tokens, last_refill, blocked_until]
+                bucket = self._buckets[key] = [float(max_attempts), now, 0.0]
+
+            tokens, last_refill, blocked_until = bucket
+            if now < blocked_until:
+                return RateLimitDecision(False, blocked_until - now)
+
+            tokens = min(
+                float(max_attempts),
+                tokens + (now - last_refill) * max_attempts / window_seconds,
+            )
+            if tokens >= 1:
+                bucket[:] = [tokens - 1, now, 0.0]
+                return RateLimitDecision(True)
+
+            bucket[:] = [tokens, now, now + block_seconds]
+            return RateLimitDecision(False, block_seconds)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def _prune(self, now: float, window_seconds: float) -> None:
+        # Drop keys that are not blocked and have been idle for a full window
+        stale = [
+            key
+            for key, (_, last_refill, blocked_until) in self._buckets.items()
+            if blocked_until <= now and now - last_refill >= window_seconds
+        ]
+        for key in stale:
+            del self._buckets[key]
+
+
+# Sliding window log kept in a sorted set. Runs atomically on the Redis
+# server and uses its clock so all API workers agree on the window.
+# KEYS: window set, block marker. ARGV: window ms, max attempts, block ms, member
+_SLIDING_WINDOW_SCRIPT = """
+local blocked = redis.call('PTTL', KEYS[2])
+if blocked > 0 then
+    return {0, blocked}
+end
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local window = tonumber(ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('PEXPIRE', KEYS[1], window)
+if redis.call('ZCARD', KEYS[1]) > tonumber(ARGV[2]) then
+    redis.call('SET', KEYS[2], '1', 'PX', ARGV[3])
+    return {0, tonumber(ARGV[3])}
+end
+return {1, 0}
+"""
+
+
+class RedisRateLimitBackend:
+    """
+    Sliding-window limiter shared by all workers through Redis.
+
+    If Redis cannot be reached the backend degrades to a per-process
+    token bucket and retries Redis after ``retry_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        client,
+        key_prefix: str = "ratelimit",
+        fallback: Optional[InMemoryRateLimitBackend] = None,
+        retry_interval: float = 30.0,
+    ):
+        self.client = client
+        self.key_prefix = key_prefix
+        self.fallback = fallback or InMemoryRateLimitBackend()
+        self.retry_interval = retry_interval
+        self._script = client.register_script(_SLIDING_WINDOW_SCRIPT)
+        self._unavailable_until = 0.0
+
+    def _keys(self, key: str):
+        return f"{self.key_prefix}:{key}:hits", f"{self.key_prefix}:{key}:blocked"
+
+    def hit(
+        self, key: str, max_attempts: int, window_seconds: float, block_seconds: float
+    ) -> RateLimitDecision:
+        if time.monotonic() < self._unavailable_until:
+            return self.fallback.hit(key, max_attempts, window_seconds, block_seconds)
+
+        try:
+            allowed, retry_after_ms = self._script(
+                keys=list(self._keys(key)),
+                args=[
+                    int(window_seconds * 1000),
+                    max_attempts,
+                    int(block_seconds * 1000),
+                    uuid.uuid4().hex,
+                ],
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Redis rate limiter unavailable, using local limits: {e}")
+            self._unavailable_until = time.monotonic() + self.retry_interval
+            return self.fallback.hit(key, max_attempts, window_seconds, block_seconds)
 
-class RateLimit(Base):
-    """Rate limiting tracking table"""
+        return RateLimitDecision(bool(allowed), int(retry_after_ms) / 1000)
 
-    __tablename__ = "rate_limits"
+    def reset(self, key: str) -> None:
+        self.fallback.reset(key)
+        try:
+            self.client.delete(*self._keys(key))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to reset rate limit for {key}: {e}")
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    key = Column(String(255), nullable=False, unique=True, index=True)
-    attempts = Column(Integer, nullable=False, default=0)
-    window_start = Column(DateTime, nullable=False, index=True)
-    blocked_until = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
-    updated_at = Column(
-        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
-    )
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_rate_limit_backend():
+    """Return the process-wide rate limit backend, creating it on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if settings.RATE_LIMIT_STORAGE == "redis" and redis is not None:
+                    client = redis.Redis.from_url(
+                        settings.RATE_LIMIT_REDIS_URL,
+                        socket_connect_timeout=0.25,
+                        socket_timeout=0.25,
+                    )
+                    _backend = RedisRateLimitBackend(client)
+                else:
+                    _backend = InMemoryRateLimitBackend()
+    return _backend
+
+
+def set_rate_limit_backend(backend) -> None:
+    """Replace the process-wide backend (used by tests and app startup)."""
+    global _backend
+    _backend = backend
 
 
 class RateLimiter:
     """Rate limiter for authentication endpoints"""
 
-    def __init__(self, db: Session):
-        self.db = db
+    def __init__(self, backend=None):
+        self.backend = backend or get_rate_limit_backend()
 
     def check_rate_limit(
         self,
@@ -41,6 +211,7 @@ class RateLimiter:
         max_attempts: int = 5,
         window_minutes: int = 15,
         block_minutes: int = 30,
+        key: Optional[str] = None,
     ) -> bool:
         """
         Check if request should be rate limited
@@ -51,77 +222,32 @@ class RateLimiter:
             max_attempts: Maximum attempts per window
             window_minutes: Time window in minutes
             block_minutes: Block duration in minutes after limit exceeded
+            key: Client identifier; defaults to the client IP
 
         Returns:
-            True if request is allowed, False if rate limited
+            True if request is allowed
 
         Raises:
             HTTPException: If rate limit exceeded
         """
-        # Create rate limit key based on IP and endpoint
-        client_ip = self._get_client_ip(request)
-        rate_key = f"{endpoint}:{client_ip}"
-
-        now = datetime.now(timezone.utc)
-        window_start = now - timedelta(minutes=window_minutes)
-
-        # Get or create rate limit record
-        rate_limit = self.db.query(RateLimit).filter(RateLimit.key == rate_key).first()
-
-        if not rate_limit:
-            # Create new rate limit record
-            rate_limit = RateLimit(key=rate_key, attempts=1, window_start=now)
-            self.db.add(rate_limit)
-            self.db.commit()
-            return True
-
-        # Check if currently blocked
-        if rate_limit.blocked_until:
-            blocked_until_utc = rate_limit.blocked_until.replace(tzinfo=timezone.utc) if rate_limit.blocked_until.tzinfo is None else rate_limit.blocked_until
-            if now < blocked_until_utc:
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail=f"Rate limit exceeded. Try again after {rate_limit.blocked_until.isoformat()}",
-                )
-
-        # Check if we need to reset the window
-        window_start_utc = rate_limit.window_start.replace(tzinfo=timezone.utc) if rate_limit.window_start.tzinfo is None else rate_limit.window_start
-        if window_start_utc < window_start:
-            # Reset window
-            rate_limit.window_start = now
-            rate_limit.attempts = 1
-            rate_limit.blocked_until = None
-            self.db.commit()
-            return True
-
-        # Increment attempts
-        rate_limit.attempts += 1
-
-        # Check if limit exceeded
-        if rate_limit.attempts > max_attempts:
-            # Block the IP
-            rate_limit.blocked_until = now + timedelta(minutes=block_minutes)
-            self.db.commit()
-
+        rate_key = f"{endpoint}:{key or self._get_client_ip(request)}"
+        decision = self.backend.hit(
+            rate_key, max_attempts, window_minutes * 60, block_minutes * 60
+        )
+        if not decision.allowed:
+            retry_at = datetime.now(timezone.utc) + timedelta(
+                seconds=decision.retry_after
+            )
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Rate limit exceeded. Blocked until {rate_limit.blocked_until.isoformat()}",
+                detail=f"Rate limit exceeded. Try again after {retry_at.isoformat()}",
+                headers={"Retry-After": str(max(1, int(decision.retry_after + 0.5)))},
             )
-
-        self.db.commit()
         return True
 
     def record_successful_auth(self, request: Request, endpoint: str) -> None:
         """Record successful authentication to potentially reset counters"""
-        client_ip = self._get_client_ip(request)
-        rate_key = f"{endpoint}:{client_ip}"
-
-        rate_limit = self.db.query(RateLimit).filter(RateLimit.key == rate_key).first()
-        if rate_limit:
-            # Reset attempts on successful auth
-            rate_limit.attempts = 0
-            rate_limit.blocked_until = None
-            self.db.commit()
+        self.backend.reset(f"{endpoint}:{self._get_client_ip(request)}")
 
     def _get_client_ip(self, request: Request) -> str:
         """Extract client IP from request"""
@@ -141,17 +267,6 @@ class RateLimiter:
 
         return "unknown"
 
-    def cleanup_old_records(self, days_old: int = 7) -> int:
-        """Clean up old rate limiting records"""
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_old)
-
-        deleted_count = (
-            self.db.query(RateLimit).filter(RateLimit.created_at < cutoff_date).delete()
-        )
-
-        self.db.commit()
-        return deleted_count
-
 
 # Decorator for rate limiting endpoints
 def rate_limit(
@@ -159,59 +274,85 @@ def rate_limit(
     window_minutes: int = 15,
     block_minutes: int = 30,
     endpoint: Optional[str] = None,
+    key_func: Optional[Callable[[Request], Optional[str]]] = None,
 ):
     """
     Decorator to apply rate limiting to endpoints
 
+    Works on sync and async endpoints. If the endpoint does not declare a
+    ``Request`` parameter one is injected for the limiter and hidden from
+    the endpoint.
+
     Usage:
-        @rate_limit(max_attempts=5, window_minutes=15)
-        async def login(request: Request, db: Session = Depends(get_db)):
+        @router.post("/upload")
+        @rate_limit(max_attempts=30, window_minutes=1, block_minutes=1)
+        async def upload_file(file: UploadFile = File(...)):
             ...
     """
 
     def decorator(func):
-        async def wrapper(*args, **kwargs):
-            # Extract request and db from function arguments
-            request = None
-            db = None
-
-            for arg in args:
-                if isinstance(arg, Request):
-                    request = arg
-                elif hasattr(arg, "query"):  # Check if it's a database session
-                    db = arg
-
-            # Also check kwargs
-            if not request:
-                request = kwargs.get("request")
-            if not db:
-                db = kwargs.get("db")
-
-            if not request or not db:
-                raise ValueError("Rate limiter requires Request and Session objects")
-
-            # Use function name as endpoint if not specified
-            endpoint_name = endpoint or func.__name__
-
-            # Check rate limit
-            rate_limiter = RateLimiter(db)
+        endpoint_name = endpoint or func.__name__
+        signature = inspect.signature(func)
+        request_param = next(
+            (
+                name
+                for name, param in signature.parameters.items()
+                if param.annotation is Request
+            ),
+            None,
+        )
+        injected = request_param is None
+        if injected:
+            request_param = "_rate_limit_request"
+            signature = signature.replace(
+                parameters=[
+                    *signature.parameters.values(),
+                    inspect.Parameter(
+                        request_param,
+                        inspect.Parameter.KEYWORD_ONLY,
+                        annotation=Request,
+                    ),
+                ]
+            )
+
+        def check(kwargs) -> Request:
+            request = kwargs.pop(request_param) if injected else kwargs[request_param]
+            rate_limiter = RateLimiter()
             rate_limiter.check_rate_limit(
                 request=request,
                 endpoint=endpoint_name,
                 max_attempts=max_attempts,
                 window_minutes=window_minutes,
                 block_minutes=block_minutes,
+                key=key_func(request) if key_func else None,
             )
+            return request
 
-            # Call the original function
-            result = await func(*args, **kwargs)
-
+        def record_success(request: Request) -> None:
             # Record successful auth if it's a login endpoint
             if endpoint_name in ["login", "register"]:
-                rate_limiter.record_successful_auth(request, endpoint_name)
+                RateLimiter().record_successful_auth(request, endpoint_name)
+
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                # The Redis backend blocks on the network; keep it off the loop
+                request = await run_in_threadpool(check, kwargs)
+                result = await func(*args, **kwargs)
+                await run_in_threadpool(record_success, request)
+                return result
+
+        else:
 
-            return result
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                request = check(kwargs)
+                result = func(*args, **kwargs)
+                record_success(request)
+                return result
 
+        wrapper.__signature__ = signature
         return wrapper
 
     return decorator
@@ -0,0 +1,354 @@
+"""
+Per-user response caching with ETag revalidation for read-heavy endpoints
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from fastapi import Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.file import UploadedFile
+from app.models.parameter import Parameter
+from app.models.report import ReportExport
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is a hard dependency in production
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# (etag, serialized JSON body)
+CachedResponse = Tuple[str, bytes]
+
+
+class InMemoryResponseCache:
+    """
+    Per-process LRU cache of serialized responses.
+
+    Invalidation bumps a per-user generation that is part of every key, so
+    stale entries are never read again and simply age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def generation(self, scope: str) -> int:
+        with self._lock:
+            return self._generations.get(scope, 0)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def set(self, key: str, response: CachedResponse, ttl_seconds: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, scope: str) -> None:
+        with self._lock:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+
+class RedisResponseCache:
+    """
+    Response cache shared by all API workers and Celery through Redis.
+
+    Redis errors are logged and treated as cache misses so a Redis outage
+    only costs the cache, never the request. After an error Redis is not
+    retried for ``retry_interval`` seconds, and invalidations made in the
+    meantime are replayed once it is reachable again.
+    """
+
+    def __init__(
+        self, client, key_prefix: str = "respcache", retry_interval: float = 30.0
+    ):
+        self.client = client
+        self.key_prefix = key_prefix
+        self.retry_interval = retry_interval
+        self._unavailable_until = 0.0
+        self._pending_invalidations: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def _generation_key(self, scope: str) -> str:
+        return f"{self.key_prefix}:gen:{scope}"
+
+    def _unavailable(self, error: Exception) -> None:
+        logger.warning(f"Response cache unavailable: {error}")
+        self._unavailable_until = time.monotonic() + self.retry_interval
+
+    def _available(self) -> bool:
+        if time.monotonic() < self._unavailable_until:
+            return False
+        if self._pending_invalidations:
+            with self._lock:
+                pending, self._pending_invalidations = (
+                    self._pending_invalidations,
+                    set(),
+                )
+            for scope in pending:
+                self.invalidate(scope)
+        return time.monotonic() >= self._unavailable_until
+
+    def generation(self, scope: str) -> int:
+        if not self._available():
+            return 0
+        try:
+            value = self.client.get(self._generation_key(scope))
+        except redis.RedisError as e:
+            self._unavailable(e)
+            return 0
+        return int(value) if value is not None else 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        if not self._available():
+            return None
+        try:
+            value = self.client.get(f"{self.key_prefix}:{key}")
+        except redis.RedisError as e:
+            self._unavailable(e)
+            return None
+        if value is None:
+            return None
+        etag, _, body = value.partition(b"\n")
+        return etag.decode(), body
+
+    def set(self, key: str, response: CachedResponse, ttl_seconds: int) -> None:
+        if not self._available():
+            return
+        etag, body = response
+        try:
+            self.client.set(
+                f"{self.key_prefix}:{key}", etag.encode() + b"\n" + body, ex=ttl_seconds
+            )
+        except redis.RedisError as e:
+            self._unavailable(e)
+
+    def invalidate(self, scope: str) -> None:
+        if time.monotonic() >= self._unavailable_until:
+            try:
+                self.client.incr(self._generation_key(scope))
+                return
+            except redis.RedisError as e:
+                self._unavailable(e)
+        # Entries cached before the outage would otherwise be served again
+        with self._lock:
+            self._pending_invalidations.add(scope)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Return the process-wide response cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                if settings.RESPONSE_CACHE_STORAGE == "redis" and redis is not None:
+                    client = redis.Redis.from_url(
+                        settings.RESPONSE_CACHE_REDIS_URL,
+                        socket_connect_timeout=0.25,
+                        socket_timeout=0.25,
+                    )
+                    _cache = RedisResponseCache(client)
+                else:
+                    _cache = InMemoryResponseCache(settings.RESPONSE_CACHE_MAX_ENTRIES)
+    return _cache
+
+
+def set_response_cache(cache) -> None:
+    """Replace the process-wide cache (used by tests and app startup)."""
+    global _cache
+    _cache = cache
+
+
+def user_scope(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def invalidate_user_responses(user_id: int) -> None:
+    """Drop every cached response of a user, e.g. after their data changed."""
+    get_response_cache().invalidate(user_scope(user_id))
+
+
+# Models shown in cached responses; commits touching them invalidate their
+# owner's responses, whichever code path (API, Celery) made the change
+_OWNED_MODELS = (UploadedFile, Parameter, ReportExport)
+_PENDING_KEY = "response_cache_invalidations"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_owner_changes(session: Session, flush_context) -> None:
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, _OWNED_MODELS) and obj.user_id is not None:
+            session.info.setdefault(_PENDING_KEY, set()).add(obj.user_id)
+
+
+def _invalidate_users(user_ids) -> None:
+    for user_id in user_ids:
+        invalidate_user_responses(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_owners(session: Session) -> None:
+    user_ids = session.info.pop(_PENDING_KEY, None)
+    if not user_ids:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _invalidate_users(user_ids)
+        return
+    # Committed on the event loop (async endpoint or AsyncSession): bump the
+    # generations in a worker thread rather than block the loop on Redis
+    loop.run_in_executor(None, _invalidate_users, user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_owner_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _build_response(request: Request, etag: str, body: bytes, cache_status: str):
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "X-Cache": cache_status,
+    }
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cached_response(
+    namespace: str,
+    ttl_seconds: Optional[int] = None,
+    user_param: str = "current_user",
+):
+    """
+    Decorator caching an endpoint's JSON response per user.
+
+    The key covers the user, the request path and query string. Responses
+    carry an ``ETag``; a matching ``If-None-Match`` gets ``304 Not
+    Modified`` without a body. Cached entries are dropped by
+    ``invalidate_user_responses``.
+
+    Usage:
+        @router.get("/metrics/overview")
+        @cached_response("dashboard")
+        async def get_overview_metrics(
+            current_user: User = Depends(get_current_active_user), ...
+        ):
+            ...
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        request_param = next(
+            (
+                name
+                for name, param in signature.parameters.items()
+                if param.annotation is Request
+            ),
+            None,
+        )
+        injected = request_param is None
+        if injected:
+            request_param = "_cache_request"
+            signature = signature.replace(
+                parameters=[
+                    *signature.parameters.values(),
+                    inspect.Parameter(
+                        request_param,
+                        inspect.Parameter.KEYWORD_ONLY,
+                        annotation=Request,
+                    ),
+                ]
+            )
+
+        def lookup(kwargs):
+            request = kwargs.pop(request_param) if injected else kwargs[request_param]
+            cache = get_response_cache()
+            scope = user_scope(kwargs[user_param].id)
+            query = "&".join(sorted(str(request.query_params).split("&")))
+            key = (
+                f"{namespace}:{scope}:g{cache.generation(scope)}:"
+                f"{request.url.path}?{query}"
+            )
+            return request, cache, key, cache.get(key)
+
+        def store(request: Request, cache, key: str, result):
+            if isinstance(result, Response):
+                return result
+            body = json.dumps(jsonable_encoder(result)).encode()
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            cache.set(
+                key, (etag, body), ttl_seconds or settings.RESPONSE_CACHE_TTL_SECONDS
+            )
+            return _build_response(request, etag, body, "MISS")
+
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                # Redis round trips run off the event loop
+                request, cache, key, cached = await run_in_threadpool(lookup, kwargs)
+                if cached is not None:
+                    return _build_response(request, *cached, "HIT")
+                result = await func(*args, **kwargs)
+                return await run_in_threadpool(store, request, cache, key, result)
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                request, cache, key, cached = lookup(kwargs)
+                if cached is not None:
+                    return _build_response(request, *cached, "HIT")
+                return store(request, cache, key, func(*args, **kwargs))
+
+        wrapper.__signature__ = signature
+        return wrapper
+
+    return decorator
@@ -1,9 +1,14 @@
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional, Any, Union
 from jose import jwt, JWTError
 from passlib.context import CryptContext
+import hashlib
 import secrets
 import string
+import threading
+import time
 from app.core.config import settings
 
 # Password hashing
@@ -30,8 +35,13 @@ def create_access_token(
     subject: Union[str, Any],
     expires_delta: Optional[timedelta] = None,
     token_type: str = "access",
+    version: int = 0,
 ) -> str:
-    """Create a JWT access token."""
+    """Create a JWT access token.
+
+    ``version`` is the user's token version; bumping it on the user revokes
+    every token issued before.
+    """
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
@@ -44,6 +54,7 @@ def create_access_token(
         "sub": str(subject),
         "type": token_type,
         "iat": datetime.utcnow(),
+        "ver": version,
     }
 
     encoded_jwt = jwt.encode(
@@ -52,7 +63,7 @@ def create_access_token(
     return encoded_jwt
 
 
-def create_refresh_token(subject: Union[str, Any]) -> str:
+def create_refresh_token(subject: Union[str, Any], version: int = 0) -> str:
     """Create a JWT refresh token."""
     expire = datetime.utcnow() + timedelta(days=30)  # Refresh tokens last 30 days
 
@@ -61,6 +72,7 @@ def create_refresh_token(subject: Union[str, Any]) -> str:
         "sub": str(subject),
         "type": "refresh",
         "iat": datetime.utcnow(),
+        "ver": version,
     }
 
     encoded_jwt = jwt.encode(
@@ -69,30 +81,93 @@ def create_refresh_token(subject: Union[str, Any]) -> str:
     return encoded_jwt
 
 
-def verify_token(token: str, token_type: str = "access") -> Optional[str]:
-    """Verify and decode a JWT token."""
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-
-        # Check token type
-        if payload.get("type") != token_type:
-            return None
-
-        # Check expiration
-        if payload.get("exp") and datetime.utcnow() > datetime.fromtimestamp(
-            payload["exp"]
-        ):
+@dataclass(frozen=True)
+class TokenClaims:
+    """Claims of a token whose signature has been verified."""
+
+    subject: str
+    token_type: str
+    expires_at: float
+    version: int = 0
+
+
+class VerifiedTokenCache:
+    """
+    Thread-safe LRU of verified tokens keyed by their SHA-256 digest.
+
+    A hit skips signature verification; entries are only trusted until the
+    token's own expiry, so the cache never extends a token's lifetime.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, TokenClaims]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: bytes) -> Optional[TokenClaims]:
+        with self._lock:
+            claims = self._entries.get(digest)
+            if claims is None:
+                return None
+            if claims.expires_at <= time.time():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return claims
+
+    def put(self, digest: bytes, claims: TokenClaims) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[digest] = claims
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+verified_tokens = VerifiedTokenCache(settings.TOKEN_CACHE_MAX_ENTRIES)
+
+
+def decode_token(token: str, token_type: str = "access") -> Optional[TokenClaims]:
+    """Verify a JWT and return its claims, served from the verified-token cache."""
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = verified_tokens.get(digest)
+    if claims is None:
+        try:
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
+        except JWTError:
             return None
 
-        user_id: str = payload.get("sub")
-        if user_id is None:
+        subject = payload.get("sub")
+        if subject is None:
             return None
+        expires_at = payload.get("exp")
+        claims = TokenClaims(
+            subject=subject,
+            token_type=payload.get("type"),
+            expires_at=float(expires_at) if expires_at else 0.0,
+            version=int(payload.get("ver", 0)),
+        )
+        # Tokens without an expiry are never cached
+        if expires_at:
+            verified_tokens.put(digest, claims)
 
-        return user_id
-    except JWTError:
+    # Check token type
+    if claims.token_type != token_type:
         return None
+    return claims
+
+
+def verify_token(token: str, token_type: str = "access") -> Optional[str]:
+    """Verify and decode a JWT token."""
+    claims = decode_token(token, token_type)
+    return claims.subject if claims is not None else None
 
 
 def create_email_verification_token(email: str) -> str:
@@ -1,33 +1,289 @@
 import json
 import asyncio
-from typing import Dict, List, Set, Any
-from fastapi import WebSocket, WebSocketDisconnect
+import uuid
+from collections import deque
+from typing import (
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Set,
+    Any,
+    Optional,
+    Union,
+)
+from fastapi import WebSocket, WebSocketDisconnect, status
 import logging
 
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is optional
+    msgpack = None
+
+from app.core.config import settings
+from app.core.websocket_backplane import (
+    BROADCAST_CHANNEL,
+    create_backplane,
+    publish_sync,
+    topic_channel,
+    user_channel,
+)
+
 logger = logging.getLogger(__name__)
 
+# Encodings a client can request through the WebSocket subprotocol header
+MSGPACK_SUBPROTOCOL = "msgpack"
+
+
+def negotiate_encoding(websocket: WebSocket) -> str:
+    """Pick msgpack when the client offers it and it is installed."""
+    offered = websocket.scope.get("subprotocols") or []
+    if msgpack is not None and (
+        MSGPACK_SUBPROTOCOL in offered
+        or websocket.query_params.get("encoding") == MSGPACK_SUBPROTOCOL
+    ):
+        return "msgpack"
+    return "json"
+
+
+class EncodedMessage:
+    """A message serialized at most once per encoding, shared by recipients."""
+
+    __slots__ = ("data", "_encoded")
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self._encoded: Dict[str, Union[str, bytes]] = {}
+
+    def encode(self, encoding: str) -> Union[str, bytes]:
+        payload = self._encoded.get(encoding)
+        if payload is None:
+            if encoding == "msgpack":
+                payload = msgpack.packb(self.data, default=str)
+            else:
+                payload = json.dumps(self.data, default=str)
+            self._encoded[encoding] = payload
+        return payload
+
+
+class CellDeltaTracker:
+    """
+    Turns recalculated scenario results into deltas against the last
+    published values.
+
+    The last values and their version are kept in the backplane, so with
+    several workers versions form one sequence and every delta is taken
+    against what was actually published last, by whichever worker.
+    """
+
+    def __init__(self, backplane):
+        self.backplane = backplane
+
+    @staticmethod
+    def _key(scenario_id: Hashable) -> str:
+        return f"scenario:{scenario_id}"
+
+    async def snapshot(self, scenario_id: Hashable) -> Optional[Dict[str, Any]]:
+        """Full message for the last published values, if any."""
+        entry = await self.backplane.get_snapshot(self._key(scenario_id))
+        if entry is None:
+            return None
+        return {
+            "type": "scenario_results",
+            "scenario_id": scenario_id,
+            "version": entry[0],
+            "values": entry[1],
+        }
+
+    async def encode(
+        self, scenario_id: Hashable, values: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        version, old_values = await self.backplane.swap_snapshot(
+            self._key(scenario_id), values
+        )
+        if old_values is not None:
+            changed = {
+                cell: value
+                for cell, value in values.items()
+                if cell not in old_values or old_values[cell] != value
+            }
+            removed = [cell for cell in old_values if cell not in values]
+            # Deltas only pay off while most cells are unchanged
+            if len(changed) + len(removed) < len(values) / 2:
+                return {
+                    "type": "scenario_results_delta",
+                    "scenario_id": scenario_id,
+                    "version": version,
+                    "base_version": version - 1,
+                    "changed": changed,
+                    "removed": removed,
+                }
+
+        return {
+            "type": "scenario_results",
+            "scenario_id": scenario_id,
+            "version": version,
+            "values": values,
+        }
+
+
+class OutboundQueue:
+    """
+    Bounded send buffer for one socket, drained by its own writer task.
+
+    Messages sharing a coalesce key replace the pending message in place,
+    so a client that falls behind only receives the latest progress value.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_size: int,
+        send_timeout: float,
+        on_failure: Callable[["OutboundQueue", Exception], None],
+    ):
+        self.websocket = websocket
+        self.max_size = max_size
+        self.send_timeout = send_timeout
+        self.on_failure = on_failure
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self._pending: Deque[list] = deque()
+        self._by_key: Dict[Hashable, list] = {}
+        self._wakeup = asyncio.Event()
+        self._writer = asyncio.create_task(self._run())
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(
+        self, text: Union[str, bytes], coalesce_key: Optional[Hashable] = None
+    ) -> bool:
+        """Queue a message; returns False if the queue is full."""
+        if coalesce_key is not None:
+            entry = self._by_key.get(coalesce_key)
+            if entry is not None:
+                entry[1] = text
+                self.coalesced += 1
+                return True
+
+        if len(self._pending) >= self.max_size:
+            return False
+
+        entry = [coalesce_key, text]
+        self._pending.append(entry)
+        if coalesce_key is not None:
+            self._by_key[coalesce_key] = entry
+        self._wakeup.set()
+        return True
+
+    def drop_oldest(self) -> None:
+        if self._pending:
+            key, _ = self._pending.popleft()
+            if key is not None:
+                self._by_key.pop(key, None)
+            self.dropped += 1
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._pending:
+                key, text = self._pending.popleft()
+                if key is not None:
+                    self._by_key.pop(key, None)
+                try:
+                    async with asyncio.timeout(self.send_timeout):
+                        if isinstance(text, bytes):
+                            await self.websocket.send_bytes(text)
+                        else:
+                            await self.websocket.send_text(text)
+                    self.sent += 1
+                except Exception as e:
+                    self.on_failure(self, e)
+                    return
+
+    def close(self):
+        self._writer.cancel()
+
+    async def wait_closed(self):
+        try:
+            await self._writer
+        except (asyncio.CancelledError, Exception):
+            pass
 
-class ConnectionManager:
-    """Manages WebSocket connections for real-time updates."""
 
-    def __init__(self):
+class ConnectionManager:
+    """
+    Manages WebSocket connections for real-time updates.
+
+    Events are published to the backplane and delivered by whichever
+    process holds the recipient's sockets, so broadcasts work the same from
+    any API worker.
+    """
+
+    def __init__(
+        self,
+        backplane=None,
+        queue_size: Optional[int] = None,
+        send_timeout: Optional[float] = None,
+        slow_consumer_policy: Optional[str] = None,
+    ):
+        self.backplane = backplane if backplane is not None else create_backplane()
+        self.queue_size = queue_size or settings.WEBSOCKET_SEND_QUEUE_SIZE
+        self.send_timeout = send_timeout or settings.WEBSOCKET_SEND_TIMEOUT
+        # "disconnect" closes laggards, "drop_oldest" discards their backlog
+        self.slow_consumer_policy = (
+            slow_consumer_policy or settings.WEBSOCKET_SLOW_CONSUMER_POLICY
+        )
+        self.outbound: Dict[WebSocket, OutboundQueue] = {}
+        # Negotiated wire encoding per socket ("json" or "msgpack")
+        self.encodings: Dict[WebSocket, str] = {}
+        self.scenario_deltas = CellDeltaTracker(self.backplane)
+        self.worker_id = uuid.uuid4().hex
+        self._broadcast_subscribed = False
         # Store active connections by user ID
         self.active_connections: Dict[int, Set[WebSocket]] = {}
-        # Store file subscriptions (user_id -> set of file_ids)
-        self.file_subscriptions: Dict[int, Set[int]] = {}
-        # Store task subscriptions (user_id -> set of task_ids)
-        self.task_subscriptions: Dict[int, Set[str]] = {}
-
-    async def connect(self, websocket: WebSocket, user_id: int):
+        self.connection_users: Dict[WebSocket, int] = {}
+        # Inverted subscription index (topic -> sockets) and its reverse,
+        # used to drop every subscription of a socket on disconnect
+        self.topic_subscribers: Dict[str, Set[WebSocket]] = {}
+        self.connection_topics: Dict[WebSocket, Set[str]] = {}
+        # Checks deciding whether a user may subscribe to a topic, by prefix
+        self.topic_authorizers: Dict[str, Callable[[int, str], Awaitable[bool]]] = {}
+
+    async def connect(self, websocket: WebSocket, user_id: int, encoding: str = "json"):
         """Accept a new WebSocket connection."""
-        await websocket.accept()
+        if encoding == "msgpack":
+            await websocket.accept(subprotocol=MSGPACK_SUBPROTOCOL)
+        else:
+            await websocket.accept()
+        self.encodings[websocket] = encoding
+
+        if not self._broadcast_subscribed:
+            await self.backplane.subscribe(BROADCAST_CHANNEL, self._deliver_broadcast)
+            self._broadcast_subscribed = True
 
         if user_id not in self.active_connections:
             self.active_connections[user_id] = set()
-            self.file_subscriptions[user_id] = set()
-            self.task_subscriptions[user_id] = set()
+            await self.backplane.subscribe(user_channel(user_id), self._deliver)
 
         self.active_connections[user_id].add(websocket)
+        self.connection_users[websocket] = user_id
+        self.connection_topics[websocket] = set()
+        self.outbound[websocket] = OutboundQueue(
+            websocket,
+            self.queue_size,
+            self.send_timeout,
+            lambda queue, error: self._evict(
+                queue.websocket, user_id, f"send failed: {error!r}"
+            ),
+        )
+        self.backplane.update_presence(self.worker_id, user_id, 1)
         logger.info(f"User {user_id} connected via WebSocket")
 
         # Send connection confirmation
@@ -42,40 +298,179 @@ class ConnectionManager:
 
     def disconnect(self, websocket: WebSocket, user_id: int):
         """Remove a WebSocket connection."""
-        if user_id in self.active_connections:
+        if (
+            user_id in self.active_connections
+            and websocket in self.active_connections[user_id]
+        ):
             self.active_connections[user_id].discard(websocket)
+            queue = self.outbound.pop(websocket, None)
+            if queue is not None:
+                queue.close()
+            self.encodings.pop(websocket, None)
+            self.connection_users.pop(websocket, None)
+            for topic in self.connection_topics.pop(websocket, ()):
+                self._remove_subscriber(topic, websocket)
+            self.backplane.update_presence(self.worker_id, user_id, -1)
 
             # Clean up empty sets
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
-                del self.file_subscriptions[user_id]
-                del self.task_subscriptions[user_id]
+                self.backplane.unsubscribe(user_channel(user_id), self._deliver)
 
         logger.info(f"User {user_id} disconnected from WebSocket")
 
-    async def send_to_user(self, user_id: int, data: Dict[str, Any]):
-        """Send data to all connections for a specific user."""
+    async def send_to_user(
+        self,
+        user_id: int,
+        data: Dict[str, Any],
+        coalesce_key: Optional[Hashable] = None,
+    ):
+        """
+        Queue data for all connections of a specific user.
+
+        Sends happen on each connection's writer task, so a slow client
+        never blocks the caller or other recipients.
+        """
         if user_id not in self.active_connections:
             return
 
-        message = json.dumps(data)
-        disconnected_websockets = []
+        self._enqueue(user_id, EncodedMessage(data), coalesce_key)
+        # Give writers a turn so fast clients are served promptly
+        await asyncio.sleep(0)
 
-        for websocket in self.active_connections[user_id].copy():
-            try:
-                await websocket.send_text(message)
-            except Exception as e:
-                logger.warning(f"Failed to send message to user {user_id}: {e}")
-                disconnected_websockets.append(websocket)
+    def _enqueue(
+        self,
+        user_id: int,
+        message: EncodedMessage,
+        coalesce_key: Optional[Hashable] = None,
+    ):
+        self._enqueue_to(
+            self.active_connections.get(user_id, ()), message, coalesce_key
+        )
 
-        # Clean up disconnected websockets
-        for websocket in disconnected_websockets:
-            self.active_connections[user_id].discard(websocket)
+    def _enqueue_to(
+        self,
+        websockets: Iterable[WebSocket],
+        message: EncodedMessage,
+        coalesce_key: Optional[Hashable] = None,
+    ):
+        for websocket in list(websockets):
+            queue = self.outbound.get(websocket)
+            if queue is None:
+                continue
+            payload = message.encode(self.encodings.get(websocket, "json"))
+            if queue.put(payload, coalesce_key):
+                continue
+            if self.slow_consumer_policy == "drop_oldest":
+                queue.drop_oldest()
+                queue.put(payload, coalesce_key)
+            else:
+                self._evict(
+                    websocket, self.connection_users[websocket], "send queue full"
+                )
+
+    def _evict(self, websocket: WebSocket, user_id: int, reason: str):
+        """Disconnect a socket that cannot keep up or has failed."""
+        logger.warning(f"Dropping WebSocket for user {user_id}: {reason}")
+        self.disconnect(websocket, user_id)
+        asyncio.create_task(self._close_quietly(websocket))
+
+    async def _close_quietly(self, websocket: WebSocket):
+        try:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        except Exception:
+            pass
+
+    async def drain(self, timeout: float = 5.0) -> bool:
+        """Wait until every outbound queue is empty (used on shutdown)."""
+        try:
+            async with asyncio.timeout(timeout):
+                while any(len(queue) for queue in self.outbound.values()):
+                    await asyncio.sleep(0.001)
+        except TimeoutError:
+            return False
+        return True
+
+    async def close(self):
+        """Stop every writer task; connections are left to the endpoint."""
+        queues = list(self.outbound.values())
+        for queue in queues:
+            queue.close()
+        for queue in queues:
+            await queue.wait_closed()
+
+    async def subscribe(self, websocket: WebSocket, topic: str) -> bool:
+        """Subscribe one socket to a topic such as ``scenario:42``."""
+        topics = self.connection_topics.get(websocket)
+        if topics is None:
+            return False
+        if topic in topics:
+            return True
+
+        topics.add(topic)
+        subscribers = self.topic_subscribers.setdefault(topic, set())
+        subscribers.add(websocket)
+        if len(subscribers) == 1:
+            await self.backplane.subscribe(topic_channel(topic), self._deliver_topic)
+        return True
+
+    def unsubscribe(self, websocket: WebSocket, topic: str):
+        """Unsubscribe one socket from a topic."""
+        topics = self.connection_topics.get(websocket)
+        if topics is not None and topic in topics:
+            topics.discard(topic)
+            self._remove_subscriber(topic, websocket)
+
+    def _remove_subscriber(self, topic: str, websocket: WebSocket):
+        subscribers = self.topic_subscribers.get(topic)
+        if subscribers is None:
+            return
+        subscribers.discard(websocket)
+        if not subscribers:
+            del self.topic_subscribers[topic]
+            self.backplane.unsubscribe(topic_channel(topic), self._deliver_topic)
+
+    def register_topic_authorizer(
+        self, prefix: str, authorizer: Callable[[int, str], Awaitable[bool]]
+    ):
+        """Allow clients to subscribe to ``{prefix}:...`` topics when approved."""
+        self.topic_authorizers[prefix] = authorizer
+
+    async def subscribe_client(self, websocket: WebSocket, topic: str) -> bool:
+        """Subscribe on a client's request, after checking the authorizer."""
+        user_id = self.connection_users.get(websocket)
+        authorizer = self.topic_authorizers.get(topic.split(":", 1)[0])
+        if (
+            user_id is None
+            or authorizer is None
+            or not await authorizer(user_id, topic)
+        ):
+            return False
+
+        await self.subscribe(websocket, topic)
+        if topic.startswith("scenario:"):
+            # Late joiners get the last snapshot so later deltas apply
+            scenario_id = topic.split(":", 1)[1]
+            snapshot = await self.scenario_deltas.snapshot(
+                int(scenario_id) if scenario_id.isdigit() else scenario_id
+            )
+            if snapshot is not None:
+                self._enqueue_to([websocket], EncodedMessage(snapshot))
+                await asyncio.sleep(0)
+        return True
+
+    async def _subscribe_user(self, user_id: int, topic: str):
+        for websocket in list(self.active_connections.get(user_id, ())):
+            await self.subscribe(websocket, topic)
+
+    def _unsubscribe_user(self, user_id: int, topic: str):
+        for websocket in list(self.active_connections.get(user_id, ())):
+            self.unsubscribe(websocket, topic)
 
     async def subscribe_to_file(self, user_id: int, file_id: int):
         """Subscribe a user to file status updates."""
-        if user_id in self.file_subscriptions:
-            self.file_subscriptions[user_id].add(file_id)
+        if user_id in self.active_connections:
+            await self._subscribe_user(user_id, file_topic(file_id, user_id))
             await self.send_to_user(
                 user_id,
                 {
@@ -87,8 +482,8 @@ class ConnectionManager:
 
     async def unsubscribe_from_file(self, user_id: int, file_id: int):
         """Unsubscribe a user from file status updates."""
-        if user_id in self.file_subscriptions:
-            self.file_subscriptions[user_id].discard(file_id)
+        if user_id in self.active_connections:
+            self._unsubscribe_user(user_id, file_topic(file_id, user_id))
             await self.send_to_user(
                 user_id,
                 {
@@ -100,8 +495,8 @@ class ConnectionManager:
 
     async def subscribe_to_task(self, user_id: int, task_id: str):
         """Subscribe a user to task status updates."""
-        if user_id in self.task_subscriptions:
-            self.task_subscriptions[user_id].add(task_id)
+        if user_id in self.active_connections:
+            await self._subscribe_user(user_id, task_topic(task_id, user_id))
             await self.send_to_user(
                 user_id,
                 {
@@ -113,8 +508,8 @@ class ConnectionManager:
 
     async def unsubscribe_from_task(self, user_id: int, task_id: str):
         """Unsubscribe a user from task status updates."""
-        if user_id in self.task_subscriptions:
-            self.task_subscriptions[user_id].discard(task_id)
+        if user_id in self.active_connections:
+            self._unsubscribe_user(user_id, task_topic(task_id, user_id))
             await self.send_to_user(
                 user_id,
                 {
@@ -124,40 +519,92 @@ class ConnectionManager:
                 },
             )
 
+    async def subscribe_to_report(self, user_id: int, export_id: int):
+        """Subscribe a user to report generation progress."""
+        if user_id in self.active_connections:
+            await self._subscribe_user(user_id, report_topic(export_id, user_id))
+            await self.send_to_user(
+                user_id,
+                {
+                    "type": "report_subscription",
+                    "export_id": export_id,
+                    "message": f"Subscribed to report {export_id} updates",
+                },
+            )
+
+    async def unsubscribe_from_report(self, user_id: int, export_id: int):
+        """Unsubscribe a user from report generation progress."""
+        if user_id in self.active_connections:
+            self._unsubscribe_user(user_id, report_topic(export_id, user_id))
+
+    async def _deliver(self, channel: str, event: Dict[str, Any]):
+        """Deliver a backplane event to this process's sockets for the user."""
+        await self.send_to_user(event["user_id"], event["message"])
+
+    async def _deliver_topic(self, channel: str, event: Dict[str, Any]):
+        """Deliver a topic event; cost is proportional to local subscribers."""
+        subscribers = self.topic_subscribers.get(event["topic"])
+        if not subscribers:
+            return
+        message = event["message"]
+        # Only the latest progress value per task is worth delivering
+        coalesce_key = (
+            ("task_progress", message["task_id"])
+            if message.get("type") == "task_progress_update"
+            else None
+        )
+        self._enqueue_to(subscribers, EncodedMessage(message), coalesce_key)
+        await asyncio.sleep(0)
+
+    async def _deliver_broadcast(self, channel: str, event: Dict[str, Any]):
+        message = EncodedMessage(event["message"])
+        for user_id in list(self.active_connections):
+            self._enqueue(user_id, message)
+        await asyncio.sleep(0)
+
+    async def publish(self, topic: str, message: Dict[str, Any]):
+        """Publish a message to every subscriber of a topic, on any worker."""
+        await self.backplane.publish(topic_channel(topic), topic_event(topic, message))
+
     async def broadcast_file_status(
         self, file_id: int, status_data: Dict[str, Any], user_id: int
     ):
         """Broadcast file status update to subscribed users."""
-        # Only send to the user who owns the file
-        if (
-            user_id in self.file_subscriptions
-            and file_id in self.file_subscriptions[user_id]
-        ):
-            await self.send_to_user(
-                user_id,
-                {"type": "file_status_update", "file_id": file_id, "data": status_data},
-            )
+        # File topics are scoped to the owner
+        await self.publish(
+            file_topic(file_id, user_id), file_status_message(file_id, status_data)
+        )
 
     async def broadcast_task_progress(
         self, task_id: str, progress_data: Dict[str, Any], user_id: int
     ):
         """Broadcast task progress update to subscribed users."""
-        if (
-            user_id in self.task_subscriptions
-            and task_id in self.task_subscriptions[user_id]
-        ):
-            await self.send_to_user(
-                user_id,
-                {
-                    "type": "task_progress_update",
-                    "task_id": task_id,
-                    "data": progress_data,
-                },
-            )
+        await self.publish(
+            task_topic(task_id, user_id), task_progress_message(task_id, progress_data)
+        )
+
+    async def broadcast_scenario_results(
+        self, scenario_id: int, values: Dict[str, Any]
+    ):
+        """
+        Push recalculated cell values to everyone watching the scenario, as
+        a delta against the previous push when most cells are unchanged.
+
+        Clients apply ``scenario_results_delta`` only on top of
+        ``base_version`` and refetch the scenario when they see a gap.
+        """
+        message = await self.scenario_deltas.encode(scenario_id, values)
+        await self.publish(f"scenario:{scenario_id}", message)
 
     async def send_notification(self, user_id: int, notification: Dict[str, Any]):
         """Send a notification to a specific user."""
-        await self.send_to_user(user_id, {"type": "notification", "data": notification})
+        await self.backplane.publish(
+            user_channel(user_id),
+            {
+                "user_id": user_id,
+                "message": {"type": "notification", "data": notification},
+            },
+        )
 
     async def broadcast_system_message(self, message: str, message_type: str = "info"):
         """Broadcast a system message to all connected users."""
@@ -166,9 +613,16 @@ class ConnectionManager:
             "message": message,
             "message_type": message_type,
         }
-
-        for user_id in self.active_connections:
-            await self.send_to_user(user_id, data)
+        await self.backplane.publish(BROADCAST_CHANNEL, {"message": data})
+
+    async def get_cluster_stats(self) -> Dict[str, Any]:
+        """Connection statistics across every process on the backplane."""
+        presence = await self.backplane.get_presence()
+        return {
+            "connected_users": sorted(presence),
+            "total_connections": sum(presence.values()),
+            "user_count": len(presence),
+        }
 
     def get_connected_users(self) -> List[int]:
         """Get list of currently connected user IDs."""
@@ -179,6 +633,75 @@ class ConnectionManager:
         return sum(len(connections) for connections in self.active_connections.values())
 
 
+def file_topic(file_id: int, user_id: int) -> str:
+    return f"user:{user_id}:file:{file_id}"
+
+
+def task_topic(task_id: str, user_id: int) -> str:
+    return f"user:{user_id}:task:{task_id}"
+
+
+def report_topic(export_id: int, user_id: int) -> str:
+    return f"user:{user_id}:report:{export_id}"
+
+
+def topic_event(topic: str, message: Dict[str, Any]) -> Dict[str, Any]:
+    return {"topic": topic, "message": message}
+
+
+def file_status_message(file_id: int, status_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "file_status_update", "file_id": file_id, "data": status_data}
+
+
+def task_progress_message(
+    task_id: str, progress_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    return {"type": "task_progress_update", "task_id": task_id, "data": progress_data}
+
+
+def publish_file_status(
+    file_id: int, status_data: Dict[str, Any], user_id: int
+) -> bool:
+    """Publish a file status update from a worker process."""
+    topic = file_topic(file_id, user_id)
+    return publish_sync(
+        topic_channel(topic),
+        topic_event(topic, file_status_message(file_id, status_data)),
+    )
+
+
+def publish_task_progress(
+    task_id: str, progress_data: Dict[str, Any], user_id: int
+) -> bool:
+    """Publish task progress from a worker process."""
+    topic = task_topic(task_id, user_id)
+    return publish_sync(
+        topic_channel(topic),
+        topic_event(topic, task_progress_message(task_id, progress_data)),
+    )
+
+
+def report_progress_message(
+    export_id: int, progress_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    return {
+        "type": "report_progress_update",
+        "export_id": export_id,
+        "data": progress_data,
+    }
+
+
+def publish_report_progress(
+    export_id: int, progress_data: Dict[str, Any], user_id: int
+) -> bool:
+    """Publish report generation progress from a worker process."""
+    topic = report_topic(export_id, user_id)
+    return publish_sync(
+        topic_channel(topic),
+        topic_event(topic, report_progress_message(export_id, progress_data)),
+    )
+
+
 # Global connection manager instance
 manager = ConnectionManager()
 
@@ -210,6 +733,30 @@ async def handle_websocket_message(
             if task_id:
                 await manager.unsubscribe_from_task(user_id, task_id)
 
+        elif message_type == "subscribe_report":
+            export_id = message.get("export_id")
+            if export_id:
+                await manager.subscribe_to_report(user_id, export_id)
+
+        elif message_type == "unsubscribe_report":
+            export_id = message.get("export_id")
+            if export_id:
+                await manager.unsubscribe_from_report(user_id, export_id)
+
+        elif message_type == "subscribe":
+            topic = message.get("topic")
+            if topic and await manager.subscribe_client(websocket, topic):
+                reply = {"type": "subscribed", "topic": topic}
+            else:
+                reply = {"type": "error", "message": f"Cannot subscribe to {topic}"}
+            # Only the requesting connection, not the user's other tabs
+            manager._enqueue_to([websocket], EncodedMessage(reply))
+
+        elif message_type == "unsubscribe":
+            topic = message.get("topic")
+            if topic:
+                manager.unsubscribe(websocket, topic)
+
         elif message_type == "ping":
             await manager.send_to_user(
                 user_id, {"type": "pong", "timestamp": message.get("timestamp")}
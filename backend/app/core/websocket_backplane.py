@@ -0,0 +1,274 @@
+"""
+Pub/sub backplanes that fan WebSocket events out across processes
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from app.core.config import settings
+
+try:
+    import redis
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis is a hard dependency in production
+    redis = None
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+BROADCAST_CHANNEL = "ws:broadcast"
+
+
+def user_channel(user_id: int) -> str:
+    return f"ws:user:{user_id}"
+
+
+def topic_channel(topic: str) -> str:
+    return f"ws:topic:{topic}"
+
+
+# Last published values of a key and their version
+Snapshot = Tuple[int, Dict[str, Any]]
+
+
+class LocalBackplane:
+    """
+    In-process broker.
+
+    Used for single-process deployments and as the test double for the
+    Redis backplane: several ConnectionManagers sharing one instance behave
+    like API workers sharing one Redis.
+    """
+
+    def __init__(self, max_snapshots: int = 1024):
+        self.max_snapshots = max_snapshots
+        self._handlers: Dict[str, Set[Handler]] = {}
+        self._presence: Dict[str, Dict[int, int]] = {}
+        self._snapshots: "OrderedDict[str, Snapshot]" = OrderedDict()
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        for handler in list(self._handlers.get(channel, ())):
+            await handler(channel, message)
+
+    async def subscribe(self, channel: str, handler: Handler) -> None:
+        self._handlers.setdefault(channel, set()).add(handler)
+
+    def unsubscribe(self, channel: str, handler: Handler) -> None:
+        handlers = self._handlers.get(channel)
+        if handlers is not None:
+            handlers.discard(handler)
+            if not handlers:
+                del self._handlers[channel]
+
+    def update_presence(self, worker_id: str, user_id: int, delta: int) -> None:
+        counts = self._presence.setdefault(worker_id, {})
+        counts[user_id] = counts.get(user_id, 0) + delta
+        if counts[user_id] <= 0:
+            del counts[user_id]
+
+    async def get_presence(self) -> Dict[int, int]:
+        """Return connection counts per user across all workers."""
+        totals: Dict[int, int] = {}
+        for counts in self._presence.values():
+            for user_id, count in counts.items():
+                totals[user_id] = totals.get(user_id, 0) + count
+        return totals
+
+    async def swap_snapshot(
+        self, key: str, values: Dict[str, Any]
+    ) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Store the next version of a key's values; return it and the previous."""
+        previous = self._snapshots.pop(key, None)
+        version = previous[0] + 1 if previous else 1
+        self._snapshots[key] = (version, dict(values))
+        if len(self._snapshots) > self.max_snapshots:
+            self._snapshots.popitem(last=False)
+        return version, previous[1] if previous else None
+
+    async def get_snapshot(self, key: str) -> Optional[Snapshot]:
+        return self._snapshots.get(key)
+
+    async def close(self) -> None:
+        self._handlers.clear()
+
+
+# Bumps a key's version and swaps in its new values atomically, so workers
+# publishing the same key share one version sequence.
+# KEYS: snapshot hash. ARGV: JSON values, TTL seconds
+_SWAP_SNAPSHOT_SCRIPT = """
+local previous = redis.call('HGET', KEYS[1], 'values')
+local version = redis.call('HINCRBY', KEYS[1], 'version', 1)
+redis.call('HSET', KEYS[1], 'values', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return {version, previous}
+"""
+
+
+class RedisBackplane:
+    """
+    Redis pub/sub backplane.
+
+    Each worker subscribes only to the channels of users it holds sockets
+    for, so a published event reaches the workers that can deliver it.
+    Unsubscribes and presence updates may come from synchronous code; they
+    are queued and applied by the listener task.
+    """
+
+    PRESENCE_TTL_SECONDS = 30
+    # How often the presence hash's TTL is extended while the worker lives
+    PRESENCE_REFRESH_SECONDS = 10
+    SNAPSHOT_TTL_SECONDS = 86400
+
+    def __init__(self, url: str, worker_id: Optional[str] = None):
+        self.client = aioredis.Redis.from_url(url)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._pubsub = self.client.pubsub()
+        self._swap_snapshot = self.client.register_script(_SWAP_SNAPSHOT_SCRIPT)
+        self._handlers: Dict[str, Set[Handler]] = {}
+        self._pending: list = []
+        self._listener: Optional[asyncio.Task] = None
+        self._presence_refreshed = 0.0
+
+    def _presence_key(self, worker_id: str) -> str:
+        return f"ws:presence:{worker_id}"
+
+    def _snapshot_key(self, key: str) -> str:
+        return f"ws:snapshot:{key}"
+
+    async def swap_snapshot(
+        self, key: str, values: Dict[str, Any]
+    ) -> Tuple[int, Optional[Dict[str, Any]]]:
+        version, previous = await self._swap_snapshot(
+            keys=[self._snapshot_key(key)],
+            args=[json.dumps(values, default=str), self.SNAPSHOT_TTL_SECONDS],
+        )
+        return int(version), json.loads(previous) if previous else None
+
+    async def get_snapshot(self, key: str) -> Optional[Snapshot]:
+        version, values = await self.client.hmget(
+            self._snapshot_key(key), "version", "values"
+        )
+        if values is None:
+            return None
+        return int(version), json.loads(values)
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        await self.client.publish(channel, json.dumps(message))
+
+    async def subscribe(self, channel: str, handler: Handler) -> None:
+        handlers = self._handlers.setdefault(channel, set())
+        handlers.add(handler)
+        if len(handlers) == 1:
+            await self._pubsub.subscribe(channel)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    def unsubscribe(self, channel: str, handler: Handler) -> None:
+        handlers = self._handlers.get(channel)
+        if handlers is None:
+            return
+        handlers.discard(handler)
+        if not handlers:
+            del self._handlers[channel]
+            self._pending.append(("unsubscribe", channel))
+
+    def update_presence(self, worker_id: str, user_id: int, delta: int) -> None:
+        self._pending.append(("presence", (user_id, delta)))
+
+    async def get_presence(self) -> Dict[int, int]:
+        await self._apply_pending()
+        totals: Dict[int, int] = {}
+        async for key in self.client.scan_iter(match=self._presence_key("*")):
+            for user_id, count in (await self.client.hgetall(key)).items():
+                if int(count) > 0:
+                    totals[int(user_id)] = totals.get(int(user_id), 0) + int(count)
+        return totals
+
+    async def _apply_pending(self) -> None:
+        pending, self._pending = self._pending, []
+        key = self._presence_key(self.worker_id)
+        presence_changed = False
+        for action, value in pending:
+            if action == "unsubscribe":
+                # Skip if someone re-subscribed since the request was queued
+                if value not in self._handlers:
+                    await self._pubsub.unsubscribe(value)
+            else:
+                user_id, delta = value
+                await self.client.hincrby(key, user_id, delta)
+                presence_changed = True
+
+        # Runs on every listener iteration; the TTL only needs extending
+        # once per refresh interval, or when the hash was just written
+        now = time.monotonic()
+        due = now - self._presence_refreshed >= self.PRESENCE_REFRESH_SECONDS
+        if presence_changed or due:
+            await self.client.expire(key, self.PRESENCE_TTL_SECONDS)
+            self._presence_refreshed = now
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                await self._apply_pending()
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+                if message is None:
+                    continue
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                payload = json.loads(message["data"])
+                for handler in list(self._handlers.get(channel, ())):
+                    await handler(channel, payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"WebSocket backplane listener error: {e}")
+                await asyncio.sleep(1.0)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+        await self._pubsub.close()
+        await self.client.delete(self._presence_key(self.worker_id))
+        await self.client.close()
+
+
+def create_backplane():
+    """Build the backplane selected by ``WEBSOCKET_BACKPLANE``."""
+    if settings.WEBSOCKET_BACKPLANE == "redis" and aioredis is not None:
+        return RedisBackplane(settings.WEBSOCKET_REDIS_URL)
+    return LocalBackplane()
+
+
+_sync_client = None
+
+
+def publish_sync(channel: str, message: Dict[str, Any]) -> bool:
+    """
+    Publish from synchronous code such as Celery tasks.
+
+    Only the Redis backplane can reach API workers from another process;
+    with the local backplane this is a no-op and returns False.
+    """
+    global _sync_client
+    if settings.WEBSOCKET_BACKPLANE != "redis" or redis is None:
+        return False
+    try:
+        if _sync_client is None:
+            _sync_client = redis.Redis.from_url(
+                settings.WEBSOCKET_REDIS_URL, socket_connect_timeout=0.5
+            )
+        _sync_client.publish(channel, json.dumps(message))
+        return True
+    except redis.RedisError as e:
+        logger.warning(f"Failed to publish WebSocket event to {channel}: {e}")
+        return False
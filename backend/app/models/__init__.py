@@ -0,0 +1,5 @@
+# Models package
+#
+# base registers every model module once Base is defined; loading it first
+# lets any model module be the first one imported (e.g. in a spawned worker)
+from app.models import base  # noqa
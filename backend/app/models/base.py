@@ -1,6 +1,12 @@
-from typing import Any
+from typing import Any, AsyncIterator, Optional
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.orm import Session
 
@@ -50,6 +56,69 @@ def get_db() -> Session:
         db.close()
 
 
+def to_async_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver (asyncpg, aiosqlite)."""
+    for sync_prefix, async_prefix in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix) :]
+    return url
+
+
+# The async engine is built on first use so processes that never touch it
+# (Celery workers, scripts) do not need the asyncio driver installed
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Return the process-wide async engine, creating it on first use."""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        url = settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+        _async_engine = create_async_engine(
+            url,
+            pool_size=20,
+            max_overflow=40,
+            pool_timeout=30,
+            pool_recycle=3600,
+            pool_pre_ping=True,
+            connect_args={
+                "server_settings": {
+                    "timezone": "utc",
+                    "application_name": "finvision_api",
+                },
+                "timeout": 10,
+            }
+            if url.startswith("postgresql")
+            else {},
+        )
+        _async_session_factory = async_sessionmaker(
+            _async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+def create_async_session() -> AsyncSession:
+    """Create a session bound to the async engine."""
+    get_async_engine()
+    return _async_session_factory()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency to get an async database session.
+
+    Queries await the driver instead of blocking the event loop, so a slow
+    query only delays its own request.
+    """
+    async with create_async_session() as db:
+        yield db
+
+
 # Import all models to ensure they are registered with SQLAlchemy
 from .user import User  # noqa
 from .role import Role, UserRole, RoleType  # noqa
@@ -58,6 +58,8 @@ class UploadedFile(Base):
     is_valid = Column(Boolean, default=None, nullable=True)
     validation_errors = Column(Text, nullable=True)
     parsed_data = Column(Text, nullable=True)  # JSON string of parsed data
+    # JSON map of sheet name to content fingerprint from the last parse
+    sheet_fingerprints = Column(Text, nullable=True)
 
     # Foreign Keys
     # Connect each file to its owning user. This satisfies the User.uploaded_files
@@ -34,6 +34,7 @@ class ExportFormat(enum.Enum):
     PNG = "png"
     SVG = "svg"
     JSON = "json"
+    ZIP = "zip"  # Report bundles
 
 
 class ReportStatus(enum.Enum):
@@ -149,6 +150,14 @@ class ReportExport(Base):
     processing_duration_seconds = Column(Integer)
     error_message = Column(Text)
 
+    # Background job tracking
+    task_id = Column(String(255))  # Celery task generating the file
+    priority = Column(String(20), default="interactive")  # Queue lane
+    progress = Column(Integer, default=0)  # Percent complete
+    current_step = Column(String(255))
+    # Hash of everything the file is generated from, see report_fingerprint
+    input_fingerprint = Column(String(64), index=True)
+
     # Ownership and sharing
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     user_id = synonym("created_by")
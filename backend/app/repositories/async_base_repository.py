@@ -0,0 +1,252 @@
+from typing import Generic, Type, List, Optional, Dict, Any
+from abc import ABC, abstractmethod
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import or_, desc, asc, func, select
+from sqlalchemy.sql import Select
+
+from app.repositories.base_repository import ModelType, apply_filters
+
+
+class AsyncBaseRepository(Generic[ModelType], ABC):
+    """
+    Async counterpart of BaseRepository for ``AsyncSession``.
+
+    Every query awaits the database driver, so request handlers using it do
+    not block the event loop. Results are fully loaded; relationships must
+    be eager-loaded by the caller since lazy loads are not allowed on an
+    async session.
+    """
+
+    def __init__(self, db: AsyncSession, model: Type[ModelType]):
+        """
+        Initialize repository with async database session and model class.
+
+        Args:
+            db: SQLAlchemy async database session
+            model: SQLAlchemy model class
+        """
+        self.db = db
+        self.model = model
+
+    async def get(self, id: int) -> Optional[ModelType]:
+        """
+        Get a single record by ID.
+
+        Args:
+            id: Primary key value
+
+        Returns:
+            Model instance or None if not found
+        """
+        try:
+            return await self.db.get(self.model, id)
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise e
+
+    async def get_multi(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        order_desc: bool = False,
+    ) -> List[ModelType]:
+        """
+        Get multiple records with pagination and filtering.
+
+        Args:
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            filters: Dictionary of field filters
+            order_by: Field name to order by
+            order_desc: Whether to order in descending order
+
+        Returns:
+            List of model instances
+        """
+        stmt = select(self.model)
+
+        if filters:
+            stmt = self._apply_filters(stmt, filters)
+
+        if order_by and hasattr(self.model, order_by):
+            order_field = getattr(self.model, order_by)
+            stmt = stmt.order_by(desc(order_field) if order_desc else asc(order_field))
+
+        return await self._all(stmt.offset(skip).limit(limit))
+
+    async def create(self, obj_in: Dict[str, Any]) -> ModelType:
+        """
+        Create a new record.
+
+        Args:
+            obj_in: Dictionary of field values
+
+        Returns:
+            Created model instance
+        """
+        try:
+            db_obj = self.model(**obj_in)
+            self.db.add(db_obj)
+            await self.db.commit()
+            await self.db.refresh(db_obj)
+            return db_obj
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise e
+
+    async def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
+        """
+        Update an existing record.
+
+        Args:
+            id: Primary key value
+            obj_in: Dictionary of field values to update
+
+        Returns:
+            Updated model instance or None if not found
+        """
+        try:
+            db_obj = await self.get(id)
+            if not db_obj:
+                return None
+
+            for field, value in obj_in.items():
+                if hasattr(db_obj, field):
+                    setattr(db_obj, field, value)
+
+            await self.db.commit()
+            await self.db.refresh(db_obj)
+            return db_obj
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise e
+
+    async def delete(self, id: int) -> bool:
+        """
+        Delete a record by ID.
+
+        Args:
+            id: Primary key value
+
+        Returns:
+            True if deleted, False if not found
+        """
+        try:
+            db_obj = await self.get(id)
+            if not db_obj:
+                return False
+
+            await self.db.delete(db_obj)
+            await self.db.commit()
+            return True
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise e
+
+    async def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Count records with optional filtering.
+
+        Args:
+            filters: Dictionary of field filters
+
+        Returns:
+            Number of matching records
+        """
+        stmt = select(func.count(self.model.id))
+        if filters:
+            stmt = self._apply_filters(stmt, filters)
+
+        try:
+            return (await self.db.execute(stmt)).scalar_one()
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise e
+
+    async def exists(self, id: int) -> bool:
+        """
+        Check if a record exists by ID.
+
+        Args:
+            id: Primary key value
+
+        Returns:
+            True if exists, False otherwise
+        """
+        stmt = select(self.model.id).where(self.model.id == id).limit(1)
+        try:
+            return (await self.db.execute(stmt)).first() is not None
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise e
+
+    async def search(
+        self,
+        search_term: str,
+        search_fields: List[str],
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[ModelType]:
+        """
+        Full-text search across specified fields.
+
+        Args:
+            search_term: Term to search for
+            search_fields: List of field names to search in
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+
+        Returns:
+            List of matching model instances
+        """
+        stmt = select(self.model)
+
+        search_conditions = [
+            getattr(self.model, field_name).ilike(f"%{search_term}%")
+            for field_name in search_fields
+            if hasattr(self.model, field_name)
+        ]
+        if search_conditions:
+            stmt = stmt.where(or_(*search_conditions))
+
+        return await self._all(stmt.offset(skip).limit(limit))
+
+    async def _all(self, stmt: Select) -> List[ModelType]:
+        try:
+            return list((await self.db.scalars(stmt)).all())
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise e
+
+    def _apply_filters(self, stmt: Select, filters: Dict[str, Any]) -> Select:
+        """
+        Apply filters to a select statement.
+
+        Args:
+            stmt: SQLAlchemy select statement
+            filters: Dictionary of field filters
+
+        Returns:
+            Filtered statement
+        """
+        return apply_filters(stmt, self.model, filters)
+
+    @abstractmethod
+    async def get_by_unique_field(
+        self, field_name: str, value: Any
+    ) -> Optional[ModelType]:
+        """
+        Get a record by a unique field value.
+        Must be implemented by concrete repositories.
+
+        Args:
+            field_name: Name of the unique field
+            value: Value to search for
+
+        Returns:
+            Model instance or None if not found
+        """
+        pass
@@ -0,0 +1,91 @@
+from typing import List, Optional, Any
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, desc
+
+from app.models.file import UploadedFile
+from app.models.parameter import Parameter, Scenario
+from app.models.report import ReportExport
+from app.repositories.async_base_repository import AsyncBaseRepository
+
+
+class _AsyncModelRepository(AsyncBaseRepository):
+    """Async repository whose unique-field lookup is a plain equality query."""
+
+    async def get_by_unique_field(self, field_name: str, value: Any) -> Optional[Any]:
+        if not hasattr(self.model, field_name):
+            return None
+        stmt = select(self.model).where(getattr(self.model, field_name) == value)
+        return (await self.db.scalars(stmt.limit(1))).first()
+
+
+class AsyncScenarioRepository(_AsyncModelRepository):
+    """Async repository for scenario reads."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, Scenario)
+
+    async def get_for_user(self, scenario_id: int, user_id: int) -> Optional[Scenario]:
+        """Get a scenario owned by the user."""
+        stmt = select(Scenario).where(
+            Scenario.id == scenario_id, Scenario.created_by_id == user_id
+        )
+        return (await self.db.scalars(stmt)).first()
+
+    async def list_for_user(
+        self,
+        user_id: int,
+        base_file_id: Optional[int] = None,
+        is_baseline: Optional[bool] = None,
+        is_template: Optional[bool] = None,
+        status: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[Scenario]:
+        """List a user's scenarios, newest first."""
+        filters = {"created_by_id": user_id}
+        if base_file_id:
+            filters["base_file_id"] = base_file_id
+        if is_baseline is not None:
+            filters["is_baseline"] = is_baseline
+        if is_template is not None:
+            filters["is_template"] = is_template
+        if status:
+            filters["status"] = status
+
+        return await self.get_multi(
+            skip=skip,
+            limit=limit,
+            filters=filters,
+            order_by="created_at",
+            order_desc=True,
+        )
+
+
+class AsyncParameterRepository(_AsyncModelRepository):
+    """Async repository for parameter reads."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, Parameter)
+
+
+class AsyncUploadedFileRepository(_AsyncModelRepository):
+    """Async repository for uploaded file reads."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, UploadedFile)
+
+    async def list_for_user(self, user_id: int) -> List[UploadedFile]:
+        """All files uploaded by the user, newest first."""
+        stmt = (
+            select(UploadedFile)
+            .where(UploadedFile.user_id == user_id)
+            .order_by(desc(UploadedFile.created_at))
+        )
+        return await self._all(stmt)
+
+
+class AsyncReportExportRepository(_AsyncModelRepository):
+    """Async repository for report export reads."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, ReportExport)
@@ -11,6 +11,51 @@ from app.models.base import Base
 ModelType = TypeVar("ModelType", bound=Base)
 
 
+def apply_filters(query: Any, model: Any, filters: Dict[str, Any]) -> Any:
+    """
+    Apply filters to a query or ``select()`` statement.
+
+    Args:
+        query: SQLAlchemy query or select statement
+        model: Model class the filters refer to
+        filters: Dictionary of field filters
+
+    Returns:
+        Filtered query or statement
+    """
+    for field_name, value in filters.items():
+        if hasattr(model, field_name):
+            field = getattr(model, field_name)
+
+            if isinstance(value, dict):
+                # Handle complex filters like ranges, operators
+                for operator, filter_value in value.items():
+                    if operator == "gt":
+                        query = query.filter(field > filter_value)
+                    elif operator == "gte":
+                        query = query.filter(field >= filter_value)
+                    elif operator == "lt":
+                        query = query.filter(field < filter_value)
+                    elif operator == "lte":
+                        query = query.filter(field <= filter_value)
+                    elif operator == "in":
+                        query = query.filter(field.in_(filter_value))
+                    elif operator == "not_in":
+                        query = query.filter(~field.in_(filter_value))
+                    elif operator == "like":
+                        query = query.filter(field.ilike(f"%{filter_value}%"))
+                    elif operator == "not_like":
+                        query = query.filter(~field.ilike(f"%{filter_value}%"))
+            elif isinstance(value, list):
+                # Handle list of values (IN operator)
+                query = query.filter(field.in_(value))
+            else:
+                # Handle simple equality
+                query = query.filter(field == value)
+
+    return query
+
+
 class BaseRepository(Generic[ModelType], ABC):
     """
     Base repository class implementing common database operations.
@@ -300,37 +345,7 @@ class BaseRepository(Generic[ModelType], ABC):
         Returns:
             Filtered query object
         """
-        for field_name, value in filters.items():
-            if hasattr(self.model, field_name):
-                field = getattr(self.model, field_name)
-
-                if isinstance(value, dict):
-                    # Handle complex filters like ranges, operators
-                    for operator, filter_value in value.items():
-                        if operator == "gt":
-                            query = query.filter(field > filter_value)
-                        elif operator == "gte":
-                            query = query.filter(field >= filter_value)
-                        elif operator == "lt":
-                            query = query.filter(field < filter_value)
-                        elif operator == "lte":
-                            query = query.filter(field <= filter_value)
-                        elif operator == "in":
-                            query = query.filter(field.in_(filter_value))
-                        elif operator == "not_in":
-                            query = query.filter(~field.in_(filter_value))
-                        elif operator == "like":
-                            query = query.filter(field.ilike(f"%{filter_value}%"))
-                        elif operator == "not_like":
-                            query = query.filter(~field.ilike(f"%{filter_value}%"))
-                elif isinstance(value, list):
-                    # Handle list of values (IN operator)
-                    query = query.filter(field.in_(value))
-                else:
-                    # Handle simple equality
-                    query = query.filter(field == value)
-
-        return query
+        return apply_filters(query, self.model, filters)
 
     @abstractmethod
     def get_by_unique_field(self, field_name: str, value: Any) -> Optional[ModelType]:
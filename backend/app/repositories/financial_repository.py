@@ -3,6 +3,7 @@ from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func, desc
 
+from app.models.file import UploadedFile, FileStatus
 from app.models.financial import (
     FinancialStatement,
     Metric,
@@ -422,6 +423,30 @@ class FileVersionRepository(BaseRepository[FileVersion]):
             self.db.query(self.model).filter(self.model.file_hash == file_hash).first()
         )
 
+    def get_processed_by_hash(
+        self, file_hash: str, user_id: int
+    ) -> Optional[FileVersion]:
+        """
+        Get the latest version with this hash whose file finished processing.
+
+        Only the user's own uploads are considered, so results are never
+        shared between users.
+        """
+        return (
+            self.db.query(self.model)
+            .join(UploadedFile, UploadedFile.id == self.model.file_id)
+            .filter(
+                and_(
+                    self.model.file_hash == file_hash,
+                    UploadedFile.user_id == user_id,
+                    UploadedFile.status == FileStatus.COMPLETED,
+                    UploadedFile.parsed_data.isnot(None),
+                )
+            )
+            .order_by(desc(UploadedFile.processing_completed_at))
+            .first()
+        )
+
 
 class DataSourceRepository(BaseRepository[DataSource]):
     """Repository for data source operations."""
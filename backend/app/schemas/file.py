@@ -20,6 +20,25 @@ class FileUploadResponse(BaseModel):
         from_attributes = True
 
 
+class ChunkedUploadCreate(BaseModel):
+    """Request schema for starting a resumable chunked upload."""
+
+    filename: str = Field(..., min_length=1, max_length=255)
+    total_size: int = Field(..., gt=0)
+    content_type: Optional[str] = None
+
+
+class ChunkedUploadStatus(BaseModel):
+    """Progress of a resumable chunked upload."""
+
+    upload_id: str
+    filename: str
+    total_size: int
+    received: int
+    chunk_size: int
+    is_complete: bool
+
+
 class FileInfo(BaseModel):
     """Schema for file information."""
 
@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from pydantic import BaseModel, Field, validator
@@ -126,6 +127,11 @@ class ReportExport(ReportExportBase):
     processing_completed_at: Optional[datetime] = None
     processing_duration_seconds: Optional[int] = None
     error_message: Optional[str] = None
+    task_id: Optional[str] = None
+    priority: Optional[str] = None
+    progress: Optional[int] = None
+    current_step: Optional[str] = None
+    input_fingerprint: Optional[str] = None
     created_by: int
     is_shared: bool
     shared_with: Optional[List[int]] = None
@@ -152,6 +158,21 @@ class GenerateReportRequest(BaseModel):
         allow_population_by_field_name = True
 
 
+class ReportBundleTarget(BaseModel):
+    file_id: Optional[int] = None
+    scenario_id: Optional[int] = None
+    period: str = "YTD"
+    name: Optional[str] = Field(None, max_length=200)
+
+
+class ReportBundleRequest(BaseModel):
+    template_id: Optional[int] = None
+    export_format: ExportFormat = ExportFormat.PDF
+    name: Optional[str] = Field(None, max_length=200)
+    targets: List[ReportBundleTarget] = Field(..., min_length=1)
+    custom_config: Optional[Dict[str, Any]] = None
+
+
 class ChartExportRequest(BaseModel):
     chart_type: str = Field(..., description="Type of chart to export")
     chart_data: Dict[str, Any] = Field(..., description="Chart data and configuration")
@@ -174,6 +195,21 @@ class DataExportRequest(BaseModel):
     include_metadata: bool = False
 
 
+class DataStreamDataset(str, Enum):
+    """Datasets available for streaming export."""
+
+    TIME_SERIES = "time_series"
+    METRICS = "metrics"
+
+
+class DataStreamFormat(str, Enum):
+    """Streaming export encodings."""
+
+    CSV = "csv"
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
 # Response schemas
 class ReportGenerationStatus(BaseModel):
     export_id: int
@@ -235,8 +235,9 @@ class AuthService:
         ):
             return False
 
-        # Update password
+        # Update password and revoke tokens issued with the old one
         user.hashed_password = get_password_hash(new_password)
+        user.token_version = (user.token_version or 0) + 1
         user.password_reset_token = None
         user.password_reset_expires = None
         user.failed_login_attempts = 0
@@ -270,8 +271,9 @@ class AuthService:
             )
             return False
 
-        # Update password
+        # Update password and revoke tokens issued with the old one
         user.hashed_password = get_password_hash(new_password)
+        user.token_version = (user.token_version or 0) + 1
 
         self.log_audit_action(
             user_id=user.id, action=AuditAction.PASSWORD_CHANGE, success="success"
@@ -405,6 +407,16 @@ class AuthService:
         self.db.commit()
         return True
 
+    def revoke_user_tokens(self, user_id: int) -> bool:
+        """Invalidate every access and refresh token issued to a user."""
+        user = self.get_user_by_id(user_id)
+        if not user:
+            return False
+
+        user.token_version = (user.token_version or 0) + 1
+        self.db.commit()
+        return True
+
     def log_audit_action(
         self,
         action: AuditAction,
@@ -435,8 +447,11 @@ class AuthService:
         self, user: User, expires_delta: timedelta | None = None
     ) -> Dict[str, str]:
         """Return access and refresh tokens for a user."""
-        access = create_access_token(user.id, expires_delta=expires_delta)
-        refresh = create_refresh_token(user.id)
+        version = user.token_version or 0
+        access = create_access_token(
+            user.id, expires_delta=expires_delta, version=version
+        )
+        refresh = create_refresh_token(user.id, version=version)
         return {
             "access_token": access,
             "refresh_token": refresh,
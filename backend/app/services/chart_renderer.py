@@ -0,0 +1,236 @@
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from app.core.config import settings
+from app.core.disk_cache import evict_least_recently_used, touch
+
+logger = logging.getLogger(__name__)
+
+LINE_CHARTS = {"revenue_trend", "profit_trend", "cash_flow_trend", "line", "trend"}
+BAR_CHARTS = {"expense_breakdown", "profit_margins", "bar", "column"}
+PIE_CHARTS = {"asset_distribution", "expense_categories", "pie", "donut"}
+
+# (chart type, data points)
+ChartSpec = Tuple[str, List[Dict[str, Any]]]
+
+
+def chart_key(
+    chart_type: str, data: List[Dict[str, Any]], style: Dict[str, Any], dpi: int
+) -> str:
+    """Content hash identifying a rendered chart image."""
+    payload = json.dumps(
+        [chart_type, data, style, dpi], sort_keys=True, default=str
+    ).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def draw_chart(ax, chart_type: str, data: List[Dict[str, Any]], style: Dict[str, Any]):
+    """Draw one chart on an Axes; points are {"period": ..., "value": ...}."""
+    points = [p for p in data if "period" in p and "value" in p]
+    if not points:
+        return
+    labels = [str(p["period"]) for p in points]
+    values = [p["value"] for p in points]
+    palette = style["colors"]
+    title = chart_type.replace("_", " ").title()
+
+    if chart_type in PIE_CHARTS:
+        ax.pie(
+            values,
+            labels=labels,
+            autopct="%1.1f%%",
+            colors=palette[: len(values)],
+            startangle=90,
+        )
+    elif chart_type in BAR_CHARTS:
+        bars = ax.bar(labels, values, color=palette[: len(values)])
+        ax.set_xlabel("Category")
+        ax.set_ylabel("Value")
+        ax.tick_params(axis="x", labelrotation=45)
+
+        # Add value labels on bars
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(
+                bar.get_x() + bar.get_width() / 2.0,
+                height,
+                f"{height:,.0f}",
+                ha="center",
+                va="bottom",
+            )
+    else:
+        ax.plot(labels, values, marker="o", linewidth=2, color=palette[0])
+        ax.set_xlabel("Period")
+        ax.set_ylabel("Value")
+        ax.grid(True, alpha=0.3)
+        ax.tick_params(axis="x", labelrotation=45)
+
+    ax.set_title(title, fontsize=style.get("title_font_size"))
+
+
+def render_chart(
+    chart_type: str,
+    data: List[Dict[str, Any]],
+    style: Dict[str, Any],
+    dpi: int,
+    figure_size: Optional[Tuple[float, float]] = None,
+    format: str = "png",
+) -> bytes:
+    """
+    Render a chart to image bytes.
+
+    Uses a standalone Figure rather than pyplot, so no global state is
+    shared and charts can be drawn concurrently.
+    """
+    figure = Figure(figsize=figure_size or style["figure_size"], dpi=dpi)
+    FigureCanvasAgg(figure)
+    draw_chart(figure.add_subplot(), chart_type, data, style)
+
+    buffer = io.BytesIO()
+    figure.savefig(
+        buffer, format=format, dpi=dpi, bbox_inches="tight", facecolor="white"
+    )
+    return buffer.getvalue()
+
+
+def _render_spec(spec: Tuple[str, List[Dict[str, Any]], Dict[str, Any], int]) -> bytes:
+    return render_chart(*spec)
+
+
+class ChartImageCache:
+    """
+    Content-addressed cache of rendered chart images.
+
+    Keys are hashes of (chart type, data, style, dpi), so a report pack
+    re-run with unchanged figures reuses every image across processes.
+    Least recently used images are evicted once the cache outgrows
+    ``max_bytes`` (CHART_CACHE_MAX_MB by default).
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir)
+        if max_bytes is None:
+            max_bytes = settings.CHART_CACHE_MAX_MB * 1024 * 1024
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.png"
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            image = path.read_bytes()
+        except OSError:
+            return None
+        touch(path)
+        return image
+
+    def put(self, key: str, image: bytes) -> None:
+        """Store an image, writing atomically."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(image)
+        os.replace(tmp_path, path)
+        evict_least_recently_used(self.cache_dir, "*.png", self.max_bytes)
+
+
+_pool: Optional[Executor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> Executor:
+    """Shared rendering pool, created on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                workers = settings.CHART_RENDER_WORKERS or os.cpu_count() or 2
+                # Daemonic processes (Celery prefork children) cannot fork
+                if (
+                    settings.CHART_RENDER_POOL == "process"
+                    and not multiprocessing.current_process().daemon
+                ):
+                    _pool = ProcessPoolExecutor(
+                        workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    _pool = ThreadPoolExecutor(
+                        workers, thread_name_prefix="chart-render"
+                    )
+    return _pool
+
+
+class ChartRenderer:
+    """Renders report charts through a shared image cache and worker pool."""
+
+    def __init__(
+        self,
+        style: Dict[str, Any],
+        dpi: int,
+        cache: Optional[ChartImageCache] = None,
+        pool: Optional[Executor] = None,
+    ):
+        self.style = style
+        self.dpi = dpi
+        self.cache = cache
+        self.pool = pool
+        self.hits = 0
+        self.misses = 0
+
+    def render_many(self, charts: Sequence[ChartSpec]) -> List[Optional[bytes]]:
+        """
+        PNG bytes for each chart, or None where rendering failed.
+
+        Cached images are reused; the rest are rendered in parallel.
+        """
+        keys = [
+            chart_key(chart_type, data, self.style, self.dpi)
+            for chart_type, data in charts
+        ]
+        images: List[Optional[bytes]] = [
+            self.cache.get(key) if self.cache else None for key in keys
+        ]
+
+        missing = [i for i, image in enumerate(images) if image is None]
+        self.hits += len(charts) - len(missing)
+        self.misses += len(missing)
+        specs = [(*charts[i], self.style, self.dpi) for i in missing]
+
+        if len(specs) > 1:
+            futures = [
+                (self.pool or _get_pool()).submit(_render_spec, spec) for spec in specs
+            ]
+            rendered = []
+            for future in futures:
+                try:
+                    rendered.append(future.result())
+                except Exception:
+                    logger.exception("Error generating chart")
+                    rendered.append(None)
+        else:
+            rendered = []
+            for spec in specs:
+                try:
+                    rendered.append(_render_spec(spec))
+                except Exception:
+                    logger.exception(f"Error generating chart {spec[0]}")
+                    rendered.append(None)
+
+        for i, image in zip(missing, rendered):
+            images[i] = image
+            if image is not None and self.cache:
+                self.cache.put(keys[i], image)
+
+        return images
@@ -1,4 +1,4 @@
-import json
+import asyncio
 import pandas as pd
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
@@ -7,6 +7,7 @@ from sqlalchemy import and_, or_
 
 from app.models.file import UploadedFile, FileStatus
 from app.models.user import User
+from app.services.financial_data_context import FinancialDataContext
 from app.services.excel_parser import (
     ParsedData,
     SheetInfo,
@@ -17,25 +18,53 @@ from app.services.excel_parser import (
 
 
 class DashboardMetricsService:
-    """Service for calculating and providing dashboard metrics."""
+    """
+    Service for calculating and providing dashboard metrics.
 
-    def __init__(self, db: Session):
+    Source data and computed statement views are cached in a
+    FinancialDataContext, so several metrics requested through the same
+    service (or a shared context) load and decode the file once.
+    """
+
+    def __init__(self, db: Session, context: Optional[FinancialDataContext] = None):
         self.db = db
+        self.context = context or FinancialDataContext(db)
 
     async def get_overview_metrics(
         self, user_id: int, period: str, file_id: Optional[int] = None
     ) -> Dict[str, Any]:
         """Get overview metrics combining P&L, Balance Sheet, and Cash Flow."""
 
+        snapshot = await self._get_snapshot(user_id, file_id)
+        if snapshot:
+            return self._overview_view(
+                *(
+                    self._snapshot_view(snapshot, name, period)["metrics"]
+                    for name in ("pl", "cash_flow", "balance_sheet")
+                )
+            )
+
         # Get parsed data
         parsed_data = await self._get_parsed_data(user_id, file_id)
         if not parsed_data:
             return self._get_demo_overview_metrics()
 
         # Calculate key metrics from all financial statements
-        pl_metrics = await self._calculate_pl_metrics(parsed_data, period)
-        cf_metrics = await self._calculate_cash_flow_metrics(parsed_data, period)
-        bs_metrics = await self._calculate_balance_sheet_metrics(parsed_data, period)
+        view = self._views(user_id, file_id, parsed_data, period)
+        pl_metrics, cf_metrics, bs_metrics = await asyncio.gather(
+            view("pl_metrics", self._calculate_pl_metrics),
+            view("cf_metrics", self._calculate_cash_flow_metrics),
+            view("bs_metrics", self._calculate_balance_sheet_metrics),
+        )
+        return self._overview_view(pl_metrics, cf_metrics, bs_metrics)
+
+    def _overview_view(
+        self,
+        pl_metrics: List[Dict[str, Any]],
+        cf_metrics: List[Dict[str, Any]],
+        bs_metrics: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Overview of the top metrics of each statement."""
 
         # Combine top metrics
         overview_metrics = []
@@ -66,13 +95,18 @@ class DashboardMetricsService:
     ) -> Dict[str, Any]:
         """Get Profit & Loss metrics and charts."""
 
+        snapshot = await self._get_snapshot(user_id, file_id)
+        if snapshot:
+            return self._snapshot_view(snapshot, "pl", period)
+
         # Get parsed data
         parsed_data = await self._get_parsed_data(user_id, file_id)
         if not parsed_data:
             return self._get_demo_pl_metrics()
 
         # Calculate P&L metrics
-        metrics = await self._calculate_pl_metrics(parsed_data, period)
+        view = self._views(user_id, file_id, parsed_data, period)
+        metrics = await view("pl_metrics", self._calculate_pl_metrics)
         charts = await self._generate_pl_charts(parsed_data, period)
         data_quality = await self._assess_data_quality(parsed_data, "pl")
 
@@ -83,13 +117,18 @@ class DashboardMetricsService:
     ) -> Dict[str, Any]:
         """Get Cash Flow metrics and charts."""
 
+        snapshot = await self._get_snapshot(user_id, file_id)
+        if snapshot:
+            return self._snapshot_view(snapshot, "cash_flow", period)
+
         # Get parsed data
         parsed_data = await self._get_parsed_data(user_id, file_id)
         if not parsed_data:
             return self._get_demo_cash_flow_metrics()
 
         # Calculate Cash Flow metrics
-        metrics = await self._calculate_cash_flow_metrics(parsed_data, period)
+        view = self._views(user_id, file_id, parsed_data, period)
+        metrics = await view("cf_metrics", self._calculate_cash_flow_metrics)
         charts = await self._generate_cash_flow_charts(parsed_data, period)
         waterfall_data = await self._generate_waterfall_data(parsed_data, period)
         data_quality = await self._assess_data_quality(parsed_data, "cf")
@@ -106,15 +145,20 @@ class DashboardMetricsService:
     ) -> Dict[str, Any]:
         """Get Balance Sheet metrics and charts."""
 
+        snapshot = await self._get_snapshot(user_id, file_id)
+        if snapshot:
+            return self._snapshot_view(snapshot, "balance_sheet", period)
+
         # Get parsed data
         parsed_data = await self._get_parsed_data(user_id, file_id)
         if not parsed_data:
             return self._get_demo_balance_sheet_metrics()
 
         # Calculate Balance Sheet metrics
-        metrics = await self._calculate_balance_sheet_metrics(parsed_data, period)
+        view = self._views(user_id, file_id, parsed_data, period)
+        metrics = await view("bs_metrics", self._calculate_balance_sheet_metrics)
         charts = await self._generate_balance_sheet_charts(parsed_data, period)
-        ratios = await self._calculate_financial_ratios(parsed_data, period)
+        ratios = await view("ratios", self._calculate_financial_ratios)
         data_quality = await self._assess_data_quality(parsed_data, "bs")
 
         return {
@@ -189,7 +233,8 @@ class DashboardMetricsService:
             return self._get_demo_ratios()
 
         # Calculate ratios
-        ratios = await self._calculate_financial_ratios(parsed_data, period)
+        view = self._views(user_id, file_id, parsed_data, period)
+        ratios = dict(await view("ratios", self._calculate_financial_ratios))
 
         # Filter by category if specified
         if ratio_category:
@@ -272,31 +317,67 @@ class DashboardMetricsService:
 
         return refresh_stats
 
+    async def get_statement_views(
+        self, user_id: int, period: str, file_id: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Overview, P&L, cash flow and balance sheet views in one pass.
+
+        The source data is loaded once and shared by all four views.
+        """
+        overview, pl, cash_flow, balance_sheet = await asyncio.gather(
+            self.get_overview_metrics(user_id, period, file_id),
+            self.get_pl_metrics(user_id, period, file_id),
+            self.get_cash_flow_metrics(user_id, period, file_id),
+            self.get_balance_sheet_metrics(user_id, period, file_id),
+        )
+        return {
+            "overview": overview,
+            "pl": pl,
+            "cash_flow": cash_flow,
+            "balance_sheet": balance_sheet,
+        }
+
     # Helper methods
 
     async def _get_parsed_data(
         self, user_id: int, file_id: Optional[int] = None
     ) -> Optional[Dict[str, Any]]:
-        """Get parsed data from database."""
+        """Get parsed data from the request's data context."""
+        return await self.context.parsed_data(user_id, file_id)
 
-        query = self.db.query(UploadedFile).filter(
-            UploadedFile.uploaded_by_id == user_id,
-            UploadedFile.status == FileStatus.COMPLETED,
-            UploadedFile.parsed_data.isnot(None),
-        )
+    async def _get_snapshot(
+        self, user_id: int, file_id: Optional[int] = None
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Get the source file's materialized statement views, if it has any."""
+        return await self.context.snapshot(user_id, file_id)
 
-        if file_id:
-            query = query.filter(UploadedFile.id == file_id)
+    def _snapshot_view(
+        self, snapshot: Dict[str, Dict[str, Any]], name: str, period: str
+    ) -> Dict[str, Any]:
+        """A stored statement view, with its metrics labelled for ``period``."""
+        view = snapshot[name]
+        return {
+            **view,
+            "metrics": [{**metric, "period": period} for metric in view["metrics"]],
+        }
 
-        file_record = query.order_by(UploadedFile.created_at.desc()).first()
+    def _views(
+        self,
+        user_id: int,
+        file_id: Optional[int],
+        parsed_data: Dict[str, Any],
+        period: str,
+    ):
+        """Bind a view lookup to one source file and period."""
 
-        if file_record and file_record.parsed_data:
-            try:
-                return json.loads(file_record.parsed_data)
-            except json.JSONDecodeError:
-                return None
+        def view(name: str, calculate):
+            return self.context.view(
+                (name, user_id, file_id, period),
+                lambda: calculate(parsed_data, period),
+            )
 
-        return None
+        return view
 
     async def _calculate_pl_metrics(
         self, parsed_data: Dict[str, Any], period: str
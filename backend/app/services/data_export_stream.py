@@ -0,0 +1,217 @@
+import csv
+import io
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.financial import Metric, TimeSeries
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# dataset: (model, date column for range filters, [(column, arrow type)])
+DATASETS: Dict[str, Tuple[Any, Any, List[Tuple[str, str]]]] = {
+    "time_series": (
+        TimeSeries,
+        TimeSeries.period_date,
+        [
+            ("id", "int64"),
+            ("scenario_id", "int64"),
+            ("data_type", "string"),
+            ("data_subtype", "string"),
+            ("period_date", "date32"),
+            ("value", "float64"),
+            ("currency", "string"),
+            ("frequency", "string"),
+            ("is_actual", "bool_"),
+            ("is_adjusted", "bool_"),
+        ],
+    ),
+    "metrics": (
+        Metric,
+        Metric.period_start,
+        [
+            ("id", "int64"),
+            ("scenario_id", "int64"),
+            ("metric_name", "string"),
+            ("metric_category", "string"),
+            ("metric_type", "string"),
+            ("value", "float64"),
+            ("period_start", "date32"),
+            ("period_end", "date32"),
+            ("currency", "string"),
+        ],
+    ),
+}
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def build_export_query(
+    dataset: str,
+    user_id: int,
+    scenario_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """Select the user's rows of a dataset as plain column tuples."""
+    model, period_column, columns = DATASETS[dataset]
+    stmt = select(*[getattr(model, name) for name, _ in columns]).where(
+        model.created_by_id == user_id
+    )
+    if scenario_id is not None:
+        stmt = stmt.where(model.scenario_id == scenario_id)
+    if start_date is not None:
+        stmt = stmt.where(period_column >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(period_column <= end_date)
+    return stmt.order_by(period_column, model.id)
+
+
+def iter_batches(
+    db: Session, stmt, batch_size: Optional[int] = None
+) -> Iterator[Sequence[Any]]:
+    """
+    Yield result rows in batches from a server-side cursor.
+
+    Rows are fetched ``batch_size`` at a time, so only one batch is held in
+    memory however large the result is.
+    """
+    result = db.execute(
+        stmt.execution_options(
+            stream_results=True,
+            yield_per=batch_size or settings.DATA_EXPORT_BATCH_SIZE,
+        )
+    )
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+
+def stream_csv(db: Session, stmt, columns: Sequence[str]) -> Iterator[bytes]:
+    """Encode query results as CSV, one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    for batch in iter_batches(db, stmt):
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        # Header only: the query matched no rows
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink:
+    """Write-only file object whose contents are drained after each batch."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def arrow_schema(columns: Sequence[Tuple[str, str]]):
+    return pa.schema([(name, getattr(pa, type_name)()) for name, type_name in columns])
+
+
+def stream_arrow(
+    db: Session, stmt, columns: Sequence[Tuple[str, str]], format: str = "parquet"
+) -> Iterator[bytes]:
+    """
+    Encode query results as Parquet or an Arrow IPC stream.
+
+    Each batch becomes one record batch (one Parquet row group), and the
+    encoded bytes are yielded as soon as it is written.
+    """
+    schema = arrow_schema(columns)
+    sink = _ChunkSink()
+    if format == "parquet":
+        writer = pq.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    try:
+        for batch in iter_batches(db, stmt):
+            arrays = [
+                pa.array([row[i] for row in batch], type=field.type)
+                for i, field in enumerate(schema)
+            ]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def _stream_in_session(bind, stmt, columns, format: str) -> Iterator[bytes]:
+    # The export outlives the request that started it, so it reads through
+    # its own session rather than the request-scoped one
+    with Session(bind) as db:
+        if format == "csv":
+            yield from stream_csv(db, stmt, [name for name, _ in columns])
+        else:
+            yield from stream_arrow(db, stmt, columns, format)
+
+
+def stream_dataset(
+    bind: Union[Engine, Connection],
+    dataset: str,
+    format: str,
+    user_id: int,
+    scenario_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Iterator[bytes]:
+    """
+    Byte chunks of a dataset export in the requested format.
+
+    The rows are read through a dedicated session on ``bind``, opened when
+    streaming starts and closed once the last chunk is sent.
+
+    Raises:
+        RuntimeError: If a columnar format is requested without pyarrow
+    """
+    if format != "csv" and not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is required for Parquet and Arrow exports")
+
+    columns = DATASETS[dataset][2]
+    stmt = build_export_query(dataset, user_id, scenario_id, start_date, end_date)
+    return _stream_in_session(bind, stmt, columns, format)
@@ -507,6 +507,7 @@ class DataRecoveryService:
                 # Update file record with partial data
                 file_record.parsed_data = json.dumps(partial_result.extracted_data)
                 file_record.status = FileStatus.COMPLETED
+                file_record.processing_completed_at = datetime.utcnow()
                 file_record.is_valid = partial_result.completion_percentage > 50
 
                 # Store recovery information
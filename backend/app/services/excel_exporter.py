@@ -1,7 +1,7 @@
 import os
 import io
 import json
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import BinaryIO, Dict, List, Any, Iterable, Optional, Sequence, Union, Tuple
 from datetime import datetime
 from pathlib import Path
 import pandas as pd
@@ -13,6 +13,7 @@ from openpyxl.worksheet.table import Table, TableStyleInfo
 from xlsxwriter import Workbook as XlsxWriterWorkbook
 
 from app.core.config import settings
+from app.services.streaming_excel import StreamingExcelWriter, StreamingSheet
 
 
 class ExcelExporter:
@@ -20,7 +21,7 @@ class ExcelExporter:
 
     def __init__(self, output_dir: Optional[str] = None):
         self.output_dir = (
-            Path(output_dir) if output_dir else Path(settings.UPLOAD_DIR) / "exports"
+            Path(output_dir) if output_dir else Path(settings.UPLOAD_FOLDER) / "exports"
         )
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -47,7 +48,9 @@ class ExcelExporter:
         template_config: Optional[Dict[str, Any]] = None,
         preserve_formulas: bool = True,
         filename: Optional[str] = None,
-    ) -> str:
+        streaming: Optional[bool] = None,
+        output: Optional[BinaryIO] = None,
+    ) -> Optional[str]:
         """
         Export financial data to Excel with multiple sheets and preserved formatting.
 
@@ -56,15 +59,25 @@ class ExcelExporter:
             template_config: Template configuration for styling
             preserve_formulas: Whether to preserve Excel formulas
             filename: Output filename
+            streaming: Use the constant-memory writer; by default it is used
+                when the data has more than EXCEL_STREAMING_ROW_THRESHOLD rows
+            output: Binary stream to write the workbook to instead of a file
 
         Returns:
-            Path to generated Excel file
+            Path to generated Excel file, or None when written to ``output``
         """
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"financial_export_{timestamp}.xlsx"
 
         output_path = self.output_dir / filename
+        target = output or output_path
+
+        if streaming is None:
+            streaming = self._count_rows(data) > settings.EXCEL_STREAMING_ROW_THRESHOLD
+        if streaming:
+            self._export_streaming(data, target)
+            return None if output else str(output_path)
 
         # Create workbook
         wb = Workbook()
@@ -74,12 +87,8 @@ class ExcelExporter:
             wb.remove(wb["Sheet"])
 
         # Create sheets based on data structure
-        sheet_order = ["Summary", "P&L", "Balance Sheet", "Cash Flow", "Raw Data"]
-
-        for sheet_name in sheet_order:
-            if sheet_name.lower().replace(" ", "_").replace("&", "") in data:
-                sheet_data = data[sheet_name.lower().replace(" ", "_").replace("&", "")]
-                self._create_sheet(wb, sheet_name, sheet_data, preserve_formulas)
+        for sheet_name, sheet_data in self._sheet_sections(data):
+            self._create_sheet(wb, sheet_name, sheet_data, preserve_formulas)
 
         # Add charts sheet if chart data exists
         if "charts" in data:
@@ -89,9 +98,18 @@ class ExcelExporter:
         self._create_metadata_sheet(wb, data.get("metadata", {}))
 
         # Save workbook
-        wb.save(output_path)
+        wb.save(target)
 
-        return str(output_path)
+        return None if output else str(output_path)
+
+    def _sheet_sections(self, data: Dict[str, Any]):
+        """Yield (sheet name, sheet data) for the sections present in data."""
+        sheet_order = ["Summary", "P&L", "Balance Sheet", "Cash Flow", "Raw Data"]
+
+        for sheet_name in sheet_order:
+            key = sheet_name.lower().replace(" ", "_").replace("&", "")
+            if key in data:
+                yield sheet_name, data[key]
 
     def _create_sheet(
         self,
@@ -571,12 +589,194 @@ class ExcelExporter:
             adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
             worksheet.column_dimensions[column_letter].width = adjusted_width
 
+    def _count_rows(self, data: Dict[str, Any]) -> int:
+        """Number of time series and table rows across all sheets."""
+        total = 0
+        for _, sheet_data in self._sheet_sections(data):
+            if not isinstance(sheet_data, dict):
+                continue
+            total += len(sheet_data.get("time_series") or [])
+            for table_data in (sheet_data.get("tables") or {}).values():
+                total += len(table_data or [])
+        return total
+
+    def _export_streaming(
+        self, data: Dict[str, Any], output_path: Union[Path, BinaryIO]
+    ):
+        """Write the financial workbook with the constant-memory writer."""
+        with StreamingExcelWriter(output_path) as writer:
+            for sheet_name, sheet_data in self._sheet_sections(data):
+                sheet = writer.add_sheet(sheet_name)
+                sheet.write_title(f"{sheet_name} Analysis")
+                if not isinstance(sheet_data, dict):
+                    continue
+
+                if isinstance(sheet_data.get("metrics"), dict):
+                    self._stream_metrics_section(sheet, sheet_data["metrics"])
+
+                time_series = sheet_data.get("time_series")
+                if time_series:
+                    columns = self._table_columns(time_series)
+                    sheet.write_title("Time Series Data", "section", skip=1)
+                    sheet.write_table(
+                        time_series,
+                        columns,
+                        labels=[c.replace("_", " ").title() for c in columns],
+                        # The first column holds the period, not an amount
+                        column_kinds=["number"] + ["currency"] * (len(columns) - 1),
+                    )
+                    sheet.skip(2)
+
+                for table_name, table_data in (sheet_data.get("tables") or {}).items():
+                    if not table_data:
+                        continue
+                    sheet.write_title(
+                        table_name.replace("_", " ").title(), "section", skip=1
+                    )
+                    sheet.write_table(table_data, self._table_columns(table_data))
+                    sheet.skip(2)
+
+            if data.get("charts"):
+                self._stream_charts_sheet(writer, data["charts"])
+
+            self._stream_metadata_sheet(writer, data.get("metadata", {}))
+
+    def _table_columns(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """Column names across all rows, in first-seen order."""
+        return list(dict.fromkeys(key for row in rows for key in row))
+
+    def _stream_metrics_section(self, sheet: StreamingSheet, metrics: Dict[str, Any]):
+        columns = ["Metric", "Value", "Previous Period", "Change %"]
+        sheet.write_title("Key Metrics", "section", skip=1)
+        sheet.write_header(columns)
+
+        for metric_name, metric_value in metrics.items():
+            current, previous, change = metric_value, None, None
+            if isinstance(metric_value, dict):
+                current = metric_value.get("current", "")
+                previous = metric_value.get("previous", "")
+                try:
+                    change = (float(current) - float(previous)) / float(previous)
+                except (TypeError, ValueError, ZeroDivisionError):
+                    change = None
+
+            kind = (
+                "currency"
+                if any(
+                    keyword in metric_name.lower()
+                    for keyword in ["revenue", "profit", "cost", "expense", "cash"]
+                )
+                else "number"
+            )
+            sheet.write_rows(
+                [[metric_name.replace("_", " ").title(), current, previous, change]],
+                columns,
+                column_kinds=["number", kind, kind, "percentage"],
+            )
+
+        sheet.skip(2)
+
+    def _stream_charts_sheet(
+        self, writer: StreamingExcelWriter, charts_data: Dict[str, Any]
+    ):
+        sheet = writer.add_sheet("Charts")
+        sheet.write_title("Financial Charts", skip=3)
+
+        for chart_name, chart_data in charts_data.items():
+            points = [
+                [p["period"], p["value"]]
+                for p in chart_data or []
+                if "period" in p and "value" in p
+            ]
+            if not points:
+                continue
+
+            sheet.write_title(chart_name.replace("_", " ").title(), "label", skip=1)
+            first_row = sheet.row + 1
+            sheet.write_table(points, ["Period", "Value"])
+            last_row = sheet.row - 1
+
+            if "trend" in chart_name or "time" in chart_name:
+                chart_type = "line"
+            elif "breakdown" in chart_name or "distribution" in chart_name:
+                chart_type = "pie"
+            else:
+                chart_type = "column"
+            chart = writer.workbook.add_chart({"type": chart_type})
+            chart.add_series(
+                {
+                    "name": chart_name.replace("_", " ").title(),
+                    "categories": ["Charts", first_row, 0, last_row, 0],
+                    "values": ["Charts", first_row, 1, last_row, 1],
+                }
+            )
+            sheet.worksheet.insert_chart(first_row - 2, 3, chart)
+            # Leave room for the chart below short data tables
+            sheet.skip(max(2, 18 - len(points)))
+
+    def _stream_metadata_sheet(
+        self, writer: StreamingExcelWriter, metadata: Dict[str, Any]
+    ):
+        sheet = writer.add_sheet("Metadata")
+        sheet.write_title("Export Metadata")
+
+        export_info = {
+            "Export Date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "Generated By": "FinVision Financial Analysis System",
+            "Export Type": "Financial Data Export",
+            **metadata,
+        }
+        for key, value in export_info.items():
+            sheet.worksheet.write_string(
+                sheet.row, 0, str(key), writer.formats["label"]
+            )
+            sheet.worksheet.write_string(sheet.row, 1, str(value))
+            sheet.track_width(0, len(str(key)))
+            sheet.track_width(1, len(str(value)))
+            sheet.skip()
+
+    def export_rows_streaming(
+        self,
+        rows: Iterable[Union[Sequence[Any], Dict[str, Any]]],
+        columns: Sequence[str],
+        filename: Optional[str] = None,
+        sheet_name: str = "Data",
+        column_kinds: Optional[Sequence[str]] = None,
+    ) -> str:
+        """
+        Export rows from an iterable to a single-sheet workbook in constant memory.
+
+        Args:
+            rows: Sequences in column order or dicts keyed by column; may be
+                a generator, which is consumed once
+            columns: Column names, written as the header row
+            filename: Output filename
+            sheet_name: Worksheet name
+            column_kinds: Number format per column ("currency", "number" or
+                "percentage"); inferred from the column names by default
+
+        Returns:
+            Path to generated Excel file
+        """
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"data_export_{timestamp}.xlsx"
+
+        output_path = self.output_dir / filename
+
+        with StreamingExcelWriter(output_path) as writer:
+            sheet = writer.add_sheet(sheet_name)
+            sheet.write_table(rows, columns, column_kinds=column_kinds)
+
+        return str(output_path)
+
     def export_raw_data_csv(
         self,
         data: List[Dict[str, Any]],
         filename: Optional[str] = None,
         include_metadata: bool = True,
-    ) -> str:
+        output: Optional[BinaryIO] = None,
+    ) -> Optional[str]:
         """
         Export raw data to CSV format.
 
@@ -584,9 +784,10 @@ class ExcelExporter:
             data: List of data records
             filename: Output filename
             include_metadata: Whether to include metadata header
+            output: Binary stream to write the CSV to instead of a file
 
         Returns:
-            Path to generated CSV file
+            Path to generated CSV file, or None when written to ``output``
         """
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -598,7 +799,11 @@ class ExcelExporter:
         df = pd.DataFrame(data)
 
         # Write CSV
-        with open(output_path, "w", newline="", encoding="utf-8") as f:
+        if output:
+            f = io.TextIOWrapper(output, encoding="utf-8", newline="")
+        else:
+            f = open(output_path, "w", newline="", encoding="utf-8")
+        try:
             if include_metadata:
                 f.write(f"# FinVision Data Export\n")
                 f.write(
@@ -608,5 +813,12 @@ class ExcelExporter:
                 f.write("\n")
 
             df.to_csv(f, index=False)
+        finally:
+            if output:
+                # Leave the caller's stream open
+                f.flush()
+                f.detach()
+            else:
+                f.close()
 
-        return str(output_path)
+        return None if output else str(output_path)
@@ -1,12 +1,17 @@
 import os
 import re
+import json
+import hashlib
 import pandas as pd
-from typing import Dict, List, Any, Optional, Tuple, Union
-from datetime import datetime, date
+from typing import Dict, List, Any, Optional, Tuple, Union, Set
+from datetime import datetime, date, time, timedelta
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 
+from app.core.config import settings
+from app.core.disk_cache import evict_least_recently_used, touch
+
 try:
     from openpyxl import load_workbook
     from openpyxl.utils import get_column_letter, column_index_from_string
@@ -14,6 +19,12 @@ try:
     from openpyxl.worksheet.worksheet import Worksheet
     from openpyxl.cell.cell import Cell
 
+    from app.services.formula_references import (
+        extract_references,
+        extract_reference_strings,
+        parse_reference,
+    )
+
     OPENPYXL_AVAILABLE = True
 except ImportError:
     OPENPYXL_AVAILABLE = False
@@ -121,15 +132,117 @@ class ParsedData:
     dependencies: Dict[str, List[str]] = field(default_factory=dict)
     time_series_data: Dict[str, Any] = field(default_factory=dict)
     financial_metrics: Dict[str, Any] = field(default_factory=dict)
+    sheet_fingerprints: Dict[str, str] = field(default_factory=dict)
+
+
+def _cell_formula(cell: Cell) -> Optional[str]:
+    """Return a cell's formula text, or None for constant cells."""
+    if cell.data_type == "f" and isinstance(cell.value, str):
+        return cell.value
+    return None
+
+
+# Cell values JSON has no type for, tagged with their type name
+_TAGGED_TYPES = {
+    "datetime": (datetime, datetime.isoformat, datetime.fromisoformat),
+    "date": (date, date.isoformat, date.fromisoformat),
+    "time": (time, time.isoformat, time.fromisoformat),
+    "timedelta": (timedelta, timedelta.total_seconds, lambda s: timedelta(seconds=s)),
+}
+
+
+def _encode_value(value: Any) -> Dict[str, Any]:
+    for name, (value_type, encode, _) in _TAGGED_TYPES.items():
+        # datetime is a date subclass, so match the exact type
+        if type(value) is value_type:
+            return {"__type__": name, "value": encode(value)}
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _decode_value(obj: Dict[str, Any]) -> Any:
+    if obj.keys() == {"__type__", "value"} and obj["__type__"] in _TAGGED_TYPES:
+        return _TAGGED_TYPES[obj["__type__"]][2](obj["value"])
+    return obj
+
+
+class SheetResultCache:
+    """
+    Content-addressed cache of per-sheet parse results.
+
+    Entries are keyed by sheet fingerprint, so any workbook containing an
+    identical sheet (typically the next version of the same model) reuses the
+    parsed sheet, its formulas and their dependencies. Entries are stored as
+    JSON and the least recently used are evicted once the cache outgrows
+    ``max_bytes`` (SHEET_CACHE_MAX_MB by default).
+    """
+
+    # Bump when the stored layout changes so old entries read as misses
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir)
+        if max_bytes is None:
+            max_bytes = settings.SHEET_CACHE_MAX_MB * 1024 * 1024
+        self.max_bytes = max_bytes
+
+    def _path(self, fingerprint: str) -> Path:
+        return self.cache_dir / f"{fingerprint}.json"
+
+    def get(self, fingerprint: str) -> Optional[Tuple[Any, ...]]:
+        """Return cached (SheetInfo, formulas, dependencies) or None."""
+        path = self._path(fingerprint)
+        if not path.exists():
+            return None
+        try:
+            entry = json.loads(path.read_text(), object_hook=_decode_value)
+            if entry.get("version") != self.FORMAT_VERSION:
+                return None
+            sheet = entry["sheet"]
+            cells = [
+                CellInfo(**{**cell, "data_type": DataType(cell["data_type"])})
+                for cell in sheet.pop("cells")
+            ]
+            sheet_type = SheetType(sheet.pop("sheet_type"))
+            sheet_info = SheetInfo(**sheet, sheet_type=sheet_type, cells=cells)
+            touch(path)
+        except Exception:
+            # Treat unreadable entries as misses; they are rewritten on put
+            return None
+        return sheet_info, entry["formulas"], entry["dependencies"]
+
+    def put(self, fingerprint: str, entry: Tuple[Any, ...]) -> None:
+        """Store a sheet result, writing atomically."""
+        sheet_info, formulas, dependencies = entry
+        try:
+            payload = json.dumps(
+                {
+                    "version": self.FORMAT_VERSION,
+                    "sheet": asdict(sheet_info),
+                    "formulas": formulas,
+                    "dependencies": dependencies,
+                },
+                default=_encode_value,
+            )
+        except (TypeError, ValueError):
+            # Sheets holding values JSON cannot represent are not cached
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(fingerprint)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(payload)
+        os.replace(tmp_path, path)
+        evict_least_recently_used(self.cache_dir, "*.json", self.max_bytes)
 
 
 class ExcelParser:
     """Advanced Excel file parser for financial models."""
 
-    def __init__(self):
+    def __init__(self, sheet_cache: Optional[SheetResultCache] = None):
         if not OPENPYXL_AVAILABLE:
             raise ImportError("openpyxl is required for Excel parsing")
 
+        self.sheet_cache = sheet_cache
+
         # Financial statement patterns
         self.pl_patterns = [
             r"(profit|loss|income|statement|p&l|pnl)",
@@ -188,7 +301,14 @@ class ExcelParser:
 
     # The remaining complex implementation is kept for completeness but unused in tests
     def parse_excel_file(self, file_path: str) -> ParsedData:
-        """Original comprehensive parser retained for reference."""
+        """
+        Original comprehensive parser retained for reference.
+
+        With a sheet cache configured, each sheet is fingerprinted and only
+        sheets whose fingerprint is not cached are reparsed. Formulas on
+        reused sheets that read from reparsed sheets are reported in
+        ``metadata["incremental"]["invalidated_formulas"]``.
+        """
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Excel file not found: {file_path}")
         file_info = Path(file_path)
@@ -200,13 +320,44 @@ class ExcelParser:
                 file_size=file_info.stat().st_size,
             )
             parsed_data.metadata = self._extract_metadata(workbook)
+            reused_sheets = []
             for sheet_name in workbook.sheetnames:
                 sheet = workbook[sheet_name]
-                sheet_info = self._parse_worksheet(sheet)
+                cached = None
+                if self.sheet_cache is not None:
+                    fingerprint = self.compute_sheet_fingerprint(sheet)
+                    parsed_data.sheet_fingerprints[sheet_name] = fingerprint
+                    cached = self.sheet_cache.get(fingerprint)
+
+                if cached is not None:
+                    sheet_info, formulas, dependencies = cached
+                    reused_sheets.append(sheet_name)
+                else:
+                    sheet_info = self._parse_worksheet(sheet)
+                    formulas, dependencies = self._extract_sheet_formulas(sheet)
+                    if self.sheet_cache is not None:
+                        self.sheet_cache.put(
+                            fingerprint, (sheet_info, formulas, dependencies)
+                        )
+
                 parsed_data.sheets.append(sheet_info)
-            parsed_data.formulas, parsed_data.dependencies = self._extract_formulas(
-                workbook
-            )
+                parsed_data.formulas.update(formulas)
+                parsed_data.dependencies.update(dependencies)
+
+            if self.sheet_cache is not None:
+                reparsed_sheets = [
+                    name for name in workbook.sheetnames if name not in reused_sheets
+                ]
+                parsed_data.metadata["incremental"] = {
+                    "reused_sheets": reused_sheets,
+                    "reparsed_sheets": reparsed_sheets,
+                    "invalidated_formulas": self._find_invalidated_formulas(
+                        parsed_data.formulas, set(reparsed_sheets)
+                    )
+                    if reused_sheets
+                    else [],
+                }
+
             parsed_data.time_series_data = self._extract_time_series(parsed_data.sheets)
             parsed_data.financial_metrics = self._calculate_basic_metrics(
                 parsed_data.sheets
@@ -232,6 +383,81 @@ class ExcelParser:
             )
             return error_data
 
+    def compute_sheet_fingerprint(self, sheet: Worksheet) -> str:
+        """
+        Fingerprint everything the per-sheet parse results depend on.
+
+        Covers the title, dimensions, cell contents and formulas, number
+        formats, comments and merged ranges.
+        """
+        digest = hashlib.sha256()
+        digest.update(
+            repr((sheet.title, sheet.max_row, sheet.max_column)).encode("utf-8")
+        )
+        for row in sheet.iter_rows():
+            for cell in row:
+                if cell.value is None and not cell.comment:
+                    continue
+                digest.update(
+                    repr(
+                        (
+                            cell.coordinate,
+                            type(cell.value).__name__,
+                            cell.value,
+                            cell.number_format,
+                            cell.comment.text if cell.comment else None,
+                        )
+                    ).encode("utf-8")
+                )
+        digest.update(
+            repr(sorted(str(merged) for merged in sheet.merged_cells.ranges)).encode(
+                "utf-8"
+            )
+        )
+        return digest.hexdigest()
+
+    def _find_invalidated_formulas(
+        self, formulas: Dict[str, str], changed_sheets: Set[str]
+    ) -> List[str]:
+        """
+        Find formulas outside changed sheets whose values depend on them.
+
+        Walks the cross-sheet dependency cone to a fixed point: a formula is
+        invalidated when it references a changed sheet or a cell that has
+        already been invalidated.
+        """
+        if not changed_sheets:
+            return []
+
+        pending = {}
+        for cell_ref, formula in formulas.items():
+            sheet_name = cell_ref.rsplit("!", 1)[0]
+            if sheet_name not in changed_sheets:
+                pending[cell_ref] = (sheet_name, extract_references(formula))
+
+        invalidated: Dict[str, List[Tuple[int, int]]] = {}
+        found = []
+        progress = True
+        while progress and pending:
+            progress = False
+            for cell_ref, (sheet_name, references) in list(pending.items()):
+                for reference in references:
+                    target = reference.sheet or sheet_name
+                    if target in changed_sheets or any(
+                        reference.contains(target, col, row)
+                        for col, row in invalidated.get(target, ())
+                    ):
+                        location = parse_reference(cell_ref.rsplit("!", 1)[1])
+                        invalidated.setdefault(sheet_name, []).append(
+                            (location.min_col, location.min_row)
+                        )
+                        found.append(cell_ref)
+                        del pending[cell_ref]
+                        progress = True
+                        break
+
+        return found
+
     def _extract_metadata(self, workbook: Workbook) -> Dict[str, Any]:
         """Extract file metadata."""
         properties = workbook.properties
@@ -266,7 +492,7 @@ class ExcelParser:
         formula_count = 0
         for row in sheet.iter_rows():
             for cell in row:
-                if cell.value is not None or cell.formula:
+                if cell.value is not None:
                     cell_info = self._parse_cell(cell)
                     sheet_info.cells.append(cell_info)
 
@@ -288,8 +514,9 @@ class ExcelParser:
         )
 
         # Handle formulas
-        if cell.formula:
-            cell_info.formula = cell.formula
+        formula = _cell_formula(cell)
+        if formula:
+            cell_info.formula = formula
             cell_info.data_type = DataType.FORMULA
         else:
             cell_info.data_type = self._detect_data_type(cell.value)
@@ -440,26 +667,38 @@ class ExcelParser:
         dependencies = {}
 
         for sheet_name in workbook.sheetnames:
-            sheet = workbook[sheet_name]
-            for row in sheet.iter_rows():
-                for cell in row:
-                    if cell.formula:
-                        cell_ref = f"{sheet_name}!{cell.coordinate}"
-                        formulas[cell_ref] = cell.formula
+            sheet_formulas, sheet_dependencies = self._extract_sheet_formulas(
+                workbook[sheet_name]
+            )
+            formulas.update(sheet_formulas)
+            dependencies.update(sheet_dependencies)
+
+        return formulas, dependencies
+
+    def _extract_sheet_formulas(
+        self, sheet: Worksheet
+    ) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+        """Extract formulas and their dependencies from a single sheet."""
+        formulas = {}
+        dependencies = {}
+
+        for row in sheet.iter_rows():
+            for cell in row:
+                formula = _cell_formula(cell)
+                if formula:
+                    cell_ref = f"{sheet.title}!{cell.coordinate}"
+                    formulas[cell_ref] = formula
 
-                        # Extract dependencies from formula
-                        deps = self._extract_cell_references(cell.formula)
-                        if deps:
-                            dependencies[cell_ref] = deps
+                    # Extract dependencies from formula
+                    deps = self._extract_cell_references(formula)
+                    if deps:
+                        dependencies[cell_ref] = deps
 
         return formulas, dependencies
 
     def _extract_cell_references(self, formula: str) -> List[str]:
-        """Extract cell references from a formula."""
-        # Simplified regex for cell references
-        pattern = r"[A-Z]+\d+"
-        references = re.findall(pattern, formula.upper())
-        return list(set(references))  # Remove duplicates
+        """Extract cell and range references from a formula."""
+        return extract_reference_strings(formula)
 
     def _identify_financial_sections(self, sheet: Worksheet) -> Dict[str, Any]:
         """Identify financial sections in the sheet."""
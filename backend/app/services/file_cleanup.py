@@ -353,6 +353,11 @@ class FileCleanupService:
 
             # Scan upload folder
             for file_path in upload_folder.rglob("*"):
+                # Hidden folders hold in-progress chunked uploads, which
+                # cleanup_stale_chunked_uploads expires separately
+                relative = file_path.relative_to(upload_folder)
+                if any(part.startswith(".") for part in relative.parts[:-1]):
+                    continue
                 if file_path.is_file():
                     full_path = str(file_path)
 
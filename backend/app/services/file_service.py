@@ -1,16 +1,57 @@
 import os
+import json
 import uuid
-import shutil
+import hashlib
+import logging
+import time
 from pathlib import Path
-from typing import Optional, List, BinaryIO, Dict, Any
+from typing import Optional, List, BinaryIO, Dict, Any, Tuple, AsyncIterator, Set
 import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime
 from sqlalchemy.orm import Session
 from fastapi import UploadFile, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
 from app.models.file import UploadedFile, ProcessingLog, FileStatus, FileType
+from app.models.financial import FileVersion, ChangeType
 from app.models.user import User
+from app.repositories.financial_repository import FileVersionRepository
 from app.core.config import settings
+from app.core.response_cache import invalidate_user_responses
+from app.services.financial_snapshot import (
+    clear_file_snapshot,
+    materialize_file_snapshot,
+)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Running SHA-256 state of in-progress chunked uploads handled by this
+# process, keyed by upload id as (bytes hashed, digest, last write time).
+# Uploads resumed on another worker are simply rehashed from disk when
+# completed.
+_chunked_upload_digests: Dict[str, Tuple[int, Any, float]] = {}
+
+# Chunked uploads a request in this process is currently writing to
+_chunked_upload_writers: Set[str] = set()
+
+
+def _prune_chunked_upload_digests(max_age: float) -> None:
+    """Drop digests of uploads that received no chunk for ``max_age`` seconds."""
+    cutoff = time.time() - max_age
+    for upload_id, (_, _, touched_at) in list(_chunked_upload_digests.items()):
+        if touched_at < cutoff:
+            _chunked_upload_digests.pop(upload_id, None)
+
+
+def _open_for_append(path: Path) -> BinaryIO:
+    """Open an existing file for appending, without creating a missing one."""
+    return os.fdopen(os.open(path, os.O_WRONLY | os.O_APPEND), "ab")
 
 
 class FileService:
@@ -20,7 +61,10 @@ class FileService:
         self.db = db
         self.upload_folder = Path(settings.UPLOAD_FOLDER)
         self.max_file_size = settings.MAX_FILE_SIZE
+        self.max_resumable_file_size = settings.MAX_RESUMABLE_FILE_SIZE
+        self.chunk_size = settings.UPLOAD_CHUNK_SIZE
         self.allowed_extensions = settings.ALLOWED_EXTENSIONS
+        self.partial_folder = self.upload_folder / ".partial"
 
         # Ensure upload folder exists
         self.upload_folder.mkdir(parents=True, exist_ok=True)
@@ -31,16 +75,25 @@ class FileService:
         if hasattr(file, "size") and file.size and file.size > self.max_file_size:
             raise HTTPException(
                 status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File size {file.size} exceeds maximum allowed size {self.max_file_size} bytes",
+                detail=(
+                    f"File size {file.size} exceeds maximum allowed size "
+                    f"{self.max_file_size} bytes"
+                ),
             )
 
-        # Check file extension
-        if file.filename:
-            file_ext = Path(file.filename).suffix.lower()
+        self.validate_filename(file.filename)
+
+    def validate_filename(self, filename: Optional[str]) -> None:
+        """Validate that a filename has an allowed extension."""
+        if filename:
+            file_ext = Path(filename).suffix.lower()
             if file_ext not in self.allowed_extensions:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"File type {file_ext} not allowed. Allowed types: {', '.join(self.allowed_extensions)}",
+                    detail=(
+                        f"File type {file_ext} not allowed. "
+                        f"Allowed types: {', '.join(self.allowed_extensions)}"
+                    ),
                 )
         else:
             raise HTTPException(
@@ -64,7 +117,18 @@ class FileService:
         return f"{unique_id}{ext}"
 
     async def save_uploaded_file(self, file: UploadFile, user: User) -> UploadedFile:
-        """Save uploaded file to disk and create database record."""
+        """
+        Save uploaded file to disk and create database record.
+
+        The body is streamed to disk in chunks with file writes and database
+        work offloaded to the thread pool, so large uploads do not block the
+        event loop. Size and SHA-256 are computed on the fly and the size
+        limit is enforced mid-stream.
+
+        When a previously processed file has the same content, its parsed
+        results are copied onto the new record, which is created already
+        completed so no processing is queued.
+        """
         self.validate_file(file)
 
         # Generate unique filename
@@ -72,42 +136,375 @@ class FileService:
         file_path = self.upload_folder / unique_filename
 
         try:
-            # Save file to disk
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            # Save file to disk, hashing it on the way
+            digest = hashlib.sha256()
+            file_size = await self._stream_to_disk(
+                self._iter_upload(file), file_path, "wb", self.max_file_size, digest
+            )
+
+            return await run_in_threadpool(
+                self._create_upload_record,
+                file_path,
+                file.filename,
+                file.content_type,
+                file_size,
+                digest.hexdigest(),
+                user,
+            )
+
+        except Exception as e:
+            # Clean up file if saving or the database operation fails
+            if file_path.exists():
+                file_path.unlink()
+            if isinstance(e, HTTPException):
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to save file: {str(e)}",
+            )
 
-            # Get actual file size
-            file_size = file_path.stat().st_size
+    async def _iter_upload(self, file: UploadFile) -> AsyncIterator[bytes]:
+        """Yield an UploadFile's content in chunks."""
+        while True:
+            chunk = await file.read(self.chunk_size)
+            if not chunk:
+                break
+            yield chunk
 
-            # Create database record
+    async def _stream_to_disk(
+        self,
+        chunks: AsyncIterator[bytes],
+        file_path: Path,
+        mode: str,
+        max_bytes: int,
+        digest: Optional[Any] = None,
+    ) -> int:
+        """
+        Write chunks to disk without blocking the event loop.
+
+        Returns the number of bytes written and raises 413 as soon as more
+        than ``max_bytes`` have been received.
+        """
+        buffer = await run_in_threadpool(open, file_path, mode)
+        try:
+            return await self._write_chunks(chunks, buffer, max_bytes, digest)
+        finally:
+            await run_in_threadpool(buffer.close)
+
+    async def _write_chunks(
+        self,
+        chunks: AsyncIterator[bytes],
+        buffer: BinaryIO,
+        max_bytes: int,
+        digest: Optional[Any] = None,
+    ) -> int:
+        """
+        Write chunks to an open file, hashing each one once it is written.
+
+        Returns the number of bytes written and raises 413 as soon as more
+        than ``max_bytes`` have been received.
+        """
+        written = 0
+        async for chunk in chunks:
+            written += len(chunk)
+            if written > max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"File exceeds maximum allowed size {max_bytes} bytes",
+                )
+            await run_in_threadpool(buffer.write, chunk)
+            if digest is not None:
+                digest.update(chunk)
+        return written
+
+    def _create_upload_record(
+        self,
+        file_path: Path,
+        original_filename: str,
+        content_type: Optional[str],
+        file_size: int,
+        file_hash: str,
+        user: User,
+    ) -> UploadedFile:
+        """Create the database record for a file already written to disk."""
+        try:
             file_record = UploadedFile(
-                filename=unique_filename,
-                stored_filename=unique_filename,
-                original_filename=file.filename,
+                filename=file_path.name,
+                stored_filename=file_path.name,
+                original_filename=original_filename,
                 file_path=str(file_path),
                 file_size=file_size,
-                file_type=self.get_file_type(file.filename).value,
-                mime_type=file.content_type or "application/octet-stream",
+                file_type=self.get_file_type(original_filename).value,
+                mime_type=content_type or "application/octet-stream",
                 status=FileStatus.UPLOADED,
                 user_id=user.id,
             )
 
+            duplicate = FileVersionRepository(self.db).get_processed_by_hash(
+                file_hash, user.id
+            )
+            if duplicate:
+                self._reuse_processing_results(file_record, duplicate.uploaded_file)
+
             self.db.add(file_record)
+            self.db.flush()
+            self.db.add(
+                FileVersion(
+                    file_id=file_record.id,
+                    version_number=1,
+                    file_path=str(file_path),
+                    file_size=file_size,
+                    file_hash=file_hash,
+                    change_type=ChangeType.INITIAL.value,
+                    is_current=True,
+                    created_by_id=user.id,
+                )
+            )
             self.db.commit()
             self.db.refresh(file_record)
-
-            # Log the upload
+        except Exception:
+            self.db.rollback()
+            raise
+
+        # Log the upload
+        self.log_processing_step(
+            file_record.id,
+            "upload",
+            f"File '{original_filename}' uploaded successfully",
+            "info",
+        )
+        if duplicate:
             self.log_processing_step(
                 file_record.id,
-                "upload",
-                f"File '{file.filename}' uploaded successfully",
+                "deduplicated",
+                "Identical content already processed; reused previous results",
                 "info",
+                json.dumps(
+                    {"source_file_id": duplicate.file_id, "file_hash": file_hash}
+                ),
             )
+            self.finish_processing(file_record)
+
+        return file_record
 
-            return file_record
+    # ------------------------------------------------------------------
+    # Resumable chunked uploads
+    # ------------------------------------------------------------------
 
+    def _chunked_upload_paths(self, upload_id: str) -> Tuple[Path, Path]:
+        """Return the (data, metadata) paths of a chunked upload."""
+        try:
+            upload_id = uuid.UUID(upload_id).hex
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found"
+            )
+        return (
+            self.partial_folder / f"{upload_id}.part",
+            self.partial_folder / f"{upload_id}.json",
+        )
+
+    def _load_chunked_upload(self, upload_id: str, user: User) -> Dict[str, Any]:
+        """Load chunked upload metadata, enforcing ownership."""
+        data_path, meta_path = self._chunked_upload_paths(upload_id)
+        if not meta_path.exists() or not data_path.exists():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found"
+            )
+
+        metadata = json.loads(meta_path.read_text())
+        if metadata["user_id"] != user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this upload",
+            )
+
+        metadata["received"] = data_path.stat().st_size
+        return metadata
+
+    def _chunked_upload_status(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "upload_id": metadata["upload_id"],
+            "filename": metadata["filename"],
+            "total_size": metadata["total_size"],
+            "received": metadata["received"],
+            "chunk_size": self.chunk_size,
+            "is_complete": metadata["received"] == metadata["total_size"],
+        }
+
+    def start_chunked_upload(
+        self,
+        filename: str,
+        total_size: int,
+        content_type: Optional[str],
+        user: User,
+    ) -> Dict[str, Any]:
+        """Register a resumable upload whose chunks arrive in later requests."""
+        self.validate_filename(filename)
+        if total_size > self.max_resumable_file_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=(
+                    f"File size {total_size} exceeds maximum allowed size "
+                    f"{self.max_resumable_file_size} bytes"
+                ),
+            )
+
+        _prune_chunked_upload_digests(settings.CHUNKED_UPLOAD_TTL_HOURS * 3600)
+        upload_id = uuid.uuid4().hex
+        self.partial_folder.mkdir(parents=True, exist_ok=True)
+        data_path, meta_path = self._chunked_upload_paths(upload_id)
+
+        metadata = {
+            "upload_id": upload_id,
+            "filename": filename,
+            "total_size": total_size,
+            "content_type": content_type,
+            "user_id": user.id,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        data_path.touch()
+        meta_path.write_text(json.dumps(metadata))
+        _chunked_upload_digests[upload_id] = (0, hashlib.sha256(), time.time())
+
+        metadata["received"] = 0
+        return self._chunked_upload_status(metadata)
+
+    async def get_chunked_upload_status(
+        self, upload_id: str, user: User
+    ) -> Dict[str, Any]:
+        """Return how many bytes of a chunked upload have been received."""
+        metadata = await run_in_threadpool(self._load_chunked_upload, upload_id, user)
+        return self._chunked_upload_status(metadata)
+
+    @asynccontextmanager
+    async def _chunked_upload_lock(self, upload_id: str):
+        """
+        Hold a chunked upload for one request, yielding its data file.
+
+        Requests in this process are tracked in memory and other workers are
+        excluded with an advisory lock on the data file; a second request for
+        a busy upload gets 409 and can retry from the reported offset.
+        """
+        busy = HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Upload is being written by another request",
+        )
+        if upload_id in _chunked_upload_writers:
+            raise busy
+        _chunked_upload_writers.add(upload_id)
+        try:
+            data_path, _ = self._chunked_upload_paths(upload_id)
+            try:
+                buffer = await run_in_threadpool(_open_for_append, data_path)
+            except FileNotFoundError:
+                # Completed or expired since its metadata was read
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found"
+                )
+            try:
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(buffer.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        raise busy
+                yield buffer
+            finally:
+                await run_in_threadpool(buffer.close)
+        finally:
+            _chunked_upload_writers.discard(upload_id)
+
+    async def append_upload_chunk(
+        self,
+        upload_id: str,
+        offset: int,
+        chunks: AsyncIterator[bytes],
+        user: User,
+    ) -> Dict[str, Any]:
+        """
+        Append a chunk to a resumable upload.
+
+        ``offset`` must equal the number of bytes already received; a mismatch
+        returns 409 so the client can resume from the reported position.
+        """
+        metadata = await run_in_threadpool(self._load_chunked_upload, upload_id, user)
+        upload_id = metadata["upload_id"]
+        async with self._chunked_upload_lock(upload_id) as buffer:
+            # Re-read under the lock; an earlier request may just have written
+            received = os.fstat(buffer.fileno()).st_size
+            if offset != received:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Upload offset mismatch: expected {received}, got {offset}",
+                )
+
+            hashed, digest, _ = _chunked_upload_digests.get(
+                upload_id, (None, None, None)
+            )
+            if hashed != received:
+                # State lost (restart or another worker); rehash on completion
+                _chunked_upload_digests.pop(upload_id, None)
+                digest = None
+
+            try:
+                written = await self._write_chunks(
+                    chunks, buffer, metadata["total_size"] - received, digest
+                )
+            except BaseException:
+                # Part of the chunk may be on disk; rehash on completion
+                _chunked_upload_digests.pop(upload_id, None)
+                raise
+            if digest is not None:
+                _chunked_upload_digests[upload_id] = (
+                    received + written,
+                    digest,
+                    time.time(),
+                )
+
+        metadata["received"] = received + written
+        return self._chunked_upload_status(metadata)
+
+    async def complete_chunked_upload(self, upload_id: str, user: User) -> UploadedFile:
+        """Assemble a fully received chunked upload into an uploaded file."""
+        metadata = await run_in_threadpool(self._load_chunked_upload, upload_id, user)
+        upload_id = metadata["upload_id"]
+        data_path, meta_path = self._chunked_upload_paths(upload_id)
+        async with self._chunked_upload_lock(upload_id) as buffer:
+            received = os.fstat(buffer.fileno()).st_size
+            if received != metadata["total_size"]:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=(
+                        f"Upload incomplete: received {received} "
+                        f"of {metadata['total_size']} bytes"
+                    ),
+                )
+
+            hashed, digest, _ = _chunked_upload_digests.pop(
+                upload_id, (None, None, None)
+            )
+            if hashed == metadata["total_size"]:
+                file_hash = digest.hexdigest()
+            else:
+                file_hash = await run_in_threadpool(self._hash_file, data_path)
+
+            file_path = self.upload_folder / self.generate_unique_filename(
+                metadata["filename"]
+            )
+            await run_in_threadpool(os.replace, data_path, file_path)
+            await run_in_threadpool(meta_path.unlink)
+
+        try:
+            return await run_in_threadpool(
+                self._create_upload_record,
+                file_path,
+                metadata["filename"],
+                metadata["content_type"],
+                metadata["total_size"],
+                file_hash,
+                user,
+            )
         except Exception as e:
-            # Clean up file if database operation fails
             if file_path.exists():
                 file_path.unlink()
             raise HTTPException(
@@ -115,6 +512,75 @@ class FileService:
                 detail=f"Failed to save file: {str(e)}",
             )
 
+    def _hash_file(self, file_path: Path) -> str:
+        """Compute the SHA-256 of a file on disk in chunks."""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as buffer:
+            for chunk in iter(lambda: buffer.read(self.chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _reuse_processing_results(
+        self, file_record: UploadedFile, source: UploadedFile
+    ) -> None:
+        """Copy the processing outcome of an identical file onto a new record."""
+        now = datetime.utcnow()
+        file_record.status = FileStatus.COMPLETED
+        file_record.is_valid = source.is_valid
+        file_record.validation_errors = source.validation_errors
+        file_record.parsed_data = source.parsed_data
+        file_record.template_id = source.template_id
+        file_record.processing_started_at = now
+        file_record.processing_completed_at = now
+
+    def finish_processing(self, file_record: UploadedFile) -> None:
+        """
+        Hooks run once a file's processing outcome is stored.
+
+        Completed files get their snapshot rows materialized, and the owner's
+        cached dashboard responses are dropped either way.
+        """
+        if file_record.status == FileStatus.COMPLETED and file_record.parsed_data:
+            self.materialize_snapshot(file_record)
+        invalidate_user_responses(file_record.user_id)
+
+    def materialize_snapshot(self, file_record: UploadedFile) -> None:
+        """
+        Store the file's statement, metric and time series rows.
+
+        A failure is logged and leaves the file processed. Any earlier snapshot
+        is deleted, since it no longer matches the file; without one, views
+        are derived from ``parsed_data`` as before.
+        """
+        try:
+            counts = asyncio.run(materialize_file_snapshot(self.db, file_record))
+        except Exception as e:
+            self.db.rollback()
+            try:
+                clear_file_snapshot(self.db, file_record)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                logger.exception(
+                    f"Could not delete the stale snapshot of file {file_record.id}"
+                )
+            self.log_processing_step(
+                file_record.id,
+                "snapshot",
+                f"Could not materialize report data: {str(e)}",
+                "warning",
+            )
+            return
+
+        self.log_processing_step(
+            file_record.id,
+            "snapshot",
+            f"Materialized {counts['metrics']} metrics and "
+            f"{counts['time_series']} time series points",
+            "info",
+            json.dumps(counts),
+        )
+
     def get_file_by_id(self, file_id: int, user: User) -> Optional[UploadedFile]:
         """Get file by ID, enforcing ownership unless admin."""
         file_record = (
@@ -260,7 +726,7 @@ class FileService:
 
             return True
 
-        except Exception as e:
+        except Exception:
             self.db.rollback()
             # During tests it's acceptable to ignore cleanup issues
             return True
@@ -286,3 +752,36 @@ class FileService:
 
         cleanup_service = FileCleanupService(self.db, self)
         return asyncio.run(cleanup_service.cleanup_expired_files(dry_run=False))
+
+    def cleanup_stale_chunked_uploads(self) -> int:
+        """
+        Delete chunked uploads that received no chunk for CHUNKED_UPLOAD_TTL_HOURS.
+
+        Returns the number of uploads removed.
+        """
+        max_age = settings.CHUNKED_UPLOAD_TTL_HOURS * 3600
+        _prune_chunked_upload_digests(max_age)
+        if not self.partial_folder.exists():
+            return 0
+
+        cutoff = time.time() - max_age
+        removed = set()
+        for path in self.partial_folder.iterdir():
+            if path.suffix not in (".part", ".json"):
+                continue
+            data_path = path.with_suffix(".part")
+            meta_path = path.with_suffix(".json")
+            try:
+                # The data file's mtime tracks the last chunk received
+                if any(
+                    p.exists() and p.stat().st_mtime >= cutoff
+                    for p in (data_path, meta_path)
+                ):
+                    continue
+                data_path.unlink(missing_ok=True)
+                meta_path.unlink(missing_ok=True)
+            except OSError:
+                continue
+            _chunked_upload_digests.pop(path.stem, None)
+            removed.add(path.stem)
+        return len(removed)
@@ -0,0 +1,73 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.file import UploadedFile, FileStatus
+from app.services.financial_snapshot import load_snapshot
+
+
+class FinancialDataContext:
+    """
+    Request-scoped cache of a user's decoded statement data, its
+    materialized snapshot, and the views computed from it.
+
+    The source file is queried and its ``parsed_data`` decoded once per
+    (user, file); each view is computed once per key, and concurrent callers
+    asking for the same view await a single computation. Views share the
+    decoded data, so they must not mutate it.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._parsed: Dict[Tuple[int, Optional[int]], Optional[Dict[str, Any]]] = {}
+        self._snapshots: Dict[Tuple[int, Optional[int]], Optional[Dict]] = {}
+        self._views: Dict[Hashable, asyncio.Future] = {}
+        self.loads = 0
+
+    async def parsed_data(
+        self, user_id: int, file_id: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Decoded parsed data of the user's latest (or given) processed file."""
+        key = (user_id, file_id)
+        if key not in self._parsed:
+            self._parsed[key] = self._load(user_id, file_id)
+        return self._parsed[key]
+
+    async def snapshot(
+        self, user_id: int, file_id: Optional[int] = None
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Materialized statement views of the latest (or given) file, if any."""
+        key = (user_id, file_id)
+        if key not in self._snapshots:
+            self._snapshots[key] = load_snapshot(self.db, user_id, file_id)
+        return self._snapshots[key]
+
+    def _load(self, user_id: int, file_id: Optional[int]) -> Optional[Dict[str, Any]]:
+        self.loads += 1
+        query = self.db.query(UploadedFile.parsed_data).filter(
+            UploadedFile.uploaded_by_id == user_id,
+            UploadedFile.status == FileStatus.COMPLETED,
+            UploadedFile.parsed_data.isnot(None),
+        )
+
+        if file_id:
+            query = query.filter(UploadedFile.id == file_id)
+
+        row = query.order_by(UploadedFile.created_at.desc()).first()
+
+        if row and row.parsed_data:
+            try:
+                return json.loads(row.parsed_data)
+            except json.JSONDecodeError:
+                return None
+
+        return None
+
+    async def view(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the view stored under ``key``, computing it on first use."""
+        future = self._views.get(key)
+        if future is None:
+            future = self._views[key] = asyncio.ensure_future(compute())
+        return await future
@@ -12,6 +12,7 @@ from openpyxl.utils import get_column_letter
 
 from app.schemas.file import ExcelSheetInfo, ParsedFileData
 from app.services.excel_parser import ExcelParser
+from app.services.formula_references import extract_reference_strings
 
 
 class MetricType(str, Enum):
@@ -940,8 +941,8 @@ class FinancialExtractor:
         return 0.8
 
     def _parse_formula_precedents(self, formula: str, sheet_name: str) -> List[str]:
-        """Parse formula to find precedent cells."""
-        return []
+        """Parse formula to find precedent cells and ranges."""
+        return extract_reference_strings(formula, sheet_name)
 
     def _classify_calculation_type(self, formula: str) -> str:
         """Classify the type of calculation."""
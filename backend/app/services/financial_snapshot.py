@@ -0,0 +1,339 @@
+import re
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.file import FileStatus, UploadedFile
+from app.models.financial import (
+    FinancialStatement,
+    Frequency,
+    Metric,
+    MetricType,
+    PeriodType,
+    StatementType,
+    TimeSeries,
+)
+from app.models.parameter import Scenario
+
+# Statement views stored per processed file, by view name
+SNAPSHOT_STATEMENTS = {
+    "pl": StatementType.PROFIT_LOSS,
+    "cash_flow": StatementType.CASH_FLOW,
+    "balance_sheet": StatementType.BALANCE_SHEET,
+}
+
+# Statement calculations only use the period as a label, so one snapshot
+# serves every period; views are relabelled when read
+SNAPSHOT_PERIOD = "ytd"
+SNAPSHOT_CURRENCY = "USD"
+# Marks snapshot rows (TimeSeries.data_source, and "source" in the JSON
+# metadata of statements and metrics) so user rows in the scenario are kept
+SNAPSHOT_SOURCE = "file_snapshot"
+
+METRIC_TYPES = {
+    "currency": MetricType.CURRENCY,
+    "percentage": MetricType.PERCENTAGE,
+    "number": MetricType.RATIO,
+}
+
+MONTHS = [
+    "Jan",
+    "Feb",
+    "Mar",
+    "Apr",
+    "May",
+    "Jun",
+    "Jul",
+    "Aug",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dec",
+]
+
+
+def _baseline_scenario(db: Session, file_record: UploadedFile) -> Optional[Scenario]:
+    return (
+        db.query(Scenario)
+        .filter(
+            Scenario.base_file_id == file_record.id,
+            Scenario.created_by_id == file_record.user_id,
+            Scenario.is_baseline == True,
+            Scenario.parent_scenario_id == None,
+        )
+        .order_by(Scenario.id)
+        .first()
+    )
+
+
+def _point_year(point: Dict[str, Any]) -> Optional[int]:
+    """Year named in a chart point's label, e.g. "January 2024"."""
+    match = re.search(r"\b(19|20)\d{2}\b", str(point.get("label", "")))
+    return int(match.group()) if match else None
+
+
+def _point_date(point: Dict[str, Any]) -> Optional[Tuple[date, Frequency]]:
+    """Date and frequency of a chart point labelled by month or quarter."""
+    year = _point_year(point)
+    if year is None:
+        return None
+    label = str(point.get("period"))
+    if label in MONTHS:
+        return date(year, MONTHS.index(label) + 1, 1), Frequency.MONTHLY
+    quarter = re.fullmatch(r"Q([1-4])", label)
+    if quarter:
+        return date(year, 3 * int(quarter.group(1)) - 2, 1), Frequency.QUARTERLY
+    return None
+
+
+def _snapshot_period(
+    views: Dict[str, Dict[str, Any]], file_record: UploadedFile
+) -> Dict[str, date]:
+    """
+    Period the file's statements and metrics cover.
+
+    The latest year named in the chart labels, or the year to date of the
+    upload when the data names no year.
+    """
+    years = [
+        _point_year(point)
+        for name in SNAPSHOT_STATEMENTS
+        for points in (views[name].get("charts") or {}).values()
+        for point in points
+    ]
+    years = [year for year in years if year]
+    if years:
+        year = max(years)
+        return {"period_start": date(year, 1, 1), "period_end": date(year, 12, 31)}
+    uploaded = (file_record.upload_date or datetime.utcnow()).date()
+    return {"period_start": date(uploaded.year, 1, 1), "period_end": uploaded}
+
+
+def _metric_rows(
+    views: Dict[str, Dict[str, Any]], common: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    rows = []
+    for name in SNAPSHOT_STATEMENTS:
+        for metric in views[name].get("metrics", []):
+            details = {
+                key: value
+                for key, value in metric.items()
+                if key not in ("name", "category", "value", "period")
+            }
+            rows.append(
+                {
+                    **common,
+                    "metric_name": metric["name"],
+                    "metric_category": metric.get("category") or name,
+                    "metric_type": METRIC_TYPES.get(
+                        metric.get("format_type"), MetricType.RATIO
+                    ).value,
+                    "value": float(metric["value"]),
+                    "currency": metric["unit"]
+                    if len(str(metric.get("unit", ""))) == 3
+                    else None,
+                    "calculation_metadata": {
+                        "statement": name,
+                        **details,
+                        "source": SNAPSHOT_SOURCE,
+                    },
+                }
+            )
+
+    for ratio_name, ratio in (views["balance_sheet"].get("ratios") or {}).items():
+        rows.append(
+            {
+                **common,
+                "metric_name": ratio_name,
+                "metric_category": ratio.get("category") or "ratio",
+                "metric_type": MetricType.RATIO.value,
+                "value": float(ratio["value"]),
+                "benchmark_value": ratio.get("benchmark"),
+                "calculation_metadata": {
+                    "statement": "ratios",
+                    **ratio,
+                    "source": SNAPSHOT_SOURCE,
+                },
+            }
+        )
+    return rows
+
+
+def _time_series_rows(
+    views: Dict[str, Dict[str, Any]], common: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Rows for chart series over labelled months or quarters.
+
+    Breakdowns, and series whose labels do not name the year, are skipped.
+    """
+    rows = []
+    for name in SNAPSHOT_STATEMENTS:
+        for chart_name, points in (views[name].get("charts") or {}).items():
+            dated = [_point_date(point) for point in points]
+            if not points or not all(dated):
+                continue
+            for point, (period_date, frequency) in zip(points, dated):
+                rows.append(
+                    {
+                        **common,
+                        "data_type": chart_name,
+                        "data_subtype": name,
+                        "period_date": period_date,
+                        "value": float(point["value"]),
+                        "currency": SNAPSHOT_CURRENCY,
+                        "frequency": frequency.value,
+                        "data_source": SNAPSHOT_SOURCE,
+                        "is_actual": True,
+                        "data_metadata": point,
+                    }
+                )
+    return rows
+
+
+def _snapshot_filters(model) -> List[Any]:
+    if model is TimeSeries:
+        return [TimeSeries.data_source == SNAPSHOT_SOURCE]
+    if model is Metric:
+        return [Metric.calculation_metadata["source"].as_string() == SNAPSHOT_SOURCE]
+    return [
+        FinancialStatement.is_baseline == True,
+        FinancialStatement.raw_data["source"].as_string() == SNAPSHOT_SOURCE,
+    ]
+
+
+def clear_file_snapshot(db: Session, file_record: UploadedFile) -> None:
+    """
+    Delete the file's snapshot rows; rows users added to its baseline
+    scenario are kept. The caller commits.
+    """
+    scenario = _baseline_scenario(db, file_record)
+    if scenario is None:
+        return
+    for model in (FinancialStatement, Metric, TimeSeries):
+        db.query(model).filter(
+            model.scenario_id == scenario.id, *_snapshot_filters(model)
+        ).delete(synchronize_session=False)
+
+
+async def materialize_file_snapshot(
+    db: Session, file_record: UploadedFile
+) -> Dict[str, int]:
+    """
+    Store a processed file's statements, metrics and time series as rows.
+
+    The rows belong to the file's baseline scenario, created on first use,
+    and replace any earlier snapshot of the file; rows users added to the
+    scenario are left alone. Dashboards and reports
+    read statement views from these rows instead of re-deriving them from
+    ``parsed_data``.
+
+    Returns:
+        Number of rows written per table
+    """
+    # Imported here, dashboard metrics reads snapshots through this module
+    from app.services.dashboard_metrics import DashboardMetricsService
+
+    scenario = _baseline_scenario(db, file_record)
+    if scenario is None:
+        scenario = Scenario(
+            name=f"{file_record.original_filename} (actuals)",
+            description="Figures materialized from the uploaded file",
+            is_baseline=True,
+            status="active",
+            base_file_id=file_record.id,
+            created_by_id=file_record.user_id,
+        )
+        db.add(scenario)
+        db.flush()
+
+    clear_file_snapshot(db, file_record)
+
+    # With the old snapshot gone the views are derived from parsed_data
+    views = await DashboardMetricsService(db).get_statement_views(
+        file_record.user_id, SNAPSHOT_PERIOD, file_record.id
+    )
+
+    period = _snapshot_period(views, file_record)
+    common = {"scenario_id": scenario.id, "created_by_id": file_record.user_id}
+
+    statements = [
+        {
+            **common,
+            **period,
+            "statement_type": statement_type.value,
+            "period_type": PeriodType.CUSTOM.value,
+            "currency": SNAPSHOT_CURRENCY,
+            "line_items": views[name].get("metrics", []),
+            "calculated_data": {
+                key: value for key, value in views[name].items() if key != "metrics"
+            },
+            "raw_data": {"source": SNAPSHOT_SOURCE},
+            "is_baseline": True,
+        }
+        for name, statement_type in SNAPSHOT_STATEMENTS.items()
+    ]
+    metrics = [{**row, **period} for row in _metric_rows(views, common)]
+    time_series = _time_series_rows(views, common)
+
+    for model, rows in (
+        (FinancialStatement, statements),
+        (Metric, metrics),
+        (TimeSeries, time_series),
+    ):
+        if rows:
+            db.execute(insert(model), rows)
+    db.commit()
+
+    return {
+        "financial_statements": len(statements),
+        "metrics": len(metrics),
+        "time_series": len(time_series),
+    }
+
+
+def load_snapshot(
+    db: Session, user_id: int, file_id: Optional[int] = None
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Materialized statement views of the user's latest (or given) file.
+
+    Returns None when the file has no complete snapshot, e.g. it was
+    processed before snapshots existed.
+    """
+    file_query = db.query(UploadedFile.id).filter(
+        UploadedFile.user_id == user_id,
+        UploadedFile.status == FileStatus.COMPLETED,
+        UploadedFile.parsed_data.isnot(None),
+    )
+    if file_id:
+        file_query = file_query.filter(UploadedFile.id == file_id)
+    source = file_query.order_by(UploadedFile.created_at.desc()).first()
+    if source is None:
+        return None
+
+    rows = (
+        db.query(
+            FinancialStatement.statement_type,
+            FinancialStatement.line_items,
+            FinancialStatement.calculated_data,
+        )
+        .join(Scenario, Scenario.id == FinancialStatement.scenario_id)
+        .filter(
+            Scenario.base_file_id == source.id,
+            Scenario.created_by_id == user_id,
+            Scenario.is_baseline == True,
+            *_snapshot_filters(FinancialStatement),
+        )
+        .all()
+    )
+    statements = {row.statement_type: row for row in rows}
+    views = {}
+    for name, statement_type in SNAPSHOT_STATEMENTS.items():
+        row = statements.get(statement_type.value)
+        if row is None:
+            return None
+        views[name] = {"metrics": row.line_items, **(row.calculated_data or {})}
+    return views
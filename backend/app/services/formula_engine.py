@@ -2,17 +2,23 @@ import re
 import ast
 import math
 import statistics
-from typing import Dict, List, Any, Optional, Union, Callable, Set, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Union, Callable, Set, Tuple
 from dataclasses import dataclass
 from datetime import datetime, date
 import pandas as pd
 import numpy as np
 import openpyxl
-from openpyxl.formula.tokenizer import Tokenizer, Token
-from openpyxl.utils import column_index_from_string, get_column_letter
+from openpyxl.utils import column_index_from_string
+from bisect import bisect_left, bisect_right
 from collections import defaultdict, deque
 
 from app.models.parameter import FormulaNode
+from app.services.formula_references import (
+    CellRange,
+    extract_references,
+    parse_reference,
+    substitute_references,
+)
 
 
 def safe_eval(expression: str, context: Dict[str, Any] = None) -> Any:
@@ -34,6 +40,319 @@ class CalculationResult:
     dependencies_used: List[str]
 
 
+class _IntervalTree:
+    """
+    Static centered interval tree over (min_row, max_row, dependent) entries.
+
+    A lookup visits one node per level and only the intervals that contain
+    the row, instead of every interval starting above it.
+    """
+
+    __slots__ = ("center", "starts", "by_start", "ends", "by_end", "left", "right")
+
+    def __init__(self, intervals: List[Tuple[int, int, str]]):
+        bounds = sorted(bound for interval in intervals for bound in interval[:2])
+        self.center = bounds[len(bounds) // 2]
+        here, left, right = [], [], []
+        for interval in intervals:
+            if interval[1] < self.center:
+                left.append(interval)
+            elif interval[0] > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+
+        self.by_start = sorted(here, key=lambda interval: interval[0])
+        self.starts = [interval[0] for interval in self.by_start]
+        # Ends are kept ascending for bisect; matches are the tail
+        self.by_end = sorted(here, key=lambda interval: interval[1])
+        self.ends = [interval[1] for interval in self.by_end]
+        self.left = _IntervalTree(left) if left else None
+        self.right = _IntervalTree(right) if right else None
+
+    def stab(self, row: int) -> Iterator[str]:
+        """Yield the dependents of every interval containing ``row``."""
+        node = self
+        while node is not None:
+            if row < node.center:
+                for interval in node.by_start[: bisect_right(node.starts, row)]:
+                    yield interval[2]
+                node = node.left
+            elif row > node.center:
+                for interval in node.by_end[bisect_left(node.ends, row) :]:
+                    yield interval[2]
+                node = node.right
+            else:
+                for interval in node.by_start:
+                    yield interval[2]
+                return
+
+
+class RangeDependencyIndex:
+    """
+    Interval index of range -> dependent cell edges.
+
+    Each range is registered once per column it spans, as a row interval in
+    an interval tree per sheet and column, so looking up the formulas that
+    read a changed cell never expands ranges into cells or scans them all.
+    """
+
+    def __init__(self):
+        self._intervals: Dict[
+            Tuple[Optional[str], int], List[Tuple[int, int, str]]
+        ] = defaultdict(list)
+        self._trees: Dict[Tuple[Optional[str], int], _IntervalTree] = {}
+        self._sheets: Set[Optional[str]] = set()
+        self.edge_count = 0
+
+    def add(self, cell_range: CellRange, sheet: Optional[str], dependent: str):
+        """Register that ``dependent`` reads every cell of ``cell_range``."""
+        self._sheets.add(sheet)
+        for col in range(cell_range.min_col, cell_range.max_col + 1):
+            self._intervals[(sheet, col)].append(
+                (cell_range.min_row, cell_range.max_row, dependent)
+            )
+            self._trees.pop((sheet, col), None)
+        self.edge_count += 1
+
+    def dependents_of(self, sheet: Optional[str], col: int, row: int) -> Set[str]:
+        """Return the cells whose ranges contain the given cell."""
+        # Ranges without a sheet match any sheet, and so does a bare cell
+        sheets = self._sheets if sheet is None else (sheet, None)
+        dependents = set()
+        for key in ((range_sheet, col) for range_sheet in sheets):
+            tree = self._trees.get(key)
+            if tree is None:
+                intervals = self._intervals.get(key)
+                if not intervals:
+                    continue
+                tree = self._trees[key] = _IntervalTree(intervals)
+            dependents.update(tree.stab(row))
+        return dependents
+
+
+# Numeric grids larger than this fall back to reading cells one by one
+GRID_MAX_CELLS = 4_000_000
+
+_CELL_NAME = re.compile(r"([A-Z]{1,3})([1-9][0-9]{0,6})")
+
+
+def _cell_location(name: Any) -> Optional[Tuple[Optional[str], int, int]]:
+    """(sheet, column, row) of a cell key such as ``Data!B2``, else None."""
+    if not isinstance(name, str):
+        return None
+    sheet, _, coordinate = name.rpartition("!")
+    match = _CELL_NAME.fullmatch(coordinate)
+    if not match:
+        return None
+    return sheet or None, column_index_from_string(match.group(1)), int(match.group(2))
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float))
+
+
+class CellValues(dict):
+    """
+    Cell values by name that also keep a dense numeric grid per sheet.
+
+    Grids are built the first time a range is aggregated and patched on
+    every later write, so range reads are NumPy slices rather than one dict
+    lookup per cell. Cells without a numeric value are NaN, and a second
+    grid records which cells exist at all.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # sheet -> (values, present); None when the sheet is too large
+        self._grids: Optional[
+            Dict[Optional[str], Optional[Tuple[np.ndarray, np.ndarray]]]
+        ] = None
+
+    def __setitem__(self, name, value):
+        super().__setitem__(name, value)
+        if self._grids is not None:
+            self._patch(name, value, True)
+
+    def __delitem__(self, name):
+        super().__delitem__(name)
+        if self._grids is not None:
+            self._patch(name, None, False)
+
+    def pop(self, name, *default):
+        present = name in self
+        value = super().pop(name, *default)
+        if present and self._grids is not None:
+            self._patch(name, None, False)
+        return value
+
+    def popitem(self):
+        name, value = super().popitem()
+        if self._grids is not None:
+            self._patch(name, None, False)
+        return name, value
+
+    def setdefault(self, name, default=None):
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def update(self, *args, **kwargs):
+        for name, value in dict(*args, **kwargs).items():
+            self[name] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        super().clear()
+        self._grids = None
+
+    def _build_grids(self):
+        cells = defaultdict(list)
+        for name, value in self.items():
+            location = _cell_location(name)
+            if location is not None:
+                cells[location[0]].append((location[1], location[2], value))
+
+        self._grids = {}
+        for sheet, entries in cells.items():
+            shape = (
+                max(row for _, row, _ in entries),
+                max(col for col, _, _ in entries),
+            )
+            if shape[0] * shape[1] > GRID_MAX_CELLS:
+                self._grids[sheet] = None
+                continue
+            values = np.full(shape, np.nan)
+            present = np.zeros(shape, dtype=bool)
+            for col, row, value in entries:
+                present[row - 1, col - 1] = True
+                if _is_number(value):
+                    values[row - 1, col - 1] = value
+            self._grids[sheet] = (values, present)
+
+    def _patch(self, name, value, present: bool):
+        location = _cell_location(name)
+        if location is None:
+            return
+        sheet, col, row = location
+        if sheet not in self._grids:
+            self._grids[sheet] = (np.full((0, 0), np.nan), np.zeros((0, 0), bool))
+        grid = self._grids[sheet]
+        if grid is None:
+            return
+
+        values, exists = grid
+        if row > values.shape[0] or col > values.shape[1]:
+            if not present:
+                return
+            shape = (max(row, values.shape[0]), max(col, values.shape[1]))
+            if shape[0] * shape[1] > GRID_MAX_CELLS:
+                self._grids[sheet] = None
+                return
+            grown = np.full(shape, np.nan)
+            grown[: values.shape[0], : values.shape[1]] = values
+            grown_exists = np.zeros(shape, dtype=bool)
+            grown_exists[: exists.shape[0], : exists.shape[1]] = exists
+            values, exists = self._grids[sheet] = (grown, grown_exists)
+
+        exists[row - 1, col - 1] = present
+        values[row - 1, col - 1] = value if present and _is_number(value) else np.nan
+
+    def _block(self, sheet: Optional[str], cell_range: CellRange, shape):
+        """Values and presence of a range on one sheet, clipped to ``shape``."""
+        values = np.full(shape, np.nan)
+        exists = np.zeros(shape, dtype=bool)
+        grid = self._grids.get(sheet)
+        if grid is not None:
+            rows = slice(cell_range.min_row - 1, cell_range.min_row - 1 + shape[0])
+            cols = slice(cell_range.min_col - 1, cell_range.min_col - 1 + shape[1])
+            block = grid[0][rows, cols]
+            values[: block.shape[0], : block.shape[1]] = block
+            exists[: block.shape[0], : block.shape[1]] = grid[1][rows, cols]
+        return values, exists
+
+    def range_numbers(
+        self, cell_range: CellRange, default_sheet: Optional[str]
+    ) -> Optional[np.ndarray]:
+        """
+        Numeric cells of a range in row-major order.
+
+        Unqualified ranges read bare cell names first and fall back to the
+        formula's sheet. Returns None when a sheet is too large for a grid.
+        """
+        if self._grids is None:
+            self._build_grids()
+
+        sheets = [cell_range.sheet] if cell_range.sheet else [None, default_sheet]
+        grids = [self._grids.get(sheet, ()) for sheet in sheets]
+        if any(grid is None for grid in grids):
+            return None
+
+        # Cells beyond every grid are blank and can be left out
+        rows = max([grid[0].shape[0] for grid in grids if grid] or [0])
+        cols = max([grid[0].shape[1] for grid in grids if grid] or [0])
+        shape = (
+            max(0, min(cell_range.max_row, rows) - cell_range.min_row + 1),
+            max(0, min(cell_range.max_col, cols) - cell_range.min_col + 1),
+        )
+        values, exists = self._block(sheets[0], cell_range, shape)
+        for sheet in sheets[1:]:
+            fallback, _ = self._block(sheet, cell_range, shape)
+            values = np.where(exists, values, fallback)
+        return values[~np.isnan(values)]
+
+
+class RangeView:
+    """
+    Lazy rectangular view over the engine's cell values.
+
+    Formulas reference ranges through a view instead of an inlined list of
+    values, so referencing ``A1:Z5000`` is constant time and aggregations
+    slice the numeric cells out of the engine's per-sheet grids.
+    """
+
+    __slots__ = ("_engine", "cell_range", "sheet")
+
+    def __init__(self, engine: "FormulaEngine", cell_range: CellRange, sheet: str):
+        self._engine = engine
+        self.cell_range = cell_range
+        self.sheet = sheet
+
+    def __len__(self) -> int:
+        return self.cell_range.size
+
+    def __iter__(self):
+        """Iterate cell values in row-major order, blanks reading as 0."""
+        for value in self._raw_values():
+            yield 0 if value is None else value
+
+    def __repr__(self) -> str:
+        return f"RangeView({self.cell_range.to_string(self.sheet)})"
+
+    def _raw_values(self):
+        values = self._engine.cell_values
+        if self.cell_range.sheet:
+            return (values.get(name) for name in self.cell_range.iter_cells())
+
+        return (
+            values.get(name, values.get(full_name))
+            for name, full_name in zip(
+                self.cell_range.iter_cells(), self.cell_range.iter_cells(self.sheet)
+            )
+        )
+
+    def numbers(self) -> np.ndarray:
+        """Return the numeric cells of the range, ignoring blanks and text."""
+        numbers = self._engine.cell_values.range_numbers(self.cell_range, self.sheet)
+        if numbers is not None:
+            return numbers
+        numbers = [value for value in self._raw_values() if _is_number(value)]
+        return np.fromiter(numbers, dtype=float, count=len(numbers))
+
+
 @dataclass
 class DependencyGraph:
     """Represents formula dependencies."""
@@ -42,6 +361,7 @@ class DependencyGraph:
     reverse_nodes: Dict[str, Set[str]]  # cell -> dependents
     calculation_order: List[str]
     circular_references: List[List[str]]
+    range_index: Optional[RangeDependencyIndex] = None  # range -> dependents
 
 
 class ExcelFunction:
@@ -52,7 +372,9 @@ class ExcelFunction:
         """Excel SUM function."""
         total = 0
         for arg in args:
-            if isinstance(arg, (list, tuple)):
+            if isinstance(arg, RangeView):
+                total += float(arg.numbers().sum())
+            elif isinstance(arg, (list, tuple)):
                 total += ExcelFunction.SUM(*arg)
             elif isinstance(arg, (int, float)):
                 total += arg
@@ -63,7 +385,7 @@ class ExcelFunction:
         """Excel AVERAGE function."""
         values = []
         for arg in args:
-            if isinstance(arg, (list, tuple)):
+            if isinstance(arg, (list, tuple, RangeView)):
                 values.extend(ExcelFunction._flatten_to_numbers(arg))
             elif isinstance(arg, (int, float)):
                 values.append(arg)
@@ -75,7 +397,7 @@ class ExcelFunction:
         """Excel MAX function."""
         values = []
         for arg in args:
-            if isinstance(arg, (list, tuple)):
+            if isinstance(arg, (list, tuple, RangeView)):
                 values.extend(ExcelFunction._flatten_to_numbers(arg))
             elif isinstance(arg, (int, float)):
                 values.append(arg)
@@ -87,7 +409,7 @@ class ExcelFunction:
         """Excel MIN function."""
         values = []
         for arg in args:
-            if isinstance(arg, (list, tuple)):
+            if isinstance(arg, (list, tuple, RangeView)):
                 values.extend(ExcelFunction._flatten_to_numbers(arg))
             elif isinstance(arg, (int, float)):
                 values.append(arg)
@@ -99,7 +421,9 @@ class ExcelFunction:
         """Excel COUNT function."""
         count = 0
         for arg in args:
-            if isinstance(arg, (list, tuple)):
+            if isinstance(arg, RangeView):
+                count += len(arg.numbers())
+            elif isinstance(arg, (list, tuple)):
                 count += ExcelFunction.COUNT(*arg)
             elif isinstance(arg, (int, float)):
                 count += 1
@@ -154,7 +478,7 @@ class ExcelFunction:
         """Excel NPV function."""
         npv = 0
         for i, cf in enumerate(cash_flows):
-            if isinstance(cf, (list, tuple)):
+            if isinstance(cf, (list, tuple, RangeView)):
                 for j, flow in enumerate(cf):
                     npv += float(flow) / ((1 + float(rate)) ** (i + j))
             else:
@@ -194,9 +518,14 @@ class ExcelFunction:
     @staticmethod
     def _flatten_to_numbers(data) -> List[float]:
         """Helper to flatten nested data to numbers."""
+        if isinstance(data, RangeView):
+            return data.numbers().tolist()
+
         result = []
         for item in data:
-            if isinstance(item, (list, tuple)):
+            if isinstance(item, RangeView):
+                result.extend(item.numbers().tolist())
+            elif isinstance(item, (list, tuple)):
                 result.extend(ExcelFunction._flatten_to_numbers(item))
             elif isinstance(item, (int, float)):
                 result.append(float(item))
@@ -207,7 +536,7 @@ class FormulaEngine:
     """Excel formula parsing and calculation engine."""
 
     def __init__(self):
-        self.cell_values: Dict[str, Any] = {}
+        self.cell_values = CellValues()
         self.formulas: Dict[str, str] = {}
         self.dependency_graph: Optional[DependencyGraph] = None
         self.excel_functions = ExcelFunction()
@@ -232,6 +561,16 @@ class FormulaEngine:
             "VLOOKUP": ExcelFunction.VLOOKUP,
         }
 
+    @property
+    def cell_values(self) -> CellValues:
+        return self._cell_values
+
+    @cell_values.setter
+    def cell_values(self, values: Dict[str, Any]):
+        self._cell_values = (
+            values if isinstance(values, CellValues) else CellValues(values)
+        )
+
     def load_workbook_data(self, workbook_path: str) -> None:
         """
         Load workbook data for formula calculation.
@@ -263,17 +602,30 @@ class FormulaEngine:
     def build_dependency_graph(self) -> DependencyGraph:
         """
         Build dependency graph from formulas.
+
+        Single-cell references become cell -> cell edges. Ranges are stored
+        once as range -> cell edges in a RangeDependencyIndex; only the formula
+        cells inside a range are added as nodes so calculation order is kept.
         """
         nodes = defaultdict(set)
         reverse_nodes = defaultdict(set)
+        range_index = RangeDependencyIndex()
 
         for cell_ref, formula in self.formulas.items():
-            dependencies = self._extract_cell_references(formula, cell_ref)
+            sheet_name = self._sheet_of(cell_ref)
+            dependencies, ranges = self._formula_dependencies(formula, cell_ref)
 
             for dep in dependencies:
                 nodes[cell_ref].add(dep)
                 reverse_nodes[dep].add(cell_ref)
 
+            if ranges:
+                # Keep range readers in the calculation order even when no
+                # formula cell falls inside their ranges
+                nodes.setdefault(cell_ref, set())
+            for cell_range in ranges:
+                range_index.add(cell_range, cell_range.sheet or sheet_name, cell_ref)
+
         # Calculate calculation order and detect circular references
         calculation_order, circular_refs = self._topological_sort(nodes)
 
@@ -282,6 +634,7 @@ class FormulaEngine:
             reverse_nodes=dict(reverse_nodes),
             calculation_order=calculation_order,
             circular_references=circular_refs,
+            range_index=range_index,
         )
 
         return self.dependency_graph
@@ -326,7 +679,7 @@ class FormulaEngine:
                 )
 
             formula = self.formulas[cell_ref]
-            dependencies = self._extract_cell_references(formula, cell_ref)
+            dependencies, _ = self._formula_dependencies(formula, cell_ref)
 
             # Calculate dependencies first
             for dep in dependencies:
@@ -398,55 +751,112 @@ class FormulaEngine:
         """
         references = set()
 
-        try:
-            # Parse formula with openpyxl tokenizer
-            tokens = Tokenizer(formula).items
-            sheet_name = current_cell.split("!")[0] if "!" in current_cell else "Sheet1"
-
-            for token in tokens:
-                if token.type == Token.OPERAND and token.subtype == Token.RANGE:
-                    ref = token.value
-
-                    # Handle different reference formats
-                    if ":" in ref:
-                        # Range reference (e.g., A1:B5)
-                        start_ref, end_ref = ref.split(":")
-                        cell_refs = self._expand_range(start_ref, end_ref, sheet_name)
-                        references.update(cell_refs)
-                    else:
-                        # Single cell reference
-                        if "!" not in ref:
-                            ref = ref
-                        references.add(ref)
-
-        except Exception:
-            # Fallback to regex parsing
-            cell_pattern = r"[A-Z]+\d+"
-            matches = re.findall(cell_pattern, formula.upper())
-            sheet_name = current_cell.split("!")[0] if "!" in current_cell else "Sheet1"
-
-            for match in matches:
-                references.add(match)
+        for cell_range in extract_references(formula):
+            if cell_range.is_cell:
+                references.add(cell_range.to_string())
+            else:
+                references.update(cell_range.iter_cells())
 
         return references
 
+    def _formula_dependencies(
+        self, formula: str, current_cell: str
+    ) -> Tuple[Set[str], List[CellRange]]:
+        """
+        Split a formula's references into cell dependencies and ranges.
+
+        Ranges are not expanded; only formula cells that fall inside them are
+        reported as dependencies, since those are the only cells whose
+        calculation order matters.
+        """
+        sheet_name = self._sheet_of(current_cell)
+        dependencies = set()
+        ranges = []
+
+        for cell_range in extract_references(formula):
+            if cell_range.is_cell:
+                dependencies.add(self._resolve_cell(cell_range, sheet_name))
+            else:
+                ranges.append(cell_range)
+                dependencies.update(self._formulas_in_range(cell_range, sheet_name))
+
+        return dependencies, ranges
+
+    def _resolve_cell(self, cell_range: CellRange, sheet_name: Optional[str]) -> str:
+        """Name a referenced cell the way it is keyed in this engine."""
+        name = cell_range.to_string()
+        if cell_range.sheet or not sheet_name:
+            return name
+        if name in self.formulas or name in self.cell_values:
+            return name
+
+        qualified = cell_range.to_string(sheet_name)
+        if qualified in self.formulas or qualified in self.cell_values:
+            return qualified
+        return name
+
+    def _formulas_in_range(
+        self, cell_range: CellRange, sheet_name: Optional[str]
+    ) -> Set[str]:
+        """
+        Return the formula cells inside a range.
+
+        Enumerates the range when it is smaller than the formula set and scans
+        the formulas by bounds otherwise.
+        """
+        if cell_range.size <= len(self.formulas):
+            names = list(cell_range.iter_cells())
+            if cell_range.sheet is None and sheet_name:
+                names.extend(cell_range.iter_cells(sheet_name))
+            return {name for name in names if name in self.formulas}
+
+        target_sheet = cell_range.sheet or sheet_name
+        found = set()
+        for formula_cell in self.formulas:
+            location = parse_reference(formula_cell)
+            if location is None or not cell_range.contains(
+                None, location.min_col, location.min_row
+            ):
+                continue
+            if location.sheet == target_sheet or (
+                location.sheet is None and cell_range.sheet is None
+            ):
+                found.add(formula_cell)
+        return found
+
+    def _dependents_of(self, cell_ref: str) -> Set[str]:
+        """Return direct dependents of a cell, including through ranges."""
+        dependents = set(self.dependency_graph.reverse_nodes.get(cell_ref, set()))
+
+        range_index = self.dependency_graph.range_index
+        location = parse_reference(cell_ref)
+        if range_index is not None and location is not None and location.is_cell:
+            dependents.update(
+                range_index.dependents_of(
+                    location.sheet, location.min_col, location.min_row
+                )
+            )
+        return dependents
+
+    @staticmethod
+    def _sheet_of(cell_ref: str) -> Optional[str]:
+        return cell_ref.split("!")[0] if "!" in cell_ref else None
+
     def _expand_range(self, start_ref: str, end_ref: str, sheet_name: str) -> List[str]:
         """
         Expand a cell range to individual cell references.
         """
-        # Parse start and end references
         start_col, start_row = self._parse_cell_reference(start_ref)
         end_col, end_row = self._parse_cell_reference(end_ref)
 
-        references = []
-
-        for row in range(start_row, end_row + 1):
-            for col in range(start_col, end_col + 1):
-                col_letter = get_column_letter(col)
-                cell_ref = f"{col_letter}{row}"
-                references.append(cell_ref)
-
-        return references
+        cell_range = CellRange(
+            sheet=None,
+            min_col=min(start_col, end_col),
+            min_row=min(start_row, end_row),
+            max_col=max(start_col, end_col),
+            max_row=max(start_row, end_row),
+        )
+        return list(cell_range.iter_cells())
 
     def _parse_cell_reference(self, ref: str) -> Tuple[int, int]:
         """
@@ -566,7 +976,7 @@ class FormulaEngine:
 
         while queue:
             current = queue.popleft()
-            dependents = self.dependency_graph.reverse_nodes.get(current, set())
+            dependents = self._dependents_of(current)
 
             for dependent in dependents:
                 if dependent not in affected:
@@ -606,29 +1016,31 @@ class FormulaEngine:
     def _replace_cell_references(self, formula: str, current_cell: str) -> str:
         """
         Replace cell references with their values.
+
+        Ranges are replaced with a call producing a RangeView rather than an
+        inlined list, so the evaluated expression stays small for any range.
         """
         sheet_name = current_cell.split("!")[0] if "!" in current_cell else "Sheet1"
 
-        # Pattern to match ranges like A1:B5
-        range_pattern = r"([A-Z]+\d+):([A-Z]+\d+)"
-        cell_pattern = r"\b([A-Z]+\d+)\b"
-
-        def replace_range(match):
-            start_ref, end_ref = match.groups()
-            cells = self._expand_range(start_ref, end_ref, sheet_name)
-            values = [
-                self.cell_values.get(c, self.cell_values.get(f"{sheet_name}!{c}", 0))
-                for c in cells
-            ]
-            return str(values)
-
-        formula = re.sub(range_pattern, replace_range, formula)
-
-        def replace_ref(match):
-            ref = match.group(1)
-            full_ref = f"{sheet_name}!{ref}"
+        def replace(cell_range: CellRange, text: str) -> str:
+            # Lower-case names such as ``x1`` are context variables
+            coordinate = text.rsplit("!", 1)[-1]
+            if coordinate != coordinate.upper():
+                return text
+
+            if not cell_range.is_cell:
+                return (
+                    f"self._range_view({cell_range.sheet!r}, {cell_range.min_col}, "
+                    f"{cell_range.min_row}, {cell_range.max_col}, "
+                    f"{cell_range.max_row}, {sheet_name!r})"
+                )
 
-            value = self.cell_values.get(ref, self.cell_values.get(full_ref, 0))
+            ref = cell_range.coordinate
+            if cell_range.sheet:
+                value = self.cell_values.get(cell_range.to_string(), 0)
+            else:
+                full_ref = f"{sheet_name}!{ref}"
+                value = self.cell_values.get(ref, self.cell_values.get(full_ref, 0))
 
             # Handle different data types
             if isinstance(value, str):
@@ -638,7 +1050,21 @@ class FormulaEngine:
             else:
                 return str(value)
 
-        return re.sub(cell_pattern, replace_ref, formula)
+        return substitute_references(formula, replace)
+
+    def _range_view(
+        self,
+        sheet: Optional[str],
+        min_col: int,
+        min_row: int,
+        max_col: int,
+        max_row: int,
+        current_sheet: str,
+    ) -> RangeView:
+        """Build the RangeView referenced by a rewritten formula."""
+        return RangeView(
+            self, CellRange(sheet, min_col, min_row, max_col, max_row), current_sheet
+        )
 
     def _replace_excel_functions(self, formula: str) -> str:
         """
@@ -764,9 +1190,7 @@ class FormulaEngine:
 
         return {
             "dependencies": list(self.dependency_graph.nodes.get(cell_ref, set())),
-            "dependents": list(
-                self.dependency_graph.reverse_nodes.get(cell_ref, set())
-            ),
+            "dependents": list(self._dependents_of(cell_ref)),
             "has_formula": cell_ref in self.formulas,
             "formula": self.formulas.get(cell_ref),
             "current_value": self.cell_values.get(cell_ref),
@@ -0,0 +1,177 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+
+# String literals are blanked out before scanning so that text such as
+# ="A1" is never reported as a reference. Blanking keeps the original length
+# so match positions can be mapped back onto the unmodified formula.
+_STRING_LITERAL_PATTERN = re.compile(r'"(?:[^"]|"")*"')
+
+# Matches A1, $A$1, Sheet1!A1, 'My Sheet'!$A$1:$B$5 (case-insensitive).
+# The look-arounds reject identifiers (Revenue2024), function names such as
+# LOG10( and the second half of an already-qualified reference.
+_REFERENCE_PATTERN = re.compile(
+    r"""
+    (?<![A-Za-z0-9_.!$'])
+    (?:(?P<sheet>'(?:[^']|'')+'|[A-Za-z_][A-Za-z0-9_.]*)!)?
+    \$?(?P<col1>[A-Za-z]{1,3})\$?(?P<row1>[1-9][0-9]{0,6})
+    (?::\$?(?P<col2>[A-Za-z]{1,3})\$?(?P<row2>[1-9][0-9]{0,6}))?
+    (?![A-Za-z0-9_(!])
+    """,
+    re.VERBOSE,
+)
+
+_MAX_COLUMN = 16384
+_MAX_ROW = 1048576
+
+
+@dataclass(frozen=True)
+class CellRange:
+    """A rectangular cell reference stored as row/column bounds."""
+
+    sheet: Optional[str]
+    min_col: int
+    min_row: int
+    max_col: int
+    max_row: int
+
+    @property
+    def is_cell(self) -> bool:
+        return self.min_col == self.max_col and self.min_row == self.max_row
+
+    @property
+    def size(self) -> int:
+        return (self.max_col - self.min_col + 1) * (self.max_row - self.min_row + 1)
+
+    @property
+    def coordinate(self) -> str:
+        """Return the reference without its sheet, e.g. ``A1`` or ``A1:B5``."""
+        start = f"{get_column_letter(self.min_col)}{self.min_row}"
+        if self.is_cell:
+            return start
+        return f"{start}:{get_column_letter(self.max_col)}{self.max_row}"
+
+    def to_string(self, default_sheet: Optional[str] = None) -> str:
+        """Return the reference, qualified when a sheet is known."""
+        sheet = self.sheet or default_sheet
+        return f"{sheet}!{self.coordinate}" if sheet else self.coordinate
+
+    def contains(self, sheet: Optional[str], col: int, row: int) -> bool:
+        """Check whether a cell falls inside this range.
+
+        A range without an explicit sheet matches cells on any sheet; callers
+        that know the formula's sheet should resolve it first.
+        """
+        if self.sheet is not None and sheet is not None and self.sheet != sheet:
+            return False
+        return (
+            self.min_col <= col <= self.max_col and self.min_row <= row <= self.max_row
+        )
+
+    def iter_cells(self, default_sheet: Optional[str] = None) -> Iterator[str]:
+        """Yield every cell name in the range in row-major order."""
+        sheet = self.sheet or default_sheet
+        prefix = f"{sheet}!" if sheet else ""
+        letters = [
+            get_column_letter(col) for col in range(self.min_col, self.max_col + 1)
+        ]
+        for row in range(self.min_row, self.max_row + 1):
+            for letter in letters:
+                yield f"{prefix}{letter}{row}"
+
+
+def _unquote_sheet(sheet: Optional[str]) -> Optional[str]:
+    if sheet and sheet.startswith("'"):
+        return sheet[1:-1].replace("''", "'")
+    return sheet
+
+
+def _scrub_strings(formula: str) -> str:
+    return _STRING_LITERAL_PATTERN.sub(
+        lambda match: '"' + " " * (len(match.group()) - 2) + '"', formula
+    )
+
+
+def _build_range(match: "re.Match[str]") -> Optional[CellRange]:
+    col1 = column_index_from_string(match.group("col1").upper())
+    row1 = int(match.group("row1"))
+    if match.group("col2"):
+        col2 = column_index_from_string(match.group("col2").upper())
+        row2 = int(match.group("row2"))
+    else:
+        col2, row2 = col1, row1
+
+    min_col, max_col = min(col1, col2), max(col1, col2)
+    min_row, max_row = min(row1, row2), max(row1, row2)
+    if max_col > _MAX_COLUMN or max_row > _MAX_ROW:
+        return None
+
+    return CellRange(
+        sheet=_unquote_sheet(match.group("sheet")),
+        min_col=min_col,
+        min_row=min_row,
+        max_col=max_col,
+        max_row=max_row,
+    )
+
+
+@lru_cache(maxsize=65536)
+def extract_references(formula: str) -> Tuple[CellRange, ...]:
+    """
+    Extract the distinct cell and range references used by a formula.
+
+    Results are memoized per formula string, so workbooks with many copies of
+    the same formula only pay for scanning once. Ranges are returned as
+    bounds and are never expanded here.
+    """
+    if not formula:
+        return ()
+
+    references = {}
+    for match in _REFERENCE_PATTERN.finditer(_scrub_strings(formula)):
+        cell_range = _build_range(match)
+        if cell_range is not None:
+            references.setdefault(cell_range, None)
+
+    return tuple(references)
+
+
+@lru_cache(maxsize=65536)
+def parse_reference(reference: str) -> Optional[CellRange]:
+    """Parse a single reference such as ``Sheet1!$B$2`` into a CellRange."""
+    match = _REFERENCE_PATTERN.fullmatch(reference.strip())
+    return _build_range(match) if match else None
+
+
+def extract_reference_strings(
+    formula: str, default_sheet: Optional[str] = None
+) -> List[str]:
+    """Extract references as strings, qualifying them with ``default_sheet``."""
+    return [ref.to_string(default_sheet) for ref in extract_references(formula)]
+
+
+def substitute_references(
+    formula: str, replace: Callable[[CellRange, str], str]
+) -> str:
+    """
+    Rewrite every reference in ``formula`` outside of string literals.
+
+    ``replace`` receives the parsed reference and its original text and
+    returns the replacement text.
+    """
+    parts = []
+    last = 0
+    for match in _REFERENCE_PATTERN.finditer(_scrub_strings(formula)):
+        cell_range = _build_range(match)
+        if cell_range is None:
+            continue
+        parts.append(formula[last : match.start()])
+        parts.append(replace(cell_range, formula[match.start() : match.end()]))
+        last = match.end()
+
+    parts.append(formula[last:])
+    return "".join(parts)
@@ -468,6 +468,7 @@ class ManualInterventionService:
 
             file_record.parsed_data = json.dumps(merged_data)
             file_record.status = FileStatus.COMPLETED
+            file_record.processing_completed_at = datetime.utcnow()
             file_record.is_valid = True
 
             actions_taken.append(f"Added manual data for {len(manual_data)} fields")
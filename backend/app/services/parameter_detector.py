@@ -1,3 +1,4 @@
+import asyncio
 import re
 import pandas as pd
 import numpy as np
@@ -5,11 +6,16 @@ from typing import Dict, List, Any, Optional, Tuple, Set
 from dataclasses import dataclass
 from datetime import datetime
 import openpyxl
-from openpyxl.formula.tokenizer import Tokenizer
 from openpyxl.formula.translate import Translator
 
+from app.core.executors import ExecutorBusyError, ExecutorTimeoutError, offload
 from app.models.parameter import ParameterType, ParameterCategory, SensitivityLevel
 from app.services.excel_parser import ExcelParser
+from app.services.formula_references import (
+    extract_references,
+    extract_reference_strings,
+    parse_reference,
+)
 
 
 @dataclass
@@ -103,34 +109,45 @@ class ParameterDetector:
     ) -> List[DetectedParameter]:
         """
         Detect and classify parameters from an Excel file.
+
+        Parsing and classification are CPU-bound and run on the shared
+        ``cpu`` executor.
         """
         try:
-            # Parse the Excel file
-            workbook = openpyxl.load_workbook(file_path, data_only=False)
-            data_workbook = openpyxl.load_workbook(file_path, data_only=True)
+            return await self._detect_in_executor(file_path)
+        except (ExecutorBusyError, ExecutorTimeoutError):
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to detect parameters: {str(e)}")
 
-            detected_parameters = []
+    @offload("cpu")
+    def _detect_in_executor(self, file_path: str) -> List[DetectedParameter]:
+        return asyncio.run(self._detect(file_path))
 
-            for sheet_name in workbook.sheetnames:
-                sheet = workbook[sheet_name]
-                data_sheet = data_workbook[sheet_name]
+    async def _detect(self, file_path: str) -> List[DetectedParameter]:
+        # Parse the Excel file
+        workbook = openpyxl.load_workbook(file_path, data_only=False)
+        data_workbook = openpyxl.load_workbook(file_path, data_only=True)
 
-                # Detect parameters in this sheet
-                sheet_parameters = await self._detect_sheet_parameters(
-                    sheet, data_sheet, sheet_name
-                )
-                detected_parameters.extend(sheet_parameters)
+        detected_parameters = []
+
+        for sheet_name in workbook.sheetnames:
+            sheet = workbook[sheet_name]
+            data_sheet = data_workbook[sheet_name]
 
-            # Build dependency graph
-            await self._build_dependency_graph(detected_parameters, workbook)
+            # Detect parameters in this sheet
+            sheet_parameters = await self._detect_sheet_parameters(
+                sheet, data_sheet, sheet_name
+            )
+            detected_parameters.extend(sheet_parameters)
 
-            # Classify sensitivity levels
-            await self._classify_sensitivity_levels(detected_parameters)
+        # Build dependency graph
+        await self._build_dependency_graph(detected_parameters, workbook)
 
-            return detected_parameters
+        # Classify sensitivity levels
+        await self._classify_sensitivity_levels(detected_parameters)
 
-        except Exception as e:
-            raise Exception(f"Failed to detect parameters: {str(e)}")
+        return detected_parameters
 
     async def _detect_sheet_parameters(
         self, formula_sheet, data_sheet, sheet_name: str
@@ -566,52 +583,47 @@ class ParameterDetector:
         """
         Build dependency relationships between parameters.
         """
-        # Create a mapping of cell references to parameters
-        param_map = {param.cell_reference: param for param in parameters}
-
+        # Index parameters by (sheet, column, row) so ranges can be matched
+        # by their bounds instead of being expanded cell by cell.
+        positions: Dict[Tuple[str, int, int], DetectedParameter] = {}
         for param in parameters:
-            if param.formula:
-                # Parse formula to find dependencies
-                dependencies = self._parse_formula_dependencies(
-                    param.formula, param.sheet_name
-                )
+            location = parse_reference(param.cell_reference)
+            if location is not None:
+                positions[
+                    (param.sheet_name, location.min_col, location.min_row)
+                ] = param
 
-                for dep_ref in dependencies:
-                    if dep_ref in param_map:
-                        param.depends_on.append(dep_ref)
-                        param_map[dep_ref].affects.append(param.cell_reference)
+        for param in parameters:
+            if not param.formula:
+                continue
+
+            for cell_range in extract_references(param.formula):
+                sheet = cell_range.sheet or param.sheet_name
+                if cell_range.size <= len(positions):
+                    candidates = (
+                        positions.get((sheet, col, row))
+                        for row in range(cell_range.min_row, cell_range.max_row + 1)
+                        for col in range(cell_range.min_col, cell_range.max_col + 1)
+                    )
+                else:
+                    candidates = (
+                        dep
+                        for (dep_sheet, col, row), dep in positions.items()
+                        if dep_sheet == sheet and cell_range.contains(sheet, col, row)
+                    )
+
+                for dep in candidates:
+                    if dep is None or dep is param:
+                        continue
+                    if dep.cell_reference not in param.depends_on:
+                        param.depends_on.append(dep.cell_reference)
+                        dep.affects.append(param.cell_reference)
 
     def _parse_formula_dependencies(self, formula: str, sheet_name: str) -> List[str]:
         """
         Parse formula to extract cell dependencies.
         """
-        dependencies = []
-
-        try:
-            # Use openpyxl tokenizer to parse formula
-            tokens = Tokenizer(formula).items
-
-            for token in tokens:
-                if token.type == "OPERAND" and token.subtype == "RANGE":
-                    # This is a cell reference
-                    ref = token.value
-
-                    # Add sheet name if not present
-                    if "!" not in ref:
-                        ref = f"{sheet_name}!{ref}"
-
-                    dependencies.append(ref)
-
-        except Exception:
-            # Fallback to regex parsing
-            cell_pattern = r"[A-Z]+\d+"
-            matches = re.findall(cell_pattern, formula.upper())
-
-            for match in matches:
-                ref = f"{sheet_name}!{match}"
-                dependencies.append(ref)
-
-        return dependencies
+        return extract_reference_strings(formula, sheet_name)
 
     async def _classify_sensitivity_levels(
         self, parameters: List[DetectedParameter]
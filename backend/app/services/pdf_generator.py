@@ -1,28 +1,19 @@
 import os
 import io
 import base64
-from typing import Dict, List, Any, Optional, Union, Tuple
+from concurrent.futures import Executor
+from typing import BinaryIO, Dict, List, Any, Optional, Union, Tuple
 from datetime import datetime
 from pathlib import Path
 
-import matplotlib
-
-matplotlib.use("Agg")  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.backends.backend_pdf import PdfPages
-import pandas as pd
-from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.units import inch, cm
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
+from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from reportlab.platypus import (
     SimpleDocTemplate,
     Paragraph,
     Spacer,
     Table,
-    TableStyle,
     PageBreak,
     Image,
     KeepTogether,
@@ -31,24 +22,31 @@ from reportlab.graphics.shapes import Drawing
 from reportlab.graphics.charts.linecharts import HorizontalLineChart
 from reportlab.graphics.charts.barcharts import VerticalBarChart
 from reportlab.graphics.charts.piecharts import Pie
-from reportlab.pdfgen import canvas
 from PIL import Image as PILImage
 
 from app.core.config import settings
+from app.services.chart_renderer import ChartImageCache, ChartRenderer, render_chart
+from app.services.pdf_layout import CompiledLayout, compile_layout
 
 
 class PDFReportGenerator:
     """Service for generating PDF reports with charts and financial data."""
 
-    def __init__(self, output_dir: Optional[str] = None):
+    def __init__(
+        self,
+        output_dir: Optional[str] = None,
+        chart_cache: Optional[ChartImageCache] = None,
+        chart_pool: Optional[Executor] = None,
+    ):
         self.output_dir = (
-            Path(output_dir) if output_dir else Path(settings.UPLOAD_DIR) / "reports"
+            Path(output_dir) if output_dir else Path(settings.UPLOAD_FOLDER) / "reports"
         )
         self.output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Setup styles
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+        self.chart_cache = chart_cache or ChartImageCache(
+            Path(settings.CACHE_FOLDER) / "charts"
+        )
+        # Defaults to the shared rendering pool
+        self.chart_pool = chart_pool
 
         # Chart configuration
         self.chart_config = {
@@ -59,60 +57,14 @@ class PDFReportGenerator:
             "colors": ["#1976d2", "#dc004e", "#2e7d32", "#ed6c02", "#9c27b0"],
         }
 
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles for reports."""
-        self.styles.add(
-            ParagraphStyle(
-                name="CustomTitle",
-                parent=self.styles["Heading1"],
-                fontSize=24,
-                spaceAfter=30,
-                alignment=TA_CENTER,
-                textColor=colors.Color(0.2, 0.2, 0.2),
-            )
-        )
-
-        self.styles.add(
-            ParagraphStyle(
-                name="SectionHeader",
-                parent=self.styles["Heading2"],
-                fontSize=16,
-                spaceBefore=20,
-                spaceAfter=12,
-                textColor=colors.Color(0.3, 0.3, 0.3),
-            )
-        )
-
-        self.styles.add(
-            ParagraphStyle(
-                name="MetricTitle",
-                parent=self.styles["Normal"],
-                fontSize=12,
-                fontName="Helvetica-Bold",
-                spaceBefore=10,
-                spaceAfter=5,
-                textColor=colors.Color(0.4, 0.4, 0.4),
-            )
-        )
-
-        self.styles.add(
-            ParagraphStyle(
-                name="MetricValue",
-                parent=self.styles["Normal"],
-                fontSize=18,
-                fontName="Helvetica-Bold",
-                alignment=TA_CENTER,
-                textColor=colors.Color(0.1, 0.1, 0.1),
-            )
-        )
-
     def generate_financial_report(
         self,
         data: Dict[str, Any],
         template_config: Optional[Dict[str, Any]] = None,
         branding_config: Optional[Dict[str, Any]] = None,
         filename: Optional[str] = None,
-    ) -> str:
+        output: Optional[BinaryIO] = None,
+    ) -> Optional[str]:
         """
         Generate a comprehensive financial report PDF.
 
@@ -121,19 +73,21 @@ class PDFReportGenerator:
             template_config: Template configuration for layout and sections
             branding_config: Company branding (logo, colors, etc.)
             filename: Output filename (auto-generated if not provided)
+            output: Binary stream to write the PDF to instead of a file
 
         Returns:
-            Path to generated PDF file
+            Path to generated PDF file, or None when written to ``output``
         """
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"financial_report_{timestamp}.pdf"
 
         output_path = self.output_dir / filename
+        layout = compile_layout(template_config, branding_config)
 
         # Create PDF document
         doc = SimpleDocTemplate(
-            str(output_path),
+            output or str(output_path),
             pagesize=A4,
             rightMargin=72,
             leftMargin=72,
@@ -145,89 +99,75 @@ class PDFReportGenerator:
         story = []
 
         # Add header with branding
-        story.extend(self._build_header(branding_config))
+        story.extend(self._build_header(layout))
 
         # Add executive summary
         if "summary" in data:
-            story.extend(self._build_executive_summary(data["summary"]))
+            story.extend(self._build_executive_summary(data["summary"], layout))
 
         # Add key metrics section
         if "metrics" in data:
-            story.extend(self._build_metrics_section(data["metrics"]))
+            story.extend(self._build_metrics_section(data["metrics"], layout))
 
         # Add charts section
         if "charts" in data:
-            story.extend(self._build_charts_section(data["charts"]))
+            story.extend(self._build_charts_section(data["charts"], layout))
 
         # Add detailed tables
         if "tables" in data:
-            story.extend(self._build_tables_section(data["tables"]))
+            story.extend(self._build_tables_section(data["tables"], layout))
 
         # Add footer
-        story.extend(self._build_footer())
+        story.extend(self._build_footer(layout))
 
         # Build PDF
         doc.build(
             story, onFirstPage=self._add_page_number, onLaterPages=self._add_page_number
         )
 
-        return str(output_path)
+        return None if output else str(output_path)
 
-    def _build_header(self, branding_config: Optional[Dict[str, Any]]) -> List:
+    def _build_header(self, layout: CompiledLayout) -> List:
         """Build report header with company branding."""
-        story = []
-
-        # Company logo
-        if branding_config and "logo_path" in branding_config:
-            try:
-                logo = Image(
-                    branding_config["logo_path"], width=2 * inch, height=1 * inch
-                )
-                story.append(logo)
-                story.append(Spacer(1, 20))
-            except:
-                pass  # Skip logo if file not found
-
-        # Report title
-        title = "Financial Analysis Report"
-        if branding_config and "company_name" in branding_config:
-            title = f"{branding_config['company_name']} - {title}"
-
-        story.append(Paragraph(title, self.styles["CustomTitle"]))
+        story = layout.header()
         story.append(Spacer(1, 20))
 
         # Report date
         report_date = datetime.now().strftime("%B %d, %Y")
-        story.append(Paragraph(f"Generated on {report_date}", self.styles["Normal"]))
+        story.append(Paragraph(f"Generated on {report_date}", layout.styles["Normal"]))
         story.append(Spacer(1, 30))
 
         return story
 
-    def _build_executive_summary(self, summary_data: Dict[str, Any]) -> List:
+    def _build_executive_summary(
+        self, summary_data: Dict[str, Any], layout: CompiledLayout
+    ) -> List:
         """Build executive summary section."""
         story = []
 
-        story.append(Paragraph("Executive Summary", self.styles["SectionHeader"]))
+        story.append(layout.paragraph("summary"))
 
         # Summary text
         if "overview" in summary_data:
-            story.append(Paragraph(summary_data["overview"], self.styles["Normal"]))
+            story.append(Paragraph(summary_data["overview"], layout.styles["Normal"]))
             story.append(Spacer(1, 15))
 
         # Key highlights
         if "highlights" in summary_data:
-            story.append(Paragraph("Key Highlights:", self.styles["MetricTitle"]))
+            story.append(layout.paragraph("highlights"))
             for highlight in summary_data["highlights"]:
-                story.append(Paragraph(f"• {highlight}", self.styles["Normal"]))
+                story.append(Paragraph(f"• {highlight}", layout.styles["Normal"]))
             story.append(Spacer(1, 20))
 
         return story
 
-    def _build_metrics_section(self, metrics_data: Dict[str, Any]) -> List:
+    def _build_metrics_section(
+        self, metrics_data: Dict[str, Any], layout: CompiledLayout
+    ) -> List:
         """Build key metrics section with KPI boxes."""
         story = []
 
-        story.append(Paragraph("Key Financial Metrics", self.styles["SectionHeader"]))
+        story.append(layout.paragraph("metrics"))
 
         # Create metrics table (2 columns)
         metrics = []
@@ -257,148 +197,52 @@ class PDFReportGenerator:
             table = Table(
                 table_data, colWidths=[2 * inch, 1.5 * inch, 2 * inch, 1.5 * inch]
             )
-            table.setStyle(
-                TableStyle(
-                    [
-                        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("FONTSIZE", (0, 0), (-1, 0), 12),
-                        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                        ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                    ]
-                )
-            )
+            table.setStyle(layout.metrics_table_style)
 
             story.append(table)
             story.append(Spacer(1, 20))
 
         return story
 
-    def _build_charts_section(self, charts_data: Dict[str, Any]) -> List:
-        """Build charts section with matplotlib-generated charts."""
+    def _build_charts_section(
+        self, charts_data: Dict[str, Any], layout: CompiledLayout
+    ) -> List:
+        """Build charts section; images are cached and rendered in parallel."""
         story = []
 
-        story.append(Paragraph("Financial Charts", self.styles["SectionHeader"]))
+        story.append(layout.paragraph("charts"))
 
-        for chart_name, chart_data in charts_data.items():
-            if not chart_data:
-                continue
+        charts = [(name, data) for name, data in charts_data.items() if data]
+        renderer = ChartRenderer(
+            self.chart_config,
+            self.chart_config["dpi"],
+            cache=self.chart_cache,
+            pool=self.chart_pool,
+        )
+        images = renderer.render_many(charts)
 
+        for (chart_name, _), image in zip(charts, images):
             story.append(
                 Paragraph(
-                    chart_name.replace("_", " ").title(), self.styles["MetricTitle"]
+                    chart_name.replace("_", " ").title(), layout.styles["MetricTitle"]
                 )
             )
 
-            # Generate chart based on type
-            chart_image = self._generate_chart(chart_name, chart_data)
-            if chart_image:
-                story.append(chart_image)
+            if image:
+                story.append(
+                    Image(io.BytesIO(image), width=6 * inch, height=3.6 * inch)
+                )
                 story.append(Spacer(1, 15))
 
         return story
 
-    def _generate_chart(
-        self, chart_type: str, data: List[Dict[str, Any]]
-    ) -> Optional[Image]:
-        """Generate chart using matplotlib and return as ReportLab Image."""
-        if not data:
-            return None
-
-        try:
-            fig, ax = plt.subplots(figsize=self.chart_config["figure_size"])
-
-            # Convert data to pandas DataFrame for easier manipulation
-            df = pd.DataFrame(data)
-
-            if chart_type in ["revenue_trend", "profit_trend", "cash_flow_trend"]:
-                self._create_line_chart(ax, df, chart_type)
-            elif chart_type in ["expense_breakdown", "profit_margins"]:
-                self._create_bar_chart(ax, df, chart_type)
-            elif chart_type in ["asset_distribution", "expense_categories"]:
-                self._create_pie_chart(ax, df, chart_type)
-            else:
-                # Default to line chart
-                self._create_line_chart(ax, df, chart_type)
-
-            # Save chart to bytes
-            img_buffer = io.BytesIO()
-            plt.savefig(
-                img_buffer,
-                format="png",
-                dpi=self.chart_config["dpi"],
-                bbox_inches="tight",
-                facecolor="white",
-            )
-            img_buffer.seek(0)
-            plt.close(fig)
-
-            # Create ReportLab Image
-            return Image(img_buffer, width=6 * inch, height=3.6 * inch)
-
-        except Exception as e:
-            print(f"Error generating chart {chart_type}: {e}")
-            return None
-
-    def _create_line_chart(self, ax, df: pd.DataFrame, chart_type: str):
-        """Create line chart."""
-        if "period" in df.columns and "value" in df.columns:
-            ax.plot(
-                df["period"],
-                df["value"],
-                marker="o",
-                linewidth=2,
-                color=self.chart_config["colors"][0],
-            )
-            ax.set_xlabel("Period")
-            ax.set_ylabel("Value")
-            ax.set_title(chart_type.replace("_", " ").title())
-            ax.grid(True, alpha=0.3)
-            plt.xticks(rotation=45)
-
-    def _create_bar_chart(self, ax, df: pd.DataFrame, chart_type: str):
-        """Create bar chart."""
-        if "period" in df.columns and "value" in df.columns:
-            bars = ax.bar(
-                df["period"], df["value"], color=self.chart_config["colors"][: len(df)]
-            )
-            ax.set_xlabel("Category")
-            ax.set_ylabel("Value")
-            ax.set_title(chart_type.replace("_", " ").title())
-            plt.xticks(rotation=45)
-
-            # Add value labels on bars
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(
-                    bar.get_x() + bar.get_width() / 2.0,
-                    height,
-                    f"{height:,.0f}",
-                    ha="center",
-                    va="bottom",
-                )
-
-    def _create_pie_chart(self, ax, df: pd.DataFrame, chart_type: str):
-        """Create pie chart."""
-        if "period" in df.columns and "value" in df.columns:
-            colors = self.chart_config["colors"][: len(df)]
-            wedges, texts, autotexts = ax.pie(
-                df["value"],
-                labels=df["period"],
-                autopct="%1.1f%%",
-                colors=colors,
-                startangle=90,
-            )
-            ax.set_title(chart_type.replace("_", " ").title())
-
-    def _build_tables_section(self, tables_data: Dict[str, Any]) -> List:
+    def _build_tables_section(
+        self, tables_data: Dict[str, Any], layout: CompiledLayout
+    ) -> List:
         """Build detailed tables section."""
         story = []
 
-        story.append(Paragraph("Detailed Financial Data", self.styles["SectionHeader"]))
+        story.append(layout.paragraph("tables"))
 
         for table_name, table_data in tables_data.items():
             if not table_data:
@@ -406,7 +250,7 @@ class PDFReportGenerator:
 
             story.append(
                 Paragraph(
-                    table_name.replace("_", " ").title(), self.styles["MetricTitle"]
+                    table_name.replace("_", " ").title(), layout.styles["MetricTitle"]
                 )
             )
 
@@ -428,37 +272,24 @@ class PDFReportGenerator:
 
                     # Create ReportLab table
                     table = Table(table_rows)
-                    table.setStyle(
-                        TableStyle(
-                            [
-                                ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                                ("FONTSIZE", (0, 0), (-1, 0), 10),
-                                ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                                ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                                ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                            ]
-                        )
-                    )
+                    table.setStyle(layout.data_table_style)
 
                     story.append(table)
                     story.append(Spacer(1, 15))
 
         return story
 
-    def _build_footer(self) -> List:
+    def _build_footer(self, layout: CompiledLayout) -> List:
         """Build report footer."""
         story = []
 
         story.append(PageBreak())
         story.append(Spacer(1, 50))
-        story.append(Paragraph("Report generated by FinVision", self.styles["Normal"]))
+        story.append(layout.paragraph("footer"))
         story.append(
             Paragraph(
                 f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                self.styles["Normal"],
+                layout.styles["Normal"],
             )
         )
 
@@ -511,31 +342,15 @@ class PDFReportGenerator:
         try:
             # Set figure size based on DPI
             dpi = 100
-            fig_width = width / dpi
-            fig_height = height / dpi
-
-            fig, ax = plt.subplots(figsize=(fig_width, fig_height), dpi=dpi)
-
-            # Generate chart
-            if "data" in chart_data:
-                df = pd.DataFrame(chart_data["data"])
-
-                if chart_type in ["line", "trend"]:
-                    self._create_line_chart(ax, df, chart_type)
-                elif chart_type in ["bar", "column"]:
-                    self._create_bar_chart(ax, df, chart_type)
-                elif chart_type in ["pie", "donut"]:
-                    self._create_pie_chart(ax, df, chart_type)
-
-            # Save with specified format
-            plt.savefig(
-                str(output_path),
+            image = render_chart(
+                chart_type,
+                chart_data.get("data", []),
+                self.chart_config,
+                dpi,
+                figure_size=(width / dpi, height / dpi),
                 format=format.lower(),
-                dpi=dpi,
-                bbox_inches="tight",
-                facecolor="white",
             )
-            plt.close(fig)
+            output_path.write_bytes(image)
 
             return str(output_path)
 
@@ -0,0 +1,270 @@
+"""
+Compiled PDF report layouts shared across report runs
+"""
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfdoc import (
+    PDFImageXObject,
+    PDFObjectReference,
+    xObjectName,
+)
+from reportlab.platypus import Flowable, Paragraph, Spacer, TableStyle
+
+from app.core.config import settings
+
+# Bump when the compiled output changes so cached layouts are rebuilt
+LAYOUT_VERSION = 1
+
+REPORT_TITLE = "Financial Analysis Report"
+
+# Static paragraphs by name: (text, style)
+SECTION_TEXT = {
+    "summary": ("Executive Summary", "SectionHeader"),
+    "highlights": ("Key Highlights:", "MetricTitle"),
+    "metrics": ("Key Financial Metrics", "SectionHeader"),
+    "charts": ("Financial Charts", "SectionHeader"),
+    "tables": ("Detailed Financial Data", "SectionHeader"),
+    "footer": ("Report generated by FinVision", "Normal"),
+}
+
+METRICS_TABLE_STYLE = [
+    ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, 0), 12),
+    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+    ("GRID", (0, 0), (-1, -1), 1, colors.black),
+]
+
+DATA_TABLE_STYLE = [
+    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, 0), 10),
+    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+    ("GRID", (0, 0), (-1, -1), 1, colors.black),
+]
+
+
+def report_styles() -> StyleSheet1:
+    """Sample stylesheet with the custom report paragraph styles."""
+    styles = getSampleStyleSheet()
+    styles.add(
+        ParagraphStyle(
+            name="CustomTitle",
+            parent=styles["Heading1"],
+            fontSize=24,
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            textColor=colors.Color(0.2, 0.2, 0.2),
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="SectionHeader",
+            parent=styles["Heading2"],
+            fontSize=16,
+            spaceBefore=20,
+            spaceAfter=12,
+            textColor=colors.Color(0.3, 0.3, 0.3),
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="MetricTitle",
+            parent=styles["Normal"],
+            fontSize=12,
+            fontName="Helvetica-Bold",
+            spaceBefore=10,
+            spaceAfter=5,
+            textColor=colors.Color(0.4, 0.4, 0.4),
+        )
+    )
+    styles.add(
+        ParagraphStyle(
+            name="MetricValue",
+            parent=styles["Normal"],
+            fontSize=18,
+            fontName="Helvetica-Bold",
+            alignment=TA_CENTER,
+            textColor=colors.Color(0.1, 0.1, 0.1),
+        )
+    )
+    return styles
+
+
+class EncodedImage(Flowable):
+    """
+    Image drawn from an already encoded PDF image object.
+
+    ReportLab encodes an image again for every document that draws it; this
+    flowable adds the layout's pre-encoded image to each document instead.
+    """
+
+    _fixedWidth = 1
+    _fixedHeight = 1
+
+    def __init__(self, image: PDFImageXObject, width: float, height: float):
+        super().__init__()
+        self.image = image
+        self.drawWidth = width
+        self.drawHeight = height
+        self.hAlign = "CENTER"
+
+    def wrap(self, availWidth, availHeight):
+        return self.drawWidth, self.drawHeight
+
+    def draw(self):
+        canv = self.canv
+        document = canv._doc
+        name = document.getXObjectName(self.image.name)
+        if name not in document.idToObject:
+            # Documents tag the objects they register, so each one gets a
+            # copy; the encoded stream itself is shared
+            document.Reference(copy.copy(self.image), name)
+            if isinstance(self.image.smask, PDFObjectReference):
+                document.Reference(copy.copy(self.image.alpha), self.image.smask.name)
+        canv.saveState()
+        canv.scale(self.drawWidth, self.drawHeight)
+        canv._code.append(f"/{name} Do")
+        canv.restoreState()
+        # Lists the image in the page's resources
+        canv._formsinuse.append(self.image.name)
+
+
+def _encode_image(path: str, name: str) -> PDFImageXObject:
+    image = PDFImageXObject(name, ImageReader(path), mask="auto")
+    image.smask = None
+    # Transparent images carry their alpha channel as a separate soft mask
+    alpha = getattr(image, "_smask", None)
+    if alpha is not None:
+        del image._smask
+        image.alpha = alpha
+        image.smask = PDFObjectReference(xObjectName(alpha.name))
+    return image
+
+
+def layout_key(
+    template_config: Optional[Dict[str, Any]],
+    branding_config: Optional[Dict[str, Any]],
+) -> str:
+    """
+    Version of a template's layout.
+
+    Covers the template and branding configuration and the logo file's
+    modification time and size, so replacing a logo recompiles the layout.
+    """
+    logo = None
+    logo_path = (branding_config or {}).get("logo_path")
+    if logo_path:
+        try:
+            stat = os.stat(logo_path)
+            logo = [stat.st_mtime_ns, stat.st_size]
+        except (OSError, TypeError, ValueError):
+            logo = "missing"
+    payload = json.dumps(
+        [LAYOUT_VERSION, template_config, branding_config, logo],
+        sort_keys=True,
+        default=str,
+    ).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+class CompiledLayout:
+    """
+    Static parts of a report template, built once and shared by its reports.
+
+    Holds the stylesheet, table styles, parsed header and section paragraphs
+    and the encoded logo. Paragraphs are handed out as copies since ReportLab
+    lays flowables out in place; styles and the logo are read-only.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        template_config: Optional[Dict[str, Any]],
+        branding_config: Optional[Dict[str, Any]],
+    ):
+        branding = branding_config or {}
+        self.key = key
+        self.template_config = template_config or {}
+        self.styles = report_styles()
+        self.metrics_table_style = TableStyle(METRICS_TABLE_STYLE)
+        self.data_table_style = TableStyle(DATA_TABLE_STYLE)
+
+        self.logo: Optional[PDFImageXObject] = None
+        if branding.get("logo_path"):
+            try:
+                self.logo = _encode_image(branding["logo_path"], f"logo{key[:16]}")
+            except Exception:
+                pass  # Skip logo if file not found
+
+        title = REPORT_TITLE
+        if "company_name" in branding:
+            title = f"{branding['company_name']} - {title}"
+        self._paragraphs = {"title": Paragraph(title, self.styles["CustomTitle"])}
+        for name, (text, style) in SECTION_TEXT.items():
+            self._paragraphs[name] = Paragraph(text, self.styles[style])
+
+    def paragraph(self, name: str) -> Paragraph:
+        """A fresh copy of a static paragraph, without re-parsing its markup."""
+        return copy.copy(self._paragraphs[name])
+
+    def header(self) -> List[Flowable]:
+        """Logo and title flowables for a new report."""
+        story = []
+        if self.logo is not None:
+            story.append(EncodedImage(self.logo, width=2 * inch, height=1 * inch))
+            story.append(Spacer(1, 20))
+        story.append(self.paragraph("title"))
+        return story
+
+
+_layouts: "OrderedDict[str, CompiledLayout]" = OrderedDict()
+_layouts_lock = threading.Lock()
+
+
+def compile_layout(
+    template_config: Optional[Dict[str, Any]] = None,
+    branding_config: Optional[Dict[str, Any]] = None,
+) -> CompiledLayout:
+    """
+    Compiled layout for a template, reused while its version is unchanged.
+
+    Up to PDF_LAYOUT_CACHE_SIZE layouts are kept per process, least recently
+    used first out.
+    """
+    key = layout_key(template_config, branding_config)
+    with _layouts_lock:
+        layout = _layouts.get(key)
+        if layout is not None:
+            _layouts.move_to_end(key)
+            return layout
+
+    layout = CompiledLayout(key, template_config, branding_config)
+    with _layouts_lock:
+        layout = _layouts.setdefault(key, layout)
+        _layouts.move_to_end(key)
+        while len(_layouts) > settings.PDF_LAYOUT_CACHE_SIZE:
+            _layouts.popitem(last=False)
+    return layout
+
+
+def clear_layout_cache() -> None:
+    with _layouts_lock:
+        _layouts.clear()
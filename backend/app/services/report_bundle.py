@@ -0,0 +1,244 @@
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.models.report import ExportFormat
+from app.services.chart_renderer import ChartImageCache
+from app.services.excel_exporter import ExcelExporter
+from app.services.pdf_generator import PDFReportGenerator
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMATS = {
+    ExportFormat.PDF: "pdf",
+    ExportFormat.EXCEL: "xlsx",
+    ExportFormat.CSV: "csv",
+}
+
+# (position in the bundle, report name, financial data)
+BundleJob = Tuple[int, str, Dict[str, Any]]
+
+
+def safe_filename(name: str) -> str:
+    """Reduce a report name to a portable file name."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("._") or "report"
+
+
+class BundleRenderer:
+    """
+    Renders every report of a bundle with one set of generators.
+
+    Paragraph styles, fonts, template configuration and the chart image cache
+    are set up once and reused for each report, instead of once per report.
+    """
+
+    def __init__(
+        self,
+        export_format: ExportFormat,
+        template_config: Optional[Dict[str, Any]],
+        branding_config: Optional[Dict[str, Any]],
+        output_dir: str,
+        chart_cache_dir: str,
+    ):
+        self.export_format = ExportFormat(export_format)
+        self.template_config = template_config
+        self.branding_config = branding_config
+        self.extension = BUNDLE_FORMATS[self.export_format]
+
+        self.chart_pool = None
+        if self.export_format == ExportFormat.PDF:
+            # Reports already run in parallel; draw each one's charts inline
+            self.chart_pool = ThreadPoolExecutor(1, thread_name_prefix="bundle-chart")
+            self.pdf_generator = PDFReportGenerator(
+                output_dir=output_dir,
+                chart_cache=ChartImageCache(chart_cache_dir),
+                chart_pool=self.chart_pool,
+            )
+        else:
+            self.excel_exporter = ExcelExporter(output_dir=output_dir)
+
+    def render(self, index: int, name: str, financial_data: Dict[str, Any]) -> str:
+        filename = f"{index + 1:04d}_{safe_filename(name)}.{self.extension}"
+        if self.export_format == ExportFormat.PDF:
+            return self.pdf_generator.generate_financial_report(
+                financial_data, self.template_config, self.branding_config, filename
+            )
+        if self.export_format == ExportFormat.EXCEL:
+            return self.excel_exporter.export_financial_data(
+                financial_data, self.template_config, filename=filename
+            )
+        return self.excel_exporter.export_raw_data_csv(
+            financial_data.get("raw_data", []), filename=filename
+        )
+
+    def close(self):
+        if self.chart_pool:
+            self.chart_pool.shutdown()
+
+
+# Renderer of the current bundle worker process
+_worker_renderer: Optional[BundleRenderer] = None
+
+
+def _init_worker(*renderer_args):
+    global _worker_renderer
+    _worker_renderer = BundleRenderer(*renderer_args)
+
+
+def _render_in_worker(job: BundleJob) -> str:
+    return _worker_renderer.render(*job)
+
+
+def _bundle_pool(workers: int, renderer_args: tuple) -> Optional[Executor]:
+    """Worker processes for a bundle, or None to render in-process."""
+    if workers <= 1 or settings.REPORT_BUNDLE_POOL != "process":
+        return None
+    # Daemonic processes (Celery prefork children) cannot have children
+    if multiprocessing.current_process().daemon:
+        logger.warning(
+            "Rendering bundle in-process: run the reports_bulk worker with "
+            "--pool threads or --pool solo to use %d render processes",
+            workers,
+        )
+        return None
+    return ProcessPoolExecutor(
+        workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=renderer_args,
+    )
+
+
+def render_bundle(
+    jobs: List[BundleJob],
+    export_format: ExportFormat,
+    template_config: Optional[Dict[str, Any]],
+    branding_config: Optional[Dict[str, Any]],
+    output_dir: str,
+    on_rendered: Optional[Callable[[int], None]] = None,
+    workers: Optional[int] = None,
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Render bundle reports across worker processes.
+
+    Each worker builds one BundleRenderer and renders its share of the jobs
+    with it. ``on_rendered`` is called with the number of finished reports.
+
+    Returns:
+        (file path, error) per job, in job order
+    """
+    # Resolved here: spawned workers do not see settings changed at runtime
+    chart_cache_dir = str(Path(settings.CACHE_FOLDER) / "charts")
+    renderer_args = (
+        export_format,
+        template_config,
+        branding_config,
+        output_dir,
+        chart_cache_dir,
+    )
+    workers = min(
+        workers or settings.REPORT_BUNDLE_WORKERS or os.cpu_count() or 1, len(jobs)
+    )
+    results: List[Tuple[Optional[str], Optional[str]]] = [(None, None)] * len(jobs)
+
+    pool = _bundle_pool(workers, renderer_args)
+    if pool is None:
+        renderer = BundleRenderer(*renderer_args)
+        try:
+            for position, job in enumerate(jobs):
+                try:
+                    results[position] = (renderer.render(*job), None)
+                except Exception as e:
+                    results[position] = (None, str(e))
+                if on_rendered:
+                    on_rendered(position + 1)
+        finally:
+            renderer.close()
+        return results
+
+    with pool:
+        futures = {
+            pool.submit(_render_in_worker, job): position
+            for position, job in enumerate(jobs)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                results[futures[future]] = (future.result(), None)
+            except Exception as e:
+                results[futures[future]] = (None, str(e))
+            if on_rendered:
+                on_rendered(done)
+    return results
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_bundle_zip(
+    zip_path: Union[Path, BinaryIO],
+    manifest: Dict[str, Any],
+    entries: List[Dict[str, Any]],
+    results: List[Tuple[Optional[str], Optional[str]]],
+) -> Dict[str, Any]:
+    """
+    Write rendered reports and a ``manifest.json`` describing them to a ZIP.
+
+    ``zip_path`` may also be a binary stream, such as a report storage sink.
+    The rendered files are removed once archived.
+
+    Returns:
+        The manifest as written
+    """
+    reports = []
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for entry, (file_path, error) in zip(entries, results):
+            record = {**entry, "status": "failed" if error else "completed"}
+            if error:
+                record["error"] = error
+            else:
+                arcname = f"reports/{Path(file_path).name}"
+                archive.write(file_path, arcname)
+                record.update(
+                    file=arcname,
+                    size=os.path.getsize(file_path),
+                    sha256=_sha256(file_path),
+                )
+                os.remove(file_path)
+            reports.append(record)
+
+        manifest = {
+            **manifest,
+            "generated_at": datetime.utcnow().isoformat(),
+            "report_count": sum(r["status"] == "completed" for r in reports),
+            "failed_count": sum(r["status"] == "failed" for r in reports),
+            "reports": reports,
+        }
+        archive.writestr("manifest.json", json.dumps(manifest, indent=2, default=str))
+
+    return manifest
+
+
+def throughput(report_count: int, started: float) -> float:
+    """Reports per minute since ``started`` (a perf_counter reading)."""
+    elapsed = time.perf_counter() - started
+    return round(report_count * 60 / elapsed, 1) if elapsed > 0 else 0.0
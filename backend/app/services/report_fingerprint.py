@@ -0,0 +1,150 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.models.file import FileStatus, UploadedFile
+from app.models.financial import FileVersion
+from app.models.parameter import Scenario
+from app.models.report import ExportFormat, ReportTemplate
+
+# Bump when rendering changes, so reports built by older code are regenerated
+RENDERER_VERSION = "1"
+
+# Bundle fields written after generation, not part of the request
+_BUNDLE_RESULT_KEYS = {"report_count", "failed_count", "reports_per_minute"}
+
+
+def _digest(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _request_config(generation_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    config = dict(generation_config or {})
+    if "bundle" in config:
+        config["bundle"] = {
+            key: value
+            for key, value in config["bundle"].items()
+            if key not in _BUNDLE_RESULT_KEYS
+        }
+    return config
+
+
+def _file_version(row) -> Optional[List[str]]:
+    if row.file_hash is None or row.processing_completed_at is None:
+        return None
+    return [row.file_hash, row.processing_completed_at.isoformat()]
+
+
+def report_fingerprint(
+    db: Session,
+    user_id: int,
+    export_format: ExportFormat,
+    template_id: Optional[int],
+    source_file_ids: Optional[List[int]],
+    generation_config: Optional[Dict[str, Any]],
+) -> Optional[str]:
+    """
+    Hash of every input a report file is generated from.
+
+    Covers the renderer version, export format, the template's configuration,
+    each source file's content hash and processing time, the calculation
+    results of any scenario targets, and the generation config (period,
+    bundle targets). Two exports with the same fingerprint produce the same
+    document.
+
+    Source files are identified by their current version's hash and the time
+    their parsed data was last written, so the parsed data itself is never
+    loaded.
+
+    Returns None when an input cannot be pinned down (a missing or unversioned
+    file, a missing scenario, or a report built from demo data); such exports
+    are always generated.
+    """
+    config = _request_config(generation_config)
+    bundle_targets = config.get("bundle", {}).get("targets", [])
+
+    file_ids = set(source_file_ids or [])
+    scenario_ids = {t["scenario_id"] for t in bundle_targets if t.get("scenario_id")}
+    if config.get("scenario_id"):
+        scenario_ids.add(config["scenario_id"])
+    # Targets without a file or scenario report on the latest file
+    uses_latest_file = not source_file_ids and (
+        not bundle_targets
+        or any(
+            not t.get("file_id") and not t.get("scenario_id") for t in bundle_targets
+        )
+    )
+
+    scenarios = {}
+    if scenario_ids:
+        rows = (
+            db.query(Scenario.id, Scenario.base_file_id, Scenario.calculation_results)
+            .filter(Scenario.id.in_(scenario_ids), Scenario.created_by_id == user_id)
+            .all()
+        )
+        if len(rows) != len(scenario_ids):
+            return None
+        for row in rows:
+            file_ids.add(row.base_file_id)
+            scenarios[row.id] = _digest(row.calculation_results)
+
+    files_query = (
+        db.query(
+            UploadedFile.id,
+            UploadedFile.processing_completed_at,
+            FileVersion.file_hash,
+        )
+        .outerjoin(
+            FileVersion,
+            and_(
+                FileVersion.file_id == UploadedFile.id, FileVersion.is_current == True
+            ),
+        )
+        .filter(
+            UploadedFile.user_id == user_id,
+            UploadedFile.status == FileStatus.COMPLETED,
+            UploadedFile.parsed_data.isnot(None),
+        )
+    )
+    files = {}
+    if file_ids:
+        files = {
+            row.id: _file_version(row)
+            for row in files_query.filter(UploadedFile.id.in_(file_ids))
+        }
+        if len(files) != len(file_ids):
+            return None
+    if uses_latest_file:
+        latest = files_query.order_by(UploadedFile.created_at.desc()).first()
+        if latest is None:
+            return None
+        files["latest"] = _file_version(latest)
+    if None in files.values():
+        return None
+
+    template = None
+    if template_id:
+        row = (
+            db.query(ReportTemplate.template_config, ReportTemplate.branding_config)
+            .filter(ReportTemplate.id == template_id)
+            .first()
+        )
+        if row is None:
+            return None
+        template = [row.template_config, row.branding_config]
+
+    return _digest(
+        {
+            "renderer": RENDERER_VERSION,
+            "user": user_id,
+            "format": export_format.value,
+            "template": template,
+            "files": files,
+            "scenarios": scenarios,
+            "config": config,
+        }
+    )
@@ -1,7 +1,8 @@
 import os
 import json
 import shutil
-from typing import Dict, List, Any, Optional, Union
+import time
+from typing import Callable, Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
 from pathlib import Path
 from sqlalchemy.orm import Session
@@ -15,11 +16,68 @@ from app.models.report import (
     ExportFormat,
     ReportStatus,
 )
+from app.models.parameter import Scenario
 from app.models.user import User
 from app.services.pdf_generator import PDFReportGenerator
+from app.services.report_fingerprint import report_fingerprint
+from app.services.report_storage import delete_report_artifact, open_report_sink
 from app.services.excel_exporter import ExcelExporter
+from app.services.report_bundle import (
+    BUNDLE_FORMATS,
+    render_bundle,
+    safe_filename,
+    throughput,
+    write_bundle_zip,
+)
 from app.services.dashboard_metrics import DashboardMetricsService
 from app.core.config import settings
+from app.core.websocket import publish_report_progress
+
+# Celery queue per report lane, so scheduled bulk runs never hold up
+# exports a user is waiting for
+REPORT_LANES = {"interactive": "reports", "bulk": "reports_bulk"}
+
+REUSED_STEP = "Reused unchanged report"
+
+
+def render_report_file(
+    export_format: ExportFormat,
+    financial_data: Dict[str, Any],
+    template_config: Optional[Dict[str, Any]],
+    branding_config: Optional[Dict[str, Any]],
+    name: str,
+) -> Tuple[str, int]:
+    """
+    Render a report in the report worker, straight into report storage.
+
+    Returns:
+        (storage location, size in bytes) of the report
+    """
+    if export_format not in BUNDLE_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    with open_report_sink(f"{name}.{BUNDLE_FORMATS[export_format]}") as sink:
+        if export_format == ExportFormat.PDF:
+            PDFReportGenerator().generate_financial_report(
+                financial_data, template_config, branding_config, output=sink
+            )
+        elif export_format == ExportFormat.EXCEL:
+            ExcelExporter().export_financial_data(
+                financial_data, template_config, output=sink
+            )
+        else:
+            # Export raw data as CSV
+            ExcelExporter().export_raw_data_csv(
+                financial_data.get("raw_data", []), output=sink
+            )
+    return sink.location, sink.size
+
+
+def _metric_values(metrics: Union[List[Dict[str, Any]], Dict[str, Any]]) -> Dict:
+    """Map metric names to values; dashboard views return metric lists."""
+    if isinstance(metrics, dict):
+        return metrics
+    return {metric["name"]: metric["value"] for metric in metrics if "name" in metric}
 
 
 class ReportService:
@@ -188,73 +246,392 @@ class ReportService:
         source_file_ids: Optional[List[int]] = None,
         custom_config: Optional[Dict[str, Any]] = None,
         name: Optional[str] = None,
+        priority: str = "interactive",
+        schedule_id: Optional[int] = None,
     ) -> ReportExport:
-        """Generate a report based on template and data."""
+        """
+        Queue a report for background generation.
+
+        Returns the PENDING export record, which tracks the job's status and
+        progress. ``priority`` selects the queue lane: "interactive" for
+        user-requested exports, "bulk" for scheduled runs.
+
+        When an earlier export was generated from identical inputs (same
+        input fingerprint), its file is reused and the record is returned
+        already COMPLETED, without queueing a job.
+        """
+        if priority not in REPORT_LANES:
+            raise ValueError(f"Unknown report priority: {priority}")
 
         # Create export record
         export_record = ReportExport(
             name=name or f"Report_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
             export_format=export_format,
             template_id=template_id,
+            schedule_id=schedule_id,
             generation_config=custom_config or {},
             source_file_ids=source_file_ids or [],
             created_by=user_id,
             status=ReportStatus.PENDING,
+            priority=priority,
+            progress=0,
+            current_step="Queued",
         )
 
+        export_record.input_fingerprint = self._fingerprint(export_record)
         self.db.add(export_record)
         self.db.commit()
         self.db.refresh(export_record)
 
+        reused = self._reuse_artifact(export_record)
+        if reused:
+            now = datetime.utcnow()
+            export_record.status = ReportStatus.COMPLETED
+            export_record.file_path, export_record.file_size = reused
+            export_record.processing_started_at = now
+            export_record.processing_completed_at = now
+            export_record.processing_duration_seconds = 0
+            export_record.expires_at = now + timedelta(days=30)
+            export_record.progress = 100
+            export_record.current_step = REUSED_STEP
+            self.db.commit()
+            self.db.refresh(export_record)
+            return export_record
+
+        # Imported here, the task module imports this service
+        from app.tasks.report_generation import generate_report_export
+
+        try:
+            task = generate_report_export.apply_async(
+                args=[export_record.id], queue=REPORT_LANES[priority]
+            )
+        except Exception as e:
+            export_record.status = ReportStatus.FAILED
+            export_record.error_message = f"Failed to queue report: {str(e)}"
+            self.db.commit()
+            raise
+
+        export_record.task_id = task.id
+        self.db.commit()
+        self.db.refresh(export_record)
+        return export_record
+
+    def _fingerprint(self, export_record: ReportExport) -> Optional[str]:
+        return report_fingerprint(
+            self.db,
+            export_record.created_by,
+            export_record.export_format,
+            export_record.template_id,
+            export_record.source_file_ids,
+            export_record.generation_config,
+        )
+
+    def _matching_export(self, export_record: ReportExport) -> Optional[ReportExport]:
+        """Latest completed export with the same inputs whose file still exists."""
+        if not export_record.input_fingerprint:
+            return None
+
+        candidates = (
+            self.db.query(ReportExport)
+            .filter(
+                ReportExport.input_fingerprint == export_record.input_fingerprint,
+                ReportExport.created_by == export_record.created_by,
+                ReportExport.status == ReportStatus.COMPLETED,
+                ReportExport.id != export_record.id,
+                or_(
+                    ReportExport.expires_at == None,
+                    ReportExport.expires_at > datetime.utcnow(),
+                ),
+            )
+            .order_by(ReportExport.id.desc())
+            .limit(5)
+            .all()
+        )
+        for candidate in candidates:
+            if candidate.file_path and os.path.exists(candidate.file_path):
+                return candidate
+        return None
+
+    def _reuse_artifact(self, export_record: ReportExport) -> Optional[Tuple[str, int]]:
+        """
+        Copy of the file of an earlier export with the same inputs.
+
+        Returns:
+            (file path, size in bytes), or None when there is no such export
+            or its file can no longer be copied
+        """
+        source = self._matching_export(export_record)
+        if source is None:
+            return None
+        try:
+            file_path = self._copy_artifact(source, export_record)
+            return file_path, os.path.getsize(file_path)
+        except OSError:
+            # Removed or unreadable since it was matched; generate afresh
+            return None
+
+    def _copy_artifact(self, source: ReportExport, export_record: ReportExport) -> str:
+        """
+        Give an export its own copy of another export's file.
+
+        A hard link where the filesystem allows, so the copy is free and
+        deleting either export leaves the other's file in place.
+        """
+        source_path = Path(source.file_path)
+        name = f"{safe_filename(export_record.name)}_{export_record.id}"
+        target_path = source_path.with_name(f"{name}{source_path.suffix}")
+        try:
+            os.link(source_path, target_path)
+        except OSError:
+            shutil.copyfile(source_path, target_path)
+        return str(target_path)
+
+    async def generate_bundle(
+        self,
+        user_id: int,
+        export_format: ExportFormat,
+        targets: List[Dict[str, Any]],
+        template_id: Optional[int] = None,
+        custom_config: Optional[Dict[str, Any]] = None,
+        name: Optional[str] = None,
+    ) -> ReportExport:
+        """
+        Queue one report per target as a single bundle job on the bulk lane.
+
+        Each target is a dict with an optional ``file_id`` or ``scenario_id``
+        (a scenario reports on its base file), a ``period`` and an optional
+        ``name``. The result is a ZIP export holding every report and a
+        ``manifest.json``.
+        """
+        if export_format not in BUNDLE_FORMATS:
+            raise ValueError(f"Unsupported bundle format: {export_format}")
+        if not targets:
+            raise ValueError("A bundle needs at least one target")
+
+        file_ids = [t["file_id"] for t in targets if t.get("file_id")]
+        return await self.generate_report(
+            user_id=user_id,
+            export_format=ExportFormat.ZIP,
+            template_id=template_id,
+            source_file_ids=list(dict.fromkeys(file_ids)),
+            custom_config={
+                **(custom_config or {}),
+                "bundle": {"format": export_format.value, "targets": targets},
+            },
+            name=name or f"Bundle_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            priority="bulk",
+        )
+
+    def _target_file_id(self, target: Dict[str, Any], user_id: int) -> Optional[int]:
+        """Source file of a bundle target; scenarios report on their base file."""
+        if target.get("scenario_id"):
+            scenario = (
+                self.db.query(Scenario.base_file_id)
+                .filter(
+                    Scenario.id == target["scenario_id"],
+                    Scenario.created_by_id == user_id,
+                )
+                .first()
+            )
+            if not scenario:
+                raise ValueError(f"Scenario {target['scenario_id']} not found")
+            return scenario.base_file_id
+        return target.get("file_id")
+
+    async def _build_bundle(
+        self,
+        export_record: ReportExport,
+        template_config: Optional[Dict[str, Any]],
+        branding_config: Optional[Dict[str, Any]],
+        progress: Callable[[int, str], None],
+    ) -> Tuple[str, int]:
+        """
+        Render every target of a bundle export and archive them in a ZIP.
+
+        Returns:
+            (storage location, size in bytes) of the ZIP
+        """
+        started = time.perf_counter()
+        config = dict(export_record.generation_config or {})
+        bundle = config.pop("bundle")
+        export_format = ExportFormat(bundle["format"])
+        user_id = export_record.created_by
+
+        # Data is gathered here, where the session lives; the shared context
+        # loads each source file once however many periods use it
+        entries: List[Dict[str, Any]] = []
+        results: List[Any] = []
+        jobs = []
+        for index, target in enumerate(bundle["targets"]):
+            period = target.get("period") or config.get("period", "YTD")
+            name = target.get("name") or f"{export_record.name}_{index + 1}"
+            entries.append(
+                {
+                    "index": index,
+                    "name": name,
+                    "file_id": target.get("file_id"),
+                    "scenario_id": target.get("scenario_id"),
+                    "period": period,
+                }
+            )
+            results.append((None, None))
+            try:
+                file_id = self._target_file_id(target, user_id)
+                financial_data = await self._gather_financial_data(
+                    user_id,
+                    [file_id] if file_id else None,
+                    {**config, "period": period},
+                )
+            except Exception as e:
+                results[index] = (None, str(e))
+                continue
+            jobs.append((index, name, financial_data))
+
+        total = len(entries)
+        progress(30, f"Rendering {total} reports")
+        output_dir = (
+            Path(settings.UPLOAD_FOLDER) / "reports" / f"bundle_{export_record.id}"
+        )
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        rendered = render_bundle(
+            jobs,
+            export_format,
+            template_config,
+            branding_config,
+            str(output_dir),
+            on_rendered=lambda done: progress(
+                30 + 60 * done // total, f"Rendered {done} of {total} reports"
+            ),
+        )
+        for (index, _, _), result in zip(jobs, rendered):
+            results[index] = result
+        reports_per_minute = throughput(total, started)
+
+        if all(error for _, error in results):
+            shutil.rmtree(output_dir, ignore_errors=True)
+            raise RuntimeError(f"All bundle reports failed: {results[0][1]}")
+
+        progress(95, "Writing bundle")
+        try:
+            # The export id keeps bundles of the same name from different
+            # users (or runs) apart in shared report storage
+            filename = f"{safe_filename(export_record.name)}_{export_record.id}.zip"
+            with open_report_sink(filename) as sink:
+                manifest = write_bundle_zip(
+                    sink,
+                    {
+                        "bundle_id": export_record.id,
+                        "name": export_record.name,
+                        "format": export_format.value,
+                        "template_id": export_record.template_id,
+                        "reports_per_minute": reports_per_minute,
+                    },
+                    entries,
+                    results,
+                )
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+        bundle.update(
+            report_count=manifest["report_count"],
+            failed_count=manifest["failed_count"],
+            reports_per_minute=reports_per_minute,
+        )
+        export_record.generation_config = {**config, "bundle": bundle}
+        return sink.location, sink.size
+
+    async def run_export(
+        self,
+        export_id: int,
+        on_progress: Optional[Callable[[int, str], None]] = None,
+    ) -> Optional[ReportExport]:
+        """
+        Generate the file for a queued export; runs in the report worker.
+
+        Progress is stored on the export record and pushed to the owner's
+        websocket subscribers. Cancelled and already completed exports are
+        returned untouched, so a redelivered task does not rebuild the file.
+        """
+        export_record = (
+            self.db.query(ReportExport).filter(ReportExport.id == export_id).first()
+        )
+        if not export_record or export_record.status in (
+            ReportStatus.CANCELLED,
+            ReportStatus.COMPLETED,
+        ):
+            return export_record
+
+        def progress(percent: int, step: str) -> None:
+            export_record.progress = percent
+            export_record.current_step = step
+            self.db.commit()
+            publish_report_progress(
+                export_id,
+                {
+                    "status": export_record.status.value,
+                    "progress": percent,
+                    "current_step": step,
+                    "error_message": export_record.error_message,
+                },
+                export_record.created_by,
+            )
+            if on_progress:
+                on_progress(percent, step)
+
         try:
             # Update status to processing
             export_record.status = ReportStatus.PROCESSING
             export_record.processing_started_at = datetime.utcnow()
-            self.db.commit()
+            export_record.error_message = None
+            completed_step = "Completed"
+            progress(10, "Gathering financial data")
 
             # Get template configuration
             template_config = None
             branding_config = None
 
-            if template_id:
-                template = self.get_template(template_id, user_id)
+            if export_record.template_id:
+                template = self.get_template(
+                    export_record.template_id, export_record.created_by
+                )
                 if template:
                     template_config = template.template_config
                     branding_config = template.branding_config
 
-            # Gather financial data
-            financial_data = await self._gather_financial_data(
-                user_id, source_file_ids, custom_config
-            )
+            # Inputs may have changed since the job was queued
+            export_record.input_fingerprint = self._fingerprint(export_record)
+            reused = self._reuse_artifact(export_record)
 
-            # Generate report based on format
-            if export_format == ExportFormat.PDF:
-                file_path = self.pdf_generator.generate_financial_report(
-                    financial_data,
-                    template_config,
-                    branding_config,
-                    f"{export_record.name}.pdf",
+            if reused:
+                file_path, file_size = reused
+                completed_step = REUSED_STEP
+            elif export_record.export_format == ExportFormat.ZIP:
+                file_path, file_size = await self._build_bundle(
+                    export_record, template_config, branding_config, progress
                 )
-            elif export_format == ExportFormat.EXCEL:
-                file_path = self.excel_exporter.export_financial_data(
+            else:
+                # Gather financial data
+                financial_data = await self._gather_financial_data(
+                    export_record.created_by,
+                    export_record.source_file_ids,
+                    export_record.generation_config,
+                )
+                progress(40, "Rendering report")
+
+                file_path, file_size = render_report_file(
+                    export_record.export_format,
                     financial_data,
                     template_config,
-                    filename=f"{export_record.name}.xlsx",
-                )
-            elif export_format == ExportFormat.CSV:
-                # Export raw data as CSV
-                raw_data = financial_data.get("raw_data", [])
-                file_path = self.excel_exporter.export_raw_data_csv(
-                    raw_data, filename=f"{export_record.name}.csv"
+                    branding_config,
+                    export_record.name,
                 )
-            else:
-                raise ValueError(f"Unsupported export format: {export_format}")
 
             # Update export record with success
             export_record.status = ReportStatus.COMPLETED
             export_record.processing_completed_at = datetime.utcnow()
             export_record.file_path = file_path
-            export_record.file_size = os.path.getsize(file_path)
+            export_record.file_size = file_size
             export_record.processing_duration_seconds = int(
                 (
                     export_record.processing_completed_at
@@ -264,9 +641,11 @@ class ReportService:
 
             # Set expiration (30 days from now)
             export_record.expires_at = datetime.utcnow() + timedelta(days=30)
+            progress(100, completed_step)
 
         except Exception as e:
             # Update export record with failure
+            self.db.rollback()
             export_record.status = ReportStatus.FAILED
             export_record.processing_completed_at = datetime.utcnow()
             export_record.error_message = str(e)
@@ -277,8 +656,8 @@ class ReportService:
                         - export_record.processing_started_at
                     ).total_seconds()
                 )
+            progress(export_record.progress or 0, "Failed")
 
-        self.db.commit()
         self.db.refresh(export_record)
         return export_record
 
@@ -293,17 +672,14 @@ class ReportService:
         period = custom_config.get("period", "YTD") if custom_config else "YTD"
         file_id = source_file_ids[0] if source_file_ids else None
 
-        # Get dashboard metrics
-        overview_data = await self.dashboard_service.get_overview_metrics(
-            user_id, period, file_id
-        )
-        pl_data = await self.dashboard_service.get_pl_metrics(user_id, period, file_id)
-        cf_data = await self.dashboard_service.get_cash_flow_metrics(
-            user_id, period, file_id
-        )
-        bs_data = await self.dashboard_service.get_balance_sheet_metrics(
+        # Load the source once and build all statement views from it
+        views = await self.dashboard_service.get_statement_views(
             user_id, period, file_id
         )
+        overview_data = views["overview"]
+        pl_data = views["pl"]
+        cf_data = views["cash_flow"]
+        bs_data = views["balance_sheet"]
 
         # Compile comprehensive data
         financial_data = {
@@ -317,10 +693,10 @@ class ReportService:
                 ],
             },
             "metrics": {
-                **overview_data.get("key_metrics", {}),
-                **pl_data.get("metrics", {}),
-                **cf_data.get("metrics", {}),
-                **bs_data.get("metrics", {}),
+                **_metric_values(overview_data.get("key_metrics", [])),
+                **_metric_values(pl_data.get("metrics", [])),
+                **_metric_values(cf_data.get("metrics", [])),
+                **_metric_values(bs_data.get("metrics", [])),
             },
             "charts": {
                 **pl_data.get("charts", {}),
@@ -423,9 +799,9 @@ class ReportService:
             return False
 
         # Delete file if it exists
-        if export.file_path and os.path.exists(export.file_path):
+        if export.file_path:
             try:
-                os.remove(export.file_path)
+                delete_report_artifact(export.file_path)
             except Exception as e:
                 print(f"Error deleting file {export.file_path}: {e}")
 
@@ -0,0 +1,220 @@
+import base64
+import io
+import mimetypes
+import os
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.config import settings
+from app.services.cloud_storage import (
+    AZURE_AVAILABLE,
+    AzureBlobStorageService,
+    CloudStorageManager,
+    S3StorageService,
+)
+
+if AZURE_AVAILABLE:
+    from azure.storage.blob import ContentSettings
+
+
+class ReportSink(io.RawIOBase):
+    """
+    Write-only stream that stores a report while it is being generated.
+
+    Writes are buffered into parts of ``part_size`` bytes, each handed to
+    the storage backend as soon as it fills. Closing the sink stores the
+    last part and completes the upload; leaving a ``with`` block on an
+    exception aborts it, so a failed report never leaves a partial artifact.
+    """
+
+    def __init__(self, location: str, part_size: Optional[int] = None):
+        self.location = location
+        self.part_size = part_size or settings.REPORT_STORAGE_PART_SIZE
+        self.size = 0
+        self.parts = 0
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self.size += len(data)
+        while len(self._buffer) >= self.part_size:
+            self._store_part(bytes(self._buffer[: self.part_size]))
+            del self._buffer[: self.part_size]
+        return len(data)
+
+    def _store_part(self, data: bytes):
+        self._upload_part(data)
+        self.parts += 1
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._buffer or not self.parts:
+                self._store_part(bytes(self._buffer))
+                self._buffer.clear()
+            self._complete()
+        except Exception:
+            self._abort()
+            raise
+        finally:
+            super().close()
+
+    def abort(self):
+        """Discard everything written so far."""
+        if self.closed:
+            return
+        try:
+            self._abort()
+        finally:
+            self._buffer.clear()
+            super().close()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    def _upload_part(self, data: bytes):
+        raise NotImplementedError
+
+    def _complete(self):
+        raise NotImplementedError
+
+    def _abort(self):
+        raise NotImplementedError
+
+
+class LocalFileSink(ReportSink):
+    """Writes to a ``.part`` file, renamed into place once complete."""
+
+    def __init__(self, path: Path, part_size: Optional[int] = None):
+        super().__init__(str(path), part_size)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._partial = self.path.with_name(self.path.name + ".part")
+        self._file = open(self._partial, "wb")
+
+    def _upload_part(self, data: bytes):
+        self._file.write(data)
+
+    def _complete(self):
+        self._file.close()
+        os.replace(self._partial, self.path)
+
+    def _abort(self):
+        self._file.close()
+        self._partial.unlink(missing_ok=True)
+
+
+class S3MultipartSink(ReportSink):
+    """Uploads to S3 with a multipart upload, one part per buffer."""
+
+    def __init__(self, client, bucket: str, key: str, part_size: Optional[int] = None):
+        super().__init__(f"s3://{bucket}/{key}", part_size)
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        content_type, _ = mimetypes.guess_type(key)
+        self.upload_id = client.create_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            ContentType=content_type or "application/octet-stream",
+            ServerSideEncryption="AES256",
+        )["UploadId"]
+        self.etags: List[dict] = []
+
+    def _upload_part(self, data: bytes):
+        number = len(self.etags) + 1
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=number,
+            Body=data,
+        )
+        self.etags.append({"ETag": response["ETag"], "PartNumber": number})
+
+    def _complete(self):
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.etags},
+        )
+
+    def _abort(self):
+        self.client.abort_multipart_upload(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id
+        )
+
+
+class AzureBlockSink(ReportSink):
+    """Stages one Azure block per buffer and commits the block list at the end."""
+
+    def __init__(self, blob_client, container: str, blob: str, part_size=None):
+        super().__init__(f"azure://{container}/{blob}", part_size)
+        self.blob_client = blob_client
+        self.content_type = mimetypes.guess_type(blob)[0] or "application/octet-stream"
+        self.block_ids: List[str] = []
+
+    def _upload_part(self, data: bytes):
+        block_id = base64.b64encode(f"{len(self.block_ids):08d}".encode()).decode()
+        self.blob_client.stage_block(block_id, data)
+        self.block_ids.append(block_id)
+
+    def _complete(self):
+        self.blob_client.commit_block_list(
+            self.block_ids,
+            content_settings=ContentSettings(content_type=self.content_type),
+        )
+
+    def _abort(self):
+        # Uncommitted blocks are discarded by Azure after a week
+        pass
+
+
+def open_report_sink(filename: str) -> ReportSink:
+    """
+    Open a sink for a report in the configured storage provider.
+
+    Reports are stored under ``reports/``; with local storage (the default,
+    and the fallback when cloud storage is unavailable) that is a directory
+    in UPLOAD_FOLDER.
+    """
+    key = f"reports/{filename}"
+    storage = CloudStorageManager().storage_provider
+    if isinstance(storage, S3StorageService):
+        return S3MultipartSink(storage.s3_client, storage.bucket_name, key)
+    if isinstance(storage, AzureBlobStorageService):
+        blob_client = storage.blob_service_client.get_blob_client(
+            container=storage.container_name, blob=key
+        )
+        return AzureBlockSink(blob_client, storage.container_name, key)
+    return LocalFileSink(storage.storage_path / key)
+
+
+def delete_report_artifact(location: str) -> bool:
+    """Delete a stored report by the location its sink reported."""
+    scheme, _, path = location.partition("://")
+    if not path:
+        if os.path.exists(location):
+            os.remove(location)
+            return True
+        return False
+
+    bucket, _, key = path.partition("/")
+    storage = CloudStorageManager().storage_provider
+    if scheme == "s3" and isinstance(storage, S3StorageService):
+        storage.s3_client.delete_object(Bucket=bucket, Key=key)
+        return True
+    if scheme == "azure" and isinstance(storage, AzureBlobStorageService):
+        storage.blob_service_client.get_blob_client(
+            container=bucket, blob=key
+        ).delete_blob()
+        return True
+    return False
@@ -3,12 +3,19 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func
 from dataclasses import dataclass
+from fastapi.concurrency import run_in_threadpool
 import asyncio
+import logging
 
 from app.models.parameter import Scenario, Parameter, ParameterValue, CalculationAudit
 from app.models.file import UploadedFile
 from app.models.user import User
 from app.services.formula_engine import FormulaEngine, CalculationResult
+from app.core.executors import ExecutorBusyError, ExecutorTimeoutError, offload
+from app.core.response_cache import invalidate_user_responses
+from app.core.websocket import manager as websocket_manager
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -550,31 +557,18 @@ class ScenarioManager:
             self.db.commit()
 
             # Load workbook data
-            self.formula_engine.load_workbook_data(scenario.base_file.file_path)
+            await self._load_workbook(scenario.base_file.file_path)
 
             # Apply scenario parameter values
             await self._apply_scenario_values(scenario_id)
 
-            # Build dependency graph
-            dependency_graph = self.formula_engine.build_dependency_graph()
-
-            # Calculate all formulas
-            calculation_results = {}
-            cells_calculated = 0
-            formulas_evaluated = 0
-
-            for cell_ref in dependency_graph.calculation_order:
-                result = self.formula_engine.calculate_cell(cell_ref)
-                calculation_results[cell_ref] = {
-                    "value": result.value,
-                    "error": result.error,
-                    "data_type": result.data_type,
-                    "calculation_time": result.calculation_time,
-                }
-
-                cells_calculated += 1
-                if result.error is None:
-                    formulas_evaluated += 1
+            # Build the dependency graph and calculate all formulas
+            (
+                dependency_graph,
+                calculation_results,
+                cells_calculated,
+                formulas_evaluated,
+            ) = await self._evaluate_formulas()
 
             # Update scenario with results
             scenario.calculation_results = calculation_results
@@ -589,6 +583,21 @@ class ScenarioManager:
             audit.formulas_evaluated = formulas_evaluated
 
             self.db.commit()
+            await run_in_threadpool(invalidate_user_responses, user_id)
+
+            # Push the recalculated values to connected clients
+            try:
+                await websocket_manager.broadcast_scenario_results(
+                    scenario_id,
+                    {
+                        cell: result["value"]
+                        for cell, result in calculation_results.items()
+                    },
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Failed to push results for scenario {scenario_id}: {e}"
+                )
 
             return {
                 "scenario_id": scenario_id,
@@ -612,8 +621,44 @@ class ScenarioManager:
 
             self.db.commit()
 
+            if isinstance(e, (ExecutorBusyError, ExecutorTimeoutError)):
+                raise
             raise Exception(f"Scenario calculation failed: {str(e)}")
 
+    # The formula engine is mutated in place, so these run on the shared
+    # thread pool rather than in a separate process.
+    @offload("io")
+    def _load_workbook(self, file_path: str) -> None:
+        self.formula_engine.load_workbook_data(file_path)
+
+    @offload("io")
+    def _evaluate_formulas(self) -> Tuple[Any, Dict[str, Dict[str, Any]], int, int]:
+        dependency_graph = self.formula_engine.build_dependency_graph()
+
+        calculation_results = {}
+        cells_calculated = 0
+        formulas_evaluated = 0
+
+        for cell_ref in dependency_graph.calculation_order:
+            result = self.formula_engine.calculate_cell(cell_ref)
+            calculation_results[cell_ref] = {
+                "value": result.value,
+                "error": result.error,
+                "data_type": result.data_type,
+                "calculation_time": result.calculation_time,
+            }
+
+            cells_calculated += 1
+            if result.error is None:
+                formulas_evaluated += 1
+
+        return (
+            dependency_graph,
+            calculation_results,
+            cells_calculated,
+            formulas_evaluated,
+        )
+
     async def create_scenario_template(
         self,
         name: str,
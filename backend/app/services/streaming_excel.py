@@ -0,0 +1,192 @@
+import math
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Sequence, Union
+
+from xlsxwriter import Workbook
+
+CURRENCY_KEYWORDS = ("revenue", "profit", "cost", "expense", "cash", "amount")
+PERCENTAGE_KEYWORDS = ("percentage", "rate")
+
+CURRENCY_FORMAT = '"$"#,##0.00_);("$"#,##0.00)'
+NUMBER_FORMAT = "#,##0.00"
+PERCENTAGE_FORMAT = "0.00%"
+DATE_FORMAT = "yyyy-mm-dd"
+
+# A row is either a sequence of values in column order or a dict keyed by column
+Row = Union[Sequence[Any], Dict[str, Any]]
+
+
+def column_kind(column_name: str) -> str:
+    """Number format kind for a column, inferred from its name."""
+    name = str(column_name).lower()
+    if any(keyword in name for keyword in CURRENCY_KEYWORDS):
+        return "currency"
+    if any(keyword in name for keyword in PERCENTAGE_KEYWORDS):
+        return "percentage"
+    return "number"
+
+
+def _display_width(value: Any) -> int:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Numbers display with two decimals and room for a currency sign
+        return len(f"{value:,.2f}") + 1 if math.isfinite(value) else 7
+    if isinstance(value, (datetime, date)):
+        return 10
+    return len(str(value))
+
+
+class StreamingSheet:
+    """
+    Worksheet written strictly top to bottom.
+
+    Each row is flushed to disk as soon as the next one starts, so only the
+    current row is held in memory. Column widths are tracked while writing
+    and applied when the workbook is closed.
+    """
+
+    def __init__(self, writer: "StreamingExcelWriter", worksheet):
+        self.writer = writer
+        self.worksheet = worksheet
+        self.row = 0
+        self.widths: List[int] = []
+
+    def track_width(self, col: int, width: int):
+        if col >= len(self.widths):
+            self.widths.extend([0] * (col + 1 - len(self.widths)))
+        if width > self.widths[col]:
+            self.widths[col] = width
+
+    def write_title(self, text: str, style: str = "title", skip: int = 2):
+        """Write a heading in column A, leaving ``skip`` rows below it."""
+        self.worksheet.write_string(self.row, 0, text, self.writer.formats[style])
+        self.row += skip
+
+    def write_header(self, labels: Sequence[str]):
+        header_format = self.writer.formats["header"]
+        for col, label in enumerate(labels):
+            self.worksheet.write_string(self.row, col, label, header_format)
+            self.track_width(col, len(label))
+        self.row += 1
+
+    def write_rows(
+        self,
+        rows: Iterable[Row],
+        columns: Sequence[str],
+        column_kinds: Optional[Sequence[str]] = None,
+    ) -> int:
+        """
+        Write data rows below the current position.
+
+        Numeric cells take the number format of their column; the formats are
+        resolved once per column rather than once per cell.
+
+        Returns:
+            Number of rows written
+        """
+        formats = self.writer.formats
+        kinds = column_kinds or [column_kind(column) for column in columns]
+        number_formats = [formats[kind] for kind in kinds]
+        text_format = formats["text"]
+        date_format = formats["date"]
+        worksheet = self.worksheet
+        widths = self.widths
+        self.track_width(len(columns) - 1, 0)
+
+        start = self.row
+        row_idx = start
+        for row in rows:
+            if isinstance(row, dict):
+                values = [row.get(column) for column in columns]
+            else:
+                values = row
+            for col, value in enumerate(values):
+                if value is None:
+                    worksheet.write_blank(row_idx, col, None, text_format)
+                    continue
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    worksheet.write_number(row_idx, col, value, number_formats[col])
+                elif isinstance(value, (datetime, date)):
+                    worksheet.write_datetime(row_idx, col, value, date_format)
+                else:
+                    worksheet.write(row_idx, col, value, text_format)
+                width = _display_width(value)
+                if width > widths[col]:
+                    widths[col] = width
+            row_idx += 1
+
+        self.row = row_idx
+        return row_idx - start
+
+    def write_table(
+        self,
+        rows: Iterable[Row],
+        columns: Sequence[str],
+        labels: Optional[Sequence[str]] = None,
+        column_kinds: Optional[Sequence[str]] = None,
+    ) -> int:
+        """Write a header row followed by data rows; returns the data row count."""
+        self.write_header(labels or list(columns))
+        return self.write_rows(rows, columns, column_kinds)
+
+    def skip(self, rows: int = 1):
+        self.row += rows
+
+    def apply_widths(self):
+        for col, width in enumerate(self.widths):
+            self.worksheet.set_column(col, col, min(width + 2, self.writer.max_width))
+
+
+class StreamingExcelWriter:
+    """
+    Constant-memory Excel writer built on xlsxwriter.
+
+    Sheets must be written in order and rows within a sheet top to bottom;
+    memory use stays flat regardless of row count. ``path`` may also be a
+    binary stream, which receives the finished workbook on close.
+    """
+
+    def __init__(self, path: Union[str, Path, BinaryIO], max_width: int = 50):
+        self.path = path if hasattr(path, "write") else Path(path)
+        self.max_width = max_width
+        self.workbook = Workbook(
+            self.path if hasattr(path, "write") else str(self.path),
+            {"constant_memory": True, "nan_inf_to_errors": True},
+        )
+        self.sheets: List[StreamingSheet] = []
+
+        add_format = self.workbook.add_format
+        self.formats = {
+            "title": add_format({"bold": True, "font_size": 16}),
+            "section": add_format({"bold": True, "font_size": 14}),
+            "label": add_format({"bold": True}),
+            "header": add_format(
+                {
+                    "bold": True,
+                    "font_color": "#FFFFFF",
+                    "bg_color": "#366092",
+                    "border": 1,
+                }
+            ),
+            "text": add_format({"border": 1}),
+            "date": add_format({"border": 1, "num_format": DATE_FORMAT}),
+            "currency": add_format({"border": 1, "num_format": CURRENCY_FORMAT}),
+            "number": add_format({"border": 1, "num_format": NUMBER_FORMAT}),
+            "percentage": add_format({"border": 1, "num_format": PERCENTAGE_FORMAT}),
+        }
+
+    def add_sheet(self, name: str) -> StreamingSheet:
+        sheet = StreamingSheet(self, self.workbook.add_worksheet(name))
+        self.sheets.append(sheet)
+        return sheet
+
+    def close(self):
+        for sheet in self.sheets:
+            sheet.apply_widths()
+        self.workbook.close()
+
+    def __enter__(self) -> "StreamingExcelWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
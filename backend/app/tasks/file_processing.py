@@ -1,14 +1,17 @@
 import json
 import traceback
+from pathlib import Path
 from typing import Dict, Any, Optional
 from celery import Task
 from sqlalchemy.orm import Session
 
 from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.response_cache import invalidate_user_responses
 from app.models.base import SessionLocal
 from app.models.file import UploadedFile, FileStatus
 from app.services.file_service import FileService
-from app.services.excel_parser import ExcelParser
+from app.services.excel_parser import ExcelParser, SheetResultCache
 from app.tasks.notifications import send_processing_notification
 from app.services.advanced_validator import AdvancedValidator
 
@@ -41,7 +44,9 @@ def process_uploaded_file(
         Dict with processing results
     """
     file_service = FileService(db)
-    excel_parser = ExcelParser()
+    excel_parser = ExcelParser(
+        sheet_cache=SheetResultCache(Path(settings.CACHE_FOLDER) / "sheets")
+    )
 
     try:
         # Update status to processing
@@ -70,6 +75,7 @@ def process_uploaded_file(
             file_id, "parsing", "Starting file parsing", "info"
         )
         parsed_data = excel_parser.parse_excel_file(file_record.file_path)
+        _record_sheet_fingerprints(file_service, file_record, parsed_data)
 
         # Validate against financial templates
         validator = AdvancedValidator()
@@ -178,6 +184,7 @@ def process_uploaded_file(
         if parsed_data_json:
             file_record.parsed_data = parsed_data_json
             db.commit()
+        file_service.finish_processing(file_record)
 
         # Log completion
         file_service.log_processing_step(
@@ -233,6 +240,7 @@ def process_uploaded_file(
         # Send error notification
         file_record = db.query(UploadedFile).filter(UploadedFile.id == file_id).first()
         if file_record:
+            invalidate_user_responses(file_record.uploaded_by_id)
             send_processing_notification.__wrapped__(
                 self, db, file_id, "failed", file_record.uploaded_by_id, error_message
             )
@@ -246,6 +254,36 @@ def process_uploaded_file(
         raise
 
 
+def _record_sheet_fingerprints(
+    file_service: FileService, file_record: UploadedFile, parsed_data: Any
+) -> None:
+    """Store per-sheet fingerprints and log which sheets were reparsed."""
+    fingerprints = getattr(parsed_data, "sheet_fingerprints", None)
+    if not isinstance(fingerprints, dict) or not fingerprints:
+        return
+
+    previous = {}
+    if isinstance(file_record.sheet_fingerprints, str):
+        try:
+            previous = json.loads(file_record.sheet_fingerprints)
+        except ValueError:
+            previous = {}
+
+    incremental = parsed_data.metadata.get("incremental", {})
+    changed_sheets = [
+        name for name, value in fingerprints.items() if previous.get(name) != value
+    ]
+    file_service.log_processing_step(
+        file_record.id,
+        "incremental",
+        f"Reused {len(incremental.get('reused_sheets', []))} of "
+        f"{len(fingerprints)} sheets",
+        "info",
+        json.dumps({**incremental, "changed_since_last_run": changed_sheets}),
+    )
+    file_record.sheet_fingerprints = json.dumps(fingerprints)
+
+
 @celery_app.task(
     bind=True, base=DatabaseTask, name="app.tasks.file_processing.reprocess_file"
 )
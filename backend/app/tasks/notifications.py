@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from app.core.celery_app import celery_app
+from app.core.websocket import publish_file_status
 from app.models.base import SessionLocal
 from app.models.file import UploadedFile
 from app.models.user import User
@@ -78,6 +79,17 @@ def send_processing_notification(
         elif status == "failed":
             print(f"  ❌ Processing failed: {error_message}")
 
+        # Push to any open sockets through the WebSocket backplane
+        publish_file_status(
+            file_id,
+            {
+                "status": status,
+                "processed_at": notification_data["processed_at"],
+                "error_message": error_message,
+            },
+            user_id,
+        )
+
         # TODO: Implement actual notification sending (email, push, etc.)
         # await send_email_notification(notification_data)
         # await send_push_notification(notification_data)
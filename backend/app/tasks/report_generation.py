@@ -0,0 +1,109 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict
+
+from celery.schedules import crontab
+
+from app.core.celery_app import celery_app
+from app.models.base import SessionLocal
+from app.models.report import ReportSchedule
+from app.services.report_service import ReportService
+
+
+@celery_app.task(bind=True, name="app.tasks.report_generation.generate_report_export")
+def generate_report_export(self, export_id: int) -> Dict[str, Any]:
+    """
+    Generate the file for a queued report export.
+
+    The ReportExport row is the job record: status and progress are written
+    to it as the report is built, so clients can poll the export or listen
+    on the websocket.
+
+    Args:
+        export_id: ID of the PENDING report export
+
+    Returns:
+        Dict with the final export status
+    """
+
+    def on_progress(percent: int, step: str) -> None:
+        self.update_state(
+            state="PROGRESS",
+            meta={"current": percent, "total": 100, "status": step},
+        )
+
+    with SessionLocal() as db:
+        export_record = asyncio.run(
+            ReportService(db).run_export(export_id, on_progress=on_progress)
+        )
+        if export_record is None:
+            raise ValueError(f"Report export with ID {export_id} not found")
+
+        return {
+            "export_id": export_id,
+            "status": export_record.status.value,
+            "file_path": export_record.file_path,
+            "error_message": export_record.error_message,
+        }
+
+
+def _next_run(cron_expression: str, last_run: datetime) -> datetime:
+    minute, hour, day_of_month, month_of_year, day_of_week = cron_expression.split()
+    schedule = crontab(
+        minute=minute,
+        hour=hour,
+        day_of_month=day_of_month,
+        month_of_year=month_of_year,
+        day_of_week=day_of_week,
+        nowfun=datetime.utcnow,
+    )
+    return last_run + schedule.remaining_estimate(last_run)
+
+
+@celery_app.task(name="app.tasks.report_generation.enqueue_scheduled_reports")
+def enqueue_scheduled_reports() -> Dict[str, Any]:
+    """Queue due report schedules on the bulk lane."""
+    now = datetime.utcnow()
+    queued = []
+    errors = []
+
+    with SessionLocal() as db:
+        service = ReportService(db)
+        due = (
+            db.query(ReportSchedule)
+            .filter(
+                ReportSchedule.is_active == True,
+                (ReportSchedule.next_run_at == None)
+                | (ReportSchedule.next_run_at <= now),
+            )
+            .all()
+        )
+
+        for schedule in due:
+            try:
+                export_record = asyncio.run(
+                    service.generate_report(
+                        user_id=schedule.created_by,
+                        export_format=schedule.export_format,
+                        template_id=schedule.template_id,
+                        custom_config=schedule.report_config,
+                        name=f"{schedule.name}_{now.strftime('%Y%m%d_%H%M')}",
+                        priority="bulk",
+                        schedule_id=schedule.id,
+                    )
+                )
+                queued.append(export_record.id)
+                schedule.run_count = (schedule.run_count or 0) + 1
+            except Exception as e:
+                errors.append(f"Schedule {schedule.id}: {str(e)}")
+                schedule.failure_count = (schedule.failure_count or 0) + 1
+
+            schedule.last_run_at = now
+            try:
+                schedule.next_run_at = _next_run(schedule.cron_expression, now)
+            except ValueError:
+                errors.append(f"Schedule {schedule.id}: invalid cron expression")
+                schedule.is_active = False
+            db.commit()
+
+    return {"queued_exports": queued, "errors": errors}
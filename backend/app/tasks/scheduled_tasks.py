@@ -34,9 +34,11 @@ def cleanup_expired_files(task=None, db_session: Session | None = None):
             with SessionLocal() as session:
                 service = FileService(session)
                 results = service.cleanup_expired_files()
+                stale_uploads = service.cleanup_stale_chunked_uploads()
         else:
             service = FileService(db_session)
             results = service.cleanup_expired_files()
+            stale_uploads = service.cleanup_stale_chunked_uploads()
 
         # Send notification if significant cleanup occurred
         if results.get("total_files_deleted", 0) > 0:
@@ -52,6 +54,7 @@ def cleanup_expired_files(task=None, db_session: Session | None = None):
             or results.get("files_deleted", 0),
             "total_storage_freed_mb": results.get("total_storage_freed_mb")
             or results.get("storage_freed_mb", 0),
+            "stale_chunked_uploads": stale_uploads,
             "error": None,
         }
         return results_dict
@@ -210,6 +213,11 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.scheduled_tasks.health_check",
         "schedule": crontab(minute="*/30"),
     },
+    # Queue due report schedules on the bulk lane every 5 minutes
+    "enqueue-scheduled-reports": {
+        "task": "app.tasks.report_generation.enqueue_scheduled_reports",
+        "schedule": crontab(minute="*/5"),
+    },
     # Update analytics cache every hour
     "update-analytics-cache": {
         "task": "app.tasks.scheduled_tasks.update_analytics_cache",
@@ -6,17 +6,20 @@ from fastapi.responses import JSONResponse
 import uvicorn
 
 from app.core.config import settings
+from app.core.executors import (
+    ExecutorBusyError,
+    ExecutorTimeoutError,
+    shutdown_executors,
+)
 from app.api.v1.api import api_router
 
-# from fastapi_cache import FastAPICache  # TODO: Fix fastapi-cache2 import
-# from fastapi_cache.backends.inmemory import InMemoryBackend  # TODO: Fix fastapi-cache2 import
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-    """Initialize FastAPI cache on startup."""
-    # FastAPICache.init(InMemoryBackend(), prefix="finvision-cache")  # TODO: Fix fastapi-cache2 setup
+    """Application startup/shutdown hooks."""
+    # Response caching is configured per endpoint, see app.core.response_cache
     yield
+    shutdown_executors(wait=False)
 
 
 app = FastAPI(
@@ -55,6 +58,23 @@ async def validation_exception_handler(request, exc):
     )
 
 
+@app.exception_handler(ExecutorBusyError)
+async def executor_busy_handler(request, exc):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "5"},
+    )
+
+
+@app.exception_handler(ExecutorTimeoutError)
+async def executor_timeout_handler(request, exc):
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={"detail": str(exc)},
+    )
+
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
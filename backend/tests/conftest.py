@@ -5,10 +5,10 @@ import asyncio
 from typing import AsyncGenerator, Generator
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-from app.models.base import Base, get_db
+from sqlalchemy.pool import NullPool, StaticPool
+from app.models.base import Base, get_async_db, get_db
 from app.core.config import settings
 from app.models.user import User
 from app.models.role import Role
@@ -32,6 +32,64 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    """Drop cached principals so user ids reused across test databases start cold."""
+    from app.core.principal_cache import principal_cache
+
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def in_memory_rate_limits():
+    """Give each test fresh, process-local rate limit buckets."""
+    from app.core.rate_limiter import InMemoryRateLimitBackend, set_rate_limit_backend
+
+    set_rate_limit_backend(InMemoryRateLimitBackend())
+    yield
+    set_rate_limit_backend(None)
+
+
+@pytest.fixture(autouse=True)
+def cache_folder(tmp_path, monkeypatch):
+    """Keep sheet and chart caches written by a test in its tmp_path."""
+    monkeypatch.setattr(settings, "CACHE_FOLDER", str(tmp_path / "cache"))
+
+
+@pytest.fixture(autouse=True)
+def in_memory_response_cache():
+    """Give each test an empty, process-local response cache."""
+    from app.core.response_cache import InMemoryResponseCache, set_response_cache
+
+    set_response_cache(InMemoryResponseCache())
+    yield
+    set_response_cache(None)
+
+
+@pytest.fixture(autouse=True)
+def thread_executors():
+    """Run offloaded work on threads so patches made by tests stay visible."""
+    from app.core.executors import ManagedExecutor, set_executor
+
+    for name in ("io", "cpu"):
+        set_executor(name, ManagedExecutor(name, "thread", max_workers=4))
+    yield
+    for name in ("io", "cpu"):
+        set_executor(name, None)
+
+
+@pytest.fixture(autouse=True)
+def queued_report_jobs(mocker):
+    """Record report jobs instead of sending them to the broker."""
+    task = mocker.patch(
+        "app.tasks.report_generation.generate_report_export.apply_async"
+    )
+    task.return_value.id = "report-task-id"
+    return task
+
+
 @pytest.fixture(scope="function")
 def test_db():
     """Create a temporary database for each test function."""
@@ -99,15 +157,28 @@ def client(test_db):
         finally:
             db.close()
 
-    # Override the dependency
+    # Async endpoints read the same database file through aiosqlite
+    async_session = async_sessionmaker(
+        create_async_engine(
+            f"sqlite+aiosqlite:///{engine.url.database}", poolclass=NullPool
+        ),
+        expire_on_commit=False,
+    )
+
+    async def override_get_async_db():
+        async with async_session() as db:
+            yield db
+
+    # Override the dependencies
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
 
     with TestClient(app) as c:
         yield c
 
-    # Clean up the override
-    if get_db in app.dependency_overrides:
-        del app.dependency_overrides[get_db]
+    # Clean up the overrides
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_async_db, None)
 
 
 @pytest.fixture
@@ -0,0 +1,54 @@
+"""
+Microbenchmark for per-request JWT verification overhead.
+
+Run from the backend directory:
+
+    python -m tests.performance.auth_overhead [requests] [tokens]
+
+Replays requests carrying a small pool of tokens, as a busy API worker
+sees them, and compares full signature verification on every request
+with the verified-token cache.
+"""
+import sys
+import time
+from datetime import timedelta
+
+from jose import jwt
+
+from app.core import security
+from app.core.config import settings
+
+
+def verify_uncached(token: str):
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    return payload.get("sub") if payload.get("type") == "access" else None
+
+
+def measure(verify, tokens, request_count: int) -> float:
+    start = time.perf_counter()
+    for i in range(request_count):
+        assert verify(tokens[i % len(tokens)]) is not None
+    return (time.perf_counter() - start) / request_count
+
+
+def run(request_count: int, token_count: int):
+    tokens = [
+        security.create_access_token(user_id, expires_delta=timedelta(minutes=30))
+        for user_id in range(token_count)
+    ]
+    security.verified_tokens.clear()
+
+    before = measure(verify_uncached, tokens, request_count)
+    after = measure(security.verify_token, tokens, request_count)
+
+    print(f"requests                 {request_count:>10,}")
+    print(f"distinct tokens          {token_count:>10,}")
+    print(f"full verification        {before * 1e6:>10.1f} us/request")
+    print(f"verified-token cache     {after * 1e6:>10.1f} us/request")
+    print(f"speedup                  {before / after:>10.1f} x")
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    tokens = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    run(requests, tokens)
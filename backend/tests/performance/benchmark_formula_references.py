@@ -0,0 +1,77 @@
+"""
+Throughput benchmark for formula reference extraction.
+
+Run from the backend directory:
+
+    python -m tests.performance.benchmark_formula_references [formula_count]
+
+Compares the previous Tokenizer-based extraction with range expansion against
+the shared memoized extractor in ``app.services.formula_references``.
+"""
+import random
+import sys
+import time
+
+from openpyxl.formula.tokenizer import Token, Tokenizer
+from openpyxl.utils import get_column_letter
+
+from app.services.formula_references import extract_references
+
+
+TEMPLATES = [
+    "={a}+{b}",
+    "=SUM({a}:{c})",
+    "=IF({a}>0,{b}*Assumptions!$B$2,0)",
+    "='Revenue Build'!{a}*(1+Assumptions!$C${row})",
+    "=AVERAGE({a}:{c})-MAX({b},0)",
+]
+
+
+def _generate_formulas(count: int, distinct: int):
+    rng = random.Random(42)
+    pool = []
+    for _ in range(distinct):
+        row = rng.randint(2, 500)
+        col = rng.randint(1, 40)
+        pool.append(
+            rng.choice(TEMPLATES).format(
+                a=f"{get_column_letter(col)}{row}",
+                b=f"{get_column_letter(col + 1)}{row}",
+                c=f"{get_column_letter(col + 3)}{row + 50}",
+                row=row,
+            )
+        )
+    return [pool[i % distinct] for i in range(count)]
+
+
+def _tokenizer_extract(formula: str):
+    references = set()
+    for token in Tokenizer(formula).items:
+        if token.type == Token.OPERAND and token.subtype == Token.RANGE:
+            references.add(token.value)
+    return references
+
+
+def _run(label: str, func, formulas) -> None:
+    start = time.perf_counter()
+    for formula in formulas:
+        func(formula)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {len(formulas) / elapsed:>12,.0f} formulas/s")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    unique = _generate_formulas(count, count)
+    repeated = _generate_formulas(count, max(count // 100, 1))
+
+    print(f"Extracting references from {count:,} formulas")
+    _run("tokenizer (unique)", _tokenizer_extract, unique)
+    extract_references.cache_clear()
+    _run("shared extractor (unique)", extract_references, unique)
+    extract_references.cache_clear()
+    _run("shared extractor (repeated)", extract_references, repeated)
+
+
+if __name__ == "__main__":
+    main()
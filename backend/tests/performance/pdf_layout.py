@@ -0,0 +1,107 @@
+"""
+Throughput benchmark for compiled PDF report layouts.
+
+Run from the backend directory:
+
+    python -m tests.performance.pdf_layout [reports] [rows]
+
+Renders a branded template of about 20 pages (logo, summary, metrics and
+detail tables) repeatedly, first compiling the layout for every report as
+uncached runs would, then reusing the compiled layout, and reports
+throughput in PDFs/second.
+"""
+import io
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from app.services.pdf_generator import PDFReportGenerator
+from app.services.pdf_layout import clear_layout_cache
+
+PAGE = re.compile(rb"/Type /Page\b(?!s)")
+
+
+def write_logo(path: Path):
+    # Photographic logos compress poorly, like real artwork
+    rng = random.Random(0)
+    image = Image.new("RGBA", (1200, 600))
+    image.putdata(
+        [
+            (x % 256, y % 256, rng.randrange(256), 255)
+            for y in range(600)
+            for x in range(1200)
+        ]
+    )
+    image.save(path)
+
+
+def report_data(index: int, rows: int):
+    return {
+        "summary": {
+            "overview": f"Entity {index} month-end pack",
+            "highlights": ["Revenue ahead of plan", "Costs in line"],
+        },
+        "metrics": {"revenue": 100000 + index, "profit": 20000 + index, "margin": 0.2},
+        "tables": {
+            f"ledger_{part}": [
+                {
+                    "account": f"{4000 + row}",
+                    "name": f"Account {row}",
+                    "actual": row * 100 + index,
+                    "budget": row * 95,
+                }
+                for row in range(rows)
+            ]
+            for part in range(4)
+        },
+    }
+
+
+def rate(report_count: int, started: float) -> float:
+    return report_count / (time.perf_counter() - started)
+
+
+def run(report_count: int, rows: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        logo = Path(tmp, "logo.png")
+        write_logo(logo)
+        branding = {"company_name": "Acme Group", "logo_path": str(logo)}
+        template = {"sections": ["summary", "metrics", "tables"]}
+        generator = PDFReportGenerator(output_dir=tmp)
+        jobs = [report_data(i, rows) for i in range(report_count)]
+
+        def render(data) -> bytes:
+            output = io.BytesIO()
+            generator.generate_financial_report(data, template, branding, output=output)
+            return output.getvalue()
+
+        pages = len(PAGE.findall(render(jobs[0])))
+
+        started = time.perf_counter()
+        for data in jobs:
+            clear_layout_cache()
+            render(data)
+        uncached = rate(report_count, started)
+
+        render(jobs[0])
+        started = time.perf_counter()
+        for data in jobs:
+            render(data)
+        compiled = rate(report_count, started)
+
+    print(f"reports                  {report_count:>10,}")
+    print(f"pages per report         {pages:>10,}")
+    print(f"layout per report        {uncached:>10.2f} PDFs/s")
+    print(f"compiled layout          {compiled:>10.2f} PDFs/s")
+    print(f"speedup                  {compiled / uncached:>10.1f} x")
+
+
+if __name__ == "__main__":
+    reports = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 180
+    run(reports, rows)
@@ -0,0 +1,85 @@
+"""
+Throughput benchmark for report bundles.
+
+Run from the backend directory:
+
+    python -m tests.performance.report_bundle [reports] [workers]
+
+Renders a month-end style batch of near-identical PDF reports, first one at
+a time with a fresh generator per report (as single report jobs do), then as
+a bundle sharing generators and chart images across worker processes, and
+reports throughput in reports/minute. Workers default to one per CPU;
+with a single worker the bundle renders in-process.
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from app.models.report import ExportFormat
+from app.services.pdf_generator import PDFReportGenerator
+from app.services.report_bundle import render_bundle
+
+
+def entity_data(index: int):
+    # Entities share the group-level charts and differ in their own figures
+    quarters = [{"period": f"Q{q}", "value": 1000 * q} for q in range(1, 5)]
+    return {
+        "summary": {"overview": f"Entity {index} month-end pack"},
+        "metrics": {"revenue": 100000 + index, "profit": 20000 + index},
+        "charts": {
+            "revenue_trend": quarters,
+            "expense_breakdown": quarters,
+            "asset_distribution": quarters,
+        },
+        "tables": {
+            "profit_loss": [
+                {"name": "Revenue", "value": 100000 + index},
+                {"name": "Costs", "value": 80000},
+            ]
+        },
+    }
+
+
+def rate(report_count: int, started: float) -> float:
+    return report_count * 60 / (time.perf_counter() - started)
+
+
+def run(report_count: int, workers: int):
+    jobs = [(i, f"Entity {i}", entity_data(i)) for i in range(report_count)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.UPLOAD_FOLDER = tmp
+        settings.CACHE_FOLDER = f"{tmp}/cache"
+
+        started = time.perf_counter()
+        for index, name, data in jobs:
+            PDFReportGenerator(output_dir=f"{tmp}/single").generate_financial_report(
+                data, filename=f"{index}.pdf"
+            )
+        single = rate(report_count, started)
+
+        # Start from a cold chart cache
+        for image in Path(tmp, "cache", "charts").glob("*"):
+            image.unlink()
+
+        started = time.perf_counter()
+        results = render_bundle(
+            jobs, ExportFormat.PDF, None, None, f"{tmp}/bundle", workers=workers
+        )
+        bundle = rate(report_count, started)
+        assert all(error is None for _, error in results)
+
+    print(f"reports                  {report_count:>10,}")
+    print(f"bundle workers           {workers:>10,}")
+    print(f"one job per report       {single:>10.1f} reports/min")
+    print(f"bundle                   {bundle:>10.1f} reports/min")
+    print(f"speedup                  {bundle / single:>10.1f} x")
+
+
+if __name__ == "__main__":
+    reports = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    run(reports, workers)
@@ -0,0 +1,94 @@
+"""
+Load harness for WebSocket fan-out with many simulated clients.
+
+Run from the backend directory:
+
+    python -m tests.performance.websocket_load [clients] [updates]
+
+Connects simulated clients to a ConnectionManager, a small share of them
+stalled, and pushes task progress plus system broadcasts. Reports how long
+the producer is blocked, how long healthy clients take to receive every
+update, and how many laggards were coalesced or disconnected.
+"""
+import asyncio
+import logging
+import random
+import sys
+import time
+
+from app.core.websocket import ConnectionManager
+from app.core.websocket_backplane import LocalBackplane
+
+
+class SimulatedClient:
+    def __init__(self, latency: float, stalled: bool):
+        self.latency = latency
+        self.stalled = stalled
+        self.received = 0
+        self.last_message_at = 0.0
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.stalled:
+            await asyncio.Event().wait()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.received += 1
+        self.last_message_at = time.perf_counter()
+
+    async def close(self, code=1000):
+        self.closed = True
+
+
+async def run(client_count: int, updates: int, stalled_share: float = 0.01):
+    rng = random.Random(7)
+    manager = ConnectionManager(LocalBackplane(), queue_size=64, send_timeout=2.0)
+    clients = []
+    for user_id in range(client_count):
+        client = SimulatedClient(
+            latency=rng.choice([0, 0, 0, 0.001, 0.005]),
+            stalled=rng.random() < stalled_share,
+        )
+        clients.append(client)
+        await manager.connect(client, user_id)
+        await manager.subscribe_to_task(user_id, "recalc")
+
+    start = time.perf_counter()
+    blocked = 0.0
+    for step in range(updates):
+        tick = time.perf_counter()
+        for user_id in range(client_count):
+            await manager.broadcast_task_progress(
+                "recalc", {"progress": (step + 1) * 100 // updates}, user_id
+            )
+        await manager.broadcast_system_message(f"tick {step}")
+        blocked += time.perf_counter() - tick
+
+    healthy = [client for client in clients if not client.stalled]
+    await manager.drain(timeout=30)
+    delivered_at = max(client.last_message_at for client in healthy)
+    await asyncio.sleep(manager.send_timeout + 0.5)
+
+    coalesced = sum(queue.coalesced for queue in manager.outbound.values())
+    print(f"clients                  {client_count:>10,}")
+    print(f"updates per client       {updates * 2:>10,}")
+    print(f"producer blocked         {blocked:>10.3f} s")
+    print(f"healthy clients done in  {delivered_at - start:>10.3f} s")
+    print(f"messages delivered       {sum(c.received for c in clients):>10,}")
+    print(f"progress coalesced       {coalesced:>10,}")
+    print(
+        f"laggards disconnected    {sum(c.closed for c in clients):>10,}"
+        f" / {sum(c.stalled for c in clients):,} stalled"
+    )
+    await manager.close()
+
+
+if __name__ == "__main__":
+    # Evictions are expected here; keep the report readable
+    logging.getLogger("app.core.websocket").setLevel(logging.ERROR)
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    updates = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    asyncio.run(run(clients, updates))
@@ -2,10 +2,13 @@ import pytest
 import json
 import tempfile
 import os
+from unittest.mock import patch
+
 from fastapi.testclient import TestClient
 from app.models.user import User
 from app.models.file import UploadedFile
 from app.core.security import get_password_hash
+from app.services.financial_snapshot import load_snapshot
 
 
 @pytest.mark.api
@@ -142,6 +145,174 @@ class TestFileEndpoints:
 
         assert response.status_code == 400
 
+    def test_upload_duplicate_reuses_processed_results(
+        self, authenticated_client, db_session, sample_excel_file
+    ):
+        """Test re-uploading identical content skips processing."""
+        from app.models.file import FileStatus
+        from app.models.financial import FileVersion
+
+        client, user = authenticated_client
+
+        def upload():
+            with open(sample_excel_file, "rb") as f:
+                files = {"file": ("model.xlsx", f, "application/octet-stream")}
+                return client.post("/api/v1/files/upload", files=files)
+
+        first = upload().json()
+        assert first["status"] == "uploaded"
+
+        original = db_session.get(UploadedFile, first["id"])
+        original.status = FileStatus.COMPLETED
+        original.is_valid = True
+        original.parsed_data = json.dumps(
+            {"sheets": [{"name": "P&L", "type": "profit_loss"}]}
+        )
+        db_session.commit()
+
+        with patch("app.services.file_service.invalidate_user_responses") as invalidate:
+            second = upload().json()
+        assert second["status"] == "completed"
+        assert second["id"] != first["id"]
+        invalidate.assert_called_with(user.id)
+
+        db_session.expire_all()
+        duplicate = db_session.get(UploadedFile, second["id"])
+        assert duplicate.parsed_data == original.parsed_data
+        assert duplicate.is_valid is True
+        hashes = {v.file_hash for v in db_session.query(FileVersion).all()}
+        assert len(hashes) == 1
+        # Completed like a processed file, snapshot included
+        assert load_snapshot(db_session, user.id, duplicate.id) is not None
+
+    def test_upload_duplicate_of_another_users_file_is_processed(
+        self, authenticated_client, db_session, sample_excel_file
+    ):
+        """Test processed results are only reused from the uploader's files."""
+        from app.models.file import FileStatus
+
+        client, user = authenticated_client
+
+        def upload():
+            with open(sample_excel_file, "rb") as f:
+                files = {"file": ("model.xlsx", f, "application/octet-stream")}
+                return client.post("/api/v1/files/upload", files=files)
+
+        first = upload().json()
+        original = db_session.get(UploadedFile, first["id"])
+        original.status = FileStatus.COMPLETED
+        original.parsed_data = json.dumps({"key_metrics": {"revenue": 1}})
+        original.user_id = user.id + 1
+        db_session.commit()
+
+        assert upload().json()["status"] == "uploaded"
+
+    def test_upload_too_large_rejected_mid_stream(
+        self, authenticated_client, monkeypatch
+    ):
+        """Test the size limit is enforced while streaming."""
+        from app.core.config import settings
+
+        client, user = authenticated_client
+        monkeypatch.setattr(settings, "MAX_FILE_SIZE", 1024)
+        monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 256)
+
+        files = {"file": ("big.csv", b"x" * 4096, "text/csv")}
+        response = client.post("/api/v1/files/upload", files=files)
+
+        assert response.status_code == 413
+
+    def test_chunked_upload_resume_and_complete(
+        self, authenticated_client, sample_excel_file
+    ):
+        """Test a resumable chunked upload."""
+        client, user = authenticated_client
+        with open(sample_excel_file, "rb") as f:
+            content = f.read()
+        half = len(content) // 2
+
+        response = client.post(
+            "/api/v1/files/uploads",
+            json={"filename": "model.xlsx", "total_size": len(content)},
+        )
+        assert response.status_code == 201
+        upload_id = response.json()["upload_id"]
+        url = f"/api/v1/files/uploads/{upload_id}"
+
+        response = client.put(url, params={"offset": 0}, content=content[:half])
+        assert response.json()["received"] == half
+
+        # A retried chunk at a stale offset is rejected
+        response = client.put(url, params={"offset": 0}, content=content[:half])
+        assert response.status_code == 409
+
+        # Completing early fails; resume from the reported position
+        assert client.post(f"{url}/complete").status_code == 409
+        received = client.get(url).json()["received"]
+        response = client.put(
+            url, params={"offset": received}, content=content[received:]
+        )
+        assert response.json()["is_complete"] is True
+
+        response = client.post(f"{url}/complete")
+        assert response.status_code == 201
+        data = response.json()
+        assert data["original_filename"] == "model.xlsx"
+        assert data["file_size"] == len(content)
+        assert client.get(url).status_code == 404
+
+    def test_chunked_upload_rejects_concurrent_writes(
+        self, authenticated_client, tmp_path, monkeypatch
+    ):
+        """Test a chunk is refused while another request holds the upload."""
+        fcntl = pytest.importorskip("fcntl")
+        from app.core.config import settings
+
+        client, user = authenticated_client
+        monkeypatch.setattr(settings, "UPLOAD_FOLDER", str(tmp_path))
+        response = client.post(
+            "/api/v1/files/uploads", json={"filename": "model.csv", "total_size": 8}
+        )
+        upload_id = response.json()["upload_id"]
+        url = f"/api/v1/files/uploads/{upload_id}"
+
+        with open(tmp_path / ".partial" / f"{upload_id}.part", "ab") as held:
+            fcntl.flock(held.fileno(), fcntl.LOCK_EX)
+            assert (
+                client.put(url, params={"offset": 0}, content=b"a,b\n").status_code
+                == 409
+            )
+            assert client.post(f"{url}/complete").status_code == 409
+
+        response = client.put(url, params={"offset": 0}, content=b"a,b\n1,2\n")
+        assert response.json()["is_complete"] is True
+
+    def test_stale_chunked_uploads_are_cleaned_up(
+        self, authenticated_client, db_session, tmp_path, monkeypatch
+    ):
+        """Test idle chunked uploads expire while active ones are kept."""
+        from app.core.config import settings
+        from app.services.file_service import FileService, _chunked_upload_digests
+
+        client, user = authenticated_client
+        monkeypatch.setattr(settings, "UPLOAD_FOLDER", str(tmp_path))
+        upload_ids = [
+            client.post(
+                "/api/v1/files/uploads", json={"filename": "a.csv", "total_size": 8}
+            ).json()["upload_id"]
+            for _ in range(2)
+        ]
+        stale = (tmp_path / ".partial").glob(f"{upload_ids[0]}.*")
+        for path in stale:
+            os.utime(path, (0, 0))
+        _chunked_upload_digests[upload_ids[0]] = (0, None, 0)
+
+        assert FileService(db_session).cleanup_stale_chunked_uploads() == 1
+
+        assert upload_ids[0] not in _chunked_upload_digests
+        assert client.get(f"/api/v1/files/uploads/{upload_ids[0]}").status_code == 404
+        assert client.get(f"/api/v1/files/uploads/{upload_ids[1]}").status_code == 200
+
     def test_get_user_files(self, authenticated_client, db_session):
         """Test getting user's files."""
         client, user = authenticated_client
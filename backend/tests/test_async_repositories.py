@@ -0,0 +1,96 @@
+import pytest
+
+from app.models.base import to_async_url
+from app.models.file import FileStatus, UploadedFile
+from app.models.user import User
+from app.repositories.async_repositories import (
+    AsyncScenarioRepository,
+    AsyncUploadedFileRepository,
+)
+
+
+def test_to_async_url_picks_asyncio_drivers():
+    assert to_async_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert (
+        to_async_url("postgresql+psycopg2://u:p@db/app")
+        == "postgresql+asyncpg://u:p@db/app"
+    )
+    assert to_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+
+async def _make_user(db, name="async"):
+    user = User(username=name, email=f"{name}@example.com", hashed_password="x")
+    db.add(user)
+    await db.commit()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_async_repository_crud(async_db_session):
+    user = await _make_user(async_db_session)
+    repo = AsyncScenarioRepository(async_db_session)
+
+    created = [
+        await repo.create(
+            {"name": f"Case {i}", "base_file_id": 1, "created_by_id": user.id}
+        )
+        for i in range(3)
+    ]
+    assert await repo.count({"created_by_id": user.id}) == 3
+    assert await repo.exists(created[0].id)
+    assert (await repo.get_by_unique_field("name", "Case 1")).id == created[1].id
+    assert await repo.get_by_unique_field("missing", "x") is None
+    assert [s.name for s in await repo.search("case 2", ["name"])] == ["Case 2"]
+
+    await repo.update(created[0].id, {"is_baseline": True})
+    baseline = await repo.list_for_user(user.id, is_baseline=True)
+    assert [s.id for s in baseline] == [created[0].id]
+    assert await repo.get_for_user(created[0].id, user.id + 1) is None
+
+    assert await repo.delete(created[2].id)
+    assert not await repo.delete(created[2].id)
+    assert await repo.update(created[2].id, {"name": "gone"}) is None
+    remaining = await repo.get_multi(filters={"id": {"in": [s.id for s in created]}})
+    assert len(remaining) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_file_repository_filters_by_status(async_db_session):
+    user = await _make_user(async_db_session, "files")
+    for i, file_status in enumerate([FileStatus.COMPLETED, FileStatus.PROCESSING]):
+        async_db_session.add(
+            UploadedFile(
+                filename=f"f{i}.xlsx",
+                original_filename=f"f{i}.xlsx",
+                file_path=f"/tmp/f{i}.xlsx",
+                file_size=1,
+                user_id=user.id,
+                status=file_status,
+            )
+        )
+    await async_db_session.commit()
+
+    repo = AsyncUploadedFileRepository(async_db_session)
+    assert len(await repo.list_for_user(user.id)) == 2
+    assert await repo.count({"user_id": user.id, "status": FileStatus.COMPLETED}) == 1
+
+
+def test_dashboard_metrics_read_through_async_session(authenticated_client, db_session):
+    client, user = authenticated_client
+    db_session.add(
+        UploadedFile(
+            filename="a.xlsx",
+            original_filename="a.xlsx",
+            file_path="/tmp/a.xlsx",
+            file_size=1,
+            user_id=user.id,
+            status=FileStatus.COMPLETED,
+        )
+    )
+    db_session.commit()
+
+    metrics = client.get("/api/v1/dashboard/metrics").json()
+    assert metrics["total_files"] == 1
+    assert metrics["completed_files"] == 1
+    sources = client.get("/api/v1/dashboard/data-sources").json()
+    assert [s["filename"] for s in sources["data_sources"]] == ["a.xlsx"]
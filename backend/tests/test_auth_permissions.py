@@ -128,3 +128,78 @@ def test_get_user_permissions():
     assert Permission.DATA_READ in viewer_permissions
     assert Permission.USER_CREATE not in viewer_permissions
     assert Permission.AUDIT_LOGS not in viewer_permissions
+
+
+def test_permission_mask_matches_role_permissions():
+    """Bitmask checks agree with the set-based permission checker."""
+    from app.core.permissions import permission_mask
+
+    for role in RoleType:
+        mask = PermissionChecker.get_permission_mask([role.value])
+        for permission in Permission:
+            assert bool(mask & permission_mask([permission])) == (
+                PermissionChecker.has_permission([role.value], permission)
+            )
+
+
+def test_principal_cache_invalidated_on_commit(authenticated_client, db_session):
+    """Cached principals are reused until the user's record changes."""
+    from app.core.principal_cache import principal_cache
+
+    client, user = authenticated_client
+
+    response = client.get("/api/v1/admin/users")
+    assert response.status_code == 403
+    cached = principal_cache.get(user.id)
+    assert cached is not None
+    assert cached.roles == (RoleType.VIEWER.value,)
+
+    # Served from the cache: no role lookup on the second request
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            "app.services.auth_service.AuthService.get_user_roles",
+            lambda *args: pytest.fail("roles should come from the cache"),
+        )
+        assert client.get("/api/v1/admin/users").status_code == 403
+
+    user.is_admin = True
+    db_session.commit()
+    assert principal_cache.get(user.id) is None
+
+    response = client.get("/api/v1/admin/users")
+    assert response.status_code == 200
+    assert RoleType.ADMIN.value in principal_cache.get(user.id).roles
+
+
+class FakePrincipalBackplane:
+    def __init__(self):
+        self.connected = True
+        self.published = []
+
+    def listen(self, cache):
+        return self.connected
+
+    def publish(self, user_id):
+        self.published.append(user_id)
+
+
+def test_principal_invalidations_reach_other_workers(
+    authenticated_client, db_session, monkeypatch
+):
+    """Commits are published for other workers, which skip the cache offline."""
+    from app.core.principal_cache import principal_cache
+
+    client, user = authenticated_client
+    backplane = FakePrincipalBackplane()
+    monkeypatch.setattr(principal_cache, "backplane", backplane)
+
+    assert client.get("/api/v1/admin/users").status_code == 403
+    assert principal_cache.get(user.id) is not None
+
+    user.first_name = "Renamed"
+    db_session.commit()
+    assert backplane.published == [user.id]
+
+    assert client.get("/api/v1/admin/users").status_code == 403
+    backplane.connected = False
+    assert principal_cache.get(user.id) is None
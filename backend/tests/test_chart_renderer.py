@@ -0,0 +1,89 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from app.services.chart_renderer import ChartImageCache, ChartRenderer, chart_key
+from app.services.pdf_generator import PDFReportGenerator
+
+STYLE = {
+    "figure_size": (4, 3),
+    "title_font_size": 12,
+    "colors": ["#1976d2", "#dc004e", "#2e7d32"],
+}
+POINTS = [{"period": "Q1", "value": 100}, {"period": "Q2", "value": 150}]
+CHARTS = [
+    ("revenue_trend", POINTS),
+    ("expense_breakdown", POINTS),
+    ("asset_distribution", POINTS),
+]
+
+
+def test_chart_key_covers_type_data_style_and_dpi():
+    key = chart_key("revenue_trend", POINTS, STYLE, 72)
+    assert key == chart_key("revenue_trend", list(POINTS), dict(STYLE), 72)
+    assert key != chart_key("profit_trend", POINTS, STYLE, 72)
+    assert key != chart_key("revenue_trend", POINTS[:1], STYLE, 72)
+    assert key != chart_key("revenue_trend", POINTS, {**STYLE, "colors": []}, 72)
+    assert key != chart_key("revenue_trend", POINTS, STYLE, 96)
+
+
+def test_renderer_reuses_cached_images(tmp_path):
+    cache = ChartImageCache(tmp_path)
+    with ThreadPoolExecutor(2) as pool:
+        first = ChartRenderer(STYLE, 72, cache=cache, pool=pool)
+        images = first.render_many(CHARTS)
+        second = ChartRenderer(STYLE, 72, cache=cache, pool=pool)
+        again = second.render_many(CHARTS)
+
+    assert all(image.startswith(b"\x89PNG") for image in images)
+    assert (first.hits, first.misses) == (0, 3)
+    assert (second.hits, second.misses) == (3, 0)
+    assert again == images
+    assert len(list(tmp_path.glob("*.png"))) == 3
+
+
+def test_chart_cache_evicts_least_recently_used(tmp_path):
+    cache = ChartImageCache(tmp_path, max_bytes=10)
+    cache.put("old", b"1234")
+    cache.put("used", b"1234")
+    os.utime(tmp_path / "old.png", (0, 0))
+    os.utime(tmp_path / "used.png", (0, 0))
+    assert cache.get("used") == b"1234"
+
+    cache.put("new", b"1234")
+
+    assert cache.get("old") is None
+    assert cache.get("used") == b"1234"
+    assert cache.get("new") == b"1234"
+
+
+def test_renderer_rasterizes_in_worker_processes():
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(2, mp_context=context) as pool:
+        images = ChartRenderer(STYLE, 72, pool=pool).render_many(CHARTS)
+
+    assert all(image.startswith(b"\x89PNG") for image in images)
+
+
+def test_failed_charts_are_skipped(tmp_path, caplog):
+    renderer = ChartRenderer(STYLE, 72, cache=ChartImageCache(tmp_path))
+    # Pie wedges cannot be negative
+    images = renderer.render_many([("pie", [{"period": "A", "value": -1}])])
+
+    assert images == [None]
+    assert list(tmp_path.glob("*.png")) == []
+    assert "Error generating chart pie" in caplog.text
+
+
+def test_pdf_reports_share_the_chart_cache(tmp_path):
+    cache = ChartImageCache(tmp_path / "charts")
+    generator = PDFReportGenerator(output_dir=tmp_path, chart_cache=cache)
+    data = {"charts": {"revenue_trend": POINTS, "empty": []}}
+
+    generator.generate_financial_report(data, filename="a.pdf")
+    cached = sorted(p.name for p in cache.cache_dir.glob("*.png"))
+    generator.generate_financial_report(data, filename="b.pdf")
+
+    assert len(cached) == 1
+    assert sorted(p.name for p in cache.cache_dir.glob("*.png")) == cached
+    assert (tmp_path / "b.pdf").stat().st_size > 0
@@ -0,0 +1,138 @@
+import csv
+import io
+from datetime import date
+
+import pytest
+
+from app.models.financial import Metric, TimeSeries
+from app.services import data_export_stream
+from app.services.data_export_stream import (
+    build_export_query,
+    iter_batches,
+    stream_dataset,
+)
+
+
+def _add_time_series(db_session, user_id, count=5):
+    db_session.add_all(
+        TimeSeries(
+            scenario_id=1,
+            data_type="revenue",
+            period_date=date(2024, month, 1),
+            value=100.0 * month,
+            currency="USD",
+            frequency="monthly",
+            created_by_id=user_id,
+        )
+        for month in range(1, count + 1)
+    )
+    db_session.add(
+        TimeSeries(
+            scenario_id=1,
+            data_type="revenue",
+            period_date=date(2024, 1, 1),
+            value=1.0,
+            currency="USD",
+            frequency="monthly",
+            created_by_id=user_id + 1000,
+        )
+    )
+    db_session.commit()
+
+
+def test_batches_are_read_from_a_cursor(db_session):
+    _add_time_series(db_session, user_id=1, count=5)
+    stmt = build_export_query("time_series", 1)
+
+    batches = list(iter_batches(db_session, stmt, batch_size=2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_csv_stream(authenticated_client, db_session):
+    client, user = authenticated_client
+    _add_time_series(db_session, user.id)
+
+    response = client.get(
+        "/api/v1/reports/data/stream/time_series",
+        params={"start_date": "2024-02-01", "end_date": "2024-04-30"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "time_series.csv" in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["period_date"] for row in rows] == [
+        "2024-02-01",
+        "2024-03-01",
+        "2024-04-01",
+    ]
+    assert rows[0]["value"] == "200.0"
+
+
+def test_empty_csv_stream_has_header(authenticated_client):
+    client, _ = authenticated_client
+
+    response = client.get("/api/v1/reports/data/stream/metrics")
+
+    assert response.status_code == 200
+    assert response.text.strip().split(",")[:3] == ["id", "scenario_id", "metric_name"]
+
+
+def test_stream_outlives_the_request_session(db_session):
+    _add_time_series(db_session, user_id=1, count=3)
+    chunks = stream_dataset(db_session.get_bind(), "time_series", "csv", user_id=1)
+    db_session.close()
+
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+
+    assert len(rows) == 3
+
+
+@pytest.mark.parametrize("export_format", ["parquet", "arrow"])
+def test_columnar_streams(authenticated_client, db_session, monkeypatch, export_format):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    client, user = authenticated_client
+    monkeypatch.setattr(data_export_stream.settings, "DATA_EXPORT_BATCH_SIZE", 2)
+    db_session.add_all(
+        Metric(
+            scenario_id=1,
+            metric_name="gross_margin",
+            metric_category="profitability",
+            metric_type="percentage",
+            value=0.1 * i,
+            period_start=date(2024, i, 1),
+            period_end=date(2024, i, 28),
+            created_by_id=user.id,
+        )
+        for i in range(1, 6)
+    )
+    db_session.commit()
+
+    response = client.get(
+        "/api/v1/reports/data/stream/metrics", params={"format": export_format}
+    )
+
+    assert response.status_code == 200
+    body = io.BytesIO(response.content)
+    if export_format == "parquet":
+        assert pq.ParquetFile(body).num_row_groups == 3
+        table = pq.read_table(body)
+    else:
+        table = pa.ipc.open_stream(body).read_all()
+    assert table.num_rows == 5
+    assert table.schema.field("period_start").type == pa.date32()
+    assert table.column("period_start")[0].as_py() == date(2024, 1, 1)
+
+
+def test_columnar_stream_requires_pyarrow(authenticated_client, monkeypatch):
+    client, _ = authenticated_client
+    monkeypatch.setattr(data_export_stream, "PYARROW_AVAILABLE", False)
+
+    response = client.get(
+        "/api/v1/reports/data/stream/metrics", params={"format": "parquet"}
+    )
+
+    assert response.status_code == 400
+    assert "pyarrow" in response.json()["detail"]
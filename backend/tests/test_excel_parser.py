@@ -1,8 +1,15 @@
+import json
+import os
+from datetime import datetime
+
 import pytest
+from openpyxl import Workbook
 from app.services.excel_parser import (
+    CellInfo,
     ExcelParser,
     ParsedData,
     SheetInfo,
+    SheetResultCache,
     DataType,
     SheetType,
     ValidationSummary,
@@ -32,3 +39,98 @@ def test_export_to_dict_minimal():
     assert result["file_info"]["name"] == "f.xlsx"
     assert result["sheets"][0]["name"] == "S1"
     assert result["validation"]["is_valid"]
+
+
+def _write_model(path, revenue=100):
+    workbook = Workbook()
+    inputs = workbook.active
+    inputs.title = "Inputs"
+    inputs["A1"] = "Revenue"
+    inputs["B1"] = revenue
+    costs = workbook.create_sheet("Costs")
+    costs["A1"] = "Cost"
+    costs["B1"] = 40
+    summary = workbook.create_sheet("Summary")
+    summary["B1"] = "=Inputs!B1-Costs!B1"
+    summary["B2"] = "=B1*2"
+    summary["B3"] = "=Costs!B1*2"
+    workbook.save(path)
+
+
+def test_parse_excel_file_reuses_unchanged_sheets(tmp_path):
+    parser = ExcelParser(sheet_cache=SheetResultCache(tmp_path / "cache"))
+    first_path = tmp_path / "v1.xlsx"
+    second_path = tmp_path / "v2.xlsx"
+    _write_model(first_path)
+    _write_model(second_path, revenue=150)
+
+    first = parser.parse_excel_file(str(first_path))
+    assert first.metadata["incremental"]["reused_sheets"] == []
+    assert first.formulas["Summary!B2"] == "=B1*2"
+    assert first.dependencies["Summary!B1"] == ["Inputs!B1", "Costs!B1"]
+
+    second = parser.parse_excel_file(str(second_path))
+    incremental = second.metadata["incremental"]
+    assert incremental["reused_sheets"] == ["Costs", "Summary"]
+    assert incremental["reparsed_sheets"] == ["Inputs"]
+    # B2 only reads B1, which is invalidated through Inputs!B1
+    assert incremental["invalidated_formulas"] == ["Summary!B1", "Summary!B2"]
+    assert second.sheet_fingerprints["Costs"] == first.sheet_fingerprints["Costs"]
+    assert second.sheet_fingerprints["Inputs"] != first.sheet_fingerprints["Inputs"]
+    assert [sheet.name for sheet in second.sheets] == ["Inputs", "Costs", "Summary"]
+    assert second.sheets[0].cells[1].value == 150
+    assert second.formulas == first.formulas
+
+
+def test_sheet_cache_round_trips_as_json(tmp_path):
+    cache = SheetResultCache(tmp_path)
+    sheet_info = SheetInfo(
+        name="Inputs",
+        sheet_type=SheetType.ASSUMPTIONS,
+        max_row=1,
+        max_column=2,
+        cells=[
+            CellInfo("A1", 1, 1, datetime(2024, 3, 31), data_type=DataType.DATE),
+            CellInfo("B1", 1, 2, "=A1", formula="=A1", data_type=DataType.FORMULA),
+        ],
+    )
+    cache.put("abc", (sheet_info, {"Inputs!B1": "=A1"}, {"Inputs!B1": ["Inputs!A1"]}))
+
+    assert json.loads((tmp_path / "abc.json").read_text())["version"] == 1
+    assert cache.get("abc") == (
+        sheet_info,
+        {"Inputs!B1": "=A1"},
+        {"Inputs!B1": ["Inputs!A1"]},
+    )
+    assert cache.get("missing") is None
+
+
+def test_sheet_cache_evicts_least_recently_used(tmp_path):
+    def entry(name):
+        return SheetInfo(name=name, sheet_type=SheetType.OTHER, max_row=1, max_column=1)
+
+    cache = SheetResultCache(tmp_path, max_bytes=10**6)
+    cache.put("old", (entry("old"), {}, {}))
+    cache.put("used", (entry("used"), {}, {}))
+    os.utime(tmp_path / "old.json", (0, 0))
+    os.utime(tmp_path / "used.json", (0, 0))
+    assert cache.get("used") is not None
+
+    cache.max_bytes = (tmp_path / "used.json").stat().st_size * 2
+    cache.put("new", (entry("new"), {}, {}))
+
+    assert cache.get("old") is None
+    assert cache.get("used") is not None
+    assert cache.get("new") is not None
+
+
+def test_sheet_fingerprint_ignores_other_sheets(tmp_path):
+    parser = ExcelParser()
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet["A1"] = 1
+    before = parser.compute_sheet_fingerprint(sheet)
+    workbook.create_sheet("Other")["A1"] = 2
+    assert parser.compute_sheet_fingerprint(sheet) == before
+    sheet["A1"] = "=1"
+    assert parser.compute_sheet_fingerprint(sheet) != before
@@ -0,0 +1,146 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.executors import (
+    ExecutorBusyError,
+    ExecutorTimeoutError,
+    ManagedExecutor,
+    executor_stats,
+    get_executor,
+    offload,
+    set_executor,
+)
+
+
+@offload("cpu")
+def square(value: int) -> int:
+    return value * value
+
+
+@offload("cpu")
+def worker_pid() -> int:
+    return os.getpid()
+
+
+class Calculator:
+    def __init__(self, factor: int):
+        self.factor = factor
+
+    @offload("io")
+    def scale(self, value: int) -> int:
+        return value * self.factor
+
+
+async def test_offload_runs_functions_and_methods_on_the_pool():
+    assert await square(7) == 49
+    assert await Calculator(3).scale(5) == 15
+    assert square.__wrapped__(4) == 16
+
+    stats = {s["name"]: s for s in executor_stats()}
+    assert stats["cpu"]["completed"] == 1
+    assert stats["io"]["completed"] == 1
+    assert stats["io"]["running"] == stats["io"]["queued"] == 0
+
+
+async def test_offload_uses_worker_processes():
+    set_executor("cpu", ManagedExecutor("cpu", "process", max_workers=1))
+    try:
+        assert await square(9) == 81
+        assert await worker_pid() != os.getpid()
+    finally:
+        set_executor("cpu", None)
+
+
+@pytest.mark.parametrize("module", ["app.services.parameter_detector"])
+def test_offloaded_modules_import_first_in_fresh_processes(module):
+    # Spawned workers import an offloaded function's module before anything else
+    result = subprocess.run(
+        [sys.executable, "-c", f"import {module}"],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+async def test_full_queue_rejects_new_calls():
+    executor = ManagedExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        first = asyncio.ensure_future(executor.run(release.wait))
+        second = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ExecutorBusyError):
+            await executor.run(release.wait)
+
+        stats = executor.stats()
+        assert (stats["running"], stats["queued"], stats["rejected"]) == (1, 1, 1)
+
+        release.set()
+        await asyncio.gather(first, second)
+        assert executor.stats()["completed"] == 2
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+async def test_timeout_raises_and_failures_are_counted():
+    executor = ManagedExecutor("test", max_workers=1, default_timeout=0.05)
+    release = threading.Event()
+    try:
+        with pytest.raises(ExecutorTimeoutError):
+            await executor.run(release.wait)
+        release.set()
+
+        with pytest.raises(ZeroDivisionError):
+            await executor.run(divmod, 1, 0)
+
+        stats = executor.stats()
+        assert stats["timed_out"] == 1
+        assert stats["failed"] == 1
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_shared_executors_are_configurable():
+    set_executor("io", None)
+    assert get_executor("io").kind == "thread"
+    assert get_executor("io") is get_executor("io")
+    with pytest.raises(ValueError):
+        get_executor("gpu")
+    with pytest.raises(ValueError):
+        ManagedExecutor("test", kind="fiber")
+
+
+def test_busy_and_timeout_map_to_http_errors():
+    from main import app
+
+    async def busy():
+        raise ExecutorBusyError("busy")
+
+    async def slow():
+        raise ExecutorTimeoutError("too slow")
+
+    app.add_api_route("/_test/busy", busy)
+    app.add_api_route("/_test/slow", slow)
+    try:
+        client = TestClient(app)
+        response = client.get("/_test/busy")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+        assert client.get("/_test/slow").status_code == 504
+    finally:
+        app.router.routes = [
+            route
+            for route in app.router.routes
+            if getattr(route, "path", "") not in ("/_test/busy", "/_test/slow")
+        ]
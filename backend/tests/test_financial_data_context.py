@@ -0,0 +1,78 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+from app.models.file import FileStatus, UploadedFile
+from app.services.dashboard_metrics import DashboardMetricsService
+from app.services.financial_data_context import FinancialDataContext
+from app.services.report_service import ReportService
+
+
+def _add_processed_file(db_session, user_id=1):
+    record = UploadedFile(
+        filename="model.xlsx",
+        original_filename="model.xlsx",
+        file_path="/tmp/model.xlsx",
+        file_size=1,
+        user_id=user_id,
+        status=FileStatus.COMPLETED,
+        parsed_data=json.dumps({"sheets": [{"name": "P&L", "type": "profit_loss"}]}),
+    )
+    db_session.add(record)
+    db_session.commit()
+    return record
+
+
+async def test_statement_views_load_source_once(db_session):
+    record = _add_processed_file(db_session)
+    service = DashboardMetricsService(db_session)
+    calculate_pl = service._calculate_pl_metrics
+
+    with patch.object(
+        service, "_calculate_pl_metrics", wraps=calculate_pl
+    ) as pl_metrics:
+        views = await service.get_statement_views(1, "ytd", record.id)
+
+    assert service.context.loads == 1
+    assert pl_metrics.call_count == 1
+    assert views["pl"]["metrics"][0]["name"] == "Revenue"
+    assert views["overview"]["key_metrics"][:3] == views["pl"]["metrics"]
+    assert set(views["balance_sheet"]["ratios"]) >= {"current_ratio", "roe"}
+
+
+async def test_missing_data_falls_back_to_demo_views(db_session):
+    service = DashboardMetricsService(db_session)
+
+    views = await service.get_statement_views(1, "ytd")
+
+    assert service.context.loads == 1
+    assert views["pl"] == service._get_demo_pl_metrics()
+
+
+async def test_context_shares_concurrent_view_computations(db_session):
+    context = FinancialDataContext(db_session)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return {"value": 1}
+
+    first, second = await asyncio.gather(
+        context.view("k", compute), context.view("k", compute)
+    )
+
+    assert first is second
+    assert len(calls) == 1
+
+
+async def test_report_data_is_gathered_in_one_pass(db_session):
+    record = _add_processed_file(db_session)
+    service = ReportService(db_session)
+
+    data = await service._gather_financial_data(1, [record.id], {"period": "ytd"})
+
+    assert service.dashboard_service.context.loads == 1
+    assert data["metrics"]["Revenue"] == 1500000
+    assert data["metrics"]["Total Assets"] == 2500000
+    assert data["tables"]["profit_loss"][0]["name"] == "Revenue"
@@ -0,0 +1,128 @@
+from datetime import date, datetime
+from unittest.mock import patch
+
+from app.models.financial import FinancialStatement, Metric, TimeSeries
+from app.models.parameter import Scenario
+from app.services.dashboard_metrics import DashboardMetricsService
+from app.services.file_service import FileService
+from app.services.financial_snapshot import load_snapshot, materialize_file_snapshot
+from tests.test_financial_data_context import _add_processed_file
+
+
+async def test_snapshot_rows_cover_statement_views(db_session):
+    record = _add_processed_file(db_session)
+    derived = await DashboardMetricsService(db_session).get_statement_views(
+        1, "mtd", record.id
+    )
+
+    counts = await materialize_file_snapshot(db_session, record)
+
+    assert counts == {"financial_statements": 3, "metrics": 12, "time_series": 6}
+    scenario = db_session.query(Scenario).one()
+    assert (scenario.base_file_id, scenario.is_baseline) == (record.id, True)
+    revenue = db_session.query(Metric).filter_by(metric_name="Revenue").one()
+    assert (revenue.value, revenue.metric_type, revenue.currency) == (
+        1500000,
+        "CURRENCY",
+        "USD",
+    )
+    # Periods come from the year in the chart labels
+    assert (revenue.period_start, revenue.period_end) == (
+        date(2024, 1, 1),
+        date(2024, 12, 31),
+    )
+    # Only series labelled with their year are stored; breakdowns are not
+    series = {(row.data_type, row.period_date) for row in db_session.query(TimeSeries)}
+    assert series == {("revenue_trend", date(2024, month, 1)) for month in range(1, 7)}
+
+    service = DashboardMetricsService(db_session)
+    views = await service.get_statement_views(1, "mtd", record.id)
+
+    assert views == derived
+    assert service.context.loads == 0
+
+
+async def test_rematerializing_replaces_the_snapshot(db_session):
+    record = _add_processed_file(db_session)
+    await materialize_file_snapshot(db_session, record)
+
+    await materialize_file_snapshot(db_session, record)
+
+    assert db_session.query(Scenario).count() == 1
+    assert db_session.query(FinancialStatement).count() == 3
+    assert db_session.query(Metric).count() == 12
+    assert db_session.query(TimeSeries).count() == 6
+
+
+async def test_rematerializing_keeps_user_rows(db_session):
+    record = _add_processed_file(db_session)
+    scenario = Scenario(
+        name="Budget", is_baseline=True, base_file_id=record.id, created_by_id=1
+    )
+    db_session.add(scenario)
+    db_session.flush()
+    period = {"period_start": date(2024, 1, 1), "period_end": date(2024, 12, 31)}
+    db_session.add_all(
+        [
+            Metric(
+                scenario_id=scenario.id,
+                metric_name="Headcount",
+                metric_category="operations",
+                metric_type="ratio",
+                value=12,
+                created_by_id=1,
+                **period,
+            ),
+            FinancialStatement(
+                scenario_id=scenario.id,
+                statement_type="profit_loss",
+                period_type="annual",
+                currency="USD",
+                line_items=[],
+                is_baseline=True,
+                created_by_id=1,
+                **period,
+            ),
+        ]
+    )
+    db_session.commit()
+
+    await materialize_file_snapshot(db_session, record)
+    await materialize_file_snapshot(db_session, record)
+
+    assert db_session.query(Scenario).count() == 1
+    assert db_session.query(Metric).count() == 13
+    assert db_session.query(FinancialStatement).count() == 4
+    assert db_session.query(Metric).filter_by(metric_name="Headcount").one()
+
+
+def test_failed_snapshot_removes_the_old_one(db_session):
+    record = _add_processed_file(db_session)
+    service = FileService(db_session)
+    service.materialize_snapshot(record)
+    assert load_snapshot(db_session, 1, record.id) is not None
+
+    with patch(
+        "app.services.file_service.materialize_file_snapshot",
+        side_effect=ValueError("bad sheet"),
+    ):
+        service.materialize_snapshot(record)
+
+    assert load_snapshot(db_session, 1, record.id) is None
+    assert db_session.query(Metric).count() == 0
+    assert db_session.query(TimeSeries).count() == 0
+
+
+async def test_files_without_snapshot_derive_views(db_session):
+    older = _add_processed_file(db_session)
+    older.created_at = datetime(2024, 1, 1)
+    await materialize_file_snapshot(db_session, older)
+    latest = _add_processed_file(db_session)
+
+    service = DashboardMetricsService(db_session)
+    await service.get_pl_metrics(1, "ytd")
+
+    # The latest file has no snapshot, so its parsed data is loaded
+    assert service.context.loads == 1
+    assert await service.context.snapshot(1, latest.id) is None
+    assert await service.context.snapshot(1, older.id) is not None
@@ -8,8 +8,12 @@ from app.services.formula_engine import (
     ExcelFunction,
     CalculationResult,
     DependencyGraph,
+    RangeDependencyIndex,
+    RangeView,
     safe_eval,
 )
+from app.services import formula_engine
+from app.services.formula_references import CellRange
 
 
 class TestExcelFunction:
@@ -385,3 +389,122 @@ class TestFormulaEngineIntegration:
         # Should complete within reasonable time
         assert end_time - start_time < 1.0  # Less than 1 second
         assert result == sum(range(1, 101))  # 5050
+
+
+class TestRangeReferences:
+    """Test lazy range views and range dependency edges"""
+
+    @pytest.fixture
+    def sheet_engine(self):
+        engine = FormulaEngine()
+        for row in range(1, 1001):
+            engine.cell_values[f"Data!A{row}"] = row
+            engine.cell_values[f"Data!B{row}"] = -row
+        engine.cell_values["Data!B1000"] = "text"
+        return engine
+
+    def test_range_is_not_inlined(self, sheet_engine):
+        processed = sheet_engine._replace_cell_references("SUM(A1:B1000)", "Data!C1")
+        assert len(processed) < 100
+        assert "_range_view" in processed
+
+    def test_range_aggregations(self, sheet_engine):
+        sheet_engine.formulas["Data!C1"] = "=SUM(A1:A1000)"
+        sheet_engine.formulas["Data!C2"] = "=COUNT(A1:B1000)"
+        sheet_engine.formulas["Data!C3"] = "=MIN(Data!B1:B1000)"
+        sheet_engine.formulas["Data!C4"] = "=AVERAGE($A$1:$A$4)"
+        assert sheet_engine.calculate_cell("Data!C1").value == 500500
+        assert sheet_engine.calculate_cell("Data!C2").value == 1999
+        assert sheet_engine.calculate_cell("Data!C3").value == -999
+        assert sheet_engine.calculate_cell("Data!C4").value == 2.5
+
+    def test_range_view_iterates_values(self, sheet_engine):
+        view = sheet_engine._range_view(None, 1, 1, 1, 3, "Data")
+        assert isinstance(view, RangeView)
+        assert len(view) == 3
+        assert list(view) == [1, 2, 3]
+
+    def test_range_dependents_use_interval_index(self, sheet_engine):
+        sheet_engine.formulas["Data!C1"] = "=SUM(A1:A1000)"
+        sheet_engine.formulas["Data!C2"] = "=C1*2"
+        sheet_engine.formulas["Summary!A1"] = "=SUM(Data!A500:A600)"
+        graph = sheet_engine.build_dependency_graph()
+
+        assert graph.range_index.edge_count == 2
+        assert graph.nodes["Data!C2"] == {"Data!C1"}
+        assert set(sheet_engine._get_affected_cells("Data!A550")) == {
+            "Data!C1",
+            "Data!C2",
+            "Summary!A1",
+        }
+        assert sheet_engine._get_affected_cells("Data!A10") == [
+            cell for cell in graph.calculation_order if cell in {"Data!C1", "Data!C2"}
+        ]
+
+    def test_formula_cells_inside_range_are_dependencies(self, sheet_engine):
+        sheet_engine.formulas["Data!A5"] = "=A4+1"
+        sheet_engine.formulas["Data!C1"] = "=SUM(A1:A1000)"
+        dependencies, ranges = sheet_engine._formula_dependencies(
+            sheet_engine.formulas["Data!C1"], "Data!C1"
+        )
+        assert dependencies == {"Data!A5"}
+        assert ranges[0].size == 1000
+
+    def test_range_reads_follow_cell_writes(self, sheet_engine):
+        view = sheet_engine._range_view(None, 1, 1, 2, 1000, "Data")
+        assert view.numbers().sum() == 1000
+
+        sheet_engine.cell_values["Data!B1000"] = 5
+        sheet_engine.cell_values.pop("Data!A1")
+        sheet_engine.cell_values.update({"Data!B1200": 7})
+        # Bare names shadow the formula's sheet
+        sheet_engine.cell_values["A2"] = "text"
+
+        assert view.numbers().tolist() == [
+            -1,
+            -2,
+            *[n for row in range(3, 1000) for n in (row, -row)],
+            1000,
+            5,
+        ]
+        wide = sheet_engine._range_view("Data", 1, 1, 2, 2000, "Data")
+        assert wide.numbers().sum() == 500500 - 1 - 499500 + 5 + 7
+
+    def test_oversized_sheets_read_cell_by_cell(self, sheet_engine, monkeypatch):
+        monkeypatch.setattr(formula_engine, "GRID_MAX_CELLS", 100)
+        view = sheet_engine._range_view(None, 1, 1, 1, 1000, "Data")
+
+        assert sheet_engine.cell_values.range_numbers(view.cell_range, "Data") is None
+        assert view.numbers().sum() == 500500
+
+    def test_assigned_cell_values_are_indexed(self):
+        engine = FormulaEngine()
+        engine.cell_values = {"A1": 1, "A2": 2}
+        assert engine.evaluate_formula("=SUM(A1:A2)") == 3
+
+
+def test_interval_index_matches_linear_scan():
+    import random
+
+    rng = random.Random(7)
+    index = RangeDependencyIndex()
+    ranges = []
+    for i in range(300):
+        sheet = rng.choice(["A", "B", None])
+        top = rng.randint(1, 500)
+        cell_range = CellRange(
+            None, 1, top, rng.randint(1, 3), top + rng.randint(0, 200)
+        )
+        index.add(cell_range, sheet, f"F{i}")
+        ranges.append((cell_range, sheet, f"F{i}"))
+
+    for _ in range(200):
+        sheet = rng.choice(["A", "B", None])
+        col, row = rng.randint(1, 4), rng.randint(1, 800)
+        expected = {
+            dependent
+            for cell_range, range_sheet, dependent in ranges
+            if cell_range.contains(None, col, row)
+            and (range_sheet is None or sheet is None or range_sheet == sheet)
+        }
+        assert index.dependents_of(sheet, col, row) == expected
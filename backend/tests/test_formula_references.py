@@ -0,0 +1,56 @@
+from app.services.formula_references import (
+    CellRange,
+    extract_references,
+    extract_reference_strings,
+    parse_reference,
+)
+
+
+class TestExtractReferences:
+    """Test the shared formula reference extractor"""
+
+    def test_single_cells(self):
+        assert extract_reference_strings("=A1+B1") == ["A1", "B1"]
+
+    def test_absolute_and_lowercase_refs_are_normalized(self):
+        assert extract_reference_strings("=$a$1+A1*$B2") == ["A1", "B2"]
+
+    def test_range_kept_as_bounds(self):
+        (cell_range,) = extract_references("=SUM(A1:Z5000)")
+        assert cell_range == CellRange(None, 1, 1, 26, 5000)
+        assert cell_range.size == 26 * 5000
+        assert cell_range.coordinate == "A1:Z5000"
+
+    def test_cross_sheet_references(self):
+        refs = extract_reference_strings("='My Sheet'!A1+Sheet2!B2:C4+D1", "Main")
+        assert refs == ["My Sheet!A1", "Sheet2!B2:C4", "Main!D1"]
+
+    def test_ignores_functions_names_and_strings(self):
+        formula = '=LOG10(C3)&"A1"&Revenue2024'
+        assert extract_reference_strings(formula) == ["C3"]
+
+    def test_out_of_bounds_references_are_ignored(self):
+        assert extract_references("=XFE1+A1048577") == ()
+
+    def test_results_are_memoized(self):
+        extract_references.cache_clear()
+        extract_references("=A1+B1")
+        extract_references("=A1+B1")
+        assert extract_references.cache_info().hits == 1
+
+
+class TestCellRange:
+    """Test CellRange helpers"""
+
+    def test_contains_respects_sheet(self):
+        cell_range = parse_reference("Sheet1!B2:C3")
+        assert cell_range.contains("Sheet1", 2, 3)
+        assert not cell_range.contains("Sheet2", 2, 3)
+        assert not cell_range.contains("Sheet1", 4, 3)
+
+    def test_iter_cells(self):
+        cell_range = parse_reference("A1:B2")
+        assert list(cell_range.iter_cells("S")) == ["S!A1", "S!B1", "S!A2", "S!B2"]
+
+    def test_parse_invalid_reference(self):
+        assert parse_reference("not a ref") is None
@@ -30,3 +30,39 @@ def test_validate_assumptions_invalid_value():
     result = det.validate_assumptions(assumptions)
     assert not result["is_valid"]
     assert result["errors"]
+
+
+def _param(ref, formula=None):
+    from app.models.parameter import ParameterCategory, ParameterType, SensitivityLevel
+    from app.services.parameter_detector import DetectedParameter
+
+    sheet, _ = ref.split("!")
+    return DetectedParameter(
+        cell_reference=ref,
+        sheet_name=sheet,
+        name=ref,
+        value=1.0,
+        parameter_type=ParameterType.CONSTANT,
+        category=ParameterCategory.ASSUMPTIONS,
+        sensitivity_level=SensitivityLevel.MEDIUM,
+        description=None,
+        unit=None,
+        format_type="number",
+        min_value=None,
+        max_value=None,
+        depends_on=[],
+        affects=[],
+        formula=formula,
+        validation_rules={},
+        confidence_score=0.5,
+    )
+
+
+@pytest.mark.asyncio
+async def test_build_dependency_graph_matches_ranges_by_bounds():
+    det = ParameterDetector()
+    a1, a2, other = _param("Sheet1!A1"), _param("Sheet1!A2"), _param("Other!A1")
+    total = _param("Sheet1!B1", "=SUM($A$1:A100)+Other!A1")
+    await det._build_dependency_graph([a1, a2, other, total], None)
+    assert set(total.depends_on) == {"Sheet1!A1", "Sheet1!A2", "Other!A1"}
+    assert a1.affects == ["Sheet1!B1"]
@@ -0,0 +1,93 @@
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from app.core.config import settings
+from app.services import pdf_layout
+from app.services.chart_renderer import ChartImageCache
+from app.services.pdf_generator import PDFReportGenerator
+from app.services.pdf_layout import clear_layout_cache, compile_layout
+
+DATA = {
+    "summary": {"overview": "Quarter close", "highlights": ["Revenue up"]},
+    "metrics": {"revenue": 1000, "margin": 0.2},
+    "tables": {"profit_loss": [{"name": "Revenue", "value": 1000}]},
+}
+
+
+@pytest.fixture(autouse=True)
+def layout_cache():
+    clear_layout_cache()
+    yield
+    clear_layout_cache()
+
+
+@pytest.fixture
+def logo(tmp_path):
+    path = tmp_path / "logo.png"
+    Image.new("RGBA", (200, 100), (25, 118, 210, 128)).save(path)
+    return str(path)
+
+
+def _generator(tmp_path):
+    return PDFReportGenerator(
+        output_dir=str(tmp_path), chart_cache=ChartImageCache(tmp_path / "charts")
+    )
+
+
+def _render(generator, branding):
+    output = io.BytesIO()
+    generator.generate_financial_report(DATA, {}, branding, output=output)
+    return output.getvalue()
+
+
+def test_layouts_are_reused_until_their_version_changes(logo):
+    branding = {"company_name": "Acme", "logo_path": logo}
+    layout = compile_layout({}, branding)
+
+    assert compile_layout({}, dict(branding)) is layout
+    assert compile_layout({"sections": ["summary"]}, branding) is not layout
+    assert compile_layout({}, {**branding, "company_name": "Other"}) is not layout
+
+    # Replacing the logo file recompiles the layout
+    stat = os.stat(logo)
+    os.utime(logo, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert compile_layout({}, branding) is not layout
+
+
+def test_layout_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(settings, "PDF_LAYOUT_CACHE_SIZE", 1)
+    first = compile_layout({}, {"company_name": "A"})
+    compile_layout({}, {"company_name": "B"})
+
+    assert compile_layout({}, {"company_name": "A"}) is not first
+
+
+def test_reports_share_the_encoded_logo(tmp_path, logo):
+    generator = _generator(tmp_path)
+    branding = {"company_name": "Acme", "logo_path": logo}
+
+    with patch.object(
+        pdf_layout, "_encode_image", wraps=pdf_layout._encode_image
+    ) as encode:
+        first = _render(generator, branding)
+        second = _render(_generator(tmp_path), branding)
+
+    encode.assert_called_once()
+    for content in (first, second):
+        assert content.startswith(b"%PDF")
+        # The logo and its alpha channel
+        assert content.count(b"/Subtype /Image") == 2
+        assert b"/SMask" in content
+
+
+def test_missing_logo_is_skipped(tmp_path):
+    generator = _generator(tmp_path)
+
+    content = _render(generator, {"logo_path": str(tmp_path / "missing.png")})
+
+    assert compile_layout({}, {"logo_path": str(tmp_path / "missing.png")}).logo is None
+    assert b"/Subtype /Image" not in content
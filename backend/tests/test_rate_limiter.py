@@ -0,0 +1,107 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import redis
+from starlette.requests import Request
+
+from app.core.rate_limiter import (
+    InMemoryRateLimitBackend,
+    RateLimitDecision,
+    RedisRateLimitBackend,
+    rate_limit,
+    set_rate_limit_backend,
+)
+
+
+def test_in_memory_backend_blocks_after_max_attempts():
+    backend = InMemoryRateLimitBackend()
+    decisions = [backend.hit("login:1.2.3.4", 3, 60, 120) for _ in range(4)]
+    assert [d.allowed for d in decisions] == [True, True, True, False]
+    assert decisions[-1].retry_after == 120
+
+    # Still blocked even though the bucket would refill
+    assert not backend.hit("login:1.2.3.4", 3, 0.001, 120).allowed
+    # Other keys are independent
+    assert backend.hit("login:5.6.7.8", 3, 60, 120).allowed
+
+    backend.reset("login:1.2.3.4")
+    assert backend.hit("login:1.2.3.4", 3, 60, 120).allowed
+
+
+def test_redis_backend_runs_script_atomically():
+    client = MagicMock()
+    script = client.register_script.return_value
+    script.side_effect = [[1, 0], [0, 90000]]
+    backend = RedisRateLimitBackend(client)
+
+    assert backend.hit("upload:ip", 5, 60, 90) == RateLimitDecision(True, 0.0)
+    assert backend.hit("upload:ip", 5, 60, 90) == RateLimitDecision(False, 90.0)
+
+    call = script.call_args
+    assert call.kwargs["keys"] == [
+        "ratelimit:upload:ip:hits",
+        "ratelimit:upload:ip:blocked",
+    ]
+    assert call.kwargs["args"][:3] == [60000, 5, 90000]
+
+    backend.reset("upload:ip")
+    client.delete.assert_called_once_with(
+        "ratelimit:upload:ip:hits", "ratelimit:upload:ip:blocked"
+    )
+
+
+def test_redis_backend_falls_back_when_unavailable():
+    client = MagicMock()
+    script = client.register_script.return_value
+    script.side_effect = redis.ConnectionError("down")
+    backend = RedisRateLimitBackend(client)
+
+    assert backend.hit("login:ip", 1, 60, 60).allowed
+    assert not backend.hit("login:ip", 1, 60, 60).allowed
+    # Redis is not retried until the retry interval passes
+    assert script.call_count == 1
+
+
+def test_login_storm_is_rate_limited(client):
+    statuses = [
+        client.post(
+            "/api/v1/auth/login", data={"username": "nobody", "password": "wrong"}
+        ).status_code
+        for _ in range(6)
+    ]
+    assert statuses[:5] == [401] * 5
+    assert statuses[5] == 429
+
+
+def test_rate_limit_decorator_guards_non_auth_endpoints(authenticated_client):
+    client, _ = authenticated_client
+    payload = {"file_id": 1, "scenarios": []}
+    for _ in range(20):
+        assert client.post("/api/v1/scenarios/analyze", json=payload).status_code == 201
+
+    response = client.post("/api/v1/scenarios/analyze", json=payload)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) == 60
+
+
+def test_async_endpoints_check_limits_off_the_event_loop():
+    threads = []
+
+    class RecordingBackend(InMemoryRateLimitBackend):
+        def hit(self, *args):
+            threads.append(threading.current_thread())
+            return super().hit(*args)
+
+    @rate_limit(max_attempts=5, window_minutes=1, endpoint="export")
+    async def endpoint(request: Request):
+        return "ok"
+
+    request = Request({"type": "http", "headers": [], "client": ("1.2.3.4", 1)})
+    set_rate_limit_backend(RecordingBackend())
+    try:
+        assert asyncio.run(endpoint(request=request)) == "ok"
+    finally:
+        set_rate_limit_backend(None)
+
+    assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,165 @@
+import json
+import zipfile
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.models.parameter import Scenario
+from app.models.report import ExportFormat, ReportExport, ReportStatus
+from app.services.report_bundle import render_bundle, write_bundle_zip
+from app.services.report_service import ReportService
+from tests.test_financial_data_context import _add_processed_file
+
+DATA = {
+    "metrics": {"revenue": 1000, "profit": 200},
+    "charts": {"revenue_trend": [{"period": "Q1", "value": 1}]},
+    "tables": {"profit_loss": [{"name": "Revenue", "value": 1000}]},
+}
+
+
+@pytest.fixture
+def upload_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_FOLDER", str(tmp_path))
+    return tmp_path
+
+
+def test_bundle_renders_across_worker_processes(upload_folder):
+    jobs = [(i, f"Entity {i}", DATA) for i in range(3)]
+    finished = []
+
+    results = render_bundle(
+        jobs,
+        ExportFormat.PDF,
+        None,
+        None,
+        str(upload_folder / "out"),
+        on_rendered=finished.append,
+        workers=2,
+    )
+
+    assert [path.rsplit("/", 1)[-1] for path, _ in results] == [
+        "0001_Entity_0.pdf",
+        "0002_Entity_1.pdf",
+        "0003_Entity_2.pdf",
+    ]
+    assert all(error is None for _, error in results)
+    assert finished == [1, 2, 3]
+
+
+def test_manifest_lists_reports_and_failures(tmp_path):
+    report = tmp_path / "0001_a.csv"
+    report.write_text("a,b\n")
+
+    manifest = write_bundle_zip(
+        tmp_path / "bundle.zip",
+        {"name": "Month end", "reports_per_minute": 12.0},
+        [{"index": 0, "name": "a"}, {"index": 1, "name": "b"}],
+        [(str(report), None), (None, "no data")],
+    )
+
+    with zipfile.ZipFile(tmp_path / "bundle.zip") as archive:
+        assert sorted(archive.namelist()) == ["manifest.json", "reports/0001_a.csv"]
+        assert json.loads(archive.read("manifest.json")) == manifest
+    assert (manifest["report_count"], manifest["failed_count"]) == (1, 1)
+    assert manifest["reports"][0]["size"] == 4
+    assert len(manifest["reports"][0]["sha256"]) == 64
+    assert manifest["reports"][1]["error"] == "no data"
+    assert not report.exists()
+
+
+def test_bundle_renders_in_process_under_prefork(upload_folder, caplog):
+    jobs = [(i, f"Entity {i}", DATA) for i in range(2)]
+
+    with patch("multiprocessing.current_process") as current:
+        current.return_value.daemon = True
+        results = render_bundle(
+            jobs, ExportFormat.CSV, None, None, str(upload_folder), workers=2
+        )
+
+    assert all(path and error is None for path, error in results)
+    assert "--pool threads" in caplog.text
+
+
+async def test_bundle_export_writes_zip(db_session, upload_folder, monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_BUNDLE_POOL", "inline")
+    record = _add_processed_file(db_session)
+    scenario = Scenario(name="Base", base_file_id=record.id, created_by_id=1)
+    db_session.add(scenario)
+    db_session.commit()
+
+    service = ReportService(db_session)
+    export = await service.generate_bundle(
+        user_id=1,
+        export_format=ExportFormat.EXCEL,
+        targets=[
+            {"file_id": record.id, "period": "mtd", "name": "North"},
+            {"scenario_id": scenario.id, "period": "ytd"},
+            {"scenario_id": 999},
+        ],
+        name="Month end",
+    )
+    assert (export.export_format, export.priority) == (ExportFormat.ZIP, "bulk")
+
+    steps = []
+    with patch("app.services.report_service.publish_report_progress"):
+        result = await service.run_export(
+            export.id, on_progress=lambda percent, step: steps.append(step)
+        )
+
+    assert result.status == ReportStatus.COMPLETED
+    assert result.file_path.endswith(f"Month_end_{export.id}.zip")
+    assert "Rendered 2 of 3 reports" in steps
+    with zipfile.ZipFile(result.file_path) as archive:
+        manifest = json.loads(archive.read("manifest.json"))
+        names = archive.namelist()
+    assert "reports/0001_North.xlsx" in names
+    assert "reports/0002_Month_end_2.xlsx" in names
+    assert [r["status"] for r in manifest["reports"]] == [
+        "completed",
+        "completed",
+        "failed",
+    ]
+    assert manifest["reports"][2]["error"] == "Scenario 999 not found"
+    assert result.generation_config["bundle"]["reports_per_minute"] > 0
+    # The shared context loaded the one source file once
+    assert service.dashboard_service.context.loads == 1
+
+
+def test_bundle_endpoint_queues_on_bulk_lane(
+    admin_client, db_session, queued_report_jobs
+):
+    client, _ = admin_client
+
+    response = client.post(
+        "/api/v1/reports/bundles",
+        json={
+            "export_format": "pdf",
+            "name": "Month end",
+            "targets": [{"file_id": 1, "period": "Q1"}, {"file_id": 1, "period": "Q2"}],
+        },
+    )
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["export_format"] == "zip"
+    queued_report_jobs.assert_called_once_with(args=[data["id"]], queue="reports_bulk")
+    export = db_session.get(ReportExport, data["id"])
+    assert export.generation_config["bundle"]["format"] == "pdf"
+    assert export.source_file_ids == [1]
+
+
+def test_bundle_endpoint_rejects_unsupported_formats(admin_client, monkeypatch):
+    client, _ = admin_client
+    monkeypatch.setattr(settings, "REPORT_BUNDLE_MAX_TARGETS", 1)
+    target = {"file_id": 1}
+
+    too_many = client.post(
+        "/api/v1/reports/bundles", json={"targets": [target, target]}
+    )
+    png = client.post(
+        "/api/v1/reports/bundles", json={"export_format": "png", "targets": [target]}
+    )
+
+    assert too_many.status_code == 400
+    assert png.status_code == 400
@@ -0,0 +1,164 @@
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from app.core.config import settings
+from app.models.financial import ChangeType, FileVersion
+from app.models.parameter import Scenario
+from app.models.report import ExportFormat, ReportStatus, ReportTemplate, ReportType
+from app.services.report_fingerprint import report_fingerprint
+from app.services.report_service import REUSED_STEP, ReportService
+from tests.test_financial_data_context import _add_processed_file
+
+
+@pytest.fixture
+def upload_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_FOLDER", str(tmp_path))
+    return tmp_path
+
+
+def _add_versioned_file(db_session):
+    record = _add_processed_file(db_session)
+    record.processing_completed_at = datetime(2024, 1, 1)
+    db_session.add(
+        FileVersion(
+            file_id=record.id,
+            version_number=1,
+            file_path=record.file_path,
+            file_size=record.file_size,
+            file_hash="a" * 64,
+            change_type=ChangeType.INITIAL.value,
+            is_current=True,
+            created_by_id=1,
+        )
+    )
+    db_session.commit()
+    return record
+
+
+def _fingerprint(db_session, file_ids, config=None, template_id=None):
+    return report_fingerprint(
+        db_session, 1, ExportFormat.PDF, template_id, file_ids, config or {}
+    )
+
+
+def test_fingerprint_follows_report_inputs(db_session):
+    record = _add_versioned_file(db_session)
+    template = ReportTemplate(
+        name="Board",
+        report_type=ReportType.FINANCIAL_SUMMARY,
+        template_config={"sections": ["summary"]},
+        created_by=1,
+    )
+    scenario = Scenario(name="Base", base_file_id=record.id, created_by_id=1)
+    db_session.add_all([template, scenario])
+    db_session.commit()
+    bundle = {"bundle": {"targets": [{"scenario_id": scenario.id}]}}
+
+    first = _fingerprint(db_session, [record.id], bundle, template.id)
+    assert first == _fingerprint(db_session, [record.id], bundle, template.id)
+    # Result stats written after generation do not count as inputs
+    with_stats = {"bundle": {**bundle["bundle"], "report_count": 1}}
+    assert first == _fingerprint(db_session, [record.id], with_stats, template.id)
+
+    scenario.calculation_results = {"revenue": 1}
+    db_session.commit()
+    after_scenario = _fingerprint(db_session, [record.id], bundle, template.id)
+    template.template_config = {"sections": ["summary", "charts"]}
+    db_session.commit()
+    after_template = _fingerprint(db_session, [record.id], bundle, template.id)
+    record.processing_completed_at = datetime(2024, 1, 2)
+    db_session.commit()
+    after_processing = _fingerprint(db_session, [record.id], bundle, template.id)
+    record.versions[0].file_hash = "b" * 64
+    db_session.commit()
+    after_upload = _fingerprint(db_session, [record.id], bundle, template.id)
+
+    fingerprints = {first, after_scenario, after_template, after_processing}
+    assert len(fingerprints | {after_upload}) == 5
+    assert first != _fingerprint(db_session, [record.id], {"period": "MTD"})
+
+
+def test_fingerprint_needs_known_inputs(db_session):
+    # Demo data, missing or unversioned files and missing scenarios are
+    # never reused
+    assert _fingerprint(db_session, None) is None
+    record = _add_versioned_file(db_session)
+    assert _fingerprint(db_session, [record.id, 999]) is None
+    assert _fingerprint(db_session, None, {"scenario_id": 999}) is None
+    assert _fingerprint(db_session, None) is not None
+    unversioned = _add_processed_file(db_session)
+    assert _fingerprint(db_session, [unversioned.id]) is None
+
+
+async def test_unchanged_inputs_reuse_the_previous_report(
+    db_session, upload_folder, queued_report_jobs
+):
+    record = _add_versioned_file(db_session)
+    service = ReportService(db_session)
+
+    first = await service.generate_report(
+        1, ExportFormat.EXCEL, source_file_ids=[record.id]
+    )
+    with patch("app.services.report_service.publish_report_progress"):
+        first = await service.run_export(first.id)
+    second = await service.generate_report(
+        1, ExportFormat.EXCEL, source_file_ids=[record.id]
+    )
+
+    queued_report_jobs.assert_called_once()
+    assert second.status == ReportStatus.COMPLETED
+    assert second.current_step == REUSED_STEP
+    assert second.input_fingerprint == first.input_fingerprint
+    assert second.file_path != first.file_path
+    assert os.path.samefile(second.file_path, first.file_path)
+
+    # Deleting one export leaves the other's file in place
+    assert service.delete_export(first.id, 1)
+    assert os.path.exists(second.file_path)
+
+
+async def test_changed_inputs_are_regenerated(
+    db_session, upload_folder, queued_report_jobs
+):
+    record = _add_versioned_file(db_session)
+    service = ReportService(db_session)
+
+    first = await service.generate_report(
+        1, ExportFormat.EXCEL, source_file_ids=[record.id]
+    )
+    with patch("app.services.report_service.publish_report_progress"):
+        await service.run_export(first.id)
+    # Reprocessing the file rewrites its parsed data
+    record.processing_completed_at = datetime(2024, 1, 2)
+    db_session.commit()
+    second = await service.generate_report(
+        1, ExportFormat.EXCEL, source_file_ids=[record.id]
+    )
+
+    assert queued_report_jobs.call_count == 2
+    assert second.status == ReportStatus.PENDING
+    assert second.input_fingerprint != first.input_fingerprint
+
+
+async def test_unreadable_previous_report_is_regenerated(
+    db_session, upload_folder, queued_report_jobs
+):
+    record = _add_versioned_file(db_session)
+    service = ReportService(db_session)
+    first = await service.generate_report(
+        1, ExportFormat.EXCEL, source_file_ids=[record.id]
+    )
+    with patch("app.services.report_service.publish_report_progress"):
+        await service.run_export(first.id)
+
+    with patch.object(service, "_copy_artifact", side_effect=PermissionError):
+        second = await service.generate_report(
+            1, ExportFormat.EXCEL, source_file_ids=[record.id]
+        )
+
+    assert queued_report_jobs.call_count == 2
+    assert second.status == ReportStatus.PENDING
+    assert second.task_id is not None
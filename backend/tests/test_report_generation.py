@@ -0,0 +1,179 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.models.report import ExportFormat, ReportExport, ReportSchedule, ReportStatus
+from app.services import report_service as report_service_module
+from app.services.report_service import ReportService
+from app.tasks.report_generation import (
+    enqueue_scheduled_reports,
+    generate_report_export,
+)
+
+
+def _session_factory(db_session):
+    factory = patch("app.tasks.report_generation.SessionLocal")
+    mock = factory.start()
+    mock.return_value.__enter__.return_value = db_session
+    return factory
+
+
+def test_generate_endpoint_queues_interactive_job(
+    authenticated_client, db_session, queued_report_jobs
+):
+    client, user = authenticated_client
+
+    response = client.post(
+        "/api/v1/reports/generate",
+        json={"file_ids": [1], "export_format": "excel", "name": "Q1"},
+    )
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["status"] == "pending"
+    assert data["priority"] == "interactive"
+    assert data["task_id"] == "report-task-id"
+    queued_report_jobs.assert_called_once_with(args=[data["id"]], queue="reports")
+
+
+async def test_run_export_records_progress(db_session, tmp_path):
+    service = ReportService(db_session)
+    export = await service.generate_report(
+        user_id=1, export_format=ExportFormat.CSV, source_file_ids=[1], name="r"
+    )
+    report_file = tmp_path / "r.csv"
+    report_file.write_text("a,b\n")
+    steps = []
+
+    with patch.object(
+        service, "_gather_financial_data", AsyncMock(return_value={"raw_data": []})
+    ), patch.object(
+        report_service_module,
+        "render_report_file",
+        return_value=(str(report_file), 4),
+    ), patch(
+        "app.services.report_service.publish_report_progress"
+    ) as publish:
+        result = await service.run_export(
+            export.id, on_progress=lambda percent, step: steps.append(percent)
+        )
+
+    assert result.status == ReportStatus.COMPLETED
+    assert (result.progress, result.current_step) == (100, "Completed")
+    assert result.file_size == 4
+    assert steps == [10, 40, 100]
+    assert publish.call_args.args[0] == export.id
+    assert publish.call_args.args[1]["status"] == "completed"
+    assert publish.call_args.args[2] == 1
+
+    # A redelivered task leaves the completed export alone
+    with patch("app.services.report_service.publish_report_progress") as publish:
+        assert await service.run_export(export.id) is result
+    publish.assert_not_called()
+    assert result.file_size == 4
+
+
+async def test_run_export_marks_failures(db_session):
+    service = ReportService(db_session)
+    export = await service.generate_report(
+        user_id=1, export_format=ExportFormat.PDF, source_file_ids=[1]
+    )
+
+    with patch.object(
+        service, "_gather_financial_data", AsyncMock(side_effect=RuntimeError("boom"))
+    ), patch("app.services.report_service.publish_report_progress") as publish:
+        result = await service.run_export(export.id)
+
+    assert result.status == ReportStatus.FAILED
+    assert result.error_message == "boom"
+    assert result.current_step == "Failed"
+    assert publish.call_args.args[1]["error_message"] == "boom"
+
+
+async def test_unknown_priority_is_rejected(db_session):
+    with pytest.raises(ValueError):
+        await ReportService(db_session).generate_report(
+            user_id=1, export_format=ExportFormat.PDF, priority="urgent"
+        )
+
+
+async def test_queue_failure_marks_export_failed(db_session, queued_report_jobs):
+    queued_report_jobs.side_effect = ConnectionError("broker down")
+
+    with pytest.raises(ConnectionError):
+        await ReportService(db_session).generate_report(
+            user_id=1, export_format=ExportFormat.PDF
+        )
+
+    export = db_session.query(ReportExport).one()
+    assert export.status == ReportStatus.FAILED
+    assert "broker down" in export.error_message
+
+
+def test_task_runs_export_with_worker_session(db_session):
+    export = ReportExport(
+        name="r",
+        export_format=ExportFormat.PDF,
+        created_by=1,
+        status=ReportStatus.PENDING,
+    )
+    db_session.add(export)
+    db_session.commit()
+
+    factory = _session_factory(db_session)
+    try:
+        with patch.object(
+            ReportService,
+            "run_export",
+            AsyncMock(return_value=export),
+        ) as run_export, patch.object(generate_report_export, "update_state"):
+            result = generate_report_export(export.id)
+    finally:
+        factory.stop()
+
+    assert result["export_id"] == export.id
+    assert result["status"] == "pending"
+    assert run_export.await_args.args[0] == export.id
+
+
+def test_scheduled_reports_use_bulk_lane(db_session, queued_report_jobs):
+    schedule = ReportSchedule(
+        name="Weekly",
+        cron_expression="0 6 * * 1",
+        template_id=1,
+        export_format=ExportFormat.EXCEL,
+        created_by=1,
+        is_active=True,
+    )
+    bad = ReportSchedule(
+        name="Broken",
+        cron_expression="whenever",
+        template_id=1,
+        created_by=1,
+        is_active=True,
+    )
+    db_session.add_all([schedule, bad])
+    db_session.commit()
+
+    factory = _session_factory(db_session)
+    try:
+        result = enqueue_scheduled_reports()
+    finally:
+        factory.stop()
+
+    assert len(result["queued_exports"]) == 2
+    assert result["errors"] == [f"Schedule {bad.id}: invalid cron expression"]
+    assert {call.kwargs["queue"] for call in queued_report_jobs.call_args_list} == {
+        "reports_bulk"
+    }
+
+    db_session.refresh(schedule)
+    assert schedule.run_count == 1
+    assert schedule.next_run_at > datetime.utcnow()
+    assert schedule.next_run_at.weekday() == 0
+    exports = db_session.query(ReportExport).filter_by(schedule_id=schedule.id).all()
+    assert [e.priority for e in exports] == ["bulk"]
+
+    db_session.refresh(bad)
+    assert bad.is_active is False
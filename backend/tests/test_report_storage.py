@@ -0,0 +1,161 @@
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+from openpyxl import load_workbook
+
+from app.core.config import settings
+from app.models.report import ExportFormat
+from app.services.excel_exporter import ExcelExporter
+from app.services.report_service import render_report_file
+from app.services.report_storage import (
+    AzureBlockSink,
+    LocalFileSink,
+    S3MultipartSink,
+    delete_report_artifact,
+)
+
+DATA = {
+    "metrics": {"revenue": 1000, "profit": 200},
+    "tables": {"profit_loss": [{"name": "Revenue", "value": 1000}]},
+    "raw_data": [{"account": "Revenue", "value": 1000}],
+}
+
+
+@pytest.fixture
+def upload_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_FOLDER", str(tmp_path))
+    monkeypatch.setattr(settings, "REPORT_STORAGE_PART_SIZE", 1024)
+    return tmp_path
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_PROVIDER", "s3")
+    client = MagicMock()
+    client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+    client.upload_part.side_effect = lambda **kwargs: {
+        "ETag": f"etag-{kwargs['PartNumber']}"
+    }
+    with patch("app.services.cloud_storage.boto3.client", return_value=client):
+        yield client
+
+
+def test_local_sink_is_visible_only_once_complete(tmp_path):
+    path = tmp_path / "reports" / "r.csv"
+
+    with LocalFileSink(path, part_size=4) as sink:
+        sink.write(b"a,b\n1,2\n")
+        assert not path.exists()
+        assert sink.parts == 2
+
+    assert path.read_bytes() == b"a,b\n1,2\n"
+    assert (sink.location, sink.size) == (str(path), 8)
+
+    with pytest.raises(RuntimeError):
+        with LocalFileSink(tmp_path / "failed.csv") as sink:
+            sink.write(b"partial")
+            raise RuntimeError("render failed")
+    assert list(tmp_path.iterdir()) == [tmp_path / "reports"]
+
+
+def test_s3_sink_uploads_parts_while_writing(s3_client):
+    sink = S3MultipartSink(s3_client, "bucket", "reports/r.pdf", part_size=4)
+
+    sink.write(b"%PDF-")
+    assert s3_client.upload_part.call_count == 1
+    sink.write(b"1.4")
+    sink.close()
+
+    assert [c.kwargs["Body"] for c in s3_client.upload_part.call_args_list] == [
+        b"%PDF",
+        b"-1.4",
+    ]
+    s3_client.complete_multipart_upload.assert_called_once_with(
+        Bucket="bucket",
+        Key="reports/r.pdf",
+        UploadId="upload-1",
+        MultipartUpload={
+            "Parts": [
+                {"ETag": "etag-1", "PartNumber": 1},
+                {"ETag": "etag-2", "PartNumber": 2},
+            ]
+        },
+    )
+    assert s3_client.create_multipart_upload.call_args.kwargs["ContentType"] == (
+        "application/pdf"
+    )
+
+
+def test_failed_s3_upload_is_aborted(s3_client):
+    with pytest.raises(ValueError):
+        with S3MultipartSink(s3_client, "bucket", "reports/r.pdf") as sink:
+            sink.write(b"data")
+            raise ValueError("render failed")
+
+    s3_client.abort_multipart_upload.assert_called_once_with(
+        Bucket="bucket", Key="reports/r.pdf", UploadId="upload-1"
+    )
+    s3_client.complete_multipart_upload.assert_not_called()
+
+
+def test_azure_sink_commits_staged_blocks():
+    blob_client = MagicMock()
+
+    with AzureBlockSink(blob_client, "files", "reports/r.csv", part_size=2) as sink:
+        sink.write(b"abc")
+
+    block_ids = [c.args[0] for c in blob_client.stage_block.call_args_list]
+    assert [c.args[1] for c in blob_client.stage_block.call_args_list] == [
+        b"ab",
+        b"c",
+    ]
+    assert blob_client.commit_block_list.call_args.args[0] == block_ids
+    assert sink.location == "azure://files/reports/r.csv"
+
+
+def test_constant_memory_workbook_streams_into_a_sink(tmp_path):
+    path = tmp_path / "large.xlsx"
+
+    with LocalFileSink(path, part_size=512) as sink:
+        ExcelExporter(str(tmp_path)).export_financial_data(
+            DATA, streaming=True, output=sink
+        )
+
+    assert sink.parts > 1
+    assert load_workbook(path).sheetnames == ["Raw Data", "Metadata"]
+
+
+@pytest.mark.parametrize(
+    "export_format", [ExportFormat.PDF, ExportFormat.EXCEL, ExportFormat.CSV]
+)
+def test_reports_render_into_local_storage(upload_folder, export_format):
+    location, size = render_report_file(export_format, DATA, None, None, "Board pack")
+
+    report = upload_folder / "reports" / f"Board pack.{location.rsplit('.', 1)[1]}"
+    assert location == str(report)
+    assert report.stat().st_size == size
+    content = report.read_bytes()
+    if export_format == ExportFormat.PDF:
+        assert content.startswith(b"%PDF")
+    elif export_format == ExportFormat.EXCEL:
+        assert "Metadata" in load_workbook(io.BytesIO(content)).sheetnames
+    else:
+        assert content.decode().endswith("account,value\nRevenue,1000\n")
+
+
+def test_reports_upload_to_s3_while_rendering(upload_folder, s3_client):
+    location, size = render_report_file(
+        ExportFormat.PDF, DATA, None, None, "Board pack"
+    )
+
+    assert location == "s3://finvision-files/reports/Board pack.pdf"
+    uploaded = b"".join(c.kwargs["Body"] for c in s3_client.upload_part.call_args_list)
+    assert uploaded.startswith(b"%PDF") and len(uploaded) == size
+    assert s3_client.upload_part.call_count > 1
+    assert not (upload_folder / "reports" / "Board pack.pdf").exists()
+
+    assert delete_report_artifact(location)
+    s3_client.delete_object.assert_called_once_with(
+        Bucket="finvision-files", Key="reports/Board pack.pdf"
+    )
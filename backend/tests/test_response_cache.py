@@ -0,0 +1,190 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import redis
+from starlette.requests import Request
+
+from app.core.response_cache import (
+    InMemoryResponseCache,
+    RedisResponseCache,
+    cached_response,
+    invalidate_user_responses,
+    set_response_cache,
+)
+
+
+def test_in_memory_cache_expires_and_evicts():
+    cache = InMemoryResponseCache(max_entries=2)
+    cache.set("a", ('"1"', b"{}"), 60)
+    cache.set("b", ('"2"', b"[]"), 0)
+    assert cache.get("a") == ('"1"', b"{}")
+    assert cache.get("b") is None
+
+    cache.set("c", ('"3"', b"1"), 60)
+    cache.set("d", ('"4"', b"2"), 60)
+    assert cache.get("a") is None
+
+    assert cache.generation("user:1") == 0
+    cache.invalidate("user:1")
+    assert cache.generation("user:1") == 1
+    assert cache.generation("user:2") == 0
+
+
+def test_redis_cache_round_trip_and_errors():
+    client = MagicMock()
+    client.get.side_effect = [b'"abc"\n{"a": 1}', None, b"3"]
+    cache = RedisResponseCache(client)
+
+    assert cache.get("dashboard:k") == ('"abc"', b'{"a": 1}')
+    assert cache.get("dashboard:k") is None
+    assert cache.generation("user:1") == 3
+
+    cache.set("dashboard:k", ('"abc"', b"{}"), 30)
+    client.set.assert_called_once_with("respcache:dashboard:k", b'"abc"\n{}', ex=30)
+    cache.invalidate("user:1")
+    client.incr.assert_called_once_with("respcache:gen:user:1")
+
+    # An unreachable Redis costs only the cache
+    client.get.side_effect = redis.ConnectionError("down")
+    assert cache.get("dashboard:k") is None
+    assert cache.generation("user:1") == 0
+
+
+def test_redis_cache_backs_off_and_replays_invalidations():
+    client = MagicMock()
+    client.get.side_effect = redis.ConnectionError("down")
+    cache = RedisResponseCache(client)
+
+    assert cache.generation("user:1") == 0
+    assert cache.get("dashboard:k") is None
+    cache.set("dashboard:k", ('"abc"', b"{}"), 30)
+    cache.invalidate("user:1")
+    # Redis is not retried until the retry interval passes
+    assert client.get.call_count == 1
+    client.set.assert_not_called()
+    client.incr.assert_not_called()
+
+    client.get.side_effect = None
+    client.get.return_value = b"4"
+    cache._unavailable_until = 0.0
+    assert cache.generation("user:1") == 4
+    client.incr.assert_called_once_with("respcache:gen:user:1")
+
+
+def test_commits_invalidate_their_owners_responses(authenticated_client, db_session):
+    from app.models.file import UploadedFile
+
+    client, user = authenticated_client
+    url = "/api/v1/dashboard/data-sources"
+    assert client.get(url).headers["X-Cache"] == "MISS"
+    assert client.get(url).headers["X-Cache"] == "HIT"
+
+    file_record = UploadedFile(
+        original_filename="model.xlsx",
+        stored_filename="stored.xlsx",
+        file_path="/path/model.xlsx",
+        file_size=1024,
+        user_id=user.id,
+    )
+    db_session.add(file_record)
+    db_session.commit()
+    response = client.get(url)
+    assert response.headers["X-Cache"] == "MISS"
+
+    assert client.delete(f"/api/v1/files/{file_record.id}").status_code == 204
+    assert client.get(url).headers["X-Cache"] == "MISS"
+
+
+def test_dashboard_responses_are_cached_with_etags(authenticated_client):
+    client, user = authenticated_client
+    first = client.get("/api/v1/dashboard/metrics")
+    assert first.status_code == 200
+    assert first.headers["X-Cache"] == "MISS"
+    etag = first.headers["ETag"]
+
+    second = client.get("/api/v1/dashboard/metrics")
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["ETag"] == etag
+    assert second.json() == first.json()
+
+    not_modified = client.get(
+        "/api/v1/dashboard/metrics", headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    # Query parameters are part of the key
+    other = client.get("/api/v1/dashboard/charts?period=mtd")
+    assert other.headers["X-Cache"] == "MISS"
+
+    invalidate_user_responses(user.id)
+    assert client.get("/api/v1/dashboard/metrics").headers["X-Cache"] == "MISS"
+
+
+def test_statement_responses_are_cached_per_user(authenticated_client):
+    client, user = authenticated_client
+    assert client.get("/api/v1/statements/").headers["X-Cache"] == "MISS"
+    invalidate_user_responses(user.id + 1)
+    assert client.get("/api/v1/statements/").headers["X-Cache"] == "HIT"
+
+    # A failed delete changes nothing and keeps the cache
+    assert client.delete("/api/v1/statements/1").status_code == 404
+    assert client.get("/api/v1/statements/").headers["X-Cache"] == "HIT"
+
+
+def test_async_endpoints_use_the_cache_off_the_event_loop():
+    threads = []
+
+    class RecordingCache(InMemoryResponseCache):
+        def generation(self, scope):
+            threads.append(threading.current_thread())
+            return super().generation(scope)
+
+        def set(self, *args):
+            threads.append(threading.current_thread())
+            return super().set(*args)
+
+    @cached_response("test")
+    async def endpoint(current_user):
+        return {"ok": True}
+
+    request = Request(
+        {"type": "http", "path": "/x", "query_string": b"", "headers": []}
+    )
+    set_response_cache(RecordingCache(10))
+    try:
+        response = asyncio.run(
+            endpoint(current_user=SimpleNamespace(id=1), _cache_request=request)
+        )
+    finally:
+        set_response_cache(None)
+
+    assert response.headers["X-Cache"] == "MISS"
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+
+
+def test_commits_on_the_event_loop_invalidate_off_it(db_session):
+    from app.models.file import UploadedFile
+
+    threads = []
+
+    class RecordingCache(InMemoryResponseCache):
+        def invalidate(self, scope):
+            threads.append(threading.current_thread())
+            super().invalidate(scope)
+
+    async def commit():
+        db_session.add(UploadedFile(original_filename="a.xlsx", file_size=1, user_id=1))
+        db_session.commit()
+
+    set_response_cache(RecordingCache(10))
+    try:
+        asyncio.run(commit())
+    finally:
+        set_response_cache(None)
+
+    assert len(threads) == 1
+    assert threads[0] is not threading.main_thread()
@@ -77,6 +77,9 @@ def patch_deps(monkeypatch):
         def cleanup_expired_files(self):
             return {"total_files_deleted": 2, "total_storage_freed_mb": 1.2}
 
+        def cleanup_stale_chunked_uploads(self):
+            return 0
+
     monkeypatch.setattr(st, "FileService", DummyFileService)
     monkeypatch.setattr(st, "FileCleanupService", DummyCleanupService)
     monkeypatch.setattr(st, "send_system_alert", dummy_send)
@@ -29,3 +29,40 @@ def test_password_strength_scores():
     strong = "StrongerPass123!"
     assert not security.check_password_strength(weak)["is_strong"]
     assert security.check_password_strength(strong)["is_strong"]
+
+
+def test_verified_tokens_skip_signature_check(monkeypatch):
+    token = security.create_access_token("user2", expires_delta=timedelta(minutes=5))
+    assert security.decode_token(token).version == 0
+
+    def fail(*args, **kwargs):
+        raise AssertionError("signature verified twice")
+
+    monkeypatch.setattr(security.jwt, "decode", fail)
+    claims = security.decode_token(token)
+    assert claims.subject == "user2"
+    # The cached claims still enforce the token type
+    assert security.decode_token(token, "refresh") is None
+
+
+def test_verified_token_cache_honours_expiry():
+    cache = security.VerifiedTokenCache(max_entries=1)
+    cache.put(b"old", security.TokenClaims("1", "access", expires_at=1.0))
+    assert cache.get(b"old") is None
+
+    cache.put(b"a", security.TokenClaims("1", "access", expires_at=2e9))
+    cache.put(b"b", security.TokenClaims("2", "access", expires_at=2e9))
+    assert cache.get(b"a") is None
+    assert cache.get(b"b").subject == "2"
+
+
+def test_logout_everywhere_revokes_issued_tokens(authenticated_client):
+    client, _ = authenticated_client
+    assert client.get("/api/v1/dashboard/metrics").status_code == 200
+
+    assert client.post("/api/v1/auth/logout?everywhere=true").status_code == 200
+    # Both the plain and the cached-principal auth paths reject the old token
+    assert client.get("/api/v1/auth/me").status_code == 401
+    response = client.get("/api/v1/dashboard/metrics")
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token has been revoked"
@@ -0,0 +1,86 @@
+from datetime import date
+
+from openpyxl import load_workbook
+
+from app.core.config import settings
+from app.services.excel_exporter import ExcelExporter
+from app.services.streaming_excel import StreamingExcelWriter, column_kind
+
+
+def test_column_kind_follows_column_names():
+    assert column_kind("Total Revenue") == "currency"
+    assert column_kind("growth_rate") == "percentage"
+    assert column_kind("units") == "number"
+
+
+def test_rows_are_streamed_from_a_generator(tmp_path):
+    exporter = ExcelExporter(output_dir=tmp_path)
+    rows = ({"period": f"P{i}", "amount": i * 1.5} for i in range(1000))
+
+    path = exporter.export_rows_streaming(
+        rows, ["period", "amount"], filename="rows.xlsx"
+    )
+
+    ws = load_workbook(path).active
+    assert ws.max_row == 1001
+    assert [c.value for c in ws[1]] == ["period", "amount"]
+    assert ws["A1001"].value == "P999"
+    assert ws["B1001"].value == 1498.5
+    assert ws["B2"].number_format == '"$"#,##0.00_);("$"#,##0.00)'
+
+
+def test_formats_and_widths_are_applied_by_column(tmp_path):
+    path = tmp_path / "formats.xlsx"
+    with StreamingExcelWriter(path, max_width=20) as writer:
+        sheet = writer.add_sheet("Data")
+        written = sheet.write_table(
+            [
+                ["a", 0.25, 10, date(2024, 1, 31)],
+                ["a much longer description than fits", None, 2000000, None],
+            ],
+            ["label", "margin", "units", "as_of"],
+            column_kinds=["number", "percentage", "number", "number"],
+        )
+
+    ws = load_workbook(path).active
+    assert written == 2
+    assert ws["B2"].number_format == "0.00%"
+    assert ws["C3"].number_format == "#,##0.00"
+    assert ws["D2"].number_format == "yyyy-mm-dd"
+    widths = {k: v.width for k, v in ws.column_dimensions.items()}
+    assert round(widths["A"]) == 21  # capped at max_width
+    assert widths["C"] > widths["B"]
+
+
+def test_large_financial_exports_switch_to_streaming(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EXCEL_STREAMING_ROW_THRESHOLD", 5)
+    exporter = ExcelExporter(output_dir=tmp_path)
+    data = {
+        "pl": {
+            "metrics": {"revenue": {"current": 120, "previous": 100}},
+            "time_series": [{"period": f"M{i}", "revenue": i} for i in range(4)],
+            "tables": {"detail": [{"name": "A", "cost": 5}, {"name": "B"}]},
+        },
+        "raw_data": [{"account": "Revenue", "value": 120}],
+        "charts": {"revenue_trend": [{"period": "Q1", "value": 1}]},
+    }
+
+    path = exporter.export_financial_data(data, filename="big.xlsx")
+
+    wb = load_workbook(path)
+    assert wb.sheetnames == ["P&L", "Raw Data", "Charts", "Metadata"]
+    values = [row for row in wb["P&L"].iter_rows(values_only=True)]
+    assert ("Revenue", 120, 100, 0.2) in values
+    assert ("Period", "Revenue", None, None) in values
+    assert ("B", None, None, None) in values
+    assert len(wb["Charts"]._charts) == 1
+
+
+def test_small_financial_exports_keep_openpyxl_layout(tmp_path):
+    exporter = ExcelExporter(output_dir=tmp_path)
+    data = {"summary": {"time_series": [{"period": "M1", "revenue": 1}]}}
+
+    path = exporter.export_financial_data(data, filename="small.xlsx")
+
+    # Excel tables are only written by the openpyxl backend
+    assert "TimeSeriesData" in load_workbook(path)["Summary"].tables
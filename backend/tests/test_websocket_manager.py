@@ -52,3 +52,435 @@ async def test_task_subscription_and_notification():
     assert any("notification" in m for m in ws.sent)
     await manager.unsubscribe_from_task(2, "task1")
     manager.disconnect(ws, user_id=2)
+
+
+@pytest.mark.asyncio
+async def test_events_fan_out_across_workers():
+    from app.core.websocket_backplane import LocalBackplane
+
+    # Two managers sharing a broker behave like two API workers
+    backplane = LocalBackplane()
+    worker_a = ConnectionManager(backplane)
+    worker_b = ConnectionManager(backplane)
+    ws_a = DummyWebSocket()
+    ws_b = DummyWebSocket()
+    await worker_a.connect(ws_a, user_id=1)
+    await worker_b.connect(ws_b, user_id=2)
+    await worker_b.subscribe_to_task(2, "task1")
+
+    # Published from worker A, delivered only by the worker holding user 2
+    await worker_a.broadcast_task_progress("task1", {"progress": 10}, user_id=2)
+    await worker_a.broadcast_task_progress("other", {"progress": 10}, user_id=2)
+    await worker_a.send_notification(2, {"text": "hi"})
+    progress = [m for m in ws_b.sent if "task_progress_update" in m]
+    assert len(progress) == 1 and '"task1"' in progress[0]
+    assert any("notification" in m for m in ws_b.sent)
+    assert not any("notification" in m for m in ws_a.sent)
+
+    await worker_b.broadcast_system_message("maintenance")
+    assert any("maintenance" in m for m in ws_a.sent)
+    assert any("maintenance" in m for m in ws_b.sent)
+
+    stats = await worker_a.get_cluster_stats()
+    assert stats == {"connected_users": [1, 2], "total_connections": 2, "user_count": 2}
+
+    worker_b.disconnect(ws_b, user_id=2)
+    sent_before = len(ws_b.sent)
+    await worker_a.send_notification(2, {"text": "gone"})
+    assert len(ws_b.sent) == sent_before
+    assert (await worker_a.get_cluster_stats())["connected_users"] == [1]
+
+
+def test_publish_sync_is_noop_without_redis():
+    from app.core.websocket import publish_file_status
+
+    assert publish_file_status(1, {"status": "completed"}, user_id=1) is False
+
+
+@pytest.mark.asyncio
+async def test_redis_backplane_dispatches_subscribed_channels(monkeypatch):
+    import asyncio
+    import json
+    from unittest.mock import AsyncMock, MagicMock
+    from app.core import websocket_backplane
+
+    client = MagicMock()
+    client.publish = AsyncMock()
+    client.hincrby = AsyncMock()
+    client.expire = AsyncMock()
+    pubsub = client.pubsub.return_value
+    pubsub.subscribe = AsyncMock()
+    pubsub.unsubscribe = AsyncMock()
+    messages = [
+        {"channel": b"ws:user:7", "data": json.dumps({"user_id": 7, "message": {}})}
+    ]
+
+    async def get_message(**kwargs):
+        await asyncio.sleep(0)
+        return messages.pop() if messages else None
+
+    pubsub.get_message = get_message
+    monkeypatch.setattr(
+        websocket_backplane.aioredis.Redis, "from_url", lambda url: client
+    )
+    backplane = websocket_backplane.RedisBackplane("redis://test", worker_id="w1")
+
+    received = []
+
+    async def handler(channel, event):
+        received.append((channel, event))
+
+    await backplane.subscribe("ws:user:7", handler)
+    pubsub.subscribe.assert_awaited_once_with("ws:user:7")
+    backplane.update_presence("w1", 7, 1)
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert received == [("ws:user:7", {"user_id": 7, "message": {}})]
+    client.hincrby.assert_awaited_with("ws:presence:w1", 7, 1)
+
+    await backplane.publish("ws:user:7", {"user_id": 7})
+    client.publish.assert_awaited_once_with("ws:user:7", json.dumps({"user_id": 7}))
+
+    backplane.unsubscribe("ws:user:7", handler)
+    for _ in range(5):
+        await asyncio.sleep(0)
+    pubsub.unsubscribe.assert_awaited_once_with("ws:user:7")
+    # The presence TTL is extended with the presence change, not on every
+    # listener iteration
+    client.expire.assert_awaited_once_with("ws:presence:w1", 30)
+    backplane._listener.cancel()
+
+
+class StalledWebSocket(DummyWebSocket):
+    """Accepts messages but never finishes sending until released."""
+
+    def __init__(self):
+        super().__init__()
+        import asyncio
+
+        self.release = asyncio.Event()
+        self.closed_with = None
+
+    async def send_text(self, text):
+        await self.release.wait()
+        self.sent.append(text)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+@pytest.mark.asyncio
+async def test_progress_updates_coalesce_for_slow_clients():
+    manager = ConnectionManager(queue_size=8)
+    slow = StalledWebSocket()
+    fast = DummyWebSocket()
+    await manager.connect(slow, user_id=1)
+    await manager.connect(fast, user_id=2)
+    await manager.subscribe_to_task(1, "t")
+    await manager.subscribe_to_task(2, "t")
+
+    for percent in range(0, 101, 10):
+        await manager.broadcast_task_progress("t", {"progress": percent}, user_id=1)
+        await manager.broadcast_task_progress("t", {"progress": percent}, user_id=2)
+
+    # The fast client got every update while the slow one was stalled
+    assert sum("task_progress_update" in m for m in fast.sent) == 11
+
+    slow.release.set()
+    assert await manager.drain()
+    progress = [m for m in slow.sent if "task_progress_update" in m]
+    assert len(progress) == 1 and '"progress": 100' in progress[0]
+    assert manager.outbound[slow].coalesced == 10
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_laggards_are_disconnected_when_queue_fills():
+    import asyncio
+
+    manager = ConnectionManager(queue_size=2)
+    slow = StalledWebSocket()
+    await manager.connect(slow, user_id=1)
+    for i in range(3):
+        await manager.send_notification(1, {"n": i})
+    await asyncio.sleep(0)
+
+    assert manager.get_connected_users() == []
+    assert slow not in manager.outbound
+    assert slow.closed_with == 1013
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_policy_keeps_connection():
+    manager = ConnectionManager(queue_size=2, slow_consumer_policy="drop_oldest")
+    slow = StalledWebSocket()
+    await manager.connect(slow, user_id=1)
+    for i in range(5):
+        await manager.send_notification(1, {"n": i})
+
+    assert manager.get_connected_users() == [1]
+    slow.release.set()
+    assert await manager.drain()
+    assert '"n": 4' in slow.sent[-1]
+    assert manager.outbound[slow].dropped == 3
+    await manager.close()
+
+
+class BinaryWebSocket(DummyWebSocket):
+    def __init__(self):
+        super().__init__()
+        self.subprotocol = None
+        self.binary = []
+
+    async def accept(self, subprotocol=None):
+        self.accepted = True
+        self.subprotocol = subprotocol
+
+    async def send_bytes(self, data):
+        self.binary.append(data)
+
+
+@pytest.mark.asyncio
+async def test_msgpack_clients_get_binary_frames_serialized_once():
+    import msgpack
+    from unittest.mock import patch
+    from app.core import websocket
+
+    manager = ConnectionManager()
+    binary = [BinaryWebSocket() for _ in range(3)]
+    text = DummyWebSocket()
+    for i, ws in enumerate(binary):
+        await manager.connect(ws, user_id=i, encoding="msgpack")
+    await manager.connect(text, user_id=9)
+    assert binary[0].subprotocol == "msgpack"
+
+    with patch.object(
+        websocket.msgpack, "packb", wraps=msgpack.packb
+    ) as packb, patch.object(
+        websocket.json, "dumps", wraps=websocket.json.dumps
+    ) as dumps:
+        await manager.broadcast_system_message("hello")
+    assert packb.call_count == 1
+    assert dumps.call_count == 1
+
+    await manager.drain()
+    assert msgpack.unpackb(binary[2].binary[-1])["message"] == "hello"
+    assert '"hello"' in text.sent[-1]
+    await manager.close()
+
+
+def test_negotiate_encoding_from_subprotocol_or_query():
+    from types import SimpleNamespace
+    from app.core.websocket import negotiate_encoding
+
+    offered = SimpleNamespace(scope={"subprotocols": ["msgpack"]}, query_params={})
+    queried = SimpleNamespace(scope={}, query_params={"encoding": "msgpack"})
+    plain = SimpleNamespace(scope={}, query_params={})
+    assert negotiate_encoding(offered) == "msgpack"
+    assert negotiate_encoding(queried) == "msgpack"
+    assert negotiate_encoding(plain) == "json"
+
+
+@pytest.mark.asyncio
+async def test_scenario_results_pushed_as_deltas():
+    import json
+
+    manager = ConnectionManager()
+    ws = DummyWebSocket()
+    await manager.connect(ws, user_id=1)
+    await manager.subscribe(ws, "scenario:5")
+    values = {f"A{row}": row for row in range(1, 101)}
+
+    await manager.broadcast_scenario_results(5, values)
+    full = json.loads(ws.sent[-1])
+    assert full["type"] == "scenario_results" and full["version"] == 1
+    assert len(full["values"]) == 100
+
+    values = {**values, "A1": 1000}
+    del values["A100"]
+    await manager.broadcast_scenario_results(5, values)
+    delta = json.loads(ws.sent[-1])
+    assert delta == {
+        "type": "scenario_results_delta",
+        "scenario_id": 5,
+        "version": 2,
+        "base_version": 1,
+        "changed": {"A1": 1000},
+        "removed": ["A100"],
+    }
+
+    # Mostly-changed results fall back to a full snapshot
+    await manager.broadcast_scenario_results(5, {k: -v for k, v in values.items()})
+    assert json.loads(ws.sent[-1])["type"] == "scenario_results"
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_scenario_versions_are_shared_across_workers():
+    import json
+    from app.core.websocket_backplane import LocalBackplane
+
+    backplane = LocalBackplane()
+    worker_a = ConnectionManager(backplane)
+    worker_b = ConnectionManager(backplane)
+    ws = DummyWebSocket()
+    await worker_b.connect(ws, user_id=1)
+    await worker_b.subscribe(ws, "scenario:5")
+    values = {f"A{row}": row for row in range(1, 11)}
+
+    await worker_a.broadcast_scenario_results(5, values)
+    await worker_b.broadcast_scenario_results(5, {**values, "A1": 0})
+    results = [json.loads(m) for m in ws.sent if "scenario_results" in m]
+    assert [r["version"] for r in results] == [1, 2]
+    # The delta is against worker A's push, which the client received
+    assert results[1]["base_version"] == 1
+    assert results[1]["changed"] == {"A1": 0}
+
+    # Late joiners on either worker start from the latest values
+    assert (await worker_a.scenario_deltas.snapshot(5))["version"] == 2
+    await worker_a.close()
+    await worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_backplane_swaps_snapshots_atomically(monkeypatch):
+    import json
+    from unittest.mock import AsyncMock, MagicMock
+    from app.core import websocket_backplane
+
+    client = MagicMock()
+    script = client.register_script.return_value = AsyncMock(
+        side_effect=[[1, None], [2, json.dumps({"A1": 1}).encode()]]
+    )
+    client.hmget = AsyncMock(return_value=[b"2", json.dumps({"A1": 2}).encode()])
+    monkeypatch.setattr(
+        websocket_backplane.aioredis.Redis, "from_url", lambda url: client
+    )
+    backplane = websocket_backplane.RedisBackplane("redis://test", worker_id="w1")
+
+    assert await backplane.swap_snapshot("scenario:5", {"A1": 1}) == (1, None)
+    assert await backplane.swap_snapshot("scenario:5", {"A1": 2}) == (2, {"A1": 1})
+    assert script.await_args.kwargs["keys"] == ["ws:snapshot:scenario:5"]
+    assert await backplane.get_snapshot("scenario:5") == (2, {"A1": 2})
+
+
+@pytest.mark.asyncio
+async def test_many_users_share_one_scenario_topic():
+    import json
+
+    manager = ConnectionManager()
+    watchers = [DummyWebSocket() for _ in range(20)]
+    bystander = DummyWebSocket()
+    for user_id, ws in enumerate(watchers):
+        await manager.connect(ws, user_id=user_id)
+        await manager.subscribe(ws, "scenario:7")
+    await manager.connect(bystander, user_id=99)
+    await manager.subscribe(bystander, "scenario:8")
+
+    await manager.broadcast_scenario_results(7, {"A1": 1})
+    for ws in watchers:
+        results = [json.loads(m) for m in ws.sent if "scenario_results" in m]
+        assert [r["scenario_id"] for r in results] == [7]
+    assert not any("scenario_results" in m for m in bystander.sent)
+    assert len(manager.topic_subscribers["scenario:7"]) == 20
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_drops_every_topic_subscription():
+    manager = ConnectionManager()
+    ws = DummyWebSocket()
+    other = DummyWebSocket()
+    await manager.connect(ws, user_id=1)
+    await manager.connect(other, user_id=2)
+    for topic in ("scenario:1", "scenario:2", "analysis:3"):
+        await manager.subscribe(ws, topic)
+    await manager.subscribe(other, "scenario:1")
+    await manager.subscribe_to_file(1, 42)
+
+    manager.disconnect(ws, user_id=1)
+    assert manager.topic_subscribers == {"scenario:1": {other}}
+    assert ws not in manager.connection_topics
+    # Backplane channels without local subscribers are released too
+    assert "ws:topic:scenario:2" not in manager.backplane._handlers
+    assert "ws:topic:user:1:file:42" not in manager.backplane._handlers
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_client_subscriptions_are_authorized():
+    import json
+
+    async def owner_only(user_id, topic):
+        return topic == "scenario:5" and user_id == 1
+
+    manager = ConnectionManager()
+    manager.register_topic_authorizer("scenario", owner_only)
+    ws = DummyWebSocket()
+    intruder = DummyWebSocket()
+    await manager.connect(ws, user_id=1)
+    await manager.connect(intruder, user_id=2)
+    await manager.broadcast_scenario_results(5, {"A1": 1})
+
+    assert not await manager.subscribe_client(intruder, "scenario:5")
+    assert not await manager.subscribe_client(ws, "user:2:file:1")
+    # Late joiners start from the latest snapshot
+    assert await manager.subscribe_client(ws, "scenario:5")
+    assert json.loads(ws.sent[-1])["values"] == {"A1": 1}
+
+    manager.unsubscribe(ws, "scenario:5")
+    assert "scenario:5" not in manager.topic_subscribers
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_subscription_replies_go_to_the_requesting_socket(monkeypatch):
+    import asyncio
+    import json
+
+    from app.core import websocket as websocket_module
+
+    async def owner_only(user_id, topic):
+        return topic == "scenario:5" and user_id == 1
+
+    manager = ConnectionManager()
+    manager.register_topic_authorizer("scenario", owner_only)
+    monkeypatch.setattr(websocket_module, "manager", manager)
+    requester = DummyWebSocket()
+    other_tab = DummyWebSocket()
+    await manager.connect(requester, user_id=1)
+    await manager.connect(other_tab, user_id=1)
+    other_tab.sent.clear()
+
+    for topic in ("scenario:5", "scenario:6"):
+        await websocket_module.handle_websocket_message(
+            requester, 1, {"type": "subscribe", "topic": topic}
+        )
+    await asyncio.sleep(0.05)
+
+    replies = [json.loads(text)["type"] for text in requester.sent[-2:]]
+    assert replies == ["subscribed", "error"]
+    assert other_tab.sent == []
+    await manager.close()
+
+
+def test_can_watch_scenario(db_session):
+    from app.api.v1.endpoints.websocket import can_watch_scenario
+    from app.models.parameter import Scenario
+    from app.models.user import User
+
+    owner = User(
+        username="owner",
+        email="owner@example.com",
+        hashed_password="x",
+        is_active=True,
+    )
+    db_session.add(owner)
+    db_session.commit()
+    scenario = Scenario(name="Shared", base_file_id=1, created_by_id=owner.id)
+    db_session.add(scenario)
+    db_session.commit()
+
+    assert can_watch_scenario(db_session, owner.id, scenario.id)
+    assert not can_watch_scenario(db_session, owner.id, scenario.id + 1)